@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import logging
+import threading
+from .filehash import get_file_hash
+
+
+__all__ = ["ArtifactCache"]
+
+
+class ArtifactCache:
+    """
+    Bounded local cache of driver install artifacts
+
+    Artifacts are stored with their sha256 hash, checked each time an artifact is used. Least recently
+    used artifacts are evicted when cache size exceeds its limit. Access times are only updated in memory
+    on cache hits, they are written with the index on next add or clear.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cleep_filesystem, cache_path, max_size):
+        """
+        Constructor
+
+        Args:
+            cleep_filesystem (CleepFilesystem): CleepFilesystem instance
+            cache_path (str): cache directory
+            max_size (int): cache max size in bytes
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cleep_filesystem = cleep_filesystem
+        self.cache_path = cache_path
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+        self.__index = None
+
+    def add(self, key, source_path):
+        """
+        Add artifact to cache
+
+        Args:
+            key (str): artifact key (usually "<driver type>/<driver name>/<artifact name>")
+            source_path (str): artifact file path
+
+        Returns:
+            bool: True if artifact was cached
+        """
+        size = os.path.getsize(source_path)
+        if size > self.max_size:
+            self.logger.debug('Artifact "%s" is too big to be cached', key)
+            return False
+
+        file_hash = get_file_hash(source_path)
+        with self.__lock:
+            index = self.__load_index()
+            blob_path = self.__get_blob_path(file_hash)
+            if not os.path.exists(blob_path):
+                if not os.path.exists(self.cache_path):
+                    self.cleep_filesystem.mkdir(self.cache_path, True)
+                if not self.cleep_filesystem.copy(source_path, blob_path):
+                    self.logger.error('Unable to cache artifact "%s"', key)
+                    return False
+
+            old_item = index.get(key)
+            index[key] = {"hash": file_hash, "size": size, "lastaccess": time.time()}
+            if old_item and old_item["hash"] != file_hash:
+                self.__remove_blob(index, old_item["hash"])
+            self.__evict(index)
+
+            return self.__save_index(index)
+
+    def get(self, key):
+        """
+        Return cached artifact path. Artifact integrity is checked.
+
+        Args:
+            key (str): artifact key
+
+        Returns:
+            str: cached artifact path or None if artifact is not cached or corrupted
+        """
+        with self.__lock:
+            index = self.__load_index()
+            item = index.get(key)
+            blob_path = item and self.__get_blob_path(item["hash"])
+            if not item or not os.path.exists(blob_path):
+                self.misses += 1
+                return None
+
+            if get_file_hash(blob_path) != item["hash"]:
+                self.logger.warning('Cached artifact "%s" is corrupted, it is removed', key)
+                del index[key]
+                self.__remove_blob(index, item["hash"])
+                self.__save_index(index)
+                self.misses += 1
+                return None
+
+            item["lastaccess"] = time.time()
+            self.hits += 1
+            return blob_path
+
+    def record_miss(self):
+        """
+        Count a cache miss for a lookup not performed by get (no artifact cached for requested prefix)
+        """
+        with self.__lock:
+            self.misses += 1
+
+    def get_keys(self, prefix=""):
+        """
+        Return keys of cached artifacts
+
+        Args:
+            prefix (str, optional): only return keys starting with this prefix
+
+        Returns:
+            list: sorted list of keys
+        """
+        with self.__lock:
+            return sorted(key for key in self.__load_index() if key.startswith(prefix))
+
+    def get_stats(self):
+        """
+        Return cache statistics
+
+        Returns:
+            dict: cache statistics::
+
+                {
+                    entries (int): number of cached artifacts,
+                    size (int): space used in bytes,
+                    maxsize (int): cache max size in bytes,
+                    hits (int): number of cache hits,
+                    misses (int): number of cache misses,
+                }
+
+        """
+        with self.__lock:
+            index = self.__load_index()
+            return {
+                "entries": len(index),
+                "size": self.__get_size(index),
+                "maxsize": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def clear(self):
+        """
+        Remove all cached artifacts
+
+        Returns:
+            bool: True if cache cleared
+        """
+        with self.__lock:
+            index = self.__load_index()
+            for key in list(index.keys()):
+                item = index.pop(key)
+                self.__remove_blob(index, item["hash"])
+
+            return self.__save_index(index)
+
+    def __get_blob_path(self, file_hash):
+        """
+        Return blob path
+
+        Args:
+            file_hash (str): file hash
+
+        Returns:
+            str: blob path
+        """
+        return os.path.join(self.cache_path, file_hash)
+
+    def __get_size(self, index):
+        """
+        Return space used by blobs referenced in index
+
+        Args:
+            index (dict): cache index
+
+        Returns:
+            int: size in bytes
+        """
+        blobs = {item["hash"]: item["size"] for item in index.values()}
+        return sum(blobs.values())
+
+    def __remove_blob(self, index, file_hash):
+        """
+        Remove blob if not referenced anymore
+
+        Args:
+            index (dict): cache index
+            file_hash (str): blob hash
+        """
+        if any(item["hash"] == file_hash for item in index.values()):
+            return
+
+        blob_path = self.__get_blob_path(file_hash)
+        if os.path.exists(blob_path):
+            self.cleep_filesystem.rm(blob_path)
+
+    def __evict(self, index):
+        """
+        Evict least recently used artifacts until cache size is under limit
+
+        Args:
+            index (dict): cache index
+        """
+        for key, item in sorted(index.items(), key=lambda entry: entry[1]["lastaccess"]):
+            if self.__get_size(index) <= self.max_size:
+                break
+            self.logger.debug('Evict artifact "%s" from cache', key)
+            del index[key]
+            self.__remove_blob(index, item["hash"])
+
+    def __load_index(self):
+        """
+        Load cache index
+
+        Returns:
+            dict: cache index
+        """
+        if self.__index is None:
+            self.__index = {}
+            index_path = os.path.join(self.cache_path, self.INDEX_FILE)
+            if os.path.exists(index_path):
+                try:
+                    self.__index = self.cleep_filesystem.read_json(index_path) or {}
+                except Exception:
+                    self.logger.exception("Invalid artifacts cache index")
+
+        return self.__index
+
+    def __save_index(self, index):
+        """
+        Save cache index
+
+        Args:
+            index (dict): cache index
+
+        Returns:
+            bool: True if index saved
+        """
+        if not os.path.exists(self.cache_path):
+            self.cleep_filesystem.mkdir(self.cache_path, True)
+        if not self.cleep_filesystem.write_json(os.path.join(self.cache_path, self.INDEX_FILE), index):
+            self.logger.error("Unable to save artifacts cache index")
+            return False
+
+        return True
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import random
+import logging
+import threading
+
+
+__all__ = ["BackupWorker"]
+
+
+class BackupWorker:
+    """
+    Run backups on a dedicated thread
+
+    Backup requests are coalesced: requests received while a backup is pending are merged into a
+    single backup, and requests received while a backup is running trigger only one more backup.
+    Scheduled requests can be deferred while device is busy, urgent ones (flush) never are.
+    """
+
+    DEFER_CHECK_INTERVAL = 10.0
+
+    def __init__(self, backup, jitter=0.0, is_busy=None, max_defer=0.0):
+        """
+        Constructor
+
+        Args:
+            backup (function): backup function. Must return True if backup succeed
+            jitter (float, optional): max random delay (in seconds) applied to scheduled requests
+            is_busy (function, optional): function returning True if scheduled backup must be deferred
+            max_defer (float, optional): max time (in seconds) a scheduled backup can be deferred
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.backup = backup
+        self.jitter = jitter
+        self.is_busy = is_busy
+        self.max_defer = max_defer
+        self.deferred = 0
+        self.__condition = threading.Condition()
+        self.__thread = None
+        self.__running = False
+        self.__requested = 0
+        self.__completed = 0
+        self.__urgent = False
+        self.__result = None
+        self.__backup_lock = threading.Lock()
+
+    def start(self):
+        """
+        Start worker
+        """
+        with self.__condition:
+            if self.__running:
+                return
+            self.__running = True
+        self.__thread = threading.Thread(target=self.__run, name="backupworker", daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop worker. Pending backup is performed before stopping.
+
+        Args:
+            timeout (float, optional): max time to wait for pending backup (in seconds)
+        """
+        with self.__condition:
+            self.__running = False
+            self.__urgent = True
+            self.__condition.notify_all()
+        if self.__thread:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def is_running(self):
+        """
+        Return True if worker is running
+
+        Returns:
+            bool: True if worker is running
+        """
+        return self.__running
+
+    def is_pending(self):
+        """
+        Return True if a backup is pending or running
+
+        Returns:
+            bool: True if a backup is pending or running
+        """
+        with self.__condition:
+            return self.__completed < self.__requested
+
+    def request(self, jitter=False):
+        """
+        Request a backup (non blocking)
+
+        Args:
+            jitter (bool, optional): delay backup randomly (up to worker jitter). Defaults to False.
+        """
+        with self.__condition:
+            self.__requested += 1
+            if not jitter:
+                self.__urgent = True
+            self.__condition.notify_all()
+
+    def flush(self, timeout):
+        """
+        Request a backup and wait for its completion.
+        Backup is executed on caller thread if worker is not running.
+
+        Args:
+            timeout (float): max time to wait (in seconds)
+
+        Returns:
+            bool: backup result or False if timeout occured
+        """
+        if not self.__running:
+            return self.__backup()
+
+        with self.__condition:
+            self.__requested += 1
+            sequence = self.__requested
+            self.__urgent = True
+            self.__condition.notify_all()
+            if not self.__condition.wait_for(lambda: self.__completed >= sequence, timeout):
+                self.logger.warning("Backup not completed after %s seconds", timeout)
+                return False
+
+            return self.__result
+
+    def __backup(self):
+        """
+        Execute backup
+
+        Returns:
+            bool: backup result
+        """
+        with self.__backup_lock:
+            try:
+                return self.backup()
+            except Exception:
+                self.logger.exception("Backup failed")
+                return False
+
+    def __wait(self, timeout):
+        """
+        Wait until timeout or urgent request received
+
+        Args:
+            timeout (float): max time to wait (in seconds)
+
+        Returns:
+            bool: True if urgent request received
+        """
+        deadline = time.time() + timeout
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: self.__urgent or time.time() >= deadline, max(0.0, timeout)
+            ) and self.__urgent
+
+    def __run(self):
+        """
+        Worker main loop
+        """
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(
+                    lambda: not self.__running or self.__completed < self.__requested
+                )
+                if self.__completed >= self.__requested:
+                    # stopped without pending backup
+                    return
+                urgent = self.__urgent
+
+            # delay scheduled backup, unless urgent request received in the meantime
+            if not urgent and self.jitter:
+                urgent = self.__wait(random.uniform(0, self.jitter))
+
+            # defer scheduled backup while device is busy
+            if not urgent and self.is_busy:
+                deadline = time.time() + self.max_defer
+                while not urgent and time.time() < deadline and self.is_busy():
+                    self.deferred += 1
+                    self.logger.debug("Device is busy, backup deferred")
+                    urgent = self.__wait(min(self.DEFER_CHECK_INTERVAL, deadline - time.time()))
+
+            with self.__condition:
+                sequence = self.__requested
+                self.__urgent = False
+
+            result = self.__backup()
+
+            with self.__condition:
+                self.__result = result
+                self.__completed = sequence
+                self.__condition.notify_all()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import logging
+import threading
+from .filehash import get_file_hash
+
+
+__all__ = ["ConfigBackup"]
+
+
+class ConfigBackup:
+    """
+    Incremental Cleep configuration backup
+
+    Keeps a manifest of backuped files (size, mtime and hash) and only copies files that changed
+    since last backup. Full backup is delegated to specified function when no manifest exists.
+    """
+
+
+    def __init__(
+        self, cleep_filesystem, full_backup, source_path, backup_path, manifest_path, copy_file=None
+    ):
+        """
+        Constructor
+
+        Args:
+            cleep_filesystem (CleepFilesystem): CleepFilesystem instance
+            full_backup (function): function performing full backup. Must return True if backup succeed
+            source_path (str): configuration directory to backup
+            backup_path (str): backup directory
+            manifest_path (str): manifest file path
+            copy_file (function, optional): file copy function. Defaults to CleepFilesystem copy
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cleep_filesystem = cleep_filesystem
+        self.copy_file = copy_file or cleep_filesystem.copy
+        self.full_backup = full_backup
+        self.source_path = source_path
+        self.backup_path = backup_path
+        self.manifest_path = manifest_path
+        self.__manifest = None
+        self.__last_backup = None
+        self.__lock = threading.Lock()
+
+    def get_manifest(self):
+        """
+        Return manifest of last backup
+
+        Returns:
+            dict: manifest or None if no backup performed yet::
+
+                {
+                    relative file path (str): {
+                        size (int): file size,
+                        mtime (int): file modification time in nanoseconds,
+                        hash (str): file sha256 hash,
+                    },
+                    ...
+                }
+
+        """
+        return self.__load_manifest()
+
+    def get_last_backup(self):
+        """
+        Return last backup statistics
+
+        Returns:
+            dict: last backup statistics or None if no backup performed yet::
+
+                {
+                    timestamp (int): backup timestamp,
+                    success (bool): True if backup succeed,
+                    full (bool): True if full backup was performed,
+                    files (int): number of configuration files,
+                    copied (int): number of copied files,
+                    deleted (int): number of deleted files,
+                    byteswritten (int): number of bytes copied,
+                    bytesskipped (int): number of bytes not copied because unchanged,
+                    duration (float): backup duration in seconds,
+                }
+
+        """
+        return self.__last_backup
+
+    def backup(self):
+        """
+        Backup configuration files that changed since last backup
+
+        Returns:
+            bool: True if backup succeed
+        """
+        with self.__lock:
+            start = time.time()
+            previous = self.__load_manifest()
+            manifest, changed = self.__scan(previous or {})
+            deleted = sorted(set(previous or {}) - set(manifest))
+            stats = {
+                "timestamp": int(start),
+                "success": False,
+                "full": previous is None,
+                "files": len(manifest),
+                "copied": 0,
+                "deleted": 0,
+                "byteswritten": 0,
+                "bytesskipped": 0,
+                "duration": 0.0,
+            }
+
+            if previous is None:
+                stats["success"] = self.full_backup()
+                stats["copied"] = len(manifest)
+                stats["byteswritten"] = sum(item["size"] for item in manifest.values())
+            else:
+                stats["success"] = self.__copy_changes(changed, deleted, stats)
+                stats["bytesskipped"] = sum(
+                    item["size"] for path, item in manifest.items() if path not in changed
+                )
+
+            if stats["success"] and (previous is None or changed or deleted or manifest != previous):
+                stats["success"] = self.__save_manifest(manifest)
+
+            stats["duration"] = round(time.time() - start, 3)
+            self.__last_backup = stats
+            self.logger.debug("Backup stats: %s", stats)
+
+            return stats["success"]
+
+    def __copy_changes(self, changed, deleted, stats):
+        """
+        Copy changed files to backup directory and remove deleted ones
+
+        Args:
+            changed (dict): changed files manifest entries
+            deleted (list): deleted files
+            stats (dict): backup stats to update
+
+        Returns:
+            bool: True if all changes were applied
+        """
+        success = True
+        for path, item in changed.items():
+            source = os.path.join(self.source_path, path)
+            destination = os.path.join(self.backup_path, path)
+            destination_dir = os.path.dirname(destination)
+            if not os.path.exists(destination_dir):
+                self.cleep_filesystem.mkdir(destination_dir, True)
+            if self.copy_file(source, destination):
+                stats["copied"] += 1
+                stats["byteswritten"] += item["size"]
+            else:
+                self.logger.error('Unable to backup file "%s"', source)
+                success = False
+
+        for path in deleted:
+            if self.cleep_filesystem.rm(os.path.join(self.backup_path, path)):
+                stats["deleted"] += 1
+            else:
+                success = False
+
+        return success
+
+    def __scan(self, previous):
+        """
+        Scan configuration directory
+
+        Args:
+            previous (dict): previous manifest
+
+        Returns:
+            tuple: current manifest and changed files manifest entries
+        """
+        manifest = {}
+        changed = {}
+        for root, _, filenames in os.walk(self.source_path):
+            for filename in filenames:
+                fullpath = os.path.join(root, filename)
+                path = os.path.relpath(fullpath, self.source_path)
+                try:
+                    stat = os.stat(fullpath)
+                except OSError:
+                    # file deleted during scan
+                    continue
+
+                item = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": None}
+                old_item = previous.get(path)
+                if (
+                    old_item
+                    and old_item["size"] == item["size"]
+                    and old_item["mtime"] == item["mtime"]
+                ):
+                    item["hash"] = old_item["hash"]
+                else:
+                    # metadata changed, compare content to detect real changes
+                    try:
+                        item["hash"] = get_file_hash(fullpath)
+                    except OSError:
+                        # file deleted or rotated during scan
+                        self.logger.debug('File "%s" disappeared during backup scan', path)
+                        continue
+                    if not old_item or old_item["hash"] != item["hash"]:
+                        changed[path] = item
+                manifest[path] = item
+
+        return manifest, changed
+
+    def __load_manifest(self):
+        """
+        Load manifest from memory or from filesystem
+
+        Returns:
+            dict: manifest or None if no manifest exists
+        """
+        if self.__manifest is None and os.path.exists(self.manifest_path):
+            try:
+                self.__manifest = self.cleep_filesystem.read_json(self.manifest_path)
+            except Exception:
+                self.logger.exception("Invalid backup manifest, full backup will be performed")
+
+        return self.__manifest
+
+    def __save_manifest(self, manifest):
+        """
+        Save manifest
+
+        Args:
+            manifest (dict): manifest to save
+
+        Returns:
+            bool: True if manifest saved
+        """
+        if not self.cleep_filesystem.write_json(self.manifest_path, manifest):
+            self.logger.error("Unable to save backup manifest")
+            self.__manifest = None
+            return False
+
+        self.__manifest = manifest
+        return True
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import glob
+import logging
+from .sysfsreader import SysfsReader
+
+
+__all__ = ["CpuFreq"]
+
+
+class CpuFreq(SysfsReader):
+    """
+    Cpu performance profiles through cpufreq sysfs
+
+    Profiles are applied on each cpufreq policy (group of cpus sharing same clock). Named profiles select
+    the governor of the same name and reset frequency limits to hardware limits. Custom profile keeps
+    ondemand governor and bounds frequency between specified limits.
+
+    Policies state found before first profile is applied is saved in a tmpfs file (cleared at reboot, when
+    kernel restores its defaults) so it can be restored even after application restarted.
+    """
+
+    POLICIES_PATH = "devices/system/cpu/cpufreq/policy*"
+    PROFILES = ["performance", "ondemand", "powersave", "custom"]
+    CUSTOM_GOVERNOR = "ondemand"
+    ORIGINAL_STATE_PATH = "/run/cleep/cpufreq.json"
+
+    def __init__(self, sysfs_root=None, state_path=None):
+        """
+        Constructor
+
+        Args:
+            sysfs_root (str, optional): sysfs directory. Defaults to SYSFS_ROOT
+            state_path (str, optional): original policies state file. Defaults to ORIGINAL_STATE_PATH
+        """
+        SysfsReader.__init__(self, sysfs_root)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.state_path = state_path or self.ORIGINAL_STATE_PATH
+        self.__policies = None
+
+    def get_policies(self):
+        """
+        Return cpufreq policies paths (resolved once)
+
+        Returns:
+            list: policies paths
+        """
+        if self.__policies is None:
+            self.__policies = sorted(glob.glob(os.path.join(self.sysfs_root, self.POLICIES_PATH)))
+
+        return self.__policies
+
+    def get_status(self):
+        """
+        Return cpufreq status
+
+        Returns:
+            dict: cpufreq status::
+
+                {
+                    supported (bool): True if cpufreq is available,
+                    governors (list): available governors,
+                    policies (list): [
+                        {
+                            policy (str): policy name,
+                            governor (str): current governor,
+                            minfreq (int): current min frequency in MHz,
+                            maxfreq (int): current max frequency in MHz,
+                            hwminfreq (int): hardware min frequency in MHz,
+                            hwmaxfreq (int): hardware max frequency in MHz,
+                        },
+                        ...
+                    ],
+                }
+
+        """
+        policies = []
+        for path in self.get_policies():
+            policies.append(
+                {
+                    "policy": os.path.basename(path),
+                    "governor": self._read(os.path.join(path, "scaling_governor")),
+                    "minfreq": self.__read_mhz(path, "scaling_min_freq"),
+                    "maxfreq": self.__read_mhz(path, "scaling_max_freq"),
+                    "hwminfreq": self.__read_mhz(path, "cpuinfo_min_freq"),
+                    "hwmaxfreq": self.__read_mhz(path, "cpuinfo_max_freq"),
+                }
+            )
+
+        governors = (
+            self._read(os.path.join(self.get_policies()[0], "scaling_available_governors")) if policies else None
+        )
+
+        return {
+            "supported": len(policies) > 0,
+            "governors": governors.split() if governors else [],
+            "policies": policies,
+        }
+
+    def apply(self, profile, min_freq=None, max_freq=None):
+        """
+        Apply cpu profile
+
+        Args:
+            profile (str): profile name (see PROFILES)
+            min_freq (int, optional): min frequency in MHz (custom profile only)
+            max_freq (int, optional): max frequency in MHz (custom profile only)
+
+        Raises:
+            ValueError: if profile or frequencies are invalid
+            OSError: if cpufreq files can't be written
+        """
+        if profile not in self.PROFILES:
+            raise ValueError(f'Profile "{profile}" does not exist')
+        if not self.get_policies():
+            raise ValueError("Cpufreq is not supported on this device")
+
+        governor = self.CUSTOM_GOVERNOR if profile == "custom" else profile
+
+        # validate all policies before writing anything, so a rejected profile leaves cpus unchanged
+        limits = []
+        for path in self.get_policies():
+            governors = self._read(os.path.join(path, "scaling_available_governors"))
+            if governor not in (governors.split() if governors else []):
+                raise ValueError(f'Governor "{governor}" is not supported on this device')
+            hw_min = self._read_int(os.path.join(path, "cpuinfo_min_freq"))
+            hw_max = self._read_int(os.path.join(path, "cpuinfo_max_freq"))
+            new_min, new_max = hw_min, hw_max
+            if profile == "custom" and hw_min is not None and hw_max is not None:
+                new_min = max(hw_min, min_freq * 1000) if min_freq else hw_min
+                new_max = min(hw_max, max_freq * 1000) if max_freq else hw_max
+                if new_min > new_max:
+                    raise ValueError("Min frequency must be lower than max frequency")
+            limits.append((path, hw_min, hw_max, new_min, new_max))
+
+        self.__save_original_state()
+        for path, hw_min, hw_max, new_min, new_max in limits:
+            self.logger.debug(
+                "Apply cpu profile %s on %s (governor=%s min=%s max=%s)", profile, path, governor, new_min, new_max
+            )
+            self.__write(path, "scaling_governor", governor)
+            if hw_min is None or hw_max is None:
+                continue
+            # widen limits first to always keep min <= max
+            self.__write(path, "scaling_max_freq", str(hw_max))
+            self.__write(path, "scaling_min_freq", str(new_min))
+            self.__write(path, "scaling_max_freq", str(new_max))
+
+    def restore(self):
+        """
+        Restore policies state found before first profile was applied
+
+        Returns:
+            bool: True if state was restored, False if no profile was applied since boot
+
+        Raises:
+            OSError: if cpufreq files can't be written
+        """
+        if not os.path.exists(self.state_path):
+            return False
+
+        with open(self.state_path, encoding="utf-8") as file_descriptor:
+            state = json.load(file_descriptor)
+        for path in self.get_policies():
+            policy = state.get(os.path.basename(path))
+            if not policy:
+                continue
+            self.logger.debug("Restore cpufreq state on %s: %s", path, policy)
+            self.__write(path, "scaling_governor", policy["governor"])
+            if policy["minfreq"] is None or policy["maxfreq"] is None:
+                continue
+            # widen limits first to always keep min <= max
+            hw_max = self._read_int(os.path.join(path, "cpuinfo_max_freq"))
+            if hw_max is not None:
+                self.__write(path, "scaling_max_freq", str(hw_max))
+            self.__write(path, "scaling_min_freq", str(policy["minfreq"]))
+            self.__write(path, "scaling_max_freq", str(policy["maxfreq"]))
+        os.remove(self.state_path)
+
+        return True
+
+    def __save_original_state(self):
+        """
+        Save policies state if not already saved since boot
+        """
+        if os.path.exists(self.state_path):
+            return
+
+        state = {
+            os.path.basename(path): {
+                "governor": self._read(os.path.join(path, "scaling_governor")),
+                "minfreq": self._read_int(os.path.join(path, "scaling_min_freq")),
+                "maxfreq": self._read_int(os.path.join(path, "scaling_max_freq")),
+            }
+            for path in self.get_policies()
+        }
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        with open(self.state_path, "w", encoding="utf-8") as file_descriptor:
+            json.dump(state, file_descriptor)
+
+    def __read_mhz(self, path, name):
+        """
+        Read policy frequency attribute in MHz
+
+        Args:
+            path (str): policy path
+            name (str): attribute name
+
+        Returns:
+            int: frequency in MHz or None if not available
+        """
+        value = self._read_int(os.path.join(path, name))
+        return value // 1000 if value is not None else None
+
+    def __write(self, path, name, value):
+        """
+        Write policy attribute
+
+        Args:
+            path (str): policy path
+            name (str): attribute name
+            value (str): value to write
+        """
+        with open(os.path.join(path, name), "w") as file_descriptor:
+            file_descriptor.write(value)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import uuid
+import logging
+import threading
+from collections import deque
+
+
+__all__ = ["DriverJobQueue"]
+
+
+class DriverJobQueue:
+    """
+    Coordinate driver installations and uninstallations
+
+    Repeated requests for the same driver are merged into the pending job. Jobs are exclusive by default:
+    driver processes use the package manager (apt/dpkg lock), so a job runs alone. Jobs submitted with a
+    conflict key run in parallel with jobs having another key, while jobs on drivers of the same type or
+    with the same key run serially. Jobs start in submission order, a blocked exclusive job is never
+    overtaken. Driver processes don't report progress, so progress is estimated from previous job
+    durations and reported with bounded frequency.
+    """
+
+    PROGRESS_INTERVAL = 2.0
+    DEFAULT_DURATION = 60.0
+    MAX_ESTIMATED_PROGRESS = 95
+    HISTORY_SIZE = 20
+
+    def __init__(self, on_progress, on_terminated):
+        """
+        Constructor
+
+        Args:
+            on_progress (function): called with job when job progress changed
+            on_terminated (function): called with job, success and message when job is terminated
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.on_progress = on_progress
+        self.on_terminated = on_terminated
+        self.__lock = threading.Lock()
+        self.__jobs = []
+        self.__launchers = {}
+        self.__history = deque(maxlen=self.HISTORY_SIZE)
+        self.__durations = {}
+        self.__ticker = None
+        self.__ticker_event = threading.Event()
+
+    def submit(self, action, driver_type, driver_name, launch, on_created=None, conflict=None):
+        """
+        Submit new job. Job is merged with pending job of the same driver if any.
+
+        Args:
+            action (str): job action (install, uninstall)
+            driver_type (str): driver type
+            driver_name (str): driver name
+            launch (function): function launching driver process (non blocking). It takes end callback
+                               (driver_type, driver_name, success, message) as parameter
+            on_created (function, optional): called with job when job is created, before any job is
+                                             launched, so it always runs before job terminated callback
+            conflict (str, optional): conflict key of resource used by driver process. Defaults to None
+                                      (exclusive job, no other job runs at the same time)
+
+        Returns:
+            tuple: job (dict) and True if job was created (False if merged with pending one)
+        """
+        with self.__lock:
+            for job in self.__jobs:
+                if (
+                    job["action"] == action
+                    and job["drivertype"] == driver_type
+                    and job["drivername"] == driver_name
+                ):
+                    self.logger.debug("Driver job %s already pending", job["id"])
+                    return dict(job), False
+
+            job = {
+                "id": str(uuid.uuid4()),
+                "action": action,
+                "drivertype": driver_type,
+                "drivername": driver_name,
+                "conflict": conflict,
+                "status": "queued",
+                "progress": 0,
+                "start": None,
+                "end": None,
+                "success": None,
+                "message": None,
+            }
+            self.__jobs.append(job)
+            self.__launchers[job["id"]] = launch
+            to_start = self.__get_startable_jobs()
+            created = dict(job)
+
+        if on_created:
+            try:
+                on_created(created)
+            except Exception:
+                self.logger.exception("Error in driver job created callback")
+        self.__start_jobs(to_start)
+        with self.__lock:
+            created = dict(job)
+        self.__notify_progress(created)
+
+        return created, True
+
+    def get_jobs(self):
+        """
+        Return pending and latest terminated jobs
+
+        Returns:
+            list: list of jobs, pending ones first
+        """
+        with self.__lock:
+            return [dict(job) for job in self.__jobs] + [dict(job) for job in reversed(self.__history)]
+
+    def is_idle(self):
+        """
+        Return True if no job is pending
+
+        Returns:
+            bool: True if no job queued or running
+        """
+        with self.__lock:
+            return not self.__jobs
+
+    def __get_startable_jobs(self):
+        """
+        Return queued jobs that can be started, in submission order. An exclusive job starts when no job
+        is running, other jobs start when no exclusive job is running and no running job has the same
+        driver type or conflict key. Jobs are marked as running. Must be called with lock acquired.
+
+        Returns:
+            list: list of jobs to start
+        """
+        running = [job for job in self.__jobs if job["status"] == "running"]
+        exclusive = any(job["conflict"] is None for job in running)
+        busy_types = {job["drivertype"] for job in running}
+        busy_conflicts = {job["conflict"] for job in running}
+        to_start = []
+        for job in self.__jobs:
+            if job["status"] != "queued":
+                continue
+            if exclusive:
+                break
+            if job["conflict"] is None:
+                if running or to_start:
+                    # wait for running jobs, later jobs must not overtake it
+                    break
+                exclusive = True
+            elif job["drivertype"] in busy_types or job["conflict"] in busy_conflicts:
+                continue
+            busy_types.add(job["drivertype"])
+            busy_conflicts.add(job["conflict"])
+            job["status"] = "running"
+            job["start"] = time.time()
+            to_start.append(job)
+
+        return to_start
+
+    def __start_jobs(self, jobs):
+        """
+        Launch driver processes of specified jobs
+
+        Args:
+            jobs (list): jobs to start
+        """
+        for job in jobs:
+            self.logger.info(
+                "Start driver %s job on %s/%s", job["action"], job["drivertype"], job["drivername"]
+            )
+            launch = self.__launchers.pop(job["id"])
+            try:
+                launch(lambda _type, _name, success, message, job=job: self.__terminate(job, success, message))
+            except Exception as error:
+                self.logger.exception("Unable to launch driver job %s", job["id"])
+                self.__terminate(job, False, str(error))
+
+        if jobs:
+            self.__start_ticker()
+
+    def __terminate(self, job, success, message):
+        """
+        Terminate job and start next ones
+
+        Args:
+            job (dict): terminated job
+            success (bool): True if driver process succeed
+            message (str): driver process message
+        """
+        with self.__lock:
+            if job not in self.__jobs:
+                return
+            job["status"] = "done" if success else "failed"
+            job["end"] = time.time()
+            job["progress"] = 100
+            job["success"] = success
+            job["message"] = message
+            if success:
+                self.__durations[(job["action"], job["drivertype"], job["drivername"])] = job["end"] - job["start"]
+            self.__jobs.remove(job)
+            self.__history.append(job)
+            to_start = self.__get_startable_jobs()
+            terminated = dict(job)
+
+        self.__notify_progress(terminated)
+        try:
+            self.on_terminated(terminated, success, message)
+        except Exception:
+            self.logger.exception("Error in driver job terminated callback")
+        self.__start_jobs(to_start)
+
+    def __estimate_progress(self, job, now):
+        """
+        Estimate job progress from previous duration of same job
+
+        Args:
+            job (dict): running job
+            now (float): current timestamp
+
+        Returns:
+            int: estimated progress percentage
+        """
+        duration = self.__durations.get(
+            (job["action"], job["drivertype"], job["drivername"]), self.DEFAULT_DURATION
+        )
+        progress = int((now - job["start"]) / max(duration, 1.0) * 100)
+        return min(progress, self.MAX_ESTIMATED_PROGRESS)
+
+    def __start_ticker(self):
+        """
+        Start progress ticker if not running
+        """
+        with self.__lock:
+            if self.__ticker and self.__ticker.is_alive():
+                return
+            self.__ticker = threading.Thread(target=self.__tick, name="driverjobs", daemon=True)
+            self.__ticker.start()
+
+    def __tick(self):
+        """
+        Progress ticker: report running jobs progress every PROGRESS_INTERVAL until no job is running
+        """
+        while not self.__ticker_event.wait(self.PROGRESS_INTERVAL):
+            updated = []
+            with self.__lock:
+                running = [job for job in self.__jobs if job["status"] == "running"]
+                if not running:
+                    self.__ticker = None
+                    return
+                now = time.time()
+                for job in running:
+                    progress = self.__estimate_progress(job, now)
+                    if progress != job["progress"]:
+                        job["progress"] = progress
+                        updated.append(dict(job))
+
+            for job in updated:
+                self.__notify_progress(job)
+
+    def __notify_progress(self, job):
+        """
+        Notify job progress
+
+        Args:
+            job (dict): job
+        """
+        try:
+            self.on_progress(job)
+        except Exception:
+            self.logger.exception("Error in driver job progress callback")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import logging
+import threading
+
+
+__all__ = ["DriversStatus"]
+
+
+class DriversStatus:
+    """
+    Cached inventory of drivers status
+
+    Checking driver status can run commands or scan filesystem, so status of all drivers is computed once
+    and served from cache. Cache is invalidated explicitly (after driver jobs) or when one of the watched
+    system files (where drivers install things) changed. Watched files are only stat'ed.
+    """
+
+    WATCHED_PATHS = [
+        "/boot/config.txt",
+        "/boot/firmware/config.txt",
+        "/etc/modules",
+        "/etc/modprobe.d",
+        "/etc/asound.conf",
+        "/var/lib/dpkg/status",
+    ]
+
+    def __init__(self, drivers, watched_paths=None):
+        """
+        Constructor
+
+        Args:
+            drivers (Drivers): Drivers instance
+            watched_paths (list, optional): files invalidating cache when modified. Defaults to WATCHED_PATHS
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.drivers = drivers
+        self.watched_paths = watched_paths if watched_paths is not None else self.WATCHED_PATHS
+        self.__lock = threading.Lock()
+        self.__status = None
+        self.__signature = None
+        self.__timestamp = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self):
+        """
+        Return drivers status, refreshed if needed
+
+        Returns:
+            dict: drivers status::
+
+                {
+                    drivers (list): [
+                        {
+                            drivertype (str): driver type,
+                            drivername (str): driver name,
+                            installed (bool): True if driver is installed,
+                            version (str): driver version (None if not available),
+                            requirereboot (bool): True if driver requires reboot after install/uninstall,
+                        },
+                        ...
+                    ],
+                    timestamp (int): status timestamp,
+                }
+
+        """
+        with self.__lock:
+            signature = self.__get_signature()
+            if self.__status is None or signature != self.__signature:
+                self.misses += 1
+                self.__status = self.__refresh()
+                self.__signature = signature
+                self.__timestamp = int(time.time())
+            else:
+                self.hits += 1
+
+            return {"drivers": [dict(item) for item in self.__status], "timestamp": self.__timestamp}
+
+    def invalidate(self):
+        """
+        Invalidate cache. Status is refreshed on next get
+        """
+        with self.__lock:
+            self.__status = None
+
+    def __get_signature(self):
+        """
+        Compute watched files signature
+
+        Returns:
+            tuple: modification times of watched files
+        """
+        signature = []
+        for path in self.watched_paths:
+            try:
+                signature.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                signature.append(None)
+
+        return tuple(signature)
+
+    def __refresh(self):
+        """
+        Compute status of all drivers
+
+        Returns:
+            list: drivers status
+        """
+        start = time.time()
+        status = []
+        for driver_type, drivers in self.drivers.get_all_drivers().items():
+            for driver_name, driver in drivers.items():
+                try:
+                    status.append(
+                        {
+                            "drivertype": driver_type,
+                            "drivername": driver_name,
+                            "installed": driver.is_installed(),
+                            "version": getattr(driver, "version", None),
+                            "requirereboot": driver.require_reboot(),
+                        }
+                    )
+                except Exception:
+                    self.logger.exception('Unable to get status of driver "%s"', driver_name)
+
+        self.logger.debug("Drivers status refreshed in %.3fs", time.time() - start)
+        return status
@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import hashlib
+
+
+__all__ = ["get_file_hash"]
+
+
+HASH_CHUNK_SIZE = 65536
+
+
+def get_file_hash(path):
+    """
+    Compute file hash
+
+    Args:
+        path (str): file path
+
+    Returns:
+        str: sha256 hex digest
+    """
+    sha = hashlib.sha256()
+    with open(path, "rb") as file_descriptor:
+        for chunk in iter(lambda: file_descriptor.read(HASH_CHUNK_SIZE), b""):
+            sha.update(chunk)
+
+    return sha.hexdigest()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import gc
+import time
+import logging
+
+
+__all__ = ["GcStats"]
+
+
+class GcStats:
+    """
+    Garbage collector instrumentation through gc.callbacks
+
+    Collections are counted per generation with pause durations histogram and number of objects collected.
+    Callback is executed by the thread that triggered the collection, inside the collection: it only updates
+    preallocated counters and never takes a lock (a collection triggered while lock is held by same thread
+    would deadlock).
+    """
+
+    GENERATIONS = 3
+    BUCKETS = [0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 200.0, 500.0]  # ms
+
+    def __init__(self, clock=None):
+        """
+        Constructor
+
+        Args:
+            clock (function, optional): monotonic clock in seconds. Defaults to time.perf_counter
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.clock = clock or time.perf_counter
+        self.__collection_start = None
+        self.__since = None
+        self.__sample_start = None
+        self.__sample_pause = 0.0
+        self.reset()
+
+    def reset(self):
+        """
+        Reset statistics
+        """
+        self.__counts = [0] * self.GENERATIONS
+        self.__durations = [0.0] * self.GENERATIONS
+        self.__max_durations = [0.0] * self.GENERATIONS
+        self.__collected = [0] * self.GENERATIONS
+        self.__uncollectable = [0] * self.GENERATIONS
+        self.__histograms = [[0] * (len(self.BUCKETS) + 1) for _ in range(self.GENERATIONS)]
+        self.__since = int(time.time())
+
+    def is_running(self):
+        """
+        Return True if collections are instrumented
+
+        Returns:
+            bool: True if running
+        """
+        return self._callback in gc.callbacks
+
+    def start(self):
+        """
+        Start collections instrumentation
+        """
+        if self.is_running():
+            return
+
+        self.__sample_start = self.clock()
+        self.__sample_pause = 0.0
+        gc.callbacks.append(self._callback)
+
+    def stop(self):
+        """
+        Stop collections instrumentation
+        """
+        if self.is_running():
+            gc.callbacks.remove(self._callback)
+        self.__collection_start = None
+
+    def _callback(self, phase, info):
+        """
+        Garbage collector callback
+
+        Args:
+            phase (str): start or stop
+            info (dict): collection infos (generation, collected, uncollectable)
+        """
+        if phase == "start":
+            self.__collection_start = self.clock()
+            return
+        if self.__collection_start is None:
+            return
+
+        duration = (self.clock() - self.__collection_start) * 1000.0
+        self.__collection_start = None
+        generation = info.get("generation", 0)
+        if not 0 <= generation < self.GENERATIONS:
+            return
+
+        self.__counts[generation] += 1
+        self.__durations[generation] += duration
+        if duration > self.__max_durations[generation]:
+            self.__max_durations[generation] = duration
+        self.__collected[generation] += info.get("collected", 0)
+        self.__uncollectable[generation] += info.get("uncollectable", 0)
+        bucket = 0
+        while bucket < len(self.BUCKETS) and duration > self.BUCKETS[bucket]:
+            bucket += 1
+        self.__histograms[generation][bucket] += 1
+        self.__sample_pause += duration
+
+    def get_pause_percent(self):
+        """
+        Return percentage of time spent in collections since previous call (or since start)
+
+        Returns:
+            float: pause time percentage
+        """
+        now = self.clock()
+        pause = self.__sample_pause
+        self.__sample_pause = 0.0
+        start = self.__sample_start
+        self.__sample_start = now
+        if start is None or now <= start:
+            return 0.0
+
+        return round(min(pause / ((now - start) * 1000.0) * 100.0, 100.0), 3)
+
+    def get_stats(self):
+        """
+        Return collections statistics
+
+        Returns:
+            dict: statistics::
+
+                {
+                    running (bool): True if collections are instrumented,
+                    since (int): statistics start timestamp,
+                    thresholds (list): garbage collector thresholds,
+                    buckets (list): histogram buckets upper bounds in ms (last bucket is unbounded),
+                    generations (list): [
+                        {
+                            generation (int): generation,
+                            count (int): number of collections,
+                            totalduration (float): total pause duration in ms,
+                            meanduration (float): mean pause duration in ms,
+                            maxduration (float): max pause duration in ms,
+                            collected (int): number of objects collected,
+                            uncollectable (int): number of uncollectable objects,
+                            histogram (list): number of pauses per bucket,
+                        },
+                        ...
+                    ],
+                }
+
+        """
+        generations = []
+        for generation in range(self.GENERATIONS):
+            count = self.__counts[generation]
+            total = self.__durations[generation]
+            generations.append(
+                {
+                    "generation": generation,
+                    "count": count,
+                    "totalduration": round(total, 3),
+                    "meanduration": round(total / count, 3) if count else 0.0,
+                    "maxduration": round(self.__max_durations[generation], 3),
+                    "collected": self.__collected[generation],
+                    "uncollectable": self.__uncollectable[generation],
+                    "histogram": list(self.__histograms[generation]),
+                }
+            )
+
+        return {
+            "running": self.is_running(),
+            "since": self.__since,
+            "thresholds": list(gc.get_threshold()),
+            "buckets": list(self.BUCKETS),
+            "generations": generations,
+        }
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import glob
+import logging
+import threading
+import psutil
+from .sysfsreader import SysfsReader
+
+
+__all__ = ["HardwareInfos"]
+
+
+class HardwareInfos(SysfsReader):
+    """
+    Cached hardware inventory
+
+    Hardware is probed once and served from cache. Only storage devices can change at runtime (hotplug),
+    so they are refreshed when block devices list changed.
+    """
+
+    IGNORED_BLOCK_DEVICES = ("loop", "ram", "zram")
+
+    def __init__(self, get_board_infos, leds, sysfs_root=None):
+        """
+        Constructor
+
+        Args:
+            get_board_infos (function): function returning board infos (see Tools.raspberry_pi_infos)
+            leds (Leds): Leds instance
+            sysfs_root (str, optional): sysfs directory. Defaults to SYSFS_ROOT
+        """
+        SysfsReader.__init__(self, sysfs_root)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.get_board_infos = get_board_infos
+        self.leds = leds
+        self.__lock = threading.Lock()
+        self.__infos = None
+        self.__block_devices = None
+
+    def get(self):
+        """
+        Return hardware infos. Infos are collected on first call
+
+        Returns:
+            dict: hardware infos::
+
+                {
+                    board (dict): board infos (see Tools.raspberry_pi_infos),
+                    cpu (dict): {
+                        count (int): number of cpus,
+                        frequencies (list): [
+                            {
+                                cpu (int): cpu index,
+                                min (int): min frequency in kHz (None if not available),
+                                max (int): max frequency in kHz (None if not available),
+                            },
+                            ...
+                        ],
+                    },
+                    memory (dict): {
+                        total (int): RAM size in bytes,
+                        swap (int): swap size in bytes,
+                    },
+                    storage (list): [
+                        {
+                            name (str): block device name,
+                            size (int): device size in bytes,
+                            removable (bool): True if device is removable,
+                            rotational (bool): True if device is rotational,
+                        },
+                        ...
+                    ],
+                    leds (dict): {
+                        <led name> (dict): {
+                            brightness (str): brightness file path (None if not available),
+                            trigger (str): trigger file path (None if not available),
+                        },
+                        ...
+                    },
+                    thermal (list): [
+                        {
+                            zone (str): thermal zone name,
+                            type (str): thermal zone type,
+                            path (str): temperature file path,
+                        },
+                        ...
+                    ],
+                }
+
+        """
+        with self.__lock:
+            if self.__infos is None:
+                self.__infos = self.__collect()
+            elif self.__get_block_devices() != self.__block_devices:
+                self.logger.debug("Storage devices changed, refresh storage infos")
+                self.__infos["storage"] = self.__get_storage()
+
+            return dict(self.__infos)
+
+    def get_board(self):
+        """
+        Return board infos
+
+        Returns:
+            dict: board infos (see Tools.raspberry_pi_infos)
+        """
+        with self.__lock:
+            if self.__infos is None:
+                self.__infos = self.__collect()
+
+            return self.__infos["board"]
+
+    def __collect(self):
+        """
+        Collect all hardware infos
+
+        Returns:
+            dict: hardware infos
+        """
+        try:
+            board = self.get_board_infos()
+        except Exception:
+            self.logger.exception("Unable to get board infos")
+            board = {}
+
+        return {
+            "board": board,
+            "cpu": self.__get_cpu(),
+            "memory": self.__get_memory(),
+            "storage": self.__get_storage(),
+            "leds": {
+                led: {
+                    "brightness": self.leds.get_path(led, "brightness"),
+                    "trigger": self.leds.get_path(led, "trigger"),
+                }
+                for led in self.leds.LEDS
+            },
+            "thermal": self.__get_thermal_zones(),
+        }
+
+    def __get_cpu(self):
+        """
+        Return cpu infos
+
+        Returns:
+            dict: cpu infos
+        """
+        count = os.cpu_count() or 1
+        cpufreq_path = os.path.join(self.sysfs_root, "devices/system/cpu/cpu{}/cpufreq")
+        frequencies = []
+        for index in range(count):
+            path = cpufreq_path.format(index)
+            frequencies.append(
+                {
+                    "cpu": index,
+                    "min": self._read_int(os.path.join(path, "cpuinfo_min_freq")),
+                    "max": self._read_int(os.path.join(path, "cpuinfo_max_freq")),
+                }
+            )
+
+        return {"count": count, "frequencies": frequencies}
+
+    def __get_memory(self):
+        """
+        Return memory infos
+
+        Returns:
+            dict: memory infos
+        """
+        return {
+            "total": psutil.virtual_memory().total,
+            "swap": psutil.swap_memory().total,
+        }
+
+    def __get_block_devices(self):
+        """
+        Return block devices names
+
+        Returns:
+            list: sorted block devices names
+        """
+        try:
+            devices = os.listdir(os.path.join(self.sysfs_root, "block"))
+        except OSError:
+            return []
+
+        return sorted(device for device in devices if not device.startswith(self.IGNORED_BLOCK_DEVICES))
+
+    def __get_storage(self):
+        """
+        Return storage devices infos
+
+        Returns:
+            list: storage devices
+        """
+        self.__block_devices = self.__get_block_devices()
+        storage = []
+        for device in self.__block_devices:
+            path = os.path.join(self.sysfs_root, "block", device)
+            sectors = self._read_int(os.path.join(path, "size")) or 0
+            storage.append(
+                {
+                    "name": device,
+                    "size": sectors * 512,
+                    "removable": self._read(os.path.join(path, "removable")) == "1",
+                    "rotational": self._read(os.path.join(path, "queue/rotational")) == "1",
+                }
+            )
+
+        return storage
+
+    def __get_thermal_zones(self):
+        """
+        Return thermal zones
+
+        Returns:
+            list: thermal zones
+        """
+        zones = []
+        pattern = os.path.join(self.sysfs_root, "class/thermal/thermal_zone*")
+        for path in sorted(glob.glob(pattern)):
+            temp_path = os.path.join(path, "temp")
+            if not os.path.exists(temp_path):
+                continue
+            zones.append(
+                {
+                    "zone": os.path.basename(path),
+                    "type": self._read(os.path.join(path, "type")),
+                    "path": temp_path,
+                }
+            )
+
+        return zones
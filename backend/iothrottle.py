@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import shutil
+import logging
+import threading
+import psutil
+
+
+__all__ = ["IoThrottle"]
+
+
+class IoThrottle:
+    """
+    Limit impact of background file copies on device I/O
+
+    Provides rate-limited file copy, idle I/O priority for calling thread and device load detection.
+    Device load is measured between two samples (see sample), so checking it never blocks.
+    """
+
+    CHUNK_SIZE = 65536
+
+    def __init__(self, cleep_filesystem, bandwidth, cpu_threshold, disk_threshold):
+        """
+        Constructor
+
+        Args:
+            cleep_filesystem (CleepFilesystem): CleepFilesystem instance
+            bandwidth (int): max copy bandwidth in bytes per second
+            cpu_threshold (float): cpu usage percentage above which device is considered busy
+            disk_threshold (int): disk I/O in bytes per second above which device is considered busy
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cleep_filesystem = cleep_filesystem
+        self.bandwidth = bandwidth
+        self.cpu_threshold = cpu_threshold
+        self.disk_threshold = disk_threshold
+        self.enabled = False
+        self.__last_sample = None
+
+    def copy(self, source, destination):
+        """
+        Copy file. Copy bandwidth is limited when throttling is enabled.
+
+        Args:
+            source (str): source file path
+            destination (str): destination file path
+
+        Returns:
+            bool: True if copy succeed
+        """
+        if not self.enabled:
+            return self.cleep_filesystem.copy(source, destination)
+
+        output = None
+        try:
+            start = time.time()
+            written = 0
+            output = self.cleep_filesystem.open(destination, "wb")
+            with open(source, "rb") as file_descriptor:
+                for chunk in iter(lambda: file_descriptor.read(self.CHUNK_SIZE), b""):
+                    output.write(chunk)
+                    written += len(chunk)
+                    # sleep to keep average bandwidth under limit
+                    delay = written / self.bandwidth - (time.time() - start)
+                    if delay > 0:
+                        time.sleep(delay)
+            # keep file mode and times like filesystem copy
+            output.flush()
+            shutil.copystat(source, destination)
+            return True
+        except Exception:
+            self.logger.exception('Unable to copy "%s" to "%s"', source, destination)
+            return False
+        finally:
+            if output:
+                self.cleep_filesystem.close(output)
+
+    def sample(self):
+        """
+        Take device load sample used as reference by next is_busy call
+        """
+        self.__last_sample = (time.monotonic(), psutil.cpu_times(), psutil.disk_io_counters())
+
+    def is_busy(self):
+        """
+        Return True if device cpu or disk I/O is above thresholds.
+        Device load is measured since previous sample (previous call or sample call), device is not
+        considered busy if there is no previous sample.
+
+        Returns:
+            bool: True if device is busy
+        """
+        if not self.enabled:
+            return False
+
+        previous = self.__last_sample
+        self.sample()
+        if previous is None:
+            return False
+
+        duration = self.__last_sample[0] - previous[0]
+        cpu = self.__get_cpu_percent(previous[1], self.__last_sample[1])
+        disk = 0
+        disk_before, disk_after = previous[2], self.__last_sample[2]
+        if disk_before and disk_after and duration > 0:
+            disk = (
+                disk_after.read_bytes
+                + disk_after.write_bytes
+                - disk_before.read_bytes
+                - disk_before.write_bytes
+            ) / duration
+
+        busy = cpu >= self.cpu_threshold or disk >= self.disk_threshold
+        if busy:
+            self.logger.debug("Device is busy (cpu=%s%% disk=%sB/s)", cpu, int(disk))
+        return busy
+
+    def __get_cpu_percent(self, before, after):
+        """
+        Return cpu usage between two cpu times samples
+
+        Args:
+            before (namedtuple): psutil cpu times
+            after (namedtuple): psutil cpu times
+
+        Returns:
+            float: cpu usage percentage
+        """
+        # guest times are already included in user times
+        total = sum(after) - sum(before)
+        total -= getattr(after, "guest", 0.0) - getattr(before, "guest", 0.0)
+        total -= getattr(after, "guest_nice", 0.0) - getattr(before, "guest_nice", 0.0)
+        if total <= 0:
+            return 0.0
+        idle = after.idle - before.idle + getattr(after, "iowait", 0.0) - getattr(before, "iowait", 0.0)
+
+        return round(max(total - idle, 0.0) / total * 100.0, 1)
+
+    def set_idle_priority(self, idle):
+        """
+        Set I/O priority of calling thread
+
+        Args:
+            idle (bool): True to set idle I/O priority, False to restore default priority
+
+        Returns:
+            bool: True if priority was updated
+        """
+        try:
+            thread = psutil.Process(threading.get_native_id())
+            if idle:
+                thread.ionice(psutil.IOPRIO_CLASS_IDLE)
+            else:
+                thread.ionice(psutil.IOPRIO_CLASS_NONE)
+            return True
+        except Exception as error:
+            self.logger.debug("Unable to set I/O priority: %s", error)
+            return False
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+import threading
+
+
+__all__ = ["Leds", "LedPatternEngine"]
+
+
+class Leds:
+    """
+    Board leds control through sysfs
+
+    Led attributes are written directly (no shell spawned) and led paths are resolved once.
+    """
+
+    SYSFS_ROOT = "/sys/class/leds"
+    LEDS = {
+        "power": ["led1", "PWR"],
+        "activity": ["led0", "ACT"],
+    }
+
+    def __init__(self, sysfs_root=None):
+        """
+        Constructor
+
+        Args:
+            sysfs_root (str, optional): leds sysfs directory. Defaults to SYSFS_ROOT
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.sysfs_root = sysfs_root or self.SYSFS_ROOT
+        self.__paths = {}
+
+    def get_path(self, led, attribute):
+        """
+        Return led attribute path
+
+        Args:
+            led (str): led name (power, activity)
+            attribute (str): led attribute (brightness, trigger)
+
+        Returns:
+            str: attribute path or None if led attribute does not exist on this board
+        """
+        key = (led, attribute)
+        if key not in self.__paths:
+            self.__paths[key] = self.find_path(
+                [os.path.join(self.sysfs_root, name, attribute) for name in self.LEDS.get(led, [])]
+            )
+
+        return self.__paths[key]
+
+    def find_path(self, paths):
+        """
+        Return first existing path
+
+        Args:
+            paths (list): list of paths to check
+
+        Returns:
+            str: found path or None if no path exists
+        """
+        for path in paths:
+            if os.path.exists(path):
+                return path
+
+        return None
+
+    def has_led(self, led):
+        """
+        Return True if led exists on this board
+
+        Args:
+            led (str): led name
+
+        Returns:
+            bool: True if led exists
+        """
+        return self.get_path(led, "brightness") is not None
+
+    def write(self, led, attribute, value):
+        """
+        Write led attribute
+
+        Args:
+            led (str): led name
+            attribute (str): led attribute
+            value (str): value to write
+
+        Returns:
+            bool: True if value written, False if attribute does not exist or write failed
+        """
+        path = self.get_path(led, attribute)
+        if not path:
+            return False
+
+        try:
+            with open(path, "w") as file_descriptor:
+                file_descriptor.write(value)
+            return True
+        except OSError as error:
+            self.logger.error('Unable to write "%s" to "%s": %s', value, path, error)
+            return False
+
+
+class LedPatternEngine:
+    """
+    Play blink codes on a board led to show device states
+
+    All patterns are played by a single timer thread that only runs while a pattern is active. Only the
+    pattern with highest priority is played. When no pattern is active anymore, led is restored.
+    """
+
+    # pattern: (priority, [(led on, duration in seconds), ...])
+    PATTERNS = {
+        "backup": (1, [(True, 0.5), (False, 0.5)]),
+        "needreboot": (2, [(True, 0.2), (False, 0.2), (True, 0.2), (False, 1.4)]),
+        "memoryalert": (3, [(True, 0.1), (False, 0.1)]),
+    }
+
+    def __init__(self, leds, led, on_value="1", off_value="0", restore=None):
+        """
+        Constructor
+
+        Args:
+            leds (Leds): Leds instance
+            led (str): led used to play patterns
+            on_value (str, optional): brightness value to turn led on
+            off_value (str, optional): brightness value to turn led off
+            restore (function, optional): called when no pattern is active anymore to restore led
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.leds = leds
+        self.led = led
+        self.on_value = on_value
+        self.off_value = off_value
+        self.restore = restore
+        self.enabled = False
+        self.__lock = threading.Lock()
+        self.__event = threading.Event()
+        self.__active = set()
+        self.__thread = None
+
+    def set_pattern(self, pattern, active):
+        """
+        Activate or deactivate pattern
+
+        Args:
+            pattern (str): pattern name (see PATTERNS)
+            active (bool): True to activate pattern
+        """
+        if pattern not in self.PATTERNS:
+            raise ValueError(f'Pattern "{pattern}" does not exist')
+
+        with self.__lock:
+            if active == (pattern in self.__active):
+                return
+            if active:
+                self.__active.add(pattern)
+            else:
+                self.__active.discard(pattern)
+            self.__event.set()
+            self.__start_thread()
+
+    def get_active_patterns(self):
+        """
+        Return active patterns
+
+        Returns:
+            list: active pattern names sorted by priority (highest first)
+        """
+        with self.__lock:
+            return sorted(self.__active, key=lambda name: self.PATTERNS[name][0], reverse=True)
+
+    def stop(self):
+        """
+        Stop playing patterns. Active patterns are kept and played again if engine is enabled again
+        """
+        self.enabled = False
+        with self.__lock:
+            self.__event.set()
+            thread = self.__thread
+        if thread and thread is not threading.current_thread():
+            thread.join()
+
+    def start(self):
+        """
+        Start playing active patterns
+        """
+        with self.__lock:
+            self.enabled = True
+            self.__start_thread()
+
+    def __start_thread(self):
+        """
+        Start timer thread if there is something to play and thread is not running. Must be called with
+        lock acquired.
+        """
+        if not self.enabled or not self.__active or self.__thread:
+            return
+
+        self.__event.clear()
+        self.__thread = threading.Thread(target=self.__play, name="ledpatterns", daemon=True)
+        self.__thread.start()
+
+    def __get_pattern(self):
+        """
+        Return pattern to play. If there is nothing to play anymore, led is restored and thread released
+
+        Returns:
+            list: pattern steps or None if nothing to play
+        """
+        with self.__lock:
+            self.__event.clear()
+            if not self.enabled or not self.__active:
+                self.__restore()
+                self.__thread = None
+                return None
+            name = max(self.__active, key=lambda name: self.PATTERNS[name][0])
+            return self.PATTERNS[name][1]
+
+    def __play(self):
+        """
+        Timer thread: play highest priority pattern until patterns change
+        """
+        self.leds.write(self.led, "trigger", "none")
+        current_state = None
+        steps = self.__get_pattern()
+        while steps:
+            changed = False
+            for led_on, duration in steps:
+                if led_on != current_state:
+                    self.leds.write(self.led, "brightness", self.on_value if led_on else self.off_value)
+                    current_state = led_on
+                if self.__event.wait(duration):
+                    changed = True
+                    break
+            if changed:
+                steps = self.__get_pattern()
+
+    def __restore(self):
+        """
+        Restore led state
+        """
+        if not self.restore:
+            return
+
+        try:
+            self.restore()
+        except Exception:
+            self.logger.exception("Error restoring led")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import re
+
+
+__all__ = ["JsonLogFormatter", "LogParser"]
+
+
+class JsonLogFormatter(logging.Formatter):
+    """
+    Log formatter that outputs one JSON object per line (JSON-lines).
+
+    Level is always the first field so parser can filter lines on level without decoding them.
+    """
+
+    JSON_PREFIX = '{"level": "'
+
+    def format(self, record):
+        """
+        Format log record
+
+        Args:
+            record (LogRecord): log record
+
+        Returns:
+            str: JSON formatted record
+        """
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            message = f"{message}\n{record.exc_text}"
+        if record.stack_info:
+            message = f"{message}\n{self.formatStack(record.stack_info)}"
+
+        return json.dumps(
+            {
+                "level": record.levelname,
+                "time": self.formatTime(record),
+                "name": record.name,
+                "file": record.filename,
+                "line": record.lineno,
+                "message": message,
+            }
+        )
+
+
+class LogParser:
+    """
+    Cleep log parser
+
+    Handles both text lines (Cleep default format) and JSON-lines written by JsonLogFormatter.
+    Only requested fields are decoded: filtering on level never decodes JSON lines and text
+    lines are only split when a field other than the raw line is needed.
+    """
+
+    FIELDS = ("time", "level", "name", "file", "line", "message")
+    TEXT_PATTERN = re.compile(
+        r"^(?P<time>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})\s+(?P<name>.*?)\s*"
+        r"\[(?P<file>[^:\]]*):?(?P<line>\d*)\]\s+(?P<level>[A-Z]+)\s*: (?P<message>.*)$",
+        re.DOTALL,
+    )
+    LEVEL_SEPARATOR = " : "
+
+    @staticmethod
+    def is_json(line):
+        """
+        Return True if line is a JSON formatted line
+
+        Args:
+            line (str): log line
+
+        Returns:
+            bool: True if line is JSON formatted
+        """
+        return line.startswith(JsonLogFormatter.JSON_PREFIX)
+
+    def get_level(self, line):
+        """
+        Return line level without decoding the whole line
+
+        Args:
+            line (str): log line
+
+        Returns:
+            str: line level or None if line has no level (multiline record continuation)
+        """
+        if self.is_json(line):
+            start = len(JsonLogFormatter.JSON_PREFIX)
+            end = line.find('"', start)
+            return line[start:end] if end > start else None
+
+        end = line.find(self.LEVEL_SEPARATOR)
+        if end == -1:
+            return None
+        header = line[:end].rstrip()
+        level = header[header.rfind(" ") + 1 :]
+        return level if level.isalpha() and level.isupper() else None
+
+    def parse_line(self, line, fields=None):
+        """
+        Parse log line
+
+        Args:
+            line (str): log line
+            fields (list, optional): fields to return (all fields by default)
+
+        Returns:
+            dict: parsed fields or None if line is not a record header (multiline record continuation)
+        """
+        fields = fields or self.FIELDS
+        if fields == ("level",) or fields == ["level"]:
+            level = self.get_level(line)
+            return {"level": level} if level else None
+
+        if self.is_json(line):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                return None
+            return {field: record.get(field) for field in fields}
+
+        match = self.TEXT_PATTERN.match(line.rstrip("\n"))
+        if not match:
+            return None
+        record = match.groupdict()
+        record["line"] = int(record["line"]) if record["line"] else None
+        return {field: record.get(field) for field in fields}
+
+    def to_text(self, line):
+        """
+        Convert log line to text format. Text lines are returned as is.
+
+        Args:
+            line (str): log line
+
+        Returns:
+            str: text log line
+        """
+        if not self.is_json(line):
+            return line
+
+        record = self.parse_line(line)
+        if record is None:
+            return line
+        return (
+            f"{record['time']} {record['name']:<12}[{record['file']}:{record['line']}] "
+            f"{record['level']:<5} : {record['message']}\n"
+        )
+
+    def search(self, lines, pattern=None, levels=None, limit=None):
+        """
+        Search records in log lines. Multiline records (tracebacks) are kept entire.
+
+        Args:
+            lines (list): log lines
+            pattern (str, optional): case insensitive string to search in records
+            levels (list, optional): levels to keep
+            limit (int, optional): max number of records to return (latest ones)
+
+        Returns:
+            list: matching records as text lines
+        """
+        pattern = pattern.lower() if pattern else None
+        # raw prefilter only works on json lines when pattern is not escaped by json encoder
+        # (non-ascii characters, quotes, backslashes, control characters)
+        raw_json_pattern = bool(pattern) and json.dumps(pattern)[1:-1] == pattern
+        levels = set(levels) if levels else None
+        records = []
+        record = None
+        for line in lines:
+            level = self.get_level(line)
+            if level is None:
+                # continuation of previous record
+                if record is not None:
+                    record.append(line)
+                continue
+
+            if record is not None and self.__match_record(record, pattern, raw_json_pattern):
+                records.append(record)
+            record = [line] if levels is None or level in levels else None
+        if record is not None and self.__match_record(record, pattern, raw_json_pattern):
+            records.append(record)
+
+        if limit:
+            records = records[-limit:]
+
+        return [self.to_text(line) for record in records for line in record]
+
+    def __match_record(self, record, pattern, raw_json_pattern):
+        """
+        Return True if pattern is found in record, continuation lines (tracebacks) included
+
+        Args:
+            record (list): record lines
+            pattern (str): lowercase pattern (None matches everything)
+            raw_json_pattern (bool): True if pattern can be searched in raw json lines
+
+        Returns:
+            bool: True if record matches
+        """
+        if not pattern:
+            return True
+
+        for line in record:
+            if not self.is_json(line):
+                if pattern in line.lower():
+                    return True
+            # raw prefilter, json lines are decoded only on candidates
+            elif (not raw_json_pattern or pattern in line.lower()) and pattern in self.to_text(line).lower():
+                return True
+
+        return False
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import gc
+import time
+import ctypes
+import ctypes.util
+import logging
+import threading
+from collections import deque
+
+
+__all__ = ["MemoryReclaimer"]
+
+
+class MemoryReclaimer:
+    """
+    Give freed memory back to the system
+
+    Python frees objects into glibc malloc arenas which keep memory for later allocations, so process
+    RSS never decreases after a burst. A reclaim run collects garbage then calls glibc malloc_trim that
+    releases free arena pages. Number of arenas can be capped with mallopt (same as MALLOC_ARENA_MAX
+    environment variable) to reduce fragmentation on multithreaded process.
+    """
+
+    M_ARENA_MAX = -8
+    HISTORY_SIZE = 20
+
+    def __init__(self, process, libc=None):
+        """
+        Constructor
+
+        Args:
+            process (psutil.Process): Cleep process
+            libc (ctypes.CDLL, optional): C library. Defaults to system libc (loaded on first use)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.process = process
+        self.__libc = libc
+        self.__libc_loaded = libc is not None
+        self.__lock = threading.Lock()
+        self.__history = deque(maxlen=self.HISTORY_SIZE)
+        self.__runs = 0
+        self.__total_reclaimed = 0
+        self.__last_cpu = None
+
+    def __get_libc(self):
+        """
+        Return C library if it provides malloc_trim (glibc)
+
+        Returns:
+            ctypes.CDLL: C library or None if not supported
+        """
+        if not self.__libc_loaded:
+            self.__libc_loaded = True
+            try:
+                self.__libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+            except OSError as error:
+                self.logger.warning("Unable to load C library: %s", error)
+        if self.__libc is not None and not hasattr(self.__libc, "malloc_trim"):
+            self.__libc = None
+
+        return self.__libc
+
+    def is_supported(self):
+        """
+        Return True if malloc_trim is available
+
+        Returns:
+            bool: True if supported
+        """
+        return self.__get_libc() is not None
+
+    def set_arena_max(self, arena_max):
+        """
+        Cap number of malloc arenas. Only arenas created afterwards are affected.
+
+        Args:
+            arena_max (int): max number of arenas
+
+        Returns:
+            bool: True if applied
+        """
+        libc = self.__get_libc()
+        if not libc or not hasattr(libc, "mallopt"):
+            return False
+
+        return libc.mallopt(self.M_ARENA_MAX, int(arena_max)) == 1
+
+    def is_idle(self, cpu_threshold):
+        """
+        Return True if process cpu usage since previous call is below threshold
+
+        Args:
+            cpu_threshold (float): cpu usage threshold (percent of one cpu)
+
+        Returns:
+            bool: True if process is idle (False on first call)
+        """
+        cpu_times = self.process.cpu_times()
+        current = (cpu_times.user + cpu_times.system, time.monotonic())
+        previous = self.__last_cpu
+        self.__last_cpu = current
+        if previous is None or current[1] <= previous[1]:
+            return False
+
+        usage = (current[0] - previous[0]) / (current[1] - previous[1]) * 100.0
+        return usage < cpu_threshold
+
+    def reclaim(self, reason=None):
+        """
+        Collect garbage and trim malloc arenas
+
+        Args:
+            reason (str, optional): reclaim reason (idle, threshold, manual...)
+
+        Returns:
+            dict: reclaim result::
+
+                {
+                    timestamp (int): run timestamp,
+                    reason (str): reclaim reason,
+                    collected (int): number of unreachable objects collected,
+                    trimmed (bool): True if malloc released memory,
+                    rssbefore (int): process RSS before run in bytes,
+                    rssafter (int): process RSS after run in bytes,
+                    reclaimed (int): bytes given back to system,
+                    duration (float): run duration in seconds,
+                }
+
+        """
+        with self.__lock:
+            start = time.time()
+            rss_before = self.process.memory_info().rss
+            collected = gc.collect()
+            libc = self.__get_libc()
+            trimmed = bool(libc.malloc_trim(0)) if libc else False
+            rss_after = self.process.memory_info().rss
+
+            result = {
+                "timestamp": int(start),
+                "reason": reason,
+                "collected": collected,
+                "trimmed": trimmed,
+                "rssbefore": rss_before,
+                "rssafter": rss_after,
+                "reclaimed": max(rss_before - rss_after, 0),
+                "duration": round(time.time() - start, 3),
+            }
+            self.__history.append(result)
+            self.__runs += 1
+            self.__total_reclaimed += result["reclaimed"]
+
+        self.logger.debug("Memory reclaimed: %s", result)
+        return result
+
+    def get_stats(self):
+        """
+        Return reclaim statistics
+
+        Returns:
+            dict: statistics::
+
+                {
+                    supported (bool): True if malloc_trim is available,
+                    runs (int): number of runs,
+                    reclaimed (int): total bytes given back to system,
+                    history (list): latest runs (see reclaim), most recent last,
+                }
+
+        """
+        with self.__lock:
+            return {
+                "supported": self.is_supported(),
+                "runs": self.__runs,
+                "reclaimed": self.__total_reclaimed,
+                "history": list(self.__history),
+            }
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import fnmatch
+import logging
+import threading
+import psutil
+
+
+__all__ = ["ProcessPriority"]
+
+
+class ProcessPriority:
+    """
+    Cpu priority (nice), I/O priority and cpu affinity of Cleep process and named thread groups
+
+    On Linux those attributes are handled per thread (new threads inherit them from their creator), so
+    settings are applied on each thread of the process. Thread groups are pinned on their own cpus,
+    other threads use process cpus. Threads started later are pinned by calling pin_new_threads.
+    """
+
+    IO_CLASSES = {
+        "none": psutil.IOPRIO_CLASS_NONE,
+        "realtime": psutil.IOPRIO_CLASS_RT,
+        "besteffort": psutil.IOPRIO_CLASS_BE,
+        "idle": psutil.IOPRIO_CLASS_IDLE,
+    }
+    THREAD_GROUPS = {
+        "rpc": ["MainThread"],
+        "background": ["backupworker", "driverjobs", "ledpatterns"],
+    }
+    NICE_MIN = -20
+    NICE_MAX = 19
+    IO_LEVEL_MAX = 7
+
+    def __init__(self, process, thread_groups=None):
+        """
+        Constructor
+
+        Args:
+            process (psutil.Process): Cleep process
+            thread_groups (dict, optional): thread name patterns (fnmatch) by group. Defaults to THREAD_GROUPS
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.process = process
+        self.thread_groups = thread_groups or self.THREAD_GROUPS
+        self.settings = self.get_default_settings()
+        self.__pinned = set()
+        self.__lock = threading.Lock()
+
+    def get_cpus(self):
+        """
+        Return available cpus
+
+        Returns:
+            list: cpu indexes
+        """
+        return list(range(psutil.cpu_count() or 1))
+
+    def get_default_settings(self):
+        """
+        Return default settings (kernel defaults)
+
+        Returns:
+            dict: default settings (see apply)
+        """
+        return {"nice": 0, "ioclass": "none", "iolevel": None, "cpus": None, "threadgroups": {}}
+
+    def validate(self, settings):
+        """
+        Validate settings
+
+        Args:
+            settings (dict): settings (see apply)
+
+        Raises:
+            ValueError: if a setting is invalid
+        """
+        cpus = self.get_cpus()
+        nice = settings.get("nice")
+        if nice is not None and not self.NICE_MIN <= nice <= self.NICE_MAX:
+            raise ValueError(f"Nice value must be between {self.NICE_MIN} and {self.NICE_MAX}")
+        if settings.get("ioclass") not in (None, *self.IO_CLASSES.keys()):
+            raise ValueError(f'I/O class "{settings.get("ioclass")}" does not exist')
+        io_level = settings.get("iolevel")
+        if io_level is not None and not 0 <= io_level <= self.IO_LEVEL_MAX:
+            raise ValueError(f"I/O level must be between 0 and {self.IO_LEVEL_MAX}")
+
+        groups_cpus = [("cpus", settings.get("cpus"))]
+        for group, group_cpus in (settings.get("threadgroups") or {}).items():
+            if group not in self.thread_groups:
+                raise ValueError(f'Thread group "{group}" does not exist')
+            groups_cpus.append((group, group_cpus))
+        for name, values in groups_cpus:
+            if values is not None and (not values or any(cpu not in cpus for cpu in values)):
+                raise ValueError(f'Invalid cpus for "{name}" (available cpus {cpus})')
+
+    def apply(self, settings):
+        """
+        Apply settings on all process threads
+
+        Args:
+            settings (dict): settings::
+
+                {
+                    nice (int): cpu priority (-20 highest, 19 lowest),
+                    ioclass (str): I/O class (none, realtime, besteffort, idle),
+                    iolevel (int): I/O level for realtime and besteffort classes (0 highest, 7 lowest),
+                    cpus (list): process cpus (None for all cpus),
+                    threadgroups (dict): cpus by thread group ({group (str): cpus (list)}),
+                }
+
+        Returns:
+            int: number of threads updated
+
+        Raises:
+            ValueError: if a setting is invalid
+        """
+        self.validate(settings)
+
+        with self.__lock:
+            self.settings = {**self.get_default_settings(), **settings}
+            self.__pinned.clear()
+            thread_names = self.__get_thread_names()
+            updated = 0
+            for thread in self.process.threads():
+                if self.__apply_thread(thread.id, thread_names.get(thread.id)):
+                    updated += 1
+                self.__pinned.add(thread.id)
+
+        self.logger.debug("Process priority applied on %s threads: %s", updated, self.settings)
+        return updated
+
+    def pin_new_threads(self):
+        """
+        Apply settings on threads started since last call
+
+        Returns:
+            int: number of threads updated
+        """
+        updated = 0
+        with self.__lock:
+            thread_names = self.__get_thread_names()
+            for thread_id, thread_name in thread_names.items():
+                if thread_id in self.__pinned:
+                    continue
+                if self.__apply_thread(thread_id, thread_name):
+                    updated += 1
+                self.__pinned.add(thread_id)
+            self.__pinned.intersection_update(thread_names.keys())
+
+        return updated
+
+    def get_status(self):
+        """
+        Return current priority of process and thread groups
+
+        Returns:
+            dict: status::
+
+                {
+                    nice (int): process nice value,
+                    ioclass (str): process I/O class,
+                    iolevel (int): process I/O level,
+                    cpus (list): process cpus,
+                    availablecpus (list): available cpus,
+                    threadgroups (dict): {
+                        group (str): {
+                            cpus (list): group cpus (None if not pinned),
+                            threads (list): running thread names,
+                        },
+                        ...
+                    },
+                    settings (dict): applied settings,
+                }
+
+        """
+        ionice = self.process.ionice()
+        io_class = next((name for name, value in self.IO_CLASSES.items() if value == ionice.ioclass), None)
+        groups_cpus = self.settings.get("threadgroups") or {}
+        thread_names = self.__get_thread_names().values()
+
+        return {
+            "nice": self.process.nice(),
+            "ioclass": io_class,
+            "iolevel": ionice.value,
+            "cpus": self.process.cpu_affinity(),
+            "availablecpus": self.get_cpus(),
+            "threadgroups": {
+                group: {
+                    "cpus": groups_cpus.get(group),
+                    "threads": sorted(name for name in thread_names if self.__match(patterns, name)),
+                }
+                for group, patterns in self.thread_groups.items()
+            },
+            "settings": self.settings,
+        }
+
+    def __get_thread_names(self):
+        """
+        Return python threads names
+
+        Returns:
+            dict: thread names by native thread id
+        """
+        return {thread.native_id: thread.name for thread in threading.enumerate() if thread.native_id}
+
+    def __match(self, patterns, thread_name):
+        """
+        Return True if thread name matches one of patterns
+        """
+        return any(fnmatch.fnmatch(thread_name, pattern) for pattern in patterns)
+
+    def __get_thread_cpus(self, thread_name):
+        """
+        Return cpus of specified thread
+
+        Args:
+            thread_name (str): thread name (None for non python threads)
+
+        Returns:
+            list: cpus
+        """
+        if thread_name:
+            for group, cpus in (self.settings.get("threadgroups") or {}).items():
+                if cpus and self.__match(self.thread_groups.get(group, []), thread_name):
+                    return cpus
+
+        return self.settings.get("cpus") or self.get_cpus()
+
+    def __apply_thread(self, thread_id, thread_name):
+        """
+        Apply settings on thread
+
+        Args:
+            thread_id (int): native thread id
+            thread_name (str): thread name (None for non python threads)
+
+        Returns:
+            bool: True if thread was updated
+        """
+        try:
+            thread = psutil.Process(thread_id)
+            if self.settings.get("nice") is not None:
+                thread.nice(self.settings["nice"])
+            io_class = self.IO_CLASSES[self.settings.get("ioclass") or "none"]
+            if io_class in (psutil.IOPRIO_CLASS_RT, psutil.IOPRIO_CLASS_BE) and self.settings.get("iolevel") is not None:
+                thread.ionice(io_class, self.settings["iolevel"])
+            else:
+                thread.ionice(io_class)
+            thread.cpu_affinity(self.__get_thread_cpus(thread_name))
+            return True
+        except Exception as error:
+            self.logger.debug("Unable to set priority of thread %s (%s): %s", thread_id, thread_name, error)
+            return False
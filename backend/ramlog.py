@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import logging
+import threading
+
+
+__all__ = ["RamLog"]
+
+
+class RamLog:
+    """
+    Keep active logs in RAM (tmpfs) and flush them to persistent logs file
+
+    Logs file handler is redirected to a tmpfs file. Buffered lines are appended to persistent logs
+    file in one sequential write when flushed, so SD card receives few large writes instead of one small
+    write per log line.
+    """
+
+    def __init__(self, cleep_filesystem, log_file, ram_path, max_size):
+        """
+        Constructor
+
+        Args:
+            cleep_filesystem (CleepFilesystem): CleepFilesystem instance
+            log_file (str): persistent logs file path
+            ram_path (str): RAM logs file path (on tmpfs)
+            max_size (int): RAM logs size (in bytes) above which flush is needed
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cleep_filesystem = cleep_filesystem
+        self.log_file = os.path.abspath(log_file)
+        self.ram_path = os.path.abspath(ram_path)
+        self.max_size = max_size
+        self.handler = None
+        self.__handler_mode = None
+        self.__lock = threading.Lock()
+        self.__flushes = 0
+        self.__bytes_flushed = 0
+        self.__last_flush = None
+
+    @property
+    def enabled(self):
+        """
+        Return True if logs are kept in RAM
+        """
+        return self.handler is not None
+
+    def enable(self, handler):
+        """
+        Redirect logs file handler to RAM logs file. Lines left in RAM logs file (previous run) are
+        flushed first.
+
+        Args:
+            handler (logging.FileHandler): logs file handler
+
+        Returns:
+            bool: True if logs are redirected to RAM
+        """
+        if self.enabled:
+            return True
+
+        with self.__lock:
+            self.__flush_file()
+        self.__handler_mode = handler.mode
+        self.__redirect(handler, self.ram_path, "a")
+        self.handler = handler
+        self.logger.info("Logs are kept in RAM (%s)", self.ram_path)
+
+        return True
+
+    def disable(self):
+        """
+        Flush RAM logs and redirect logs file handler to persistent logs file
+        """
+        if not self.enabled:
+            return
+
+        handler = self.handler
+        self.flush()
+        self.__redirect(handler, self.log_file, self.__handler_mode)
+        self.handler = None
+        with self.__lock:
+            self.__flush_file()
+        self.logger.info("Logs are written to %s", self.log_file)
+
+    def flush(self):
+        """
+        Append RAM logs to persistent logs file
+
+        Returns:
+            int: number of bytes flushed
+        """
+        if not self.enabled:
+            return 0
+
+        self.handler.acquire()
+        try:
+            if self.handler.stream:
+                self.handler.stream.flush()
+            with self.__lock:
+                return self.__flush_file()
+        finally:
+            self.handler.release()
+
+    def need_flush(self):
+        """
+        Return True if RAM logs size exceeds max size
+
+        Returns:
+            bool: True if flush is needed
+        """
+        return self.enabled and self.__get_size() >= self.max_size
+
+    def read_lines(self):
+        """
+        Return lines buffered in RAM
+
+        Returns:
+            list: list of lines
+        """
+        if not os.path.exists(self.ram_path):
+            return []
+
+        with open(self.ram_path, "r", encoding="utf-8", errors="replace") as file_descriptor:
+            return file_descriptor.readlines()
+
+    def clear(self):
+        """
+        Drop lines buffered in RAM
+        """
+        if not os.path.exists(self.ram_path):
+            return
+
+        if self.enabled:
+            self.handler.acquire()
+        try:
+            os.truncate(self.ram_path, 0)
+        except OSError as error:
+            self.logger.warning("Unable to clear RAM logs: %s", error)
+        finally:
+            if self.enabled:
+                self.handler.release()
+
+    def get_stats(self):
+        """
+        Return RAM logs statistics
+
+        Returns:
+            dict: statistics::
+
+                {
+                    enabled (bool): True if logs are kept in RAM,
+                    size (int): RAM logs size in bytes,
+                    flushes (int): number of flushes,
+                    bytesflushed (int): number of bytes flushed to persistent logs file,
+                    lastflush (int): last flush timestamp (None if never flushed),
+                }
+
+        """
+        return {
+            "enabled": self.enabled,
+            "size": self.__get_size(),
+            "flushes": self.__flushes,
+            "bytesflushed": self.__bytes_flushed,
+            "lastflush": self.__last_flush,
+        }
+
+    def __get_size(self):
+        """
+        Return RAM logs file size
+
+        Returns:
+            int: size in bytes
+        """
+        try:
+            return os.path.getsize(self.ram_path)
+        except OSError:
+            return 0
+
+    def __redirect(self, handler, path, mode):
+        """
+        Redirect file handler to specified file. Stream is lazily reopened by handler on next record.
+
+        Args:
+            handler (logging.FileHandler): file handler
+            path (str): new file path
+            mode (str): file open mode
+        """
+        handler.acquire()
+        try:
+            if handler.stream:
+                handler.stream.flush()
+                handler.stream.close()
+                handler.stream = None
+            handler.baseFilename = path
+            handler.mode = mode
+        finally:
+            handler.release()
+
+    def __flush_file(self):
+        """
+        Append RAM logs file content to persistent logs file and truncate RAM logs file. Must be called
+        with lock acquired.
+
+        Returns:
+            int: number of bytes flushed
+        """
+        if not os.path.exists(self.ram_path):
+            return 0
+
+        with open(self.ram_path, "rb") as file_descriptor:
+            content = file_descriptor.read()
+        if not content:
+            return 0
+
+        output = self.cleep_filesystem.open(self.log_file, "ab")
+        try:
+            output.write(content)
+        except Exception:
+            self.logger.exception("Unable to flush RAM logs")
+            return 0
+        finally:
+            self.cleep_filesystem.close(output)
+
+        os.truncate(self.ram_path, 0)
+        self.__flushes += 1
+        self.__bytes_flushed += len(content)
+        self.__last_flush = int(time.time())
+
+        return len(content)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import logging
+import threading
+
+
+__all__ = ["ShutdownPipeline"]
+
+
+class ShutdownPipeline:
+    """
+    Orchestrate device shutdown
+
+    Pipeline is made of sequential phases. Steps of a phase run concurrently, each one with its own
+    timeout, and next phase starts as soon as all steps of current phase are terminated or timed out.
+    Whole pipeline is bounded by a global timeout.
+    """
+
+    def __init__(self, timeout):
+        """
+        Constructor
+
+        Args:
+            timeout (float): pipeline max duration (in seconds)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.timeout = timeout
+        self.__phases = []
+
+    def add_phase(self, name, steps, timeout=None):
+        """
+        Add phase to pipeline
+
+        Args:
+            name (str): phase name
+            steps (dict): steps to run concurrently (step name as key, function as value). Step fails
+                          if function raises exception or returns False
+            timeout (float, optional): max duration of each step (in seconds). Defaults to remaining
+                                       pipeline time
+        """
+        self.__phases.append((name, steps, timeout))
+
+    def run(self):
+        """
+        Run pipeline
+
+        Returns:
+            dict: pipeline report::
+
+                {
+                    duration (float): pipeline duration in seconds,
+                    timedout (bool): True if pipeline timeout was reached or a step timed out,
+                    phases (list): [
+                        {
+                            name (str): phase name,
+                            duration (float): phase duration in seconds,
+                            skipped (bool): True if phase was skipped (no time left),
+                            timedout (list): names of steps that timed out,
+                            steps (dict): {
+                                step name (str): {
+                                    success (bool): True if step succeed,
+                                    timedout (bool): True if step timed out,
+                                    duration (float): step duration in seconds (None if timed out),
+                                },
+                                ...
+                            }
+                        },
+                        ...
+                    ]
+                }
+
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        report = {"duration": 0.0, "timedout": False, "phases": []}
+
+        for name, steps, timeout in self.__phases:
+            phase_start = time.monotonic()
+            remaining = deadline - phase_start
+            if remaining <= 0:
+                self.logger.warning('Shutdown phase "%s" skipped: no time left', name)
+                report["timedout"] = True
+                report["phases"].append(
+                    {"name": name, "duration": 0.0, "steps": {}, "skipped": True, "timedout": []}
+                )
+                continue
+
+            phase_timeout = min(timeout, remaining) if timeout else remaining
+            results = self.__run_steps(steps, phase_timeout)
+            duration = round(time.monotonic() - phase_start, 3)
+            timedout = [step for step, result in results.items() if result["timedout"]]
+            if timedout:
+                report["timedout"] = True
+            self.logger.info('Shutdown phase "%s" terminated in %ss', name, duration)
+            report["phases"].append(
+                {"name": name, "duration": duration, "steps": results, "skipped": False, "timedout": timedout}
+            )
+
+        report["duration"] = round(time.monotonic() - start, 3)
+        return report
+
+    def __run_steps(self, steps, timeout):
+        """
+        Run steps concurrently
+
+        Args:
+            steps (dict): steps to run
+            timeout (float): max duration of each step (in seconds)
+
+        Returns:
+            dict: steps results
+        """
+        results = {}
+        threads = []
+        for name, func in steps.items():
+            results[name] = {"success": False, "timedout": True, "duration": None}
+            thread = threading.Thread(
+                target=self.__run_step, args=(name, func, results), name=f"shutdown-{name}", daemon=True
+            )
+            thread.start()
+            threads.append((name, thread))
+
+        deadline = time.monotonic() + timeout
+        report = {}
+        for name, thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                self.logger.warning('Shutdown step "%s" timed out after %ss', name, round(timeout, 3))
+                # late step result must not change report
+                report[name] = {"success": False, "timedout": True, "duration": None}
+            else:
+                report[name] = dict(results[name])
+
+        return report
+
+    def __run_step(self, name, func, results):
+        """
+        Run single step and store its result
+
+        Args:
+            name (str): step name
+            func (function): step function
+            results (dict): steps results
+        """
+        start = time.monotonic()
+        try:
+            success = func() is not False
+        except Exception:
+            self.logger.exception('Shutdown step "%s" failed', name)
+            success = False
+        results[name] = {
+            "success": success,
+            "timedout": False,
+            "duration": round(time.monotonic() - start, 3),
+        }
@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import logging
+import threading
+from .filehash import get_file_hash
+
+
+__all__ = ["SnapshotStore"]
+
+
+class SnapshotStore:
+    """
+    Content-addressed store of configuration snapshots
+
+    Each snapshot references file blobs named by their content hash, so a file is stored only once
+    whatever the number of snapshots referencing it. Storage cost is close to the size of the diffs.
+    """
+
+    BLOBS_DIR = "blobs"
+    SNAPSHOTS_DIR = "snapshots"
+    INCOMING_BLOB = "incoming"
+
+    def __init__(self, cleep_filesystem, store_path, retention, copy_file=None):
+        """
+        Constructor
+
+        Args:
+            cleep_filesystem (CleepFilesystem): CleepFilesystem instance
+            store_path (str): store directory
+            retention (int): number of snapshots to keep
+            copy_file (function, optional): file copy function. Defaults to CleepFilesystem copy
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cleep_filesystem = cleep_filesystem
+        self.copy_file = copy_file or cleep_filesystem.copy
+        self.store_path = store_path
+        self.retention = retention
+        self.__lock = threading.Lock()
+
+    def list(self):
+        """
+        Return list of snapshots
+
+        Returns:
+            list: list of snapshots sorted from latest to oldest::
+
+                [
+                    {
+                        id (str): snapshot id,
+                        timestamp (int): snapshot timestamp,
+                        files (int): number of files,
+                        size (int): snapshot size in bytes,
+                    },
+                    ...
+                ]
+
+        """
+        snapshots = []
+        for snapshot in self.__get_snapshots():
+            snapshots.append(
+                {
+                    "id": snapshot["id"],
+                    "timestamp": snapshot["timestamp"],
+                    "files": len(snapshot["files"]),
+                    "size": sum(item["size"] for item in snapshot["files"].values()),
+                }
+            )
+
+        return snapshots
+
+    def get(self, snapshot_id):
+        """
+        Return snapshot
+
+        Args:
+            snapshot_id (str): snapshot id
+
+        Returns:
+            dict: snapshot or None if snapshot does not exist
+        """
+        path = self.__get_snapshot_path(snapshot_id)
+        if not os.path.exists(path):
+            return None
+
+        return self.cleep_filesystem.read_json(path)
+
+    def record(self, source_path, manifest):
+        """
+        Record snapshot of specified directory. Snapshot is not recorded if files did not change
+        since latest snapshot.
+
+        Files are copied to a temporary blob and hashed once copied, so blob name always matches its
+        content even if file changed since manifest was computed.
+
+        Args:
+            source_path (str): directory to snapshot
+            manifest (dict): directory manifest (relative file path as key, dict with size and hash as value)
+
+        Returns:
+            dict: recorded snapshot or None if nothing recorded
+        """
+        with self.__lock:
+            files = {
+                path: {"hash": item["hash"], "size": item["size"]}
+                for path, item in manifest.items()
+            }
+            snapshots = self.__get_snapshots()
+            if snapshots and snapshots[0]["files"] == files:
+                self.logger.debug("Configuration did not change since latest snapshot")
+                return None
+
+            for path, item in files.items():
+                if os.path.exists(self.__get_blob_path(item["hash"])):
+                    continue
+                stored = self.__store_blob(os.path.join(source_path, path))
+                if not stored:
+                    self.logger.error('Unable to store "%s" in snapshot', path)
+                    return None
+                if stored["hash"] != item["hash"]:
+                    self.logger.debug('File "%s" changed since manifest was computed', path)
+                item.update(stored)
+
+            timestamp = time.time()
+            snapshot = {
+                "id": str(int(timestamp * 1000)),
+                "timestamp": int(timestamp),
+                "files": files,
+            }
+            snapshot_path = self.__get_snapshot_path(snapshot["id"])
+            if not os.path.exists(os.path.dirname(snapshot_path)):
+                self.cleep_filesystem.mkdir(os.path.dirname(snapshot_path), True)
+            if not self.cleep_filesystem.write_json(snapshot_path, snapshot):
+                self.logger.error("Unable to save snapshot")
+                return None
+
+            self.__apply_retention([snapshot] + snapshots)
+
+            return snapshot
+
+    def restore(self, snapshot_id, target_path, tracked=None):
+        """
+        Restore snapshot to specified directory. Only files that differ from snapshot are written.
+
+        Blobs to restore are verified first: nothing is written if one of them is missing or corrupted.
+
+        Args:
+            snapshot_id (str): snapshot id
+            target_path (str): directory to restore snapshot to
+            tracked (list, optional): files tracked in target directory (relative paths). Tracked files
+                that are not part of snapshot are deleted, other files are never deleted.
+
+        Returns:
+            dict: restore statistics or None if snapshot does not exist::
+
+                {
+                    restored (int): number of restored files,
+                    deleted (int): number of deleted files,
+                    unchanged (int): number of unchanged files,
+                    failed (int): number of files that couldn't be restored,
+                    corrupted (int): number of missing or corrupted blobs (nothing restored if any),
+                }
+
+        """
+        with self.__lock:
+            snapshot = self.get(snapshot_id)
+            if not snapshot:
+                return None
+
+            stats = {"restored": 0, "deleted": 0, "unchanged": 0, "failed": 0, "corrupted": 0}
+            changed = []
+            for path, item in snapshot["files"].items():
+                target = os.path.join(target_path, path)
+                if (
+                    os.path.exists(target)
+                    and os.path.getsize(target) == item["size"]
+                    and get_file_hash(target) == item["hash"]
+                ):
+                    stats["unchanged"] += 1
+                    continue
+
+                blob_path = self.__get_blob_path(item["hash"])
+                if not os.path.exists(blob_path) or get_file_hash(blob_path) != item["hash"]:
+                    self.logger.error('Snapshot blob of "%s" is missing or corrupted', path)
+                    stats["corrupted"] += 1
+                changed.append((path, blob_path, target))
+
+            if stats["corrupted"]:
+                self.logger.error('Snapshot "%s" is corrupted, nothing restored', snapshot_id)
+                return stats
+
+            for path, blob_path, target in changed:
+                target_dir = os.path.dirname(target)
+                if not os.path.exists(target_dir):
+                    self.cleep_filesystem.mkdir(target_dir, True)
+                if self.copy_file(blob_path, target):
+                    stats["restored"] += 1
+                else:
+                    self.logger.error('Unable to restore "%s"', path)
+                    stats["failed"] += 1
+
+            for path in tracked or []:
+                fullpath = os.path.join(target_path, path)
+                if path in snapshot["files"] or not os.path.exists(fullpath):
+                    continue
+                if self.cleep_filesystem.rm(fullpath):
+                    stats["deleted"] += 1
+                else:
+                    stats["failed"] += 1
+
+            return stats
+
+    def __store_blob(self, source):
+        """
+        Copy file to blobs, blob is named by the hash of copied content
+
+        Args:
+            source (str): file path
+
+        Returns:
+            dict: stored blob hash and size or None if copy failed
+        """
+        blobs_path = os.path.join(self.store_path, self.BLOBS_DIR)
+        if not os.path.exists(blobs_path):
+            self.cleep_filesystem.mkdir(blobs_path, True)
+        temp_path = os.path.join(blobs_path, self.INCOMING_BLOB)
+        if not self.copy_file(source, temp_path):
+            return None
+
+        stored = {"hash": get_file_hash(temp_path), "size": os.path.getsize(temp_path)}
+        blob_path = self.__get_blob_path(stored["hash"])
+        if os.path.exists(blob_path):
+            self.cleep_filesystem.rm(temp_path)
+            return stored
+        if not os.path.exists(os.path.dirname(blob_path)):
+            self.cleep_filesystem.mkdir(os.path.dirname(blob_path), True)
+        if not self.cleep_filesystem.move(temp_path, blob_path):
+            self.cleep_filesystem.rm(temp_path)
+            return None
+
+        return stored
+
+    def __get_blob_path(self, file_hash):
+        """
+        Return blob path
+
+        Args:
+            file_hash (str): file hash
+
+        Returns:
+            str: blob path
+        """
+        return os.path.join(self.store_path, self.BLOBS_DIR, file_hash[:2], file_hash)
+
+    def __get_snapshot_path(self, snapshot_id):
+        """
+        Return snapshot file path
+
+        Args:
+            snapshot_id (str): snapshot id
+
+        Returns:
+            str: snapshot file path
+        """
+        return os.path.join(self.store_path, self.SNAPSHOTS_DIR, f"{snapshot_id}.json")
+
+    def __get_snapshots(self):
+        """
+        Load all snapshots
+
+        Returns:
+            list: list of snapshots sorted from latest to oldest
+        """
+        snapshots_path = os.path.join(self.store_path, self.SNAPSHOTS_DIR)
+        if not os.path.exists(snapshots_path):
+            return []
+
+        snapshots = []
+        for filename in os.listdir(snapshots_path):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                snapshot = self.cleep_filesystem.read_json(os.path.join(snapshots_path, filename))
+                if snapshot:
+                    snapshots.append(snapshot)
+            except Exception:
+                self.logger.exception('Invalid snapshot "%s"', filename)
+
+        return sorted(snapshots, key=lambda snapshot: int(snapshot["id"]), reverse=True)
+
+    def __apply_retention(self, snapshots):
+        """
+        Delete snapshots exceeding retention and blobs not referenced anymore
+
+        Args:
+            snapshots (list): list of snapshots sorted from latest to oldest
+        """
+        kept = snapshots[: self.retention]
+        for snapshot in snapshots[self.retention :]:
+            self.logger.debug('Delete snapshot "%s"', snapshot["id"])
+            self.cleep_filesystem.rm(self.__get_snapshot_path(snapshot["id"]))
+
+        referenced = {item["hash"] for snapshot in kept for item in snapshot["files"].values()}
+        blobs_path = os.path.join(self.store_path, self.BLOBS_DIR)
+        for root, _, filenames in os.walk(blobs_path):
+            for filename in filenames:
+                if filename not in referenced:
+                    self.cleep_filesystem.rm(os.path.join(root, filename))
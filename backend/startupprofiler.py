@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import ssl
+import time
+import logging
+import threading
+import urllib.request
+import urllib.error
+
+
+__all__ = ["StartupProfiler"]
+
+
+class StartupProfiler:
+    """
+    Collect Cleep startup timeline
+
+    Timeline is made of spans (relative to process start) and of apps readiness, which is the time
+    elapsed until an app answers its first command. Profiles of latest boots are persisted.
+    """
+
+    def __init__(self, cleep_filesystem, profiles_path, history_size):
+        """
+        Constructor
+
+        Args:
+            cleep_filesystem (CleepFilesystem): CleepFilesystem instance
+            profiles_path (str): profiles file path
+            history_size (int): number of boot profiles to keep
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cleep_filesystem = cleep_filesystem
+        self.profiles_path = profiles_path
+        self.history_size = history_size
+        self.__lock = threading.Lock()
+        self.__profile = None
+        self.__process_start = None
+
+    def start(self, process_start):
+        """
+        Start new profile
+
+        Args:
+            process_start (float): Cleep process start timestamp
+        """
+        with self.__lock:
+            self.__process_start = process_start
+            self.__profile = {
+                "timestamp": int(process_start),
+                "duration": 0.0,
+                "rpc": None,
+                "timeline": [],
+                "apps": {},
+            }
+
+    def add_span(self, name, phase, start, end):
+        """
+        Add span to timeline
+
+        Args:
+            name (str): span owner (app name)
+            phase (str): phase name (import, configure, start...)
+            start (float): span start timestamp
+            end (float): span end timestamp
+        """
+        with self.__lock:
+            self.__profile["timeline"].append(
+                {
+                    "name": name,
+                    "phase": phase,
+                    "start": round(start - self.__process_start, 3),
+                    "duration": round(end - start, 3),
+                }
+            )
+
+    def probe_apps(self, apps, probe, timeout):
+        """
+        Probe apps concurrently and record time elapsed since process start until app answers
+
+        Args:
+            apps (list): list of app names
+            probe (function): probe function, takes app name and returns True if app answered
+            timeout (float): max probe duration (in seconds)
+        """
+        threads = []
+        for app in apps:
+            thread = threading.Thread(
+                target=self.__probe_app, args=(app, probe), name=f"probe-{app}", daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+
+        deadline = time.time() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.time()))
+
+    def __probe_app(self, app, probe):
+        """
+        Probe single app
+
+        Args:
+            app (str): app name
+            probe (function): probe function
+        """
+        try:
+            ready = probe(app)
+        except Exception:
+            self.logger.exception('Unable to probe app "%s"', app)
+            ready = False
+
+        with self.__lock:
+            self.__profile["apps"][app] = (
+                round(time.time() - self.__process_start, 3) if ready else None
+            )
+
+    def probe_rpc(self, url, timeout, interval=0.25):
+        """
+        Wait for RPC server to answer and record time elapsed since process start
+
+        Args:
+            url (str): RPC server url
+            timeout (float): max time to wait (in seconds)
+            interval (float, optional): time between two requests (in seconds)
+
+        Returns:
+            bool: True if RPC server answered
+        """
+        context = ssl._create_unverified_context()  # pylint: disable=protected-access
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                with urllib.request.urlopen(url, timeout=interval * 4, context=context):
+                    pass
+                served = True
+            except urllib.error.HTTPError:
+                # server answered, even with an error status
+                served = True
+            except Exception:
+                served = False
+
+            if served:
+                with self.__lock:
+                    self.__profile["rpc"] = round(time.time() - self.__process_start, 3)
+                return True
+            time.sleep(interval)
+
+        self.logger.warning("RPC server did not answer after %ss", timeout)
+        return False
+
+    def save(self):
+        """
+        Terminate current profile and persist it with latest boot profiles
+
+        Returns:
+            dict: current profile
+        """
+        with self.__lock:
+            profile = self.__profile
+            ends = [span["start"] + span["duration"] for span in profile["timeline"]]
+            ends.extend(ready for ready in profile["apps"].values() if ready is not None)
+            if profile["rpc"] is not None:
+                ends.append(profile["rpc"])
+            profile["duration"] = round(max(ends), 3) if ends else 0.0
+
+            profiles = [profile] + self.__load_profiles()
+            if not self.cleep_filesystem.write_json(self.profiles_path, profiles[: self.history_size]):
+                self.logger.error("Unable to save startup profiles")
+
+            return profile
+
+    def get_profile(self):
+        """
+        Return current profile
+
+        Returns:
+            dict: current profile or None if profiling not started
+        """
+        return self.__profile
+
+    def get_profiles(self):
+        """
+        Return persisted profiles
+
+        Returns:
+            list: latest boot profiles, from latest to oldest
+        """
+        with self.__lock:
+            return self.__load_profiles()
+
+    def __load_profiles(self):
+        """
+        Load persisted profiles
+
+        Returns:
+            list: list of profiles
+        """
+        if not os.path.exists(self.profiles_path):
+            return []
+
+        try:
+            return self.cleep_filesystem.read_json(self.profiles_path) or []
+        except Exception:
+            self.logger.exception("Invalid startup profiles file")
+            return []
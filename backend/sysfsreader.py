@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+
+
+__all__ = ["SysfsReader"]
+
+
+class SysfsReader:
+    """
+    Base class of components reading sysfs values
+
+    Sysfs root can be changed (tests, chroot), values that can't be read are returned as None.
+    """
+
+    SYSFS_ROOT = "/sys"
+
+    def __init__(self, sysfs_root=None):
+        """
+        Constructor
+
+        Args:
+            sysfs_root (str, optional): sysfs directory. Defaults to SYSFS_ROOT
+        """
+        self.sysfs_root = sysfs_root or self.SYSFS_ROOT
+
+    def _read(self, path, default=None):
+        """
+        Read sysfs value
+
+        Args:
+            path (str): file path
+            default (any): value returned if file can't be read
+
+        Returns:
+            str: file content stripped
+        """
+        try:
+            with open(path) as file_descriptor:
+                return file_descriptor.read().strip()
+        except OSError:
+            return default
+
+    def _read_int(self, path):
+        """
+        Read sysfs integer value
+
+        Args:
+            path (str): file path
+
+        Returns:
+            int: value or None if file can't be read
+        """
+        value = self._read(path)
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            return None
@@ -2,10 +2,13 @@
 # -*- coding: utf-8 -*-
 
 import os
+import socket
+import hashlib
 import logging
+import threading
+from collections import deque
 from datetime import datetime
 import time
-from zipfile import ZipFile, ZIP_DEFLATED
 from tempfile import NamedTemporaryFile
 import psutil
 from cleep.exception import InvalidParameter, CommandError, CommandInfo
@@ -15,7 +18,27 @@ from cleep.libs.internals.console import Console
 from cleep.libs.configs.cleepconf import CleepConf
 import cleep.libs.internals.tools as Tools
 from cleep import __version__ as VERSION
-from cleep.libs.internals.cleepbackup import CleepBackup
+from .logparser import JsonLogFormatter, LogParser
+from .configbackup import ConfigBackup
+from .backupworker import BackupWorker
+from .snapshotstore import SnapshotStore
+from .iothrottle import IoThrottle
+from .shutdownpipeline import ShutdownPipeline
+from .startupprofiler import StartupProfiler
+from .driverjobqueue import DriverJobQueue
+from .driversstatus import DriversStatus
+from .artifactcache import ArtifactCache
+from .leds import Leds, LedPatternEngine
+from .hardwareinfos import HardwareInfos
+from .thermalcollector import ThermalCollector
+from .cpufreq import CpuFreq
+from .vmtuning import VmTuning
+from .ramlog import RamLog
+from .processpriority import ProcessPriority
+from .memoryreclaimer import MemoryReclaimer
+from .gcstats import GcStats
+from .threadwatchdog import ThreadWatchdog, dump_threads
+from .taskstats import TaskStats
 
 
 __all__ = ["System"]
@@ -52,18 +75,88 @@ class System(CleepModule):
         "needreboot": False,
         "enablepowerled": True,
         "enableactivityled": True,
+        "logformat": "text",
+        "snapshotretention": 10,
+        "backupthrottling": False,
+        "ledpatterns": False,
+        "cpuprofile": None,
+        "cpuminfreq": None,
+        "cpumaxfreq": None,
+        "vmprofile": None,
+        "zram": False,
+        "ramlogs": False,
+        "processpriority": None,
+        "memoryreclaim": False,
+        "mallocarenamax": None,
+        "watchdog": False,
+        "apptaskstats": False,
     }
 
     MONITORING_CPU_DELAY = 60.0  # 1 minute
     MONITORING_MEMORY_DELAY = 300.0  # 5 minutes
+    MONITORING_THERMAL_DELAY = 60.0  # 1 minute
     MONITORING_DISKS_DELAY = 21600  # 6 hours
 
+    WATCHDOG_DELAY = 10.0  # seconds
+    WATCHDOG_STUCK_TIMEOUT = 120.0  # seconds
+
     THRESHOLD_MEMORY = 80.0
     THRESHOLD_DISK_SYSTEM = 80.0
     THRESHOLD_DISK_EXTERNAL = 90.0
 
+    MEMORY_RECLAIM_DELAY = 5  # minutes
+    MEMORY_RECLAIM_IDLE_CPU = 5.0  # percent
+    MEMORY_RECLAIM_THRESHOLD = 70.0  # percent
+
     EVENT_SEPARATOR = "__"
 
+    CORE_DEBUG_COMPONENTS = [
+        "internal_bus",
+        "events_broker",
+        "cleep_filesystem",
+        "formatters_broker",
+        "crash_report",
+        "critical_resources",
+        "drivers",
+    ]
+    DEBUG_SESSION_MAX_DURATION = 1440  # 1 day
+
+    CLEEP_CONFIG_PATH = "/etc/cleep/"
+    CLEEP_BACKUP_PATH = "/etc/cleep.bak/"
+    CLEEP_BACKUP_MANIFEST_PATH = "/etc/cleep.bak.json"
+    CLEEP_SNAPSHOTS_PATH = "/etc/cleep.snapshots/"
+    BACKUP_JITTER = 45.0  # seconds
+    DEVICE_ID_PATH = "/etc/machine-id"
+    BACKUP_FLUSH_TIMEOUT = 30.0  # seconds
+    BACKUP_THROTTLE_BANDWIDTH = 1048576  # 1MB/s
+    BACKUP_THROTTLE_CPU = 80.0  # percent
+    BACKUP_THROTTLE_DISK = 4194304  # 4MB/s
+    BACKUP_MAX_DEFER = 300.0  # 5 minutes
+    BACKUP_METRICS_SIZE = 50
+
+    CLEEP_STARTUP_PROFILES_PATH = "/etc/cleep.startup.json"
+    STARTUP_PROFILES_SIZE = 5
+    STARTUP_PROBE_TIMEOUT = 120.0  # seconds
+    DEFERRED_RPC_TIMEOUT = 30.0  # seconds
+
+    APP_RELOAD_TIMEOUT = 30.0  # seconds
+
+    DRIVER_REBOOT_DEADLINE = 1800.0  # 30 minutes
+    DRIVER_ARTIFACTS_PATH = "/var/cache/cleep/drivers/"
+    DRIVER_ARTIFACTS_MAX_SIZE = 209715200  # 200MB
+    APT_ARCHIVES_PATH = "/var/cache/apt/archives"
+
+    VM_BENCHMARK_PATH = "/var/tmp/cleep.vmbenchmark"
+
+    SHUTDOWN_TIMEOUT = 30.0  # seconds
+    SHUTDOWN_APP_TIMEOUT = 5.0  # seconds
+
+    LOG_FORMATS = ["text", "json"]
+    SEARCH_LOGS_LIMIT = 1000
+    RAM_LOG_PATH = "/dev/shm/cleep.log"
+    RAM_LOG_FLUSH_DELAY = 15  # minutes
+    RAM_LOG_MAX_SIZE = 4194304  # 4MB
+
     def __init__(self, bootstrap, debug_enabled):
         """
         Constructor
@@ -72,6 +165,7 @@ class System(CleepModule):
             bootstrap (dict): bootstrap objects
             debug_enabled (bool): flag to set debug level to logger
         """
+        init_start = time.time()
         CleepModule.__init__(self, bootstrap, debug_enabled)
 
         # members
@@ -82,30 +176,110 @@ class System(CleepModule):
         self.__monitor_memory_uuid = None
         self.__monitoring_cpu_task = None
         self.__monitoring_memory_task = None
+        self.__monitor_thermal_uuid = None
+        self.__monitoring_thermal_task = None
+        self.__monitor_gc_uuid = None
         # self.__monitoring_disks_task = None
         self.__process = None
+        self.process_priority = None
+        self.memory_reclaimer = None
+        self.__memory_reclaim_minutes = 0
         self.__need_restart = False
+        self.__debug_session = None
+        self.__shutdown_task = None
         self.cleep_update_pending = False
-        self.cleep_backup = CleepBackup(self.cleep_filesystem, self.crash_report)
+        self.io_throttle = IoThrottle(
+            self.cleep_filesystem,
+            self.BACKUP_THROTTLE_BANDWIDTH,
+            self.BACKUP_THROTTLE_CPU,
+            self.BACKUP_THROTTLE_DISK,
+        )
+        self.cleep_backup = ConfigBackup(
+            self.cleep_filesystem,
+            self.__full_backup,
+            self.CLEEP_CONFIG_PATH,
+            self.CLEEP_BACKUP_PATH,
+            self.CLEEP_BACKUP_MANIFEST_PATH,
+            copy_file=self.io_throttle.copy,
+        )
+        self.__backup_metrics = deque(maxlen=self.BACKUP_METRICS_SIZE)
         self.cleep_backup_delay = None
+        self.cleep_backup_offset = 0
+        self.backup_worker = BackupWorker(
+            self._run_backup,
+            jitter=self.BACKUP_JITTER,
+            is_busy=self.io_throttle.is_busy,
+            max_defer=self.BACKUP_MAX_DEFER,
+        )
+        self.snapshot_store = SnapshotStore(
+            self.cleep_filesystem,
+            self.CLEEP_SNAPSHOTS_PATH,
+            self.DEFAULT_CONFIG["snapshotretention"],
+            copy_file=self.io_throttle.copy,
+        )
         self.cleep_conf = CleepConf(self.cleep_filesystem)
         self.drivers = bootstrap["drivers"]
+        self.drivers_status = DriversStatus(self.drivers)
+        self.artifact_cache = ArtifactCache(
+            self.cleep_filesystem,
+            self.DRIVER_ARTIFACTS_PATH,
+            self.DRIVER_ARTIFACTS_MAX_SIZE,
+        )
+        self.driver_jobs = DriverJobQueue(self.__on_driver_job_progress, self.__on_driver_job_terminated)
+        self.__driver_reboot_deadline = None
+        self.log_parser = LogParser()
+        self.__text_log_formatter = None
+        self.ram_log = RamLog(self.cleep_filesystem, self.log_file, self.RAM_LOG_PATH, self.RAM_LOG_MAX_SIZE)
+        self.__ram_log_minutes = 0
+        self.startup_profiler = StartupProfiler(
+            self.cleep_filesystem,
+            self.CLEEP_STARTUP_PROFILES_PATH,
+            self.STARTUP_PROFILES_SIZE,
+        )
+        self.__startup_spans = []
+        self.__startup_task = None
+        self.__core_backup = None
+        self.__deferred_lock = threading.Lock()
+        self.__deferred_configured = False
+        self.leds = Leds()
+        self.hardware_infos = HardwareInfos(Tools.raspberry_pi_infos, self.leds)
+        self.thermal_collector = ThermalCollector(self.hardware_infos)
+        self.cpu_freq = CpuFreq()
+        self.vm_tuning = VmTuning(self.cleep_filesystem, lambda command: Console().command(command))
+        self.__vm_benchmark = {"running": False, "profile": None, "timestamp": None, "before": None, "after": None}
+        self.led_patterns = LedPatternEngine(self.leds, "activity", restore=self.__restore_activity_led)
+        self.gc_stats = GcStats()
+        self.thread_watchdog = ThreadWatchdog(self.__on_watchdog_alert, self.WATCHDOG_STUCK_TIMEOUT)
+        self.__watchdog_task = None
+        self.task_stats = TaskStats()
+        self.__create_task = None
+        self.__instrumented_create_task = None
 
         # events
         self.device_poweroff_event = self._get_event("system.device.poweroff")
         self.device_reboot_event = self._get_event("system.device.reboot")
         self.cleep_restart_event = self._get_event("system.cleep.restart")
         self.cleep_need_restart_event = self._get_event("system.cleep.needrestart")
+        self.shutdown_report_event = self._get_event("system.shutdown.report")
         self.monitoring_cpu_event = self._get_event("system.monitoring.cpu")
         self.monitoring_memory_event = self._get_event("system.monitoring.memory")
         self.alert_memory_event = self._get_event("system.alert.memory")
+        self.monitoring_thermal_event = self._get_event("system.monitoring.thermal")
+        self.monitoring_gc_event = self._get_event("system.monitoring.gc")
+        self.alert_throttling_event = self._get_event("system.alert.throttling")
+        self.alert_watchdog_event = self._get_event("system.alert.watchdog")
         self.driver_install_event = self._get_event("system.driver.install")
         self.driver_uninstall_event = self._get_event("system.driver.uninstall")
+        self.driver_progress_event = self._get_event("system.driver.progress")
+
+        self.__startup_spans.append(("init", init_start, time.time()))
 
     def _configure(self):
         """
         Configure module
         """
+        configure_start = time.time()
+
         # reset needreboot flag
         self._set_config_field("needreboot", False)
 
@@ -113,48 +287,121 @@ class System(CleepModule):
         self._configure_crash_report(self._get_config_field("crashreport"))
 
         # set members
-        self.cleep_backup_delay = self._get_config_field("cleepbackupdelay")
+        self.__load_members()
+
+        # instrument app tasks as soon as possible to catch tasks created by apps at startup
+        self.__instrument_app_tasks(self._get_config_field("apptaskstats"))
 
         # init first cpu percent for current process
         self.__process = psutil.Process(os.getpid())
         self.__process.cpu_percent()
+        self.process_priority = ProcessPriority(self.__process)
+        self.memory_reclaimer = MemoryReclaimer(self.__process)
+        self.__apply_malloc_arena_max(self._get_config_field("mallocarenamax"))
+
+        # configure logs
+        self.__apply_log_format(self._get_config_field("logformat"))
+        self.__apply_ram_logs(self._get_config_field("ramlogs"))
+
+        # other configuration is performed by _configure_deferred once UI is served
+
+        self.__startup_spans.append(("configure", configure_start, time.time()))
 
-        # store device uuids for events
-        devices = self.get_module_devices()
-        monitor_uuid = None
-        for (device_uuid, device) in devices.items():
-            if device["type"] == "monitorcpu":
-                self.__monitor_cpu_uuid = device_uuid
-            elif device["type"] == "monitormemory":
-                self.__monitor_memory_uuid = device_uuid
-            elif device["type"] == "monitor":
-                monitor_uuid = device_uuid
-
-        # create missing devices
-        if not monitor_uuid:
-            # add fake monitor device (used to have a device on dashboard)
-            self.logger.info('Create missing "monitor" device')
-            self._add_device({"type": "monitor", "name": "System monitor"})
-        if not self.__monitor_cpu_uuid:
-            # add monitor cpu device (used to save cpu data into database and has no widget)
-            self.logger.info('Create missing "monitorcpu" device')
-            self._add_device({"type": "monitorcpu", "name": "Cpu monitor"})
-        if not self.__monitor_memory_uuid:
-            # add monitor memory device (used to save cpu data into database and has no widget)
-            self.logger.info('Create missing "monitormemory" device')
-            self._add_device({"type": "monitormemory", "name": "Memory monitor"})
-
-        # configure not renderable events
-        self._set_not_renderable_events()
-
-        # apply tweaks
+    def __load_members(self):
+        """
+        Load members from configuration
+        """
+        self.cleep_backup_delay = self._get_config_field("cleepbackupdelay")
+        self.cleep_backup_offset = self.__get_backup_offset(self.cleep_backup_delay)
+        self.snapshot_store.retention = self._get_config_field("snapshotretention")
+        self.io_throttle.enabled = self._get_config_field("backupthrottling")
+        if self._get_config_field("ledpatterns"):
+            self.led_patterns.start()
+        else:
+            self.led_patterns.stop()
+
+    def reload(self):
+        """
+        Reload application in place: configuration is applied again and tasks are restarted
+
+        Returns:
+            bool: True if application reloaded
+        """
+        self.__stop_monitoring_tasks()
+        self.__stop_watchdog()
+        self.__load_members()
+        self.__apply_log_format(self._get_config_field("logformat"))
+        self.__apply_ram_logs(self._get_config_field("ramlogs"))
         self.__apply_tweaks()
+        self.__start_monitoring_tasks()
+        self.__start_watchdog()
+
+        return True
 
     def _on_start(self):
         """
         Application started
         """
+        start = time.time()
+        self.backup_worker.start()
         self.__start_monitoring_tasks()
+        self.__start_watchdog()
+        self.__startup_spans.append(("start", start, time.time()))
+
+        # run startup stage in background
+        self.__startup_task = self.task_factory.create_task(None, self._run_startup_stage)
+        self.__startup_task.start()
+
+    def _configure_deferred(self):
+        """
+        Configure module (non critical part). It is executed once in background when UI is served, it
+        must not depend on apps.
+        """
+        with self.__deferred_lock:
+            if self.__deferred_configured:
+                return
+
+            # store device uuids for events
+            devices = self.get_module_devices()
+            monitor_uuid = None
+            for (device_uuid, device) in devices.items():
+                if device["type"] == "monitorcpu":
+                    self.__monitor_cpu_uuid = device_uuid
+                elif device["type"] == "monitormemory":
+                    self.__monitor_memory_uuid = device_uuid
+                elif device["type"] == "monitorthermal":
+                    self.__monitor_thermal_uuid = device_uuid
+                elif device["type"] == "monitorgc":
+                    self.__monitor_gc_uuid = device_uuid
+                elif device["type"] == "monitor":
+                    monitor_uuid = device_uuid
+
+            # create missing devices
+            if not monitor_uuid:
+                # add fake monitor device (used to have a device on dashboard)
+                self.logger.info('Create missing "monitor" device')
+                self._add_device({"type": "monitor", "name": "System monitor"})
+            if not self.__monitor_cpu_uuid:
+                # add monitor cpu device (used to save cpu data into database and has no widget)
+                self.logger.info('Create missing "monitorcpu" device')
+                self._add_device({"type": "monitorcpu", "name": "Cpu monitor"})
+            if not self.__monitor_memory_uuid:
+                # add monitor memory device (used to save cpu data into database and has no widget)
+                self.logger.info('Create missing "monitormemory" device')
+                self._add_device({"type": "monitormemory", "name": "Memory monitor"})
+            if not self.__monitor_thermal_uuid:
+                # add monitor thermal device (used to save thermal data into database)
+                self.logger.info('Create missing "monitorthermal" device')
+                self._add_device({"type": "monitorthermal", "name": "Thermal monitor"})
+            if not self.__monitor_gc_uuid:
+                # add monitor gc device (used to chart garbage collector pauses apart from cpu usage)
+                self.logger.info('Create missing "monitorgc" device')
+                self._add_device({"type": "monitorgc", "name": "Garbage collector monitor"})
+
+            # apply tweaks
+            self.__apply_tweaks()
+
+            self.__deferred_configured = True
 
     def _on_stop(self):
         """
@@ -162,6 +409,18 @@ class System(CleepModule):
         """
         # stop monitoring task
         self.__stop_monitoring_tasks()
+        self.__stop_watchdog()
+        if self.__startup_task:
+            self.__startup_task.stop()
+
+        # stop backup worker, flushing pending backup
+        self.backup_worker.stop(self.BACKUP_FLUSH_TIMEOUT)
+
+        # stop led patterns
+        self.led_patterns.stop()
+
+        # write back RAM logs
+        self.ram_log.disable()
 
     def _configure_crash_report(self, enable):
         """
@@ -198,6 +457,9 @@ class System(CleepModule):
                     "core": self.cleep_conf.is_core_debugged(),
                     "trace": self.cleep_conf.is_trace_enabled(),
                 },
+                "debugsession": self.get_debug_session(),
+                "lastbackup": self.get_last_backup(),
+                "ramlog": self.ram_log.get_stats(),
             }
         )
 
@@ -236,6 +498,15 @@ class System(CleepModule):
         if mem_device:
             mem_device.update(mem_data)
 
+        gc_device = next((dev for dev in devices.values() if dev["type"] == "monitorgc"), None)
+        if gc_device:
+            gc_device.update({"hidden": not bool(self.__monitoring_cpu_task)})
+
+        thermal_device = next((dev for dev in devices.values() if dev["type"] == "monitorthermal"), None)
+        if thermal_device:
+            thermal_device.update({"hidden": not bool(self.__monitoring_thermal_task)})
+            thermal_device.update(self.get_thermal_status())
+
         return devices
 
     def on_event(self, event):
@@ -252,11 +523,36 @@ class System(CleepModule):
         # handle reboot event
         elif event["event"].endswith("device.needreboot"):
             self._set_config_field("needreboot", True)
+            self.__set_led_pattern("needreboot", True)
 
         if event["event"] == "parameters.time.now":
-            # backup configuration
-            if not event["params"]["minute"] % self.cleep_backup_delay:
-                self.backup_cleep_config()
+            # backup configuration (offset spreads backups of devices over the delay). Minutes are counted
+            # since epoch (or since midnight) so delays longer than one hour are also handled
+            if event["params"].get("timestamp") is not None:
+                minutes = int(event["params"]["timestamp"]) // 60
+            else:
+                minutes = event["params"].get("hour", 0) * 60 + event["params"]["minute"]
+            if self.io_throttle.enabled:
+                # device load reference for backups deferral
+                self.io_throttle.sample()
+            if not (minutes - self.cleep_backup_offset) % self.cleep_backup_delay:
+                self.backup_worker.request(jitter=True)
+
+            # stop expired debug session
+            self.__check_debug_session()
+
+            # reboot requested by drivers
+            self.__check_driver_reboot()
+
+            # flush RAM logs
+            self.__check_ram_logs()
+
+            # pin threads started since last minute
+            if self._get_config_field("processpriority"):
+                self.process_priority.pin_new_threads()
+
+            # give freed memory back to system
+            self.__check_memory_reclaim()
 
     def set_monitoring(self, monitoring):
         """
@@ -290,56 +586,242 @@ class System(CleepModule):
         """
         return self._get_config_field("monitoring")
 
-    def reboot_device(self, delay=5.0):
+    def reboot_device(self, delay=5.0, timeout=None):
         """
         Reboot device
 
         Args:
-            delay (float, optional): delay before rebooting the device. Defaults to 5.0.
+            delay (float, optional): delay before rebooting the device (in seconds). Defaults to 5.0.
+            timeout (float, optional): max time to gracefully prepare reboot (in seconds). Defaults to SHUTDOWN_TIMEOUT.
         """
-        # backup configuration
-        self.backup_cleep_config()
+        # reboot system as soon as device is ready
+        self.__start_shutdown("reboot", "reboot -f", delay, timeout, self.device_reboot_event)
 
-        # send event
-        self.device_reboot_event.send({"delay": delay})
+    def poweroff_device(self, delay=5.0, timeout=None):
+        """
+        Poweroff device
 
-        # and reboot system
-        console = Console()
-        console.command_delayed("reboot -f", delay)
+        Args:
+            delay (float, optional): delay before powering off the device (in seconds). Defaults to 5.0.
+            timeout (float, optional): max time to gracefully prepare poweroff (in seconds). Defaults to
+                                       SHUTDOWN_TIMEOUT.
+        """
+        # poweroff system as soon as device is ready
+        self.__start_shutdown("poweroff", "poweroff -f", delay, timeout, self.device_poweroff_event)
 
-    def poweroff_device(self, delay=5.0):
+    def restart_cleep(self, delay=3.0, timeout=None):
         """
-        Poweroff device
+        Restart Cleep
 
         Args:
-            delay (float, optional): delay before powering off the device. Defaults to 5.0.
+            delay (float, optional): delay before restarting Cleep (in seconds). Defaults to 3.0.
+            timeout (float, optional): max time to gracefully prepare restart (in seconds). Defaults to
+                                       SHUTDOWN_TIMEOUT.
         """
-        # backup configuration
-        self.backup_cleep_config()
+        # restart cleep as soon as apps are ready
+        self.__start_shutdown(
+            "restart", "/etc/cleep/cleephelper.sh restart", delay, timeout, self.cleep_restart_event
+        )
 
-        # send event
-        self.device_poweroff_event.send({"delay": delay})
+    def reload_app(self, app):
+        """
+        Reload specified application without restarting Cleep.
+        Applications opt in by implementing "reload" command that stops, reloads and restarts the
+        application in place. Cleep is fully restarted if application doesn't implement reload or
+        declares it unsafe (command returns False).
 
-        # and reboot system
-        console = Console()
-        console.command_delayed("poweroff -f", delay)
+        Args:
+            app (str): application name
+
+        Returns:
+            dict: reload result::
+
+                {
+                    reloaded (bool): True if application was reloaded in place,
+                    restart (bool): True if Cleep restart was triggered instead,
+                    duration (float): reload duration in seconds,
+                }
 
-    def restart_cleep(self, delay=3.0):
+        Raises:
+            InvalidParameter: if application is not running
+            CommandError: if application failed to reload (error or timeout)
         """
-        Restart Cleep
+        self._check_parameters(
+            [
+                {"name": "app", "type": str, "value": app},
+            ]
+        )
+        if app != "system" and app not in self.__get_running_apps():
+            raise InvalidParameter(f'Application "{app}" is not running')
+
+        start = time.time()
+        if app == "system":
+            # command can't be sent to itself
+            reloaded = self.reload()
+        elif not self.__is_command_implemented(app, "reload"):
+            self.logger.info("App %s doesn't implement reload", app)
+            reloaded = False
+        else:
+            resp = self.send_command("reload", app, timeout=self.APP_RELOAD_TIMEOUT)
+            if resp.error:
+                self.logger.error("App %s failed to reload: %s", app, resp.message)
+                raise CommandError(f'Application "{app}" failed to reload: {resp.message}')
+            reloaded = resp.data is not False
+        duration = round(time.time() - start, 3)
+
+        if not reloaded:
+            self.logger.info("Restarting Cleep to reload app %s", app)
+            self.restart_cleep()
+            return {"reloaded": False, "restart": True, "duration": duration}
+
+        self.logger.info("App %s reloaded in %ss", app, duration)
+        return {"reloaded": True, "restart": False, "duration": duration}
+
+    def __start_shutdown(self, action, command, delay, timeout, event):
+        """
+        Send shutdown event and launch shutdown pipeline in background
+
+        Args:
+            action (str): shutdown action (reboot, poweroff, restart)
+            command (str): command to execute at end of pipeline
+            delay (float): min delay before executing command (in seconds)
+            timeout (float): pipeline max duration (in seconds). SHUTDOWN_TIMEOUT if None
+            event (Event): event to send when shutdown starts
+        """
+        if self.__shutdown_task:
+            self.logger.info("Shutdown already in progress, %s request dropped", action)
+            return
+
+        timeout = timeout or self.SHUTDOWN_TIMEOUT
+        event.send({"delay": delay, "timeout": timeout})
+        self.__shutdown_task = self.task_factory.create_task(
+            None, self._shutdown, task_args=[action, command, delay, timeout]
+        )
+        self.__shutdown_task.start()
+
+    def _shutdown(self, action, command, delay, timeout):
+        """
+        Shutdown pipeline: prepare apps concurrently, flush backup, RAM logs and filesystem buffers,
+        then execute shutdown command.
 
         Args:
-            delay (float, optional): delay before restarting the device. Defaults to 3.0.
+            action (str): shutdown action (reboot, poweroff, restart)
+            command (str): command to execute at end of pipeline
+            delay (float): min delay before executing command (in seconds)
+            timeout (float): pipeline max duration (in seconds)
+
+        Returns:
+            dict: shutdown report (see ShutdownPipeline.run)
         """
-        # backup configuration
-        self.backup_cleep_config()
+        try:
+            return self.__run_shutdown(action, command, delay, timeout)
+        finally:
+            # allow new shutdown requests if shutdown command failed
+            self.__shutdown_task = None
 
-        # send event
-        self.cleep_restart_event.send({"delay": delay})
+    def __run_shutdown(self, action, command, delay, timeout):
+        """
+        Run shutdown pipeline and execute shutdown command (see _shutdown)
+        """
+        start = time.monotonic()
+        self.logger.info("Preparing %s (timeout %ss)", action, timeout)
+        pipeline = ShutdownPipeline(timeout)
+        pipeline.add_phase(
+            "apps",
+            {
+                app: self.__get_prepare_shutdown_step(app, action)
+                for app in self.__get_running_apps()
+            },
+            self.SHUTDOWN_APP_TIMEOUT,
+        )
+        pipeline.add_phase("backup", {"backup": self.backup_cleep_config})
+        pipeline.add_phase("logs", {"logs": self.ram_log.flush})
+        pipeline.add_phase("sync", {"sync": os.sync})
+        report = pipeline.run()
+        report["action"] = action
+        self.logger.info(
+            "Shutdown prepared in %ss: %s",
+            report["duration"],
+            ", ".join(f"{phase['name']}={phase['duration']}s" for phase in report["phases"]),
+        )
+
+        self.shutdown_report_event.send(report)
 
-        # and restart cleep
+        # command is not executed before announced delay, pipeline duration included
+        remaining = (delay or 0.0) - (time.monotonic() - start)
+        if remaining > 0:
+            time.sleep(remaining)
+
+        # last flush: logs written after "logs" phase (report included) would be lost otherwise
+        self.logger.info("Executing %s command", action)
+        try:
+            self.ram_log.flush()
+            os.sync()
+        except Exception:
+            self.logger.exception("Unable to flush RAM logs before %s", action)
         console = Console()
-        console.command_delayed("/etc/cleep/cleephelper.sh restart", delay)
+        console.command(command)
+
+        return report
+
+    def __get_running_apps(self):
+        """
+        Return list of running apps (except system)
+
+        Returns:
+            list: list of app names
+        """
+        resp = self.send_command("get_modules_debug", "inventory")
+        if resp.error or not resp.data:
+            self.logger.warning("Unable to get running apps: %s", resp.message)
+            return []
+
+        return [app for app in resp.data.keys() if app != "system"]
+
+    def __get_prepare_shutdown_step(self, app, action):
+        """
+        Return shutdown step that asks specified app to prepare shutdown.
+        Apps opt in by implementing "prepare_shutdown" command, other apps are considered ready.
+
+        Args:
+            app (str): app name
+            action (str): shutdown action
+
+        Returns:
+            function: step function
+        """
+
+        def step():
+            if not self.__is_command_implemented(app, "prepare_shutdown"):
+                return True
+            resp = self.send_command(
+                "prepare_shutdown", app, {"action": action}, timeout=self.SHUTDOWN_APP_TIMEOUT
+            )
+            if resp.error:
+                self.logger.warning("App %s failed to prepare shutdown: %s", app, resp.message)
+                return False
+            return True
+
+        return step
+
+    def __is_command_implemented(self, app, command):
+        """
+        Return True if app implements specified command. Commands are listed by inventory, so an error
+        returned by command itself is never confused with a command not implemented.
+
+        Args:
+            app (str): app name
+            command (str): command name
+
+        Returns:
+            bool: True if command is implemented
+        """
+        resp = self.send_command("get_module_commands", "inventory", {"module_name": app})
+        if resp.error:
+            self.logger.warning("Unable to get app %s commands: %s", app, resp.message)
+            return False
+
+        return command in (resp.data or [])
 
     def get_memory_usage(self):
         """
@@ -369,6 +851,24 @@ class System(CleepModule):
             # 'others': system.total - system.available - cleep
         }
 
+    def get_gc_stats(self):
+        """
+        Return Cleep garbage collector statistics (collected while monitoring is enabled)
+
+        Returns:
+            dict: garbage collector statistics (see GcStats.get_stats)
+        """
+        return self.gc_stats.get_stats()
+
+    def get_thermal_status(self):
+        """
+        Return cpu thermal status
+
+        Returns:
+            dict: thermal status (see ThermalCollector.read)
+        """
+        return self.thermal_collector.read()
+
     def get_cpu_usage(self):
         """
         Return cpu usage for cleep process and system
@@ -403,6 +903,113 @@ class System(CleepModule):
         uptime = int(time.time() - psutil.boot_time())
         return {"uptime": uptime, "uptimehr": Tools.hr_uptime(uptime)}
 
+    def get_startup_profile(self):
+        """
+        Return Cleep startup timeline of current and previous boots
+
+        Returns:
+            dict: startup profiles::
+
+                {
+                    current (dict): current boot profile (None if not available yet) {
+                        timestamp (int): Cleep process start timestamp,
+                        duration (float): time until all apps and RPC server answered (in seconds),
+                        rpc (float): time until RPC server served first request (in seconds),
+                        timeline (list): [
+                            {
+                                name (str): app name,
+                                phase (str): startup phase (init, configure, start, deferred),
+                                start (float): phase start since process start (in seconds),
+                                duration (float): phase duration (in seconds),
+                            },
+                            ...
+                        ],
+                        apps (dict): time until app answered its first command (in seconds) per app,
+                    },
+                    previous (list): previous boots profiles, from latest to oldest
+                }
+
+        """
+        current = self.startup_profiler.get_profile()
+        previous = [
+            profile
+            for profile in self.startup_profiler.get_profiles()
+            if not current or profile["timestamp"] != current["timestamp"]
+        ]
+        return {"current": current, "previous": previous}
+
+    def _run_startup_stage(self):
+        """
+        Startup stage executed once in background at application start: run deferred configuration as
+        soon as UI is served (or after DEFERRED_RPC_TIMEOUT), then configure what depends on apps once
+        apps are ready and save startup profile. Apps are probed concurrently from the beginning.
+
+        Returns:
+            dict: startup profile
+        """
+        self.startup_profiler.start(self.__process.create_time())
+        for phase, start, end in self.__startup_spans:
+            self.startup_profiler.add_span("system", phase, start, end)
+
+        apps_probe = threading.Thread(
+            target=self.startup_profiler.probe_apps,
+            args=(self.__get_running_apps(), self.__probe_app, self.STARTUP_PROBE_TIMEOUT),
+            name="probe-apps",
+            daemon=True,
+        )
+        apps_probe.start()
+
+        url = "%s://127.0.0.1:%s/" % (
+            "https" if self._get_config_field("ssl") else "http",
+            self._get_config_field("rpcport"),
+        )
+        served = self.startup_profiler.probe_rpc(url, self.DEFERRED_RPC_TIMEOUT)
+
+        start = time.time()
+        try:
+            self.hardware_infos.get()
+        except Exception:
+            self.logger.exception("Error collecting hardware infos")
+        self.startup_profiler.add_span("system", "hardware", start, time.time())
+
+        # deferred configuration (devices, leds, cpu profile, vm tweaks...) doesn't wait for apps
+        start = time.time()
+        try:
+            self._configure_deferred()
+        except Exception:
+            self.logger.exception("Error during deferred configuration")
+        self.startup_profiler.add_span("system", "deferred", start, time.time())
+
+        # not renderable events are registered by apps
+        apps_probe.join(self.STARTUP_PROBE_TIMEOUT)
+        start = time.time()
+        try:
+            self._set_not_renderable_events()
+        except Exception:
+            self.logger.exception("Error configuring not renderable events")
+        self.startup_profiler.add_span("system", "events", start, time.time())
+
+        if not served:
+            # keep measuring when UI is served
+            self.startup_profiler.probe_rpc(url, self.STARTUP_PROBE_TIMEOUT - self.DEFERRED_RPC_TIMEOUT)
+
+        profile = self.startup_profiler.save()
+        self.logger.info("Cleep started in %ss", profile["duration"])
+        return profile
+
+    def __probe_app(self, app):
+        """
+        Probe app readiness
+
+        Args:
+            app (str): app name
+
+        Returns:
+            bool: True if app answered
+        """
+        resp = self.send_command("get_module_config", app, timeout=self.STARTUP_PROBE_TIMEOUT)
+        return not resp.error
+
     def __start_monitoring_tasks(self):
         """
         Start monitoring threads
@@ -411,14 +1018,19 @@ class System(CleepModule):
         if not self._get_config_field("monitoring"):
             return
 
-        self.__monitoring_cpu_task = self.task_factory.create_task(
-            self.MONITORING_CPU_DELAY, self._monitoring_cpu_task
+        self.__monitoring_cpu_task = self.__create_periodic_task(
+            "monitoringcpu", self.MONITORING_CPU_DELAY, self._monitoring_cpu_task
         )
         self.__monitoring_cpu_task.start()
-        self.__monitoring_memory_task = self.task_factory.create_task(
-            self.MONITORING_MEMORY_DELAY, self._monitoring_memory_task
+        self.__monitoring_memory_task = self.__create_periodic_task(
+            "monitoringmemory", self.MONITORING_MEMORY_DELAY, self._monitoring_memory_task
         )
         self.__monitoring_memory_task.start()
+        self.__monitoring_thermal_task = self.__create_periodic_task(
+            "monitoringthermal", self.MONITORING_THERMAL_DELAY, self._monitoring_thermal_task
+        )
+        self.__monitoring_thermal_task.start()
+        self.gc_stats.start()
         # self.__monitoring_disks_task = self.task_factory.create_task(
         #    self.MONITORING_DISKS_DELAY, self._monitoring_disks_task
         # )
@@ -435,9 +1047,182 @@ class System(CleepModule):
         if self.__monitoring_memory_task is not None:
             self.__monitoring_memory_task.stop()
             self.__monitoring_memory_task = None
+        if self.__monitoring_thermal_task is not None:
+            self.__monitoring_thermal_task.stop()
+            self.__monitoring_thermal_task = None
+        self.gc_stats.stop()
+        # memory is not monitored anymore, do not keep alert pattern forever
+        self.__set_led_pattern("memoryalert", False)
         # if self.__monitoring_disks_task is not None:
         #     self.__monitoring_disks_task.stop()
 
+    def __create_periodic_task(self, name, delay, func):
+        """
+        Create periodic task watched by thread watchdog
+
+        Args:
+            name (str): task name
+            delay (float): task interval in seconds
+            func (function): task function
+
+        Returns:
+            Task: task instance (not started)
+        """
+        func = self.task_stats.wrap(name, delay, func)
+        return self.__get_create_task()(delay, self.thread_watchdog.wrap(name, delay, func, stuck=True))
+
+    def __get_create_task(self):
+        """
+        Return task factory create_task function not instrumented for app tasks statistics
+
+        Returns:
+            function: create_task function
+        """
+        return self.__create_task or self.task_factory.create_task
+
+    def __instrument_app_tasks(self, enable):
+        """
+        Record statistics of periodic tasks created through task factory (app tasks) from now on, and
+        watch them with thread watchdog (overrun and stuck executions)
+
+        Task factory has no hook for this, so create_task is replaced on the task factory instance shared
+        by all apps. Apps resolve it each time they create a task, so apps load order does not matter, but
+        tasks created before instrumentation is enabled are not recorded. If create_task was replaced again
+        by someone else in the meantime, disabling instrumentation only deactivates it, so the other
+        wrapper is kept.
+
+        Args:
+            enable (bool): True to instrument app tasks
+        """
+        self.task_stats.enable_source("apps", enable)
+        if enable and self.__create_task is None:
+            create_task = self.task_factory.create_task
+
+            def instrumented_create_task(interval, task, *args, **kwargs):
+                if interval and self.__create_task is create_task:
+                    name = self.__get_task_name(task)
+                    task = self.task_stats.wrap(name, interval, task, source="apps")
+                    task = self.thread_watchdog.wrap(name, interval, task, stuck=True)
+                return create_task(interval, task, *args, **kwargs)
+
+            self.__create_task = create_task
+            self.__instrumented_create_task = instrumented_create_task
+            self.task_factory.create_task = instrumented_create_task
+        elif not enable and self.__create_task is not None:
+            if self.task_factory.create_task is self.__instrumented_create_task:
+                self.task_factory.create_task = self.__create_task
+            else:
+                self.logger.warning("Task factory create_task was replaced after app tasks instrumentation")
+            self.__create_task = None
+            self.__instrumented_create_task = None
+
+    def __get_task_name(self, task):
+        """
+        Return task name (<app>.<function>)
+
+        Args:
+            task (function): task function
+
+        Returns:
+            str: task name
+        """
+        owner = getattr(task, "__self__", None)
+        name = getattr(task, "__name__", task.__class__.__name__)
+        return f"{owner.__class__.__name__.lower()}.{name}" if owner is not None else name
+
+    def __start_watchdog(self):
+        """
+        Start thread watchdog if enabled
+        """
+        if not self._get_config_field("watchdog") or self.__watchdog_task:
+            return
+
+        self.__watchdog_task = self.__create_periodic_task("watchdog", self.WATCHDOG_DELAY, self.thread_watchdog.check)
+        self.__watchdog_task.start()
+
+    def __stop_watchdog(self):
+        """
+        Stop thread watchdog
+        """
+        if self.__watchdog_task is not None:
+            self.__watchdog_task.stop()
+            self.__watchdog_task = None
+
+    def __on_watchdog_alert(self, alert):
+        """
+        Thread watchdog callback: send alert event
+
+        Args:
+            alert (dict): watchdog alert (see ThreadWatchdog.check)
+        """
+        self.alert_watchdog_event.send(params=alert)
+
+    def set_watchdog(self, enable):
+        """
+        Enable or disable thread watchdog that reports periodic tasks overrunning their interval and threads
+        blocked on the same frame
+
+        Args:
+            enable (bool): True to enable watchdog
+
+        Raises:
+            CommandError: if error occured
+        """
+        self._check_parameters([{"name": "enable", "type": bool, "value": enable}])
+
+        if not self._set_config_field("watchdog", enable):
+            raise CommandError("Unable to save configuration")
+
+        if enable:
+            self.__start_watchdog()
+        else:
+            self.__stop_watchdog()
+
+    def get_task_stats(self):
+        """
+        Return scheduling statistics of periodic tasks (System tasks and app tasks if enabled)
+
+        Returns:
+            dict: statistics by task name (see TaskStats.get_stats)
+        """
+        return self.task_stats.get_stats()
+
+    def set_app_task_stats(self, enable):
+        """
+        Record scheduling statistics of app periodic tasks. Only tasks created afterwards are recorded,
+        enabled setting is applied at startup before apps create their tasks.
+
+        Args:
+            enable (bool): True to record app tasks statistics
+
+        Raises:
+            CommandError: if error occured
+        """
+        self._check_parameters([{"name": "enable", "type": bool, "value": enable}])
+
+        if not self._set_config_field("apptaskstats", enable):
+            raise CommandError("Unable to save configuration")
+
+        self.__instrument_app_tasks(enable)
+
+    def dump_threads(self):
+        """
+        Return stacks of all Cleep threads
+
+        Returns:
+            dict: threads dump::
+
+                {
+                    threads (list): threads stacks (see threadwatchdog.dump_threads),
+                    tasks (dict): watched periodic tasks (see ThreadWatchdog.get_tasks),
+                }
+
+        """
+        return {
+            "threads": dump_threads(),
+            "tasks": self.thread_watchdog.get_tasks(),
+        }
+
     def _monitoring_cpu_task(self):
         """
         Read cpu usage
@@ -445,9 +1230,15 @@ class System(CleepModule):
         if not self.get_monitoring():
             return
 
+        # make sure monitor devices exist
+        self._configure_deferred()
+
         self.monitoring_cpu_event.send(
             params=self.get_cpu_usage(), device_id=self.__monitor_cpu_uuid
         )
+        self.monitoring_gc_event.send(
+            params={"pause": self.gc_stats.get_pause_percent()}, device_id=self.__monitor_gc_uuid
+        )
 
     def _monitoring_memory_task(self):
         """
@@ -457,6 +1248,9 @@ class System(CleepModule):
         if not self.get_monitoring():
             return
 
+        # make sure monitor devices exist
+        self._configure_deferred()
+
         memory = self.get_memory_usage()
 
         # detect memory leak
@@ -469,30 +1263,82 @@ class System(CleepModule):
             self.alert_memory_event.send(
                 params={"percent": percent, "threshold": self.THRESHOLD_MEMORY}
             )
+        self.__set_led_pattern("memoryalert", percent >= self.THRESHOLD_MEMORY)
 
         self.monitoring_memory_event.send(
             params=memory, device_id=self.__monitor_memory_uuid
         )
 
-    # TODO move to filesystem app
-    # def _monitoring_disks_task(self):
-    # """
-    #    Read disks usage
-    #    Only used to send alert when threshold reached
-    #    """
-    #    disks = self.get_filesystem_infos()
-    #    for disk in disks:
-    #        if not disk['mounted']:
-    #            continue
-    #
-    #        if disk['mountpoint'] == '/' and disk['percent'] >= self.THRESHOLD_DISK_SYSTEM:
-    #            self.alert_disk_event.send(params={
-    #                'percent': disk['percent'],
-    #                'threshold': self.THRESHOLD_DISK_SYSTEM,
-    #                'mountpoint': disk['mountpoint']
-    #            })
-    #
-    #        elif disk['mountpoint'] not in ('/', '/boot') and disk['percent'] >= self.THRESHOLD_DISK_EXTERNAL:
+    def __check_memory_reclaim(self):
+        """
+        Reclaim memory when process is idle or when device memory usage exceeds threshold
+        """
+        if not self._get_config_field("memoryreclaim"):
+            return
+
+        self.__memory_reclaim_minutes += 1
+        if self.__memory_reclaim_minutes < self.MEMORY_RECLAIM_DELAY:
+            return
+
+        reason = None
+        if psutil.virtual_memory().percent >= self.MEMORY_RECLAIM_THRESHOLD:
+            reason = "threshold"
+        elif self.memory_reclaimer.is_idle(self.MEMORY_RECLAIM_IDLE_CPU):
+            reason = "idle"
+        if not reason:
+            return
+
+        self.__memory_reclaim_minutes = 0
+        try:
+            self.memory_reclaimer.reclaim(reason)
+        except Exception:
+            self.logger.exception("Unable to reclaim memory")
+
+    def _monitoring_thermal_task(self):
+        """
+        Read cpu temperature, frequency and throttling flags
+        Send alert when throttling starts
+        """
+        if not self.get_monitoring():
+            return
+
+        # make sure monitor devices exist
+        self._configure_deferred()
+
+        status, started = self.thermal_collector.collect()
+        if started:
+            self.logger.warning("Cpu throttling started: %s", started)
+            self.alert_throttling_event.send(
+                params={
+                    "flags": started,
+                    "temperature": status["temperature"],
+                    "frequency": status["frequency"],
+                }
+            )
+
+        self.monitoring_thermal_event.send(
+            params=status, device_id=self.__monitor_thermal_uuid
+        )
+
+    # TODO move to filesystem app
+    # def _monitoring_disks_task(self):
+    # """
+    #    Read disks usage
+    #    Only used to send alert when threshold reached
+    #    """
+    #    disks = self.get_filesystem_infos()
+    #    for disk in disks:
+    #        if not disk['mounted']:
+    #            continue
+    #
+    #        if disk['mountpoint'] == '/' and disk['percent'] >= self.THRESHOLD_DISK_SYSTEM:
+    #            self.alert_disk_event.send(params={
+    #                'percent': disk['percent'],
+    #                'threshold': self.THRESHOLD_DISK_SYSTEM,
+    #                'mountpoint': disk['mountpoint']
+    #            })
+    #
+    #        elif disk['mountpoint'] not in ('/', '/boot') and disk['percent'] >= self.THRESHOLD_DISK_EXTERNAL:
     #            self.alert_disk_event.send(params={
     #                'percent': disk['percent'],
     #                'threshold': self.THRESHOLD_DISK_EXTERNAL,
@@ -587,11 +1433,16 @@ class System(CleepModule):
         Raises:
             Exception: if error occured
         """
+        # write back RAM logs to get them in archive
+        self.ram_log.flush()
+
         if not os.path.exists(self.log_file):
             # file doesn't exist, raise exception
             raise CommandError("Logs file doesn't exist")
 
         # log file exists, zip it
+        from zipfile import ZipFile, ZIP_DEFLATED  # pylint: disable=import-outside-toplevel
+
         with NamedTemporaryFile(delete=False) as file_descriptor:
             log_filename = file_descriptor.name
             self.logger.debug("Zipped log filename: %s", log_filename)
@@ -605,7 +1456,7 @@ class System(CleepModule):
 
     def get_logs(self):
         """
-        Return logs file content
+        Return logs file content. Structured (JSON) lines are converted to text lines.
 
         Returns:
             list: list of lines from log file::
@@ -617,19 +1468,186 @@ class System(CleepModule):
                 ]
 
         """
+        lines = self.__read_logs()
+
+        return [self.log_parser.to_text(line) for line in lines]
+
+    def search_logs(self, pattern=None, levels=None, limit=None):
+        """
+        Search records in logs file
+
+        Args:
+            pattern (str, optional): case insensitive string to search in records
+            levels (list, optional): list of levels to keep (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+            limit (int, optional): max number of records to return (latest ones). Defaults to 1000.
+
+        Returns:
+            list: list of matching lines (same format than get_logs)
+        """
+        self._check_parameters(
+            [
+                {"name": "pattern", "type": str, "value": pattern, "none": True},
+                {"name": "levels", "type": list, "value": levels, "none": True},
+                {
+                    "name": "limit",
+                    "type": int,
+                    "value": limit,
+                    "none": True,
+                    "validator": lambda val: val > 0,
+                },
+            ]
+        )
+
+        lines = self.__read_logs()
+
+        return self.log_parser.search(
+            lines, pattern=pattern, levels=levels, limit=limit or self.SEARCH_LOGS_LIMIT
+        )
+
+    def __read_logs(self):
+        """
+        Read logs lines from logs file and from RAM logs (not flushed yet)
+
+        Returns:
+            list: list of lines
+        """
         lines = []
         if os.path.exists(self.log_file):
-            lines = self.cleep_filesystem.read_data(self.log_file)
+            lines = list(self.cleep_filesystem.read_data(self.log_file) or [])
+        if self.ram_log.enabled:
+            lines.extend(self.ram_log.read_lines())
 
         return lines
 
+    def set_log_format(self, log_format):
+        """
+        Set logs file format
+
+        Args:
+            log_format (str): log format (text or json)
+
+        Raises:
+            CommandError: if error occured
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "log_format",
+                    "type": str,
+                    "value": log_format,
+                    "validator": lambda val: val in self.LOG_FORMATS,
+                },
+            ]
+        )
+
+        if not self._set_config_field("logformat", log_format):
+            raise CommandError("Unable to save configuration")
+
+        self.__apply_log_format(log_format)
+
+    def __get_log_handler(self):
+        """
+        Return logging handler that writes to logs file
+
+        Returns:
+            logging.FileHandler: handler or None if not found
+        """
+        log_paths = (os.path.abspath(self.log_file), self.ram_log.ram_path)
+        for handler in logging.getLogger().handlers:
+            if getattr(handler, "baseFilename", None) in log_paths:
+                return handler
+
+        return None
+
+    def __apply_log_format(self, log_format):
+        """
+        Apply log format to logs file handler
+
+        Args:
+            log_format (str): log format (text or json)
+        """
+        handler = self.__get_log_handler()
+        if not handler:
+            self.logger.info("Logs file handler not found, log format not applied")
+            return
+
+        if not isinstance(handler.formatter, JsonLogFormatter):
+            self.__text_log_formatter = handler.formatter
+        if log_format == "json":
+            handler.setFormatter(JsonLogFormatter())
+        else:
+            handler.setFormatter(self.__text_log_formatter)
+
+    def set_ram_logs(self, enable):
+        """
+        Keep logs in RAM and write them back to logs file periodically
+
+        Args:
+            enable (bool): True to keep logs in RAM
+
+        Raises:
+            CommandError: if error occured
+        """
+        self._check_parameters([{"name": "enable", "type": bool, "value": enable}])
+
+        if not self._set_config_field("ramlogs", enable):
+            raise CommandError("Unable to save configuration")
+
+        if not self.__apply_ram_logs(enable):
+            raise CommandError("Unable to keep logs in RAM")
+
+    def __apply_ram_logs(self, enable):
+        """
+        Redirect logs file handler to RAM logs or back to logs file
+
+        Args:
+            enable (bool): True to keep logs in RAM
+
+        Returns:
+            bool: True if applied
+        """
+        if not enable:
+            self.ram_log.disable()
+            return True
+
+        handler = self.__get_log_handler()
+        if not handler:
+            self.logger.info("Logs file handler not found, logs are not kept in RAM")
+            return False
+
+        try:
+            self.__ram_log_minutes = 0
+            return self.ram_log.enable(handler)
+        except Exception:
+            self.logger.exception("Unable to keep logs in RAM")
+            return False
+
+    def __check_ram_logs(self):
+        """
+        Flush RAM logs when flush delay is elapsed or RAM logs are too big
+        """
+        if not self.ram_log.enabled:
+            return
+
+        self.__ram_log_minutes += 1
+        if self.__ram_log_minutes < self.RAM_LOG_FLUSH_DELAY and not self.ram_log.need_flush():
+            return
+
+        self.__ram_log_minutes = 0
+        try:
+            flushed = self.ram_log.flush()
+            self.logger.debug("%s bytes of RAM logs flushed", flushed)
+        except Exception:
+            self.logger.exception("Unable to flush RAM logs")
+
     def clear_logs(self):
         """
-        Clear logs file
+        Clear logs file (and RAM logs)
 
         Returns:
             bool: True if operation succeed, False otherwise
         """
+        self.ram_log.clear()
         if os.path.exists(self.log_file):
             return self.cleep_filesystem.write_data(self.log_file, "")
 
@@ -671,25 +1689,13 @@ class System(CleepModule):
             ]
         )
 
-        if debug:
-            self.bootstrap["internal_bus"].logger.setLevel(logging.DEBUG)
-            self.bootstrap["events_broker"].logger.setLevel(logging.DEBUG)
-            self.bootstrap["cleep_filesystem"].logger.setLevel(logging.DEBUG)
-            self.bootstrap["formatters_broker"].logger.setLevel(logging.DEBUG)
-            self.bootstrap["crash_report"].logger.setLevel(logging.DEBUG)
-            self.bootstrap["critical_resources"].logger.setLevel(logging.DEBUG)
-            self.bootstrap["drivers"].logger.setLevel(logging.DEBUG)
+        level = logging.DEBUG if debug else logging.INFO
+        for component in self.CORE_DEBUG_COMPONENTS:
+            self.bootstrap[component].logger.setLevel(level)
 
+        if debug:
             self.cleep_conf.enable_core_debug()
         else:
-            self.bootstrap["internal_bus"].logger.setLevel(logging.INFO)
-            self.bootstrap["events_broker"].logger.setLevel(logging.INFO)
-            self.bootstrap["cleep_filesystem"].logger.setLevel(logging.INFO)
-            self.bootstrap["formatters_broker"].logger.setLevel(logging.INFO)
-            self.bootstrap["crash_report"].logger.setLevel(logging.INFO)
-            self.bootstrap["critical_resources"].logger.setLevel(logging.INFO)
-            self.bootstrap["drivers"].logger.setLevel(logging.INFO)
-
             self.cleep_conf.disable_core_debug()
 
     def set_module_debug(self, module_name, debug):
@@ -714,6 +1720,20 @@ class System(CleepModule):
             self.cleep_conf.disable_module_debug(module_name)
 
         # set debug on module
+        if not self.__set_module_debug_level(module_name, debug):
+            raise CommandError("Update debug failed")
+
+    def __set_module_debug_level(self, module_name, debug):
+        """
+        Set module logger level at runtime (configuration is not updated)
+
+        Args:
+            module_name (string): module name
+            debug (bool): enable debug
+
+        Returns:
+            bool: True if module debug level updated
+        """
         if module_name == "rpc":
             # specific command for rpcserver
             resp = self.send_command("set_rpc_debug", "inventory", {"debug": debug})
@@ -723,7 +1743,134 @@ class System(CleepModule):
             self.logger.error(
                 "Unable to set debug on module %s: %s", module_name, resp.message
             )
-            raise CommandError("Update debug failed")
+            return False
+
+        return True
+
+    def start_debug_session(self, targets, duration=60):
+        """
+        Start time-boxed debug session on specified core components and applications.
+        Debug levels are only applied at runtime (Cleep configuration is not modified) and
+        are automatically reverted when session expires.
+
+        Args:
+            targets (list): list of core components (see CORE_DEBUG_COMPONENTS) and application names
+            duration (int, optional): session duration in minutes (1..1440). Defaults to 60.
+
+        Returns:
+            dict: debug session::
+
+                {
+                    targets (list): list of debugged targets,
+                    failed (list): list of targets debug couldn't be enabled on,
+                    expire (int): session expiration timestamp,
+                }
+
+        Raises:
+            CommandError: if debug couldn't be enabled on any target
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "targets",
+                    "type": list,
+                    "value": targets,
+                    "validator": lambda val: len(val) > 0
+                    and all(isinstance(target, str) and target for target in val),
+                },
+                {
+                    "name": "duration",
+                    "type": int,
+                    "value": duration,
+                    "validator": lambda val: 1 <= val <= self.DEBUG_SESSION_MAX_DURATION,
+                },
+            ]
+        )
+
+        # only one session at a time
+        self.stop_debug_session()
+
+        core_levels = {}
+        apps = []
+        failed = []
+        for target in set(targets):
+            if target in self.CORE_DEBUG_COMPONENTS:
+                target_logger = self.bootstrap[target].logger
+                core_levels[target] = target_logger.level
+                target_logger.setLevel(logging.DEBUG)
+            elif self.__set_module_debug_level(target, True):
+                apps.append(target)
+            else:
+                failed.append(target)
+
+        if not core_levels and not apps:
+            raise CommandError("Unable to enable debug on specified targets")
+
+        self.__debug_session = {
+            "core": core_levels,
+            "apps": apps,
+            "failed": failed,
+            "expire": int(time.time() + duration * 60),
+        }
+        self.logger.info(
+            "Debug session started for %s minutes on %s",
+            duration,
+            sorted(list(core_levels.keys()) + apps),
+        )
+
+        return self.get_debug_session()
+
+    def stop_debug_session(self):
+        """
+        Stop running debug session, restoring previous debug levels
+
+        Returns:
+            bool: True if a session was running
+        """
+        session = self.__debug_session
+        if not session:
+            return False
+        self.__debug_session = None
+
+        for component, level in session["core"].items():
+            self.bootstrap[component].logger.setLevel(level)
+        for app in session["apps"]:
+            self.__set_module_debug_level(app, self.cleep_conf.is_module_debugged(app))
+        self.logger.info("Debug session stopped")
+
+        return True
+
+    def get_debug_session(self):
+        """
+        Return running debug session
+
+        Returns:
+            dict: debug session or None if no session running::
+
+                {
+                    targets (list): list of debugged targets,
+                    failed (list): list of targets debug couldn't be enabled on,
+                    expire (int): session expiration timestamp,
+                }
+
+        """
+        session = self.__debug_session
+        if not session:
+            return None
+
+        return {
+            "targets": sorted(list(session["core"].keys()) + session["apps"]),
+            "failed": sorted(session["failed"]),
+            "expire": session["expire"],
+        }
+
+    def __check_debug_session(self):
+        """
+        Stop debug session if expired
+        """
+        if self.__debug_session and time.time() >= self.__debug_session["expire"]:
+            self.logger.info("Debug session expired")
+            self.stop_debug_session()
 
     def _set_not_renderable_events(self):
         """
@@ -841,74 +1988,334 @@ class System(CleepModule):
         # configure crash report
         self._configure_crash_report(enable)
 
+    def __full_backup(self):
+        """
+        Perform full Cleep configuration backup using core backup (imported on first use)
+
+        Returns:
+            bool: True if backup successful
+        """
+        if not self.__core_backup:
+            from cleep.libs.internals.cleepbackup import CleepBackup  # pylint: disable=import-outside-toplevel
+
+            self.__core_backup = CleepBackup(self.cleep_filesystem, self.crash_report)
+
+        return self.__core_backup.backup()
+
     def backup_cleep_config(self):
         """
-        Backup Cleep configuration files on filesystem
+        Backup Cleep configuration files on filesystem.
+        Backup is performed by backup worker, concurrent requests are coalesced.
 
         Returns:
             bool: True if backup successful
         """
-        self.logger.debug("Backup Cleep configuration")
-        return self.cleep_backup.backup()
+        return self.backup_worker.flush(self.BACKUP_FLUSH_TIMEOUT)
 
-    def set_cleep_backup_delay(self, delay):
+    def _run_backup(self):
         """
-        Set Cleep backup delay
+        Backup Cleep configuration files (executed by backup worker)
 
-        Args:
-            delay (int): delay in minutes (5..60)
+        Returns:
+            bool: True if backup successful
         """
-        self._check_parameters(
-            [
-                {
-                    "name": "delay",
-                    "type": int,
-                    "value": delay,
-                    "validator": lambda val: 5 <= val <= 120,
-                }
-            ]
+        self.logger.debug("Backup Cleep configuration")
+        throttled = self.io_throttle.enabled
+        if throttled:
+            self.io_throttle.set_idle_priority(True)
+        self.__set_led_pattern("backup", True)
+        start = time.time()
+
+        try:
+            result = self.cleep_backup.backup()
+
+            # record configuration snapshot
+            if result:
+                try:
+                    manifest = self.cleep_backup.get_manifest()
+                    if manifest:
+                        self.snapshot_store.record(self.CLEEP_CONFIG_PATH, manifest)
+                except Exception:
+                    self.logger.exception("Error recording configuration snapshot")
+        finally:
+            self.__set_led_pattern("backup", False)
+            if throttled:
+                self.io_throttle.set_idle_priority(False)
+
+        stats = self.cleep_backup.get_last_backup() or {}
+        self.__backup_metrics.append(
+            {
+                "timestamp": int(start),
+                "success": result,
+                "duration": round(time.time() - start, 3),
+                "byteswritten": stats.get("byteswritten", 0),
+                "throttled": throttled,
+                "deferred": self.backup_worker.deferred,
+            }
         )
+        self.backup_worker.deferred = 0
 
-        if self._set_config_field("cleepbackupdelay", delay):
-            self.cleep_backup_delay = delay
+        return result
 
-    def _install_driver_terminated(self, driver_type, driver_name, success, message):
+    def get_backup_metrics(self):
         """
-        Callback when driver is installed
+        Return metrics of latest backups
 
-        Args:
-            driver_type (string): driver type
-            driver_name (string): driver name
-            success (bool): True if install was successful, False otherwise
-            message (string): error message
-        """
-        data = {
-            "drivertype": driver_type,
-            "drivername": driver_name,
-            "installing": False,
-            "success": success,
-            "message": message,
-        }
-        self.logger.debug("Driver install terminated: %s", data)
+        Returns:
+            list: list of backup metrics from oldest to latest::
 
-        # send event
-        self.driver_install_event.send(data)
+                [
+                    {
+                        timestamp (int): backup timestamp,
+                        success (bool): True if backup succeed,
+                        duration (float): backup duration in seconds,
+                        byteswritten (int): number of bytes written,
+                        throttled (bool): True if backup was throttled,
+                        deferred (int): number of times backup was deferred because device was busy,
+                    },
+                    ...
+                ]
 
-        # reboot device if install succeed and required
-        driver = success and self.drivers.get_driver(driver_type, driver_name)
-        if driver and driver.require_reboot():
-            self.reboot_device()
+        """
+        return list(self.__backup_metrics)
 
-    def install_driver(self, driver_type, driver_name, force=False):
+    def set_backup_throttling(self, enable):
         """
-        Install specified driver.
-        If install succeed, device will reboot after a delay
+        Enable or disable backup throttling. When enabled backup copies are rate-limited, performed
+        with idle I/O priority and scheduled backups are deferred while device is busy.
 
         Args:
-            driver_type (string): driver type
-            driver_name (string): driver name
+            enable (bool): True to enable backup throttling
+
+        Raises:
+            CommandError: if error occured
+        """
+        self._check_parameters([{"name": "enable", "type": bool, "value": enable}])
+
+        if not self._set_config_field("backupthrottling", enable):
+            raise CommandError("Unable to save configuration")
+        self.io_throttle.enabled = enable
+
+    def list_config_snapshots(self):
+        """
+        Return list of Cleep configuration snapshots
+
+        Returns:
+            list: list of snapshots sorted from latest to oldest::
+
+                [
+                    {
+                        id (str): snapshot id,
+                        timestamp (int): snapshot timestamp,
+                        files (int): number of files,
+                        size (int): snapshot size in bytes,
+                    },
+                    ...
+                ]
+
+        """
+        return self.snapshot_store.list()
+
+    def restore_config_snapshot(self, snapshot_id):
+        """
+        Restore Cleep configuration snapshot. Only files that differ from snapshot are restored.
+        Cleep must be restarted to apply restored configuration.
+
+        Args:
+            snapshot_id (str): snapshot id
+
+        Returns:
+            dict: restore statistics::
+
+                {
+                    restored (int): number of restored files,
+                    deleted (int): number of deleted files,
+                    unchanged (int): number of unchanged files,
+                    failed (int): number of files that couldn't be restored,
+                    corrupted (int): number of missing or corrupted snapshot files,
+                }
+
+        Raises:
+            InvalidParameter: if snapshot does not exist
+            CommandError: if snapshot is corrupted or restore failed
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "snapshot_id",
+                    "type": str,
+                    "value": snapshot_id,
+                    "validator": lambda val: val.isdigit(),
+                },
+            ]
+        )
+
+        tracked = list((self.cleep_backup.get_manifest() or {}).keys())
+        stats = self.snapshot_store.restore(snapshot_id, self.CLEEP_CONFIG_PATH, tracked)
+        if stats is None:
+            raise InvalidParameter(f'Snapshot "{snapshot_id}" does not exist')
+        if stats["corrupted"]:
+            raise CommandError("Configuration snapshot is corrupted, nothing restored")
+        self.logger.info('Configuration snapshot "%s" restored: %s', snapshot_id, stats)
+
+        if stats["restored"] or stats["deleted"]:
+            self.__need_restart = True
+            self.cleep_need_restart_event.send()
+        if stats["failed"]:
+            raise CommandError("Configuration snapshot partially restored")
+
+        return stats
+
+    def set_snapshot_retention(self, retention):
+        """
+        Set number of configuration snapshots to keep
+
+        Args:
+            retention (int): number of snapshots to keep (1..100)
+
+        Raises:
+            CommandError: if error occured
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "retention",
+                    "type": int,
+                    "value": retention,
+                    "validator": lambda val: 1 <= val <= 100,
+                }
+            ]
+        )
+
+        if not self._set_config_field("snapshotretention", retention):
+            raise CommandError("Unable to save configuration")
+        self.snapshot_store.retention = retention
+
+    def get_last_backup(self):
+        """
+        Return last Cleep configuration backup statistics
+
+        Returns:
+            dict: last backup statistics or None if no backup performed yet::
+
+                {
+                    timestamp (int): backup timestamp,
+                    success (bool): True if backup succeed,
+                    full (bool): True if full backup was performed,
+                    files (int): number of configuration files,
+                    copied (int): number of copied files,
+                    deleted (int): number of deleted files,
+                    byteswritten (int): number of bytes copied,
+                    bytesskipped (int): number of bytes not copied because unchanged,
+                    duration (float): backup duration in seconds,
+                }
+
+        """
+        return self.cleep_backup.get_last_backup()
+
+    def set_cleep_backup_delay(self, delay):
+        """
+        Set Cleep backup delay
+
+        Args:
+            delay (int): delay in minutes (5..120)
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "delay",
+                    "type": int,
+                    "value": delay,
+                    "validator": lambda val: 5 <= val <= 120,
+                }
+            ]
+        )
+
+        if self._set_config_field("cleepbackupdelay", delay):
+            self.cleep_backup_delay = delay
+            self.cleep_backup_offset = self.__get_backup_offset(delay)
+
+    def __get_backup_offset(self, delay):
+        """
+        Return backup offset to avoid all devices backuping at the same minute. Offset is derived from
+        device identifier so it is the same on each boot.
+
+        Args:
+            delay (int): backup delay in minutes
+
+        Returns:
+            int: backup offset in minutes
+        """
+        if not delay:
+            return 0
+
+        device_id = "".join(self.cleep_filesystem.read_data(self.DEVICE_ID_PATH) or []).strip()
+        device_id = device_id or socket.gethostname()
+        return int(hashlib.sha256(device_id.encode("utf-8")).hexdigest(), 16) % delay
+
+    def _install_driver_terminated(self, driver_type, driver_name, success, message):
+        """
+        Callback when driver is installed
+
+        Args:
+            driver_type (string): driver type
+            driver_name (string): driver name
+            success (bool): True if install was successful, False otherwise
+            message (string): error message
+        """
+        data = {
+            "drivertype": driver_type,
+            "drivername": driver_name,
+            "installing": False,
+            "success": success,
+            "message": message,
+        }
+        self.logger.debug("Driver install terminated: %s", data)
+
+        # send event
+        self.driver_install_event.send(data)
+
+        # reboot device if install succeed and required, once all driver jobs are terminated
+        driver = success and self.drivers.get_driver(driver_type, driver_name)
+        if driver and driver.require_reboot():
+            self.__request_driver_reboot()
+        self.__check_driver_reboot()
+
+    def __request_driver_reboot(self):
+        """
+        Request reboot after driver operation. Reboot is coalesced: it is only flagged (needreboot) while
+        driver jobs are pending, and performed once all jobs are terminated or deadline is reached.
+        """
+        self._set_config_field("needreboot", True)
+        self.__set_led_pattern("needreboot", True)
+        if self.__driver_reboot_deadline is None:
+            self.__driver_reboot_deadline = time.time() + self.DRIVER_REBOOT_DEADLINE
+
+    def __check_driver_reboot(self):
+        """
+        Reboot device if driver reboot was requested and driver jobs are terminated or deadline is reached
+        """
+        if self.__driver_reboot_deadline is None:
+            return
+
+        if self.driver_jobs.is_idle() or time.time() >= self.__driver_reboot_deadline:
+            self.logger.info("Rebooting device to apply drivers changes")
+            self.__driver_reboot_deadline = None
+            self.reboot_device()
+
+    def install_driver(self, driver_type, driver_name, force=False):
+        """
+        Install specified driver.
+        If install succeed, device will reboot after a delay
+
+        Args:
+            driver_type (string): driver type
+            driver_name (string): driver name
             force (bool, optional): force install (repair). Defaults to False.
 
+        Returns:
+            dict: driver job (see get_driver_jobs). Pending job is returned if driver is already being installed
+
         Raises:
             MissingParameter: if a parameter is missing
             InvalidParameter: if driver was not found
@@ -930,18 +2337,25 @@ class System(CleepModule):
         if not force and driver.is_installed():
             raise CommandInfo("Driver is already installed")
 
-        # launch installation (non blocking) and send event
-        driver.install(self._install_driver_terminated, logger=self.logger)
-        self.driver_install_event.send(
-            {
-                "drivertype": driver_type,
-                "drivername": driver_name,
-                "installing": True,
-                "success": None,
-                "message": None,
-            }
+        # queue installation (non blocking), event is sent before driver process is launched
+        job, _ = self.driver_jobs.submit(
+            "install",
+            driver_type,
+            driver_name,
+            lambda end_callback: self.__launch_driver_install(driver, driver_type, driver_name, force, end_callback),
+            on_created=lambda _job: self.driver_install_event.send(
+                {
+                    "drivertype": driver_type,
+                    "drivername": driver_name,
+                    "installing": True,
+                    "success": None,
+                    "message": None,
+                }
+            ),
         )
 
+        return job
+
     def _uninstall_driver_terminated(self, driver_type, driver_name, success, message):
         """
         Callback when driver is uninstalled
@@ -964,10 +2378,11 @@ class System(CleepModule):
         # send event
         self.driver_uninstall_event.send(data)
 
-        # reboot device if uninstall succeed
+        # reboot device if uninstall succeed, once all driver jobs are terminated
         driver = success and self.drivers.get_driver(driver_type, driver_name)
         if driver and driver.require_reboot():
-            self.reboot_device()
+            self.__request_driver_reboot()
+        self.__check_driver_reboot()
 
     def uninstall_driver(self, driver_type, driver_name):
         """
@@ -978,6 +2393,9 @@ class System(CleepModule):
             driver_type (string): driver type
             driver_name (string): driver name
 
+        Returns:
+            dict: driver job (see get_driver_jobs). Pending job is returned if driver is already being uninstalled
+
         Raises:
             MissingParameter: if a parameter is missing
             InvalidParameter: if driver was not found
@@ -998,19 +2416,226 @@ class System(CleepModule):
         if not driver.is_installed():
             raise CommandInfo("Driver is not installed")
 
-        # launch uninstallation (non blocking) and send event
-        driver.uninstall(self._uninstall_driver_terminated, logger=self.logger)
-        self.driver_uninstall_event.send(
+        # queue uninstallation (non blocking), event is sent before driver process is launched
+        job, _ = self.driver_jobs.submit(
+            "uninstall",
+            driver_type,
+            driver_name,
+            lambda end_callback: driver.uninstall(end_callback, logger=self.logger),
+            on_created=lambda _job: self.driver_uninstall_event.send(
+                {
+                    "drivertype": driver_type,
+                    "drivername": driver_name,
+                    "uninstalling": True,
+                    "success": None,
+                    "message": None,
+                }
+            ),
+        )
+
+        return job
+
+    def get_driver_jobs(self):
+        """
+        Return driver jobs
+
+        Returns:
+            list: pending jobs followed by latest terminated jobs::
+
+                [
+                    {
+                        id (str): job id,
+                        action (str): install or uninstall,
+                        drivertype (str): driver type,
+                        drivername (str): driver name,
+                        conflict (str): conflict key (None for exclusive job),
+                        status (str): queued, running, done or failed,
+                        progress (int): estimated progress percentage,
+                        start (float): job start timestamp (None if not started),
+                        end (float): job end timestamp (None if not terminated),
+                        success (bool): True if job succeed (None if not terminated),
+                        message (str): driver process message,
+                    },
+                    ...
+                ]
+
+        """
+        return self.driver_jobs.get_jobs()
+
+    def __launch_driver_install(self, driver, driver_type, driver_name, force, end_callback):
+        """
+        Launch driver install process. Packages cached during previous install are put back in apt
+        archives before repairing a driver, so apt does not have to download them again.
+
+        Apt archives are snapshotted when the job is launched and compared when its driver process ends,
+        before the queue starts next job. Install jobs are exclusive (see DriverJobQueue), so packages
+        downloaded meanwhile belong to this job.
+
+        Args:
+            driver (Driver): driver instance
+            driver_type (string): driver type
+            driver_name (string): driver name
+            force (bool): True if driver is repaired
+            end_callback (function): install end callback
+        """
+        if force:
+            self.__restore_driver_artifacts(driver_type, driver_name)
+        archives = self.__get_apt_archives()
+
+        def install_end(end_type, end_name, success, message):
+            # keep downloaded packages to repair driver offline
+            try:
+                self.__store_driver_artifacts(driver_type, driver_name, archives, success)
+            except Exception:
+                self.logger.exception("Unable to cache driver %s/%s artifacts", driver_type, driver_name)
+            end_callback(end_type, end_name, success, message)
+
+        driver.install(install_end, logger=self.logger)
+
+    def __get_apt_archives(self):
+        """
+        Return packages available in apt archives
+
+        Returns:
+            set: packages filenames
+        """
+        if not os.path.exists(self.APT_ARCHIVES_PATH):
+            return set()
+
+        return {filename for filename in os.listdir(self.APT_ARCHIVES_PATH) if filename.endswith(".deb")}
+
+    def __store_driver_artifacts(self, driver_type, driver_name, archives, success):
+        """
+        Cache packages downloaded during driver install
+
+        Args:
+            driver_type (string): driver type
+            driver_name (string): driver name
+            archives (set): packages available in apt archives before install
+            success (bool): True if install was successful
+        """
+        if not success:
+            return
+
+        for filename in sorted(self.__get_apt_archives() - archives):
+            key = f"{driver_type}/{driver_name}/{filename}"
+            if not self.artifact_cache.add(key, os.path.join(self.APT_ARCHIVES_PATH, filename)):
+                self.logger.debug('Driver artifact "%s" not cached', key)
+
+    def __restore_driver_artifacts(self, driver_type, driver_name):
+        """
+        Copy cached packages of specified driver to apt archives
+
+        Args:
+            driver_type (string): driver type
+            driver_name (string): driver name
+        """
+        keys = self.artifact_cache.get_keys(f"{driver_type}/{driver_name}/")
+        if not keys:
+            self.artifact_cache.record_miss()
+        for key in keys:
+            target = os.path.join(self.APT_ARCHIVES_PATH, os.path.basename(key))
+            if os.path.exists(target):
+                continue
+            cached = self.artifact_cache.get(key)
+            if cached and not self.cleep_filesystem.copy(cached, target):
+                self.logger.warning('Unable to restore driver artifact "%s"', key)
+
+    def get_driver_artifacts_cache(self):
+        """
+        Return drivers artifacts cache statistics
+
+        Returns:
+            dict: cache statistics::
+
+                {
+                    entries (int): number of cached artifacts,
+                    size (int): space used in bytes,
+                    maxsize (int): cache max size in bytes,
+                    hits (int): number of cache hits,
+                    misses (int): number of cache misses,
+                }
+
+        """
+        return self.artifact_cache.get_stats()
+
+    def clear_driver_artifacts_cache(self):
+        """
+        Remove all cached drivers artifacts
+
+        Raises:
+            CommandError: if error occured
+        """
+        if not self.artifact_cache.clear():
+            raise CommandError("Unable to clear drivers cache")
+
+    def get_drivers_status(self):
+        """
+        Return status of all drivers. Status is served from cache, refreshed after driver jobs
+        and when driver related system files change.
+
+        Returns:
+            dict: drivers status::
+
+                {
+                    drivers (list): [
+                        {
+                            drivertype (str): driver type,
+                            drivername (str): driver name,
+                            installed (bool): True if driver is installed,
+                            version (str): driver version (None if not available),
+                            requirereboot (bool): True if driver requires reboot,
+                            processing (int): 0 if no job running, 1 if installing, 2 if uninstalling,
+                        },
+                        ...
+                    ],
+                    timestamp (int): status timestamp,
+                }
+
+        """
+        status = self.drivers_status.get()
+        processing = {
+            (job["drivertype"], job["drivername"]): 1 if job["action"] == "install" else 2
+            for job in self.driver_jobs.get_jobs()
+            if job["status"] in ("queued", "running")
+        }
+        for driver in status["drivers"]:
+            driver["processing"] = processing.get((driver["drivertype"], driver["drivername"]), 0)
+
+        return status
+
+    def __on_driver_job_progress(self, job):
+        """
+        Driver job progress callback
+
+        Args:
+            job (dict): driver job
+        """
+        self.driver_progress_event.send(
             {
-                "drivertype": driver_type,
-                "drivername": driver_name,
-                "uninstalling": True,
-                "success": None,
-                "message": None,
+                "jobid": job["id"],
+                "action": job["action"],
+                "drivertype": job["drivertype"],
+                "drivername": job["drivername"],
+                "status": job["status"],
+                "progress": job["progress"],
             }
         )
 
-        return True
+    def __on_driver_job_terminated(self, job, success, message):
+        """
+        Driver job terminated callback
+
+        Args:
+            job (dict): driver job
+            success (bool): True if job succeed
+            message (str): driver process message
+        """
+        self.drivers_status.invalidate()
+        if job["action"] == "install":
+            self._install_driver_terminated(job["drivertype"], job["drivername"], success, message)
+        else:
+            self._uninstall_driver_terminated(job["drivertype"], job["drivername"], success, message)
 
     def __apply_tweaks(self):
         """
@@ -1028,6 +2653,48 @@ class System(CleepModule):
         except Exception:
             self.logger.exception("Error applying activity led tweak")
 
+        cpu_profile = self._get_config_field("cpuprofile", None)
+        if cpu_profile:
+            try:
+                self.cpu_freq.apply(
+                    cpu_profile,
+                    self._get_config_field("cpuminfreq", None),
+                    self._get_config_field("cpumaxfreq", None),
+                )
+            except Exception:
+                self.logger.exception("Error applying cpu profile tweak")
+
+        vm_profile = self._get_config_field("vmprofile", None)
+        if vm_profile:
+            try:
+                self.vm_tuning.apply_profile(vm_profile)
+            except Exception:
+                self.logger.exception("Error applying vm profile tweak")
+
+        if self._get_config_field("zram", False):
+            try:
+                if not self.vm_tuning.enable_zram(self.hardware_infos.get()["memory"]["total"]):
+                    self.logger.error("Unable to enable zram swap")
+            except Exception:
+                self.logger.exception("Error applying zram tweak")
+
+        process_priority = self._get_config_field("processpriority", None)
+        if process_priority:
+            try:
+                self.process_priority.apply(process_priority)
+            except Exception:
+                self.logger.exception("Error applying process priority tweak")
+
+    def get_hardware_infos(self):
+        """
+        Return hardware infos. Hardware is probed once at startup, only storage devices are refreshed
+        when they are plugged or unplugged
+
+        Returns:
+            dict: hardware infos (see HardwareInfos.get)
+        """
+        return self.hardware_infos.get()
+
     def get_led_path(self, paths):
         """
         Return first existing path in paths
@@ -1040,11 +2707,20 @@ class System(CleepModule):
         Returns:
             str: found path or None if no path found
         """
-        for path in paths:
-            if os.path.exists(path):
-                return path
+        return self.leds.find_path(paths)
 
-        return None
+    def __get_led_values(self):
+        """
+        Return led brightness values according to board
+
+        Returns:
+            tuple: on value (str) and off value (str)
+        """
+        raspi = self.hardware_infos.get_board()
+        off_value = "0" if raspi.get("model", "").lower().find("zero") else "1"
+        on_value = "1" if raspi.get("model", "").lower().find("zero") else "0"
+
+        return on_value, off_value
 
     def tweak_power_led(self, enable):
         """
@@ -1056,20 +2732,14 @@ class System(CleepModule):
         Args:
             enable (bool): True to turn on led
         """
-        led_paths = ["/sys/class/leds/led1/brightness", "/sys/class/leds/PWR/brightness"]
-        led_path = self.get_led_path(led_paths)
-        if not led_path:
+        if not self.leds.has_led("power"):
             self.logger.info("Power led not found on this device")
             return
 
-        raspi = Tools.raspberry_pi_infos()
-        off_value = "0" if raspi["model"].lower().find("zero") else "1"
-        on_value = "1" if raspi["model"].lower().find("zero") else "0"
-        echo_value = on_value if enable else off_value
-        self.logger.debug("Tweaking power led with value %s", echo_value)
-        console = Console()
-        resp = console.command(f"echo {echo_value} > {led_path}")
-        if resp["returncode"] != 0:
+        on_value, off_value = self.__get_led_values()
+        value = on_value if enable else off_value
+        self.logger.debug("Tweaking power led with value %s", value)
+        if not self.leds.write("power", "brightness", value):
             raise CommandError("Error tweaking power led")
 
         # store led status
@@ -1085,31 +2755,477 @@ class System(CleepModule):
         Args:
             enable (bool): True to turn on led
         """
-        led_paths = ["/sys/class/leds/led0/brightness", "/sys/class/leds/ACT/brightness"]
-        led_path = self.get_led_path(led_paths)
-        if not led_path:
+        if not self.leds.has_led("activity"):
             self.logger.info("Activity led not found on this device")
             return
 
-        raspi = Tools.raspberry_pi_infos()
-        off_value = "0" if raspi["model"].lower().find("zero") else "1"
-        on_value = "1" if raspi["model"].lower().find("zero") else "0"
-        echo_value = on_value if enable else off_value
-        self.logger.debug("Tweaking activity led with value %s", echo_value)
-        console = Console()
+        # store led status (led is restored with it once led patterns are terminated)
+        self._set_config_field("enableactivityled", enable)
+        if self.led_patterns.get_active_patterns() and self.led_patterns.enabled:
+            self.logger.debug("Activity led is playing pattern, tweak will be applied after")
+            return
+
+        self.__apply_activity_led(enable)
+
+    def __apply_activity_led(self, enable):
+        """
+        Apply activity led state
+
+        Args:
+            enable (bool): True to turn on led
+
+        Raises:
+            CommandError: if led couldn't be updated
+        """
+        on_value, off_value = self.__get_led_values()
+        value = on_value if enable else off_value
+        self.logger.debug("Tweaking activity led with value %s", value)
 
         # update led status
-        resp = console.command(f"echo {echo_value} > {led_path}")
-        if resp["returncode"] != 0:
+        if not self.leds.write("activity", "brightness", value):
             raise CommandError("Error tweaking activity led")
 
         # restore default trigger mode to mmc0 activity if necessary
-        led_paths = ["/sys/class/leds/led0/trigger", "/sys/class/leds/ACT/trigger"]
-        led_path = self.get_led_path(led_paths)
-        if enable and led_path:
-            resp = console.command(f"echo mmc0 > {led_path}")
-            if resp["returncode"] != 0:
+        if enable and self.leds.get_path("activity", "trigger"):
+            if not self.leds.write("activity", "trigger", "mmc0"):
                 raise CommandError("Error tweaking activity led trigger mode")
 
-        # store led status
-        self._set_config_field("enableactivityled", enable)
+    def __restore_activity_led(self):
+        """
+        Restore activity led state after led patterns (led pattern engine callback)
+        """
+        self.__apply_activity_led(self._get_config_field("enableactivityled"))
+
+    def __set_led_pattern(self, pattern, active):
+        """
+        Activate or deactivate led pattern on activity led
+
+        Args:
+            pattern (str): pattern name
+            active (bool): True to activate pattern
+        """
+        try:
+            if active:
+                self.led_patterns.on_value, self.led_patterns.off_value = self.__get_led_values()
+            self.led_patterns.set_pattern(pattern, active)
+        except Exception:
+            self.logger.exception('Unable to update led pattern "%s"', pattern)
+
+    def tweak_cpu_profile(self, profile, min_freq=None, max_freq=None):
+        """
+        Tweak cpu performance profile. Profile is applied at startup
+
+        Args:
+            profile (str): cpu profile (performance, ondemand, powersave or custom). None restores cpu
+                           state found before first profile was applied
+            min_freq (int, optional): min cpu frequency in MHz (custom profile only)
+            max_freq (int, optional): max cpu frequency in MHz (custom profile only)
+
+        Raises:
+            CommandError: if error occured
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "profile",
+                    "type": str,
+                    "value": profile,
+                    "none": True,
+                    "validator": lambda val: val in CpuFreq.PROFILES,
+                },
+                {
+                    "name": "min_freq",
+                    "type": int,
+                    "value": min_freq,
+                    "none": True,
+                    "validator": lambda val: val > 0,
+                },
+                {
+                    "name": "max_freq",
+                    "type": int,
+                    "value": max_freq,
+                    "none": True,
+                    "validator": lambda val: val > 0,
+                },
+            ]
+        )
+        if profile != "custom":
+            min_freq = max_freq = None
+
+        try:
+            if profile is None:
+                self.cpu_freq.restore()
+            else:
+                self.cpu_freq.apply(profile, min_freq, max_freq)
+        except ValueError as error:
+            raise CommandError(str(error)) from error
+        except OSError as error:
+            self.logger.error("Unable to apply cpu profile: %s", error)
+            raise CommandError("Error tweaking cpu profile") from error
+
+        # store cpu profile
+        if not (
+            self._set_config_field("cpuprofile", profile)
+            and self._set_config_field("cpuminfreq", min_freq)
+            and self._set_config_field("cpumaxfreq", max_freq)
+        ):
+            raise CommandError("Unable to save configuration")
+
+    def get_cpu_profile(self):
+        """
+        Return cpu performance profile
+
+        Returns:
+            dict: cpu profile::
+
+                {
+                    profile (str): configured profile (None if system default is used),
+                    minfreq (int): configured min frequency in MHz (custom profile only),
+                    maxfreq (int): configured max frequency in MHz (custom profile only),
+                    status (dict): cpufreq status (see CpuFreq.get_status),
+                }
+
+        """
+        return {
+            "profile": self._get_config_field("cpuprofile", None),
+            "minfreq": self._get_config_field("cpuminfreq", None),
+            "maxfreq": self._get_config_field("cpumaxfreq", None),
+            "status": self.cpu_freq.get_status(),
+        }
+
+    def tweak_process_priority(self, nice=None, io_class=None, io_level=None, cpus=None, thread_groups=None):
+        """
+        Tweak Cleep process priority (nice, I/O priority) and cpu affinity, and optionally pin thread groups
+        on dedicated cpus. Settings are applied at startup. Without parameters, kernel defaults are restored.
+
+        Args:
+            nice (int, optional): cpu priority (-20 highest, 19 lowest)
+            io_class (str, optional): I/O class (none, realtime, besteffort, idle)
+            io_level (int, optional): I/O level for realtime and besteffort classes (0 highest, 7 lowest)
+            cpus (list, optional): process cpus (all cpus if not specified)
+            thread_groups (dict, optional): cpus by thread group (see ProcessPriority.THREAD_GROUPS)::
+
+                {
+                    rpc (list): cpus,
+                    ...
+                }
+
+        Raises:
+            CommandError: if error occured
+        """
+        self._check_parameters(
+            [
+                {"name": "nice", "type": int, "value": nice, "none": True},
+                {"name": "io_class", "type": str, "value": io_class, "none": True},
+                {"name": "io_level", "type": int, "value": io_level, "none": True},
+                {"name": "cpus", "type": list, "value": cpus, "none": True},
+                {"name": "thread_groups", "type": dict, "value": thread_groups, "none": True},
+            ]
+        )
+
+        settings = {
+            "nice": nice,
+            "ioclass": io_class,
+            "iolevel": io_level,
+            "cpus": cpus,
+            "threadgroups": thread_groups or {},
+        }
+        customized = any(value for value in settings.values())
+        try:
+            self.process_priority.apply(settings if customized else self.process_priority.get_default_settings())
+        except ValueError as error:
+            raise CommandError(str(error)) from error
+
+        if not self._set_config_field("processpriority", settings if customized else None):
+            raise CommandError("Unable to save configuration")
+
+    def get_process_priority(self):
+        """
+        Return Cleep process priority and cpu affinity
+
+        Returns:
+            dict: process priority::
+
+                {
+                    configured (bool): True if process priority is customized,
+                    status (dict): process priority status (see ProcessPriority.get_status),
+                }
+
+        """
+        return {
+            "configured": bool(self._get_config_field("processpriority", None)),
+            "status": self.process_priority.get_status(),
+        }
+
+    def tweak_memory_reclaim(self, enable, arena_max=None):
+        """
+        Tweak memory reclaim: garbage is collected and freed memory is given back to system (malloc_trim)
+        when Cleep is idle or when device memory usage is high. Number of malloc arenas can be capped
+        (applied to arenas created afterwards, fully effective after Cleep restart).
+
+        Args:
+            enable (bool): True to enable periodic memory reclaim
+            arena_max (int, optional): max number of malloc arenas (None for glibc default)
+
+        Raises:
+            CommandError: if error occured
+        """
+        self._check_parameters(
+            [
+                {"name": "enable", "type": bool, "value": enable},
+                {
+                    "name": "arena_max",
+                    "type": int,
+                    "value": arena_max,
+                    "none": True,
+                    "validator": lambda val: val > 0,
+                },
+            ]
+        )
+
+        if not (
+            self._set_config_field("memoryreclaim", enable)
+            and self._set_config_field("mallocarenamax", arena_max)
+        ):
+            raise CommandError("Unable to save configuration")
+
+        self.__memory_reclaim_minutes = 0
+        if arena_max and not self.__apply_malloc_arena_max(arena_max):
+            raise CommandError("Unable to cap malloc arenas on this device")
+
+    def __apply_malloc_arena_max(self, arena_max):
+        """
+        Cap number of malloc arenas
+
+        Args:
+            arena_max (int): max number of arenas (None to keep default)
+
+        Returns:
+            bool: True if applied
+        """
+        if not arena_max:
+            return True
+
+        try:
+            return self.memory_reclaimer.set_arena_max(arena_max)
+        except Exception:
+            self.logger.exception("Unable to cap malloc arenas")
+            return False
+
+    def reclaim_memory(self):
+        """
+        Collect garbage and give freed memory back to system now
+
+        Returns:
+            dict: reclaim result (see MemoryReclaimer.reclaim)
+        """
+        return self.memory_reclaimer.reclaim("manual")
+
+    def get_memory_reclaim(self):
+        """
+        Return memory reclaim configuration and statistics
+
+        Returns:
+            dict: memory reclaim::
+
+                {
+                    enabled (bool): True if periodic memory reclaim is enabled,
+                    arenamax (int): configured max number of malloc arenas,
+                    stats (dict): reclaim statistics (see MemoryReclaimer.get_stats),
+                }
+
+        """
+        return {
+            "enabled": self._get_config_field("memoryreclaim", False),
+            "arenamax": self._get_config_field("mallocarenamax", None),
+            "stats": self.memory_reclaimer.get_stats(),
+        }
+
+    def tweak_vm_profile(self, profile):
+        """
+        Tweak kernel virtual memory profile (swappiness and dirty pages writeback). Profile is applied at startup
+
+        Args:
+            profile (str): vm profile (default, sdcard or lowmemory)
+
+        Raises:
+            CommandError: if error occured
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "profile",
+                    "type": str,
+                    "value": profile,
+                    "validator": lambda val: val in VmTuning.PROFILES,
+                },
+            ]
+        )
+
+        try:
+            self.vm_tuning.apply_profile(profile)
+        except OSError as error:
+            self.logger.error("Unable to apply vm profile: %s", error)
+            raise CommandError("Error tweaking vm profile") from error
+
+        # store vm profile
+        if not self._set_config_field("vmprofile", profile):
+            raise CommandError("Unable to save configuration")
+
+    def tweak_zram(self, enable):
+        """
+        Tweak zram swap (compressed swap in RAM). Zram is enabled at startup
+
+        Args:
+            enable (bool): True to enable zram swap
+
+        Raises:
+            CommandError: if error occured
+        """
+        self._check_parameters([{"name": "enable", "type": bool, "value": enable}])
+
+        if enable:
+            done = self.vm_tuning.enable_zram(self.hardware_infos.get()["memory"]["total"])
+        else:
+            done = self.vm_tuning.disable_zram()
+        if not done:
+            raise CommandError("Error tweaking zram swap")
+
+        # store zram status
+        if not self._set_config_field("zram", enable):
+            raise CommandError("Unable to save configuration")
+
+    def get_vm_profile(self):
+        """
+        Return kernel virtual memory tuning
+
+        Returns:
+            dict: vm tuning::
+
+                {
+                    profile (str): configured profile (None if system settings are used),
+                    zram (bool): True if zram swap is configured,
+                    zramactive (bool): True if zram swap is active,
+                    settings (dict): current sysctl values,
+                    benchmark (dict): latest benchmark (see get_vm_benchmark),
+                }
+
+        """
+        return {
+            "profile": self._get_config_field("vmprofile", None),
+            "zram": self._get_config_field("zram", False),
+            "zramactive": self.vm_tuning.is_zram_enabled(),
+            "settings": self.vm_tuning.get_settings(),
+            "benchmark": self.get_vm_benchmark(),
+        }
+
+    def benchmark_vm_profile(self, profile):
+        """
+        Benchmark vm profile against current settings. Benchmark runs in background (see get_vm_benchmark),
+        current settings are restored after benchmark
+
+        Args:
+            profile (str): vm profile to benchmark
+
+        Raises:
+            CommandInfo: if benchmark is already running
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "profile",
+                    "type": str,
+                    "value": profile,
+                    "validator": lambda val: val in VmTuning.PROFILES,
+                },
+            ]
+        )
+        if self.__vm_benchmark["running"]:
+            raise CommandInfo("Benchmark is already running")
+
+        self.__vm_benchmark = {
+            "running": True,
+            "profile": profile,
+            "timestamp": int(time.time()),
+            "before": None,
+            "after": None,
+        }
+        task = self.task_factory.create_task(None, self._run_vm_benchmark, task_args=[profile])
+        task.start()
+
+    def _run_vm_benchmark(self, profile):
+        """
+        Run vm benchmark: synthetic load is executed with current settings, then with profile settings
+
+        Args:
+            profile (str): vm profile to benchmark
+        """
+        settings = self.vm_tuning.get_settings()
+        try:
+            self.__vm_benchmark["before"] = self.vm_tuning.benchmark(self.VM_BENCHMARK_PATH)
+            self.vm_tuning.apply_profile(profile)
+            self.__vm_benchmark["after"] = self.vm_tuning.benchmark(self.VM_BENCHMARK_PATH)
+        except Exception:
+            self.logger.exception('Error benchmarking vm profile "%s"', profile)
+        finally:
+            try:
+                self.vm_tuning.set_settings(settings)
+            except Exception:
+                self.logger.exception("Unable to restore vm settings after benchmark")
+            self.__vm_benchmark["running"] = False
+
+    def get_vm_benchmark(self):
+        """
+        Return latest vm benchmark
+
+        Returns:
+            dict: vm benchmark::
+
+                {
+                    running (bool): True if benchmark is running,
+                    profile (str): benchmarked profile,
+                    timestamp (int): benchmark timestamp,
+                    before (dict): benchmark with previous settings (see VmTuning.benchmark),
+                    after (dict): benchmark with profile settings (see VmTuning.benchmark),
+                }
+
+        """
+        return dict(self.__vm_benchmark)
+
+    def set_led_patterns(self, enable):
+        """
+        Enable or disable led patterns. When enabled, activity led blinks codes to show device states
+        (need reboot, memory alert, backup running)
+
+        Args:
+            enable (bool): True to enable led patterns
+
+        Raises:
+            CommandError: if error occured
+        """
+        self._check_parameters([{"name": "enable", "type": bool, "value": enable}])
+
+        if not self._set_config_field("ledpatterns", enable):
+            raise CommandError("Unable to save configuration")
+        if enable:
+            self.led_patterns.start()
+        else:
+            self.led_patterns.stop()
+
+    def get_led_patterns(self):
+        """
+        Return led patterns status
+
+        Returns:
+            dict: led patterns status::
+
+                {
+                    enabled (bool): True if led patterns are enabled,
+                    active (list): active patterns sorted by priority (highest first),
+                }
+
+        """
+        return {
+            "enabled": self.led_patterns.enabled,
+            "active": self.led_patterns.get_active_patterns(),
+        }
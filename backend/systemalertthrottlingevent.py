@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+
+class SystemAlertThrottlingEvent(Event):
+    """
+    System.alert.throttling event
+    """
+
+    EVENT_NAME = "system.alert.throttling"
+    EVENT_PROPAGATE = True
+    EVENT_PARAMS = ["flags", "temperature", "frequency"]
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+
+class SystemAlertWatchdogEvent(Event):
+    """
+    System.alert.watchdog event
+    """
+
+    EVENT_NAME = "system.alert.watchdog"
+    EVENT_PROPAGATE = True
+    EVENT_PARAMS = ["type", "thread", "task", "duration", "stack"]
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
@@ -12,7 +12,7 @@ class SystemCleepRestartEvent(Event):
 
     EVENT_NAME = "system.cleep.restart"
     EVENT_PROPAGATE = False
-    EVENT_PARAMS = ["delay"]
+    EVENT_PARAMS = ["delay", "timeout"]
 
     def __init__(self, params):
         """
@@ -12,7 +12,7 @@ class SystemDevicePoweroffEvent(Event):
 
     EVENT_NAME = "system.device.poweroff"
     EVENT_PROPAGATE = False
-    EVENT_PARAMS = ["delay"]
+    EVENT_PARAMS = ["delay", "timeout"]
 
     def __init__(self, params):
         """
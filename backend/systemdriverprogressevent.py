@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+
+class SystemDriverProgressEvent(Event):
+    """
+    System.driver.progress event
+    This event is sent periodically while a driver is installed or uninstalled. Progress is estimated.
+    """
+
+    EVENT_NAME = "system.driver.progress"
+    EVENT_PROPAGATE = False
+    EVENT_PARAMS = ["jobid", "action", "drivertype", "drivername", "status", "progress"]
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+
+class SystemMonitoringGcEvent(Event):
+    """
+    System.monitoring.gc event
+    """
+
+    EVENT_NAME = "system.monitoring.gc"
+    EVENT_PROPAGATE = False
+    EVENT_PARAMS = ["pause"]
+    EVENT_CHARTABLE = True
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
+
+    def get_chart_values(self, params):
+        """
+        Returns chart values
+
+        Args:
+            params (dict): event parameters
+
+        Returns:
+            list: list of field+value ::
+
+                [
+                    {
+                        field (string): field name,
+                        value (any): value
+                    },
+                    ...
+                ]
+
+        """
+        return [
+            {"field": "pause", "value": float(params["pause"] or 0.0)},
+        ]
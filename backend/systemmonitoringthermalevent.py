@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+
+class SystemMonitoringThermalEvent(Event):
+    """
+    System.monitoring.thermal event
+    """
+
+    EVENT_NAME = "system.monitoring.thermal"
+    EVENT_PROPAGATE = False
+    EVENT_PARAMS = [
+        "temperature",
+        "frequency",
+        "frequencies",
+        "throttled",
+        "undervoltage",
+        "flags",
+        "occurred",
+    ]
+    EVENT_CHARTABLE = True
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
+
+    def get_chart_values(self, params):
+        """
+        Returns chart values
+
+        Args:
+            params (dict): event parameters
+
+        Returns:
+            list: list of field+value ::
+
+                [
+                    {
+                        field (string): field name,
+                        value (any): value
+                    },
+                    ...
+                ]
+
+        """
+        return [
+            {"field": "temperature", "value": float(params["temperature"] or 0.0)},
+            {"field": "frequency", "value": int(params["frequency"] or 0)},
+        ]
@@ -0,0 +1,25 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+
+class SystemShutdownReportEvent(Event):
+    """
+    System.shutdown.report event
+    This event is sent when shutdown pipeline is terminated, just before reboot, poweroff or restart command is launched.
+    It reports time spent in each shutdown phase.
+    """
+
+    EVENT_NAME = "system.shutdown.report"
+    EVENT_PROPAGATE = False
+    EVENT_PARAMS = ["action", "duration", "timedout", "phases"]
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
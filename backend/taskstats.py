@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import logging
+import functools
+import threading
+from collections import deque
+
+
+__all__ = ["TaskStats"]
+
+
+class TaskStats:
+    """
+    Scheduling metrics of periodic tasks
+
+    Each execution of a wrapped task records its start and end. Tasks are rescheduled once executed, so
+    the expected delay between end of an execution and start of next one is task interval: jitter is the
+    difference between measured delay and interval (positive when task fires late, e.g. scheduler starvation).
+    """
+
+    HISTORY_SIZE = 100
+    PERCENTILES = [50, 90, 99]
+
+    def __init__(self, clock=None, history_size=None):
+        """
+        Constructor
+
+        Args:
+            clock (function, optional): monotonic clock in seconds. Defaults to time.monotonic
+            history_size (int, optional): number of executions kept per task. Defaults to HISTORY_SIZE
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.clock = clock or time.monotonic
+        self.history_size = history_size or self.HISTORY_SIZE
+        self.__tasks = {}
+        self.__disabled_sources = set()
+        self.__lock = threading.Lock()
+
+    def wrap(self, name, interval, func, source="system"):
+        """
+        Wrap periodic task function to record its executions
+
+        Args:
+            name (str): task name
+            interval (float): task interval in seconds
+            func (function): task function
+            source (str, optional): task source (system or apps)
+
+        Returns:
+            function: wrapped function
+        """
+        with self.__lock:
+            self.__tasks[name] = {
+                "source": source,
+                "interval": interval,
+                "executions": deque(maxlen=self.history_size),
+                "fires": 0,
+                "overruns": 0,
+            }
+
+        @functools.wraps(func)
+        def measured(*args, **kwargs):
+            if source in self.__disabled_sources:
+                return func(*args, **kwargs)
+            start = self.clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, start, self.clock())
+
+        return measured
+
+    def record(self, name, start, end):
+        """
+        Record task execution
+
+        Args:
+            name (str): task name
+            start (float): execution start (clock)
+            end (float): execution end (clock)
+        """
+        with self.__lock:
+            task = self.__tasks.get(name)
+            if task is None:
+                return
+            task["executions"].append((start, end))
+            task["fires"] += 1
+            if end - start > task["interval"]:
+                task["overruns"] += 1
+
+    def enable_source(self, source, enabled):
+        """
+        Enable or disable recording of tasks from specified source. Disabling a source drops its statistics.
+
+        Args:
+            source (str): task source
+            enabled (bool): True to record tasks of this source
+        """
+        with self.__lock:
+            if enabled:
+                self.__disabled_sources.discard(source)
+                return
+            self.__disabled_sources.add(source)
+            for name in [name for name, task in self.__tasks.items() if task["source"] == source]:
+                del self.__tasks[name]
+
+    def get_stats(self, source=None):
+        """
+        Return tasks statistics (durations in seconds)
+
+        Args:
+            source (str, optional): only return tasks of this source
+
+        Returns:
+            dict: statistics by task name::
+
+                {
+                    name (str): {
+                        source (str): task source,
+                        interval (float): configured interval,
+                        fires (int): number of executions,
+                        overruns (int): number of executions longer than interval,
+                        lastfire (float): seconds since last execution start (None if never fired),
+                        period (float): mean start to start interval (None if not enough executions),
+                        jitter (dict): delay between executions minus interval ({p50, p90, p99, max}),
+                        execution (dict): execution duration ({mean, p90, max}),
+                    },
+                    ...
+                }
+
+        """
+        now = self.clock()
+        with self.__lock:
+            tasks = {
+                name: (task["source"], task["interval"], task["fires"], task["overruns"], list(task["executions"]))
+                for name, task in self.__tasks.items()
+                if source is None or task["source"] == source
+            }
+
+        stats = {}
+        for name, (task_source, interval, fires, overruns, executions) in tasks.items():
+            durations = [end - start for start, end in executions]
+            jitters = [executions[i][0] - executions[i - 1][1] - interval for i in range(1, len(executions))]
+            periods = [executions[i][0] - executions[i - 1][0] for i in range(1, len(executions))]
+            stats[name] = {
+                "source": task_source,
+                "interval": interval,
+                "fires": fires,
+                "overruns": overruns,
+                "lastfire": round(now - executions[-1][0], 3) if executions else None,
+                "period": round(sum(periods) / len(periods), 3) if periods else None,
+                "jitter": self.__summarize(jitters, [f"p{p}" for p in self.PERCENTILES] + ["max"]),
+                "execution": self.__summarize(durations, ["mean", "p90", "max"]),
+            }
+
+        return stats
+
+    def __summarize(self, values, keys):
+        """
+        Summarize values
+
+        Args:
+            values (list): values
+            keys (list): summary keys (mean, max or pN percentile)
+
+        Returns:
+            dict: summary (None values if no value)
+        """
+        ordered = sorted(values)
+        summary = {}
+        for key in keys:
+            if not ordered:
+                summary[key] = None
+            elif key == "mean":
+                summary[key] = round(sum(ordered) / len(ordered), 3)
+            elif key == "max":
+                summary[key] = round(ordered[-1], 3)
+            else:
+                # nearest rank percentile
+                rank = max(int(-(-int(key[1:]) * len(ordered) // 100)), 1)
+                summary[key] = round(ordered[rank - 1], 3)
+
+        return summary
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+from .sysfsreader import SysfsReader
+
+
+__all__ = ["ThermalCollector"]
+
+
+class ThermalCollector(SysfsReader):
+    """
+    Collect cpu temperature, frequency and firmware throttling flags from sysfs
+
+    Thermal zones and cpu count are read from hardware inventory, so collecting only reads a few sysfs files.
+    """
+
+    THROTTLED_PATH = "devices/platform/soc/soc:firmware/get_throttled"
+    CPUFREQ_PATH = "devices/system/cpu/cpu{}/cpufreq/scaling_cur_freq"
+
+    # firmware throttled bits (occurred since boot flags are shifted by 16 bits)
+    THROTTLED_FLAGS = {
+        0: "undervoltage",
+        1: "freqcapped",
+        2: "throttled",
+        3: "softtemplimit",
+    }
+    OCCURRED_SHIFT = 16
+
+    def __init__(self, hardware_infos, sysfs_root=None):
+        """
+        Constructor
+
+        Args:
+            hardware_infos (HardwareInfos): HardwareInfos instance
+            sysfs_root (str, optional): sysfs directory. Defaults to SYSFS_ROOT
+        """
+        SysfsReader.__init__(self, sysfs_root)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.hardware_infos = hardware_infos
+        self.__flags = []
+
+    def read(self):
+        """
+        Read thermal status
+
+        Returns:
+            dict: thermal status::
+
+                {
+                    temperature (float): cpu temperature in celsius (None if not available),
+                    frequency (int): highest cpu frequency in MHz (None if not available),
+                    frequencies (list): frequency of each cpu in MHz,
+                    throttled (bool): True if cpu is currently throttled or frequency capped,
+                    undervoltage (bool): True if under-voltage is currently detected,
+                    flags (list): currently active throttling flags,
+                    occurred (list): throttling flags that occurred since boot,
+                }
+
+        """
+        infos = self.hardware_infos.get()
+
+        temperatures = [self._read_int(zone["path"]) for zone in infos.get("thermal", [])]
+        temperatures = [round(temperature / 1000.0, 1) for temperature in temperatures if temperature is not None]
+
+        frequencies = []
+        for index in range(infos.get("cpu", {}).get("count", 0)):
+            frequency = self._read_int(os.path.join(self.sysfs_root, self.CPUFREQ_PATH.format(index)))
+            if frequency is not None:
+                frequencies.append(frequency // 1000)
+
+        flags, occurred = self.__read_throttled()
+
+        return {
+            "temperature": temperatures[0] if temperatures else None,
+            "frequency": max(frequencies) if frequencies else None,
+            "frequencies": frequencies,
+            "throttled": any(flag in flags for flag in ("freqcapped", "throttled", "softtemplimit")),
+            "undervoltage": "undervoltage" in flags,
+            "flags": flags,
+            "occurred": occurred,
+        }
+
+    def collect(self):
+        """
+        Read thermal status and detect throttling start
+
+        Returns:
+            tuple: thermal status (dict, see read) and throttling flags activated since last collect (list)
+        """
+        status = self.read()
+        started = [flag for flag in status["flags"] if flag not in self.__flags]
+        self.__flags = status["flags"]
+
+        return status, started
+
+    def __read_throttled(self):
+        """
+        Read and decode firmware throttled flags
+
+        Returns:
+            tuple: active flags (list) and flags occurred since boot (list)
+        """
+        value = self._read(os.path.join(self.sysfs_root, self.THROTTLED_PATH))
+        if value is None:
+            return [], []
+
+        try:
+            value = int(value, 16)
+        except ValueError:
+            self.logger.warning('Invalid throttled value "%s"', value)
+            return [], []
+
+        flags = [name for bit, name in self.THROTTLED_FLAGS.items() if value & (1 << bit)]
+        occurred = [
+            name for bit, name in self.THROTTLED_FLAGS.items() if value & (1 << (bit + self.OCCURRED_SHIFT))
+        ]
+
+        return flags, occurred
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import time
+import logging
+import functools
+import threading
+import traceback
+
+
+__all__ = ["ThreadWatchdog", "dump_threads"]
+
+
+def dump_threads():
+    """
+    Return stacks of all python threads
+
+    Returns:
+        list: threads sorted by name::
+
+            [
+                {
+                    name (str): thread name,
+                    ident (int): python thread identifier,
+                    nativeid (int): system thread identifier,
+                    daemon (bool): True if thread is daemon,
+                    stack (list): stack lines (most recent call last),
+                },
+                ...
+            ]
+
+    """
+    frames = sys._current_frames()  # pylint: disable=protected-access
+    threads = {thread.ident: thread for thread in threading.enumerate()}
+    dump = []
+    for ident, frame in frames.items():
+        thread = threads.get(ident)
+        dump.append(
+            {
+                "name": thread.name if thread else f"unknown-{ident}",
+                "ident": ident,
+                "nativeid": thread.native_id if thread else None,
+                "daemon": thread.daemon if thread else None,
+                "stack": [line.rstrip() for line in traceback.format_stack(frame)],
+            }
+        )
+
+    return sorted(dump, key=lambda item: item["name"])
+
+
+class ThreadWatchdog:
+    """
+    Detect periodic tasks overrunning their interval and task executions that are stuck
+
+    Periodic tasks are watched by wrapping their function (see wrap). Stuck detection is opted in per
+    task: an execution is stuck when its whole stack (code and last instruction of every frame) does not
+    change during stuck timeout. Other threads are never checked, since long-lived threads legitimately
+    wait on the same frame (sleep loops, select, socket recv, gevent hub). Each hang is reported once.
+    """
+
+    def __init__(self, on_alert, stuck_timeout, clock=None):
+        """
+        Constructor
+
+        Args:
+            on_alert (function): function called with alert (dict, see check)
+            stuck_timeout (float): duration in seconds after which a task execution without progress is stuck
+            clock (function, optional): monotonic clock in seconds. Defaults to time.monotonic
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.on_alert = on_alert
+        self.stuck_timeout = stuck_timeout
+        self.clock = clock or time.monotonic
+        self.__tasks = {}
+        self.__frames = {}
+        self.__lock = threading.Lock()
+
+    def wrap(self, name, interval, func, stuck=False):
+        """
+        Wrap periodic task function to watch its executions
+
+        Args:
+            name (str): task name
+            interval (float): task interval in seconds
+            func (function): task function
+            stuck (bool, optional): True to also report executions stuck without progress
+
+        Returns:
+            function: wrapped function
+        """
+        with self.__lock:
+            self.__tasks[name] = {
+                "interval": interval,
+                "stuck": stuck,
+                "start": None,
+                "ident": None,
+                "alerted": False,
+            }
+
+        @functools.wraps(func)
+        def watched(*args, **kwargs):
+            with self.__lock:
+                task = self.__tasks[name]
+                task.update({"start": self.clock(), "ident": threading.get_ident(), "alerted": False})
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self.__lock:
+                    task.update({"start": None, "ident": None})
+
+        return watched
+
+    def get_tasks(self):
+        """
+        Return watched tasks
+
+        Returns:
+            dict: tasks by name::
+
+                {
+                    name (str): {
+                        interval (float): task interval in seconds,
+                        running (float): current execution duration in seconds (None if not running),
+                    },
+                    ...
+                }
+
+        """
+        now = self.clock()
+        with self.__lock:
+            return {
+                name: {
+                    "interval": task["interval"],
+                    "running": round(now - task["start"], 3) if task["start"] is not None else None,
+                }
+                for name, task in self.__tasks.items()
+            }
+
+    def check(self):
+        """
+        Check watched tasks, and call on_alert for each new hang
+
+        Returns:
+            list: new alerts::
+
+                [
+                    {
+                        type (str): overrun or stuck,
+                        thread (str): thread name,
+                        task (str): task name,
+                        duration (float): task execution or stuck duration in seconds,
+                        stack (list): thread stack lines,
+                    },
+                    ...
+                ]
+
+        """
+        now = self.clock()
+        frames = sys._current_frames()  # pylint: disable=protected-access
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        alerts = []
+
+        with self.__lock:
+            current = {}
+            for name, task in self.__tasks.items():
+                ident = task["ident"]
+                if task["start"] is None or ident not in frames or ident == threading.get_ident():
+                    continue
+                duration = now - task["start"]
+                if duration > task["interval"] and not task["alerted"]:
+                    task["alerted"] = True
+                    alerts.append(self.__get_alert("overrun", ident, name, duration, names, frames))
+                if not task["stuck"]:
+                    continue
+
+                key = (task["start"], self.__get_stack_key(frames[ident]))
+                previous = self.__frames.get(name)
+                if previous and previous["key"] == key:
+                    current[name] = previous
+                else:
+                    current[name] = {"key": key, "since": now, "alerted": False}
+                state = current[name]
+                if now - state["since"] >= self.stuck_timeout and not state["alerted"]:
+                    state["alerted"] = True
+                    alerts.append(self.__get_alert("stuck", ident, name, now - state["since"], names, frames))
+            self.__frames = current
+
+        for alert in alerts:
+            self.logger.warning(
+                "Thread %s %s for %ss (task %s)", alert["thread"], alert["type"], alert["duration"], alert["task"]
+            )
+            try:
+                self.on_alert(alert)
+            except Exception:
+                self.logger.exception("Error sending watchdog alert")
+
+        return alerts
+
+    def __get_stack_key(self, frame):
+        """
+        Return key identifying thread progress: code and last executed instruction of every frame
+
+        Args:
+            frame (frame): thread innermost frame
+
+        Returns:
+            tuple: stack key
+        """
+        key = []
+        while frame is not None:
+            key.append((id(frame.f_code), frame.f_lasti))
+            frame = frame.f_back
+
+        return tuple(key)
+
+    def __get_alert(self, alert_type, ident, task, duration, names, frames):
+        """
+        Build alert
+
+        Returns:
+            dict: alert (see check)
+        """
+        return {
+            "type": alert_type,
+            "thread": names.get(ident, f"unknown-{ident}"),
+            "task": task,
+            "duration": round(duration, 3),
+            "stack": [line.rstrip() for line in traceback.format_stack(frames[ident])],
+        }
@@ -0,0 +1,386 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import time
+import logging
+import subprocess
+import psutil
+
+
+__all__ = ["VmTuning"]
+
+
+class VmTuning:
+    """
+    Kernel virtual memory tuning profiles and zram swap
+
+    Sysctl values are written directly to /proc/sys. Profiles:
+     - default: kernel defaults
+     - sdcard: dirty pages are kept longer and flushed in larger batches, swap is avoided (less SD card writes)
+     - lowmemory: less dirty page cache and aggressive swapping (to be used with zram swap)
+    """
+
+    PROC_ROOT = "/proc"
+    SYSFS_ROOT = "/sys"
+    SETTINGS = [
+        "vm.swappiness",
+        "vm.dirty_ratio",
+        "vm.dirty_background_ratio",
+        "vm.dirty_expire_centisecs",
+        "vm.dirty_writeback_centisecs",
+    ]
+    PROFILES = {
+        "default": {
+            "vm.swappiness": 60,
+            "vm.dirty_ratio": 20,
+            "vm.dirty_background_ratio": 10,
+            "vm.dirty_expire_centisecs": 3000,
+            "vm.dirty_writeback_centisecs": 500,
+        },
+        "sdcard": {
+            "vm.swappiness": 10,
+            "vm.dirty_ratio": 40,
+            "vm.dirty_background_ratio": 20,
+            "vm.dirty_expire_centisecs": 6000,
+            "vm.dirty_writeback_centisecs": 1500,
+        },
+        "lowmemory": {
+            "vm.swappiness": 100,
+            "vm.dirty_ratio": 10,
+            "vm.dirty_background_ratio": 5,
+            "vm.dirty_expire_centisecs": 3000,
+            "vm.dirty_writeback_centisecs": 500,
+        },
+    }
+    ZRAM_DEVICE = "zram0"
+    ZRAM_RATIO = 0.5
+    ZRAM_ALGORITHM = "lz4"
+    ZRAM_PRIORITY = 100
+    SETTLE_MARGIN = 5.0
+    BENCHMARK_TIMEOUT = 300.0
+
+    def __init__(self, cleep_filesystem, run_command, proc_root=None, sysfs_root=None):
+        """
+        Constructor
+
+        Args:
+            cleep_filesystem (CleepFilesystem): CleepFilesystem instance
+            run_command (function): function running command line and returning console response
+                                    (dict with returncode)
+            proc_root (str, optional): procfs directory. Defaults to PROC_ROOT
+            sysfs_root (str, optional): sysfs directory. Defaults to SYSFS_ROOT
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cleep_filesystem = cleep_filesystem
+        self.run_command = run_command
+        self.proc_root = proc_root or self.PROC_ROOT
+        self.sysfs_root = sysfs_root or self.SYSFS_ROOT
+
+    def get_settings(self):
+        """
+        Return current sysctl settings
+
+        Returns:
+            dict: sysctl values (None if not available)::
+
+                {
+                    vm.swappiness (int): value,
+                    ...
+                }
+
+        """
+        settings = {}
+        for name in self.SETTINGS:
+            try:
+                with open(self.__get_sysctl_path(name)) as file_descriptor:
+                    settings[name] = int(file_descriptor.read().strip())
+            except (OSError, ValueError):
+                settings[name] = None
+
+        return settings
+
+    def set_settings(self, settings):
+        """
+        Write sysctl settings
+
+        Args:
+            settings (dict): sysctl values (None values are skipped)
+
+        Raises:
+            OSError: if a setting can't be written
+        """
+        for name, value in settings.items():
+            if name not in self.SETTINGS or value is None:
+                continue
+            self.logger.debug("Set %s=%s", name, value)
+            with open(self.__get_sysctl_path(name), "w") as file_descriptor:
+                file_descriptor.write(str(value))
+
+    def apply_profile(self, profile):
+        """
+        Apply named profile
+
+        Args:
+            profile (str): profile name (see PROFILES)
+
+        Raises:
+            ValueError: if profile does not exist
+            OSError: if a setting can't be written
+        """
+        if profile not in self.PROFILES:
+            raise ValueError(f'Profile "{profile}" does not exist')
+
+        self.set_settings(self.PROFILES[profile])
+
+    def is_zram_enabled(self):
+        """
+        Return True if zram swap is active
+
+        Returns:
+            bool: True if zram swap is active
+        """
+        try:
+            with open(os.path.join(self.proc_root, "swaps")) as file_descriptor:
+                return any(line.split()[0].endswith(self.ZRAM_DEVICE) for line in file_descriptor if line.strip())
+        except OSError:
+            return False
+
+    def enable_zram(self, memory_total):
+        """
+        Enable zram swap
+
+        Args:
+            memory_total (int): RAM size in bytes (zram disk size is a ratio of it)
+
+        Returns:
+            bool: True if zram swap is enabled
+        """
+        if self.is_zram_enabled():
+            return True
+
+        device_path = os.path.join(self.sysfs_root, "block", self.ZRAM_DEVICE)
+        if not os.path.exists(device_path) and not self.__run("modprobe zram num_devices=1"):
+            return False
+
+        try:
+            with open(os.path.join(device_path, "comp_algorithm")) as file_descriptor:
+                algorithms = file_descriptor.read().replace("[", "").replace("]", "").split()
+            if self.ZRAM_ALGORITHM in algorithms:
+                with open(os.path.join(device_path, "comp_algorithm"), "w") as file_descriptor:
+                    file_descriptor.write(self.ZRAM_ALGORITHM)
+            with open(os.path.join(device_path, "disksize"), "w") as file_descriptor:
+                file_descriptor.write(str(int(memory_total * self.ZRAM_RATIO)))
+        except OSError as error:
+            self.logger.error("Unable to configure zram device: %s", error)
+            return False
+
+        device = f"/dev/{self.ZRAM_DEVICE}"
+        return self.__run(f"mkswap {device}") and self.__run(f"swapon -p {self.ZRAM_PRIORITY} {device}")
+
+    def disable_zram(self):
+        """
+        Disable zram swap
+
+        Returns:
+            bool: True if zram swap is disabled
+        """
+        if not self.is_zram_enabled():
+            return True
+
+        if not self.__run(f"swapoff /dev/{self.ZRAM_DEVICE}"):
+            return False
+
+        try:
+            with open(os.path.join(self.sysfs_root, "block", self.ZRAM_DEVICE, "reset"), "w") as file_descriptor:
+                file_descriptor.write("1")
+        except OSError as error:
+            self.logger.warning("Unable to reset zram device: %s", error)
+
+        return True
+
+    def benchmark(self, path, file_size=8388608, rewrites=4, chunk_size=4096, settle=None, memory_ratio=0.25):
+        """
+        Run synthetic load and measure write amplification and memory headroom. Load rewrites a file several
+        times (like logs and configuration files) while memory is allocated, then waits for settle duration
+        so that kernel writeback policy applies. Remaining dirty pages are flushed before disk counters are
+        read, so all writes caused by the load are measured.
+
+        Load runs in a child process, so memory allocated to simulate pressure is never held by caller.
+
+        Args:
+            path (str): benchmark file path (on persistent storage)
+            file_size (int, optional): benchmark file size in bytes
+            rewrites (int, optional): number of times file is rewritten
+            chunk_size (int, optional): write chunk size in bytes
+            settle (float, optional): duration to wait after load in seconds. Defaults to current dirty pages
+                                      expire time plus writeback interval (see SETTLE_MARGIN)
+            memory_ratio (float, optional): ratio of available memory allocated during load
+
+        Returns:
+            dict: benchmark result::
+
+                {
+                    logicalbytes (int): bytes written by load,
+                    diskbytes (int): bytes written to disks during benchmark,
+                    amplification (float): disk bytes / logical bytes,
+                    minavailable (int): min available memory during benchmark in bytes,
+                    swapused (int): swap used during benchmark in bytes,
+                    duration (float): benchmark duration in seconds,
+                }
+
+        Raises:
+            RuntimeError: if benchmark process failed
+        """
+        if settle is None:
+            settle = self.__get_settle_duration()
+        params = {
+            "path": path,
+            "file_size": file_size,
+            "rewrites": rewrites,
+            "chunk_size": chunk_size,
+            "settle": settle,
+            "memory_ratio": memory_ratio,
+        }
+        self.logger.debug("Run vm benchmark %s", params)
+
+        # file is opened through cleep filesystem to allow writing on read-only filesystem during benchmark
+        output = self.cleep_filesystem.open(path, "wb")
+        try:
+            process = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), json.dumps(params)],
+                capture_output=True,
+                text=True,
+                timeout=settle + self.BENCHMARK_TIMEOUT,
+                check=False,
+            )
+        finally:
+            self.cleep_filesystem.close(output)
+            self.cleep_filesystem.rm(path)
+        if process.returncode != 0:
+            raise RuntimeError(f"Benchmark process failed: {process.stderr.strip()}")
+
+        return json.loads(process.stdout)
+
+    def __get_settle_duration(self):
+        """
+        Return duration to wait after benchmark load for dirty pages to be written back by kernel
+
+        Returns:
+            float: duration in seconds
+        """
+        settings = self.get_settings()
+        expire = settings["vm.dirty_expire_centisecs"] or self.PROFILES["default"]["vm.dirty_expire_centisecs"]
+        writeback = (
+            settings["vm.dirty_writeback_centisecs"] or self.PROFILES["default"]["vm.dirty_writeback_centisecs"]
+        )
+
+        return (expire + writeback) / 100 + self.SETTLE_MARGIN
+
+    def __get_sysctl_path(self, name):
+        """
+        Return sysctl file path
+
+        Args:
+            name (str): sysctl name (vm.swappiness)
+
+        Returns:
+            str: sysctl path
+        """
+        return os.path.join(self.proc_root, "sys", *name.split("."))
+
+    def __run(self, command):
+        """
+        Run command
+
+        Args:
+            command (str): command line
+
+        Returns:
+            bool: True if command succeed
+        """
+        resp = self.run_command(command)
+        if resp["returncode"] != 0:
+            self.logger.error('Command "%s" failed: %s', command, resp.get("stderr"))
+            return False
+
+        return True
+
+
+def run_benchmark_load(path, file_size, rewrites, chunk_size, settle, memory_ratio):
+    """
+    Run benchmark load (see VmTuning.benchmark). Executed in benchmark child process
+
+    Args:
+        path (str): benchmark file path
+        file_size (int): benchmark file size in bytes
+        rewrites (int): number of times file is rewritten
+        chunk_size (int): write chunk size in bytes
+        settle (float): duration to wait after load in seconds
+        memory_ratio (float): ratio of available memory allocated during load
+
+    Returns:
+        dict: benchmark result (see VmTuning.benchmark)
+    """
+    os.sync()
+    start = time.time()
+    disk_before = get_disk_written()
+    swap_before = psutil.swap_memory().used
+    min_available = psutil.virtual_memory().available
+
+    # memory pressure
+    memory = []
+    to_allocate = int(min_available * memory_ratio)
+    block = 1048576
+    while to_allocate > 0:
+        memory.append(bytearray(b"\x01") * min(block, to_allocate))
+        to_allocate -= block
+    min_available = min(min_available, psutil.virtual_memory().available)
+
+    # rewrite load
+    chunk = b"\x00" * chunk_size
+    logical_bytes = 0
+    with open(path, "wb") as output:
+        for _ in range(rewrites):
+            output.seek(0)
+            for _ in range(file_size // chunk_size):
+                output.write(chunk)
+                logical_bytes += chunk_size
+            output.flush()
+
+    end = time.time() + settle
+    while time.time() < end:
+        min_available = min(min_available, psutil.virtual_memory().available)
+        time.sleep(min(0.5, max(end - time.time(), 0.0)))
+
+    # flush pages not written back yet to count all writes caused by load
+    os.sync()
+    disk_bytes = get_disk_written() - disk_before
+    swap_used = max(psutil.swap_memory().used - swap_before, 0)
+    del memory
+
+    return {
+        "logicalbytes": logical_bytes,
+        "diskbytes": disk_bytes,
+        "amplification": round(disk_bytes / logical_bytes, 3) if logical_bytes else 0.0,
+        "minavailable": min_available,
+        "swapused": swap_used,
+        "duration": round(time.time() - start, 3),
+    }
+
+
+def get_disk_written():
+    """
+    Return bytes written to disks since boot (read from /proc/diskstats)
+
+    Returns:
+        int: written bytes
+    """
+    counters = psutil.disk_io_counters()
+    return counters.write_bytes if counters else 0
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark_load(**json.loads(sys.argv[1]))))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compare log parsing throughput of text and JSON-lines log formats
+
+Usage:
+    python3 bench_logparser.py [size_in_mb]
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from backend.logparser import JsonLogFormatter, LogParser
+
+TEXT_FORMAT = "%(asctime)s %(name)-12s[%(filename)s:%(lineno)d] %(levelname)-5s : %(message)s"
+LEVELS = [logging.DEBUG, logging.INFO, logging.INFO, logging.INFO, logging.WARNING, logging.ERROR]
+
+
+def generate_log(path, formatter, size):
+    """
+    Generate log file of specified size
+    """
+    written = 0
+    index = 0
+    with open(path, "w", encoding="utf-8") as fd:
+        while written < size:
+            level = LEVELS[index % len(LEVELS)]
+            record = logging.LogRecord(
+                f"module{index % 20}", level, "module.py", index % 500,
+                "Message number %d with some payload %s", (index, "x" * (index % 80)), None,
+            )
+            line = formatter.format(record) + "\n"
+            fd.write(line)
+            written += len(line)
+            index += 1
+
+    return index
+
+
+def bench(name, func, lines, size):
+    """
+    Run benchmark and print throughput
+    """
+    start = time.perf_counter()
+    result = func(lines)
+    duration = time.perf_counter() - start
+    print(f"  {name:<28} {duration:8.3f}s {size / duration / 1048576:8.1f} MB/s ({len(result)} results)")
+
+
+def main(size_mb):
+    size = size_mb * 1048576
+    parser = LogParser()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for log_format, formatter in (("text", logging.Formatter(TEXT_FORMAT)), ("json", JsonLogFormatter())):
+            path = os.path.join(tmp_dir, f"cleep.{log_format}.log")
+            count = generate_log(path, formatter, size)
+            with open(path, encoding="utf-8") as fd:
+                lines = fd.readlines()
+            print(f"{log_format} format: {count} lines, {size_mb} MB")
+
+            bench("full parse", lambda lines: [parser.parse_line(line) for line in lines], lines, size)
+            bench("level only", lambda lines: [parser.get_level(line) for line in lines], lines, size)
+            bench("filter ERROR", lambda lines: parser.search(lines, levels=["ERROR"]), lines, size)
+            bench('search "number 42"', lambda lines: parser.search(lines, pattern="number 42"), lines, size)
+            bench('search "payload é"', lambda lines: parser.search(lines, pattern="payload é"), lines, size)
+            bench("to text (get_logs)", lambda lines: [parser.to_text(line) for line in lines], lines, size)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
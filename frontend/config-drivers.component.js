@@ -27,6 +27,8 @@ angular.module('Cleep').component('configDrivers', {
         ctrl.types = [];
         ctrl.names = [];
         ctrl.drivers = [];
+        ctrl.rawDrivers = [];
+        ctrl.jobs = {};
         ctrl.icon = '';
         ctrl.displayHeader = true;
 
@@ -36,9 +38,20 @@ angular.module('Cleep').component('configDrivers', {
             ctrl.icon = ctrl.clIcon ?? 'developer-board';
             ctrl.types = ctrl.clTypes?.split(',') || [];
             ctrl.names = ctrl.clNames?.split(',') || [];
+            ctrl.loadDrivers();
+        };
+
+        ctrl.loadDrivers = function () {
+            rpcService.sendCommand('get_drivers_status', 'system')
+                .then(function (resp) {
+                    if (!resp.error) {
+                        ctrl.setDrivers(resp.data.drivers);
+                    }
+                });
         };
 
         ctrl.setDrivers = function (drivers) {
+            ctrl.rawDrivers = drivers;
             if (ctrl.types.length > 0 || ctrl.names.length > 0) {
                 drivers = drivers.filter(function(driver) {
                     return !(ctrl.types.indexOf(driver.drivertype) === -1 && ctrl.names.indexOf(driver.drivername) === -1);
@@ -47,7 +60,9 @@ angular.module('Cleep').component('configDrivers', {
 
             const driversList = [];
             for (const driver of drivers) {
-                const loadingStatus = ctrl.getLoadingStatus(driver.processing);
+                const job = ctrl.jobs[driver.drivertype + '/' + driver.drivername];
+                const processing = job ? (job.action === 'install' ? 1 : 2) : driver.processing;
+                const loadingStatus = ctrl.getLoadingStatus(processing, job);
                 driversList.push({
                     title: driver.drivername,
                     subtitle: loadingStatus,
@@ -55,21 +70,21 @@ angular.module('Cleep').component('configDrivers', {
                     loading: !!loadingStatus,
                     clicks: [
                         {
-                            disabled: driver.installed || driver.processing !== 0,
+                            disabled: driver.installed || processing !== 0,
                             click: ctrl.install,
                             icon: 'plus-circle',
                             tooltip: 'Install driver',
                             meta: { driver },
                         },
                         {
-                            disabled: !driver.installed || driver.processing !== 0,
+                            disabled: !driver.installed || processing !== 0,
                             click: ctrl.uninstall,
                             icon: 'minus-circle',
                             tooltip: 'Uninstall driver',
                             meta: { driver },
                         },
                         {
-                            disabled: !driver.installed || driver.processing !== 0,
+                            disabled: !driver.installed || processing !== 0,
                             click: ctrl.repair,
                             icon: 'wrench',
                             tooltip: 'Repair driver',
@@ -81,9 +96,11 @@ angular.module('Cleep').component('configDrivers', {
             ctrl.drivers = driversList;
         };
 
-        ctrl.getLoadingStatus = function (driverProcessing) {
-            if (driverProcessing === 1) return 'Installing...';
-            if (driverProcessing === 2) return 'Uninstalling...';
+        ctrl.getLoadingStatus = function (driverProcessing, job) {
+            if (job && job.status === 'queued') return 'Waiting for other driver...';
+            const progress = job && job.status === 'running' ? ' ' + job.progress + '%' : '';
+            if (driverProcessing === 1) return 'Installing...' + progress;
+            if (driverProcessing === 2) return 'Uninstalling...' + progress;
             return null;
         };
 
@@ -135,17 +152,19 @@ angular.module('Cleep').component('configDrivers', {
                 });
         };
 
-        $rootScope.$watchCollection(
-            () => cleepService.drivers,
-            (newDrivers) => {
-                if (newDrivers) {
-                    ctrl.setDrivers(newDrivers);
-                }
+        $rootScope.$on('system.driver.progress', function(event, uuid, params) {
+            const key = params.drivertype + '/' + params.drivername;
+            if (params.status === 'queued' || params.status === 'running') {
+                ctrl.jobs[key] = params;
+            } else {
+                delete ctrl.jobs[key];
             }
-        );
+            ctrl.setDrivers(ctrl.rawDrivers);
+        });
 
         $rootScope.$on('system.driver.install', function(event, uuid, params) {
             cleepService.reloadDrivers();
+            ctrl.loadDrivers();
             if (params && params.success === true) {
                 toastService.success('Driver installed successfully');
             } else if (params && params.success === false) {
@@ -156,6 +175,7 @@ angular.module('Cleep').component('configDrivers', {
 
         $rootScope.$on('system.driver.uninstall', function(event, uuid, params) {
             cleepService.reloadDrivers();
+            ctrl.loadDrivers();
             if (params && params.success === true) {
                 toastService.success('Driver uninstalled successfully');
             } else if (params && params.success === false) {
@@ -15,6 +15,17 @@ function($rootScope, $timeout, $q, toast, systemService, cleepService, confirm,
         self.debugOptions = [];
         self.debugs = [];
         self.renderings = [];
+        self.sessionOptions = [];
+        self.sessionTargets = [];
+        self.sessionDuration = 60;
+        self.sessionDurations = [
+            { value: 15, label: "15 minutes" },
+            { value: 30, label: "30 minutes" },
+            { value: 60, label: "1 hour" },
+            { value: 240, label: "4 hours" },
+            { value: 1440, label: "1 day" },
+        ];
+        self.coreComponents = ['internal_bus', 'events_broker', 'cleep_filesystem', 'formatters_broker', 'crash_report', 'critical_resources', 'drivers'];
         self.backupDelays = [
             { value: 5, label: "every 5 minutes" },
             { value: 10, label: "every 10 minutes" },
@@ -22,8 +33,67 @@ function($rootScope, $timeout, $q, toast, systemService, cleepService, confirm,
             { value: 30, label: "every 30 minutes" },
             { value: 60, label: "every 60 minutes" },
         ];
+        self.snapshots = [];
+        self.snapshotRetentions = [
+            { value: 5, label: "Keep 5 snapshots" },
+            { value: 10, label: "Keep 10 snapshots" },
+            { value: 20, label: "Keep 20 snapshots" },
+            { value: 50, label: "Keep 50 snapshots" },
+        ];
+        self.driversCache = null;
+        self.hardware = [];
+        self.gcStats = [];
+        self.threadsDump = [];
+        self.taskStats = [];
+        self.cpuProfile = null;
+        self.cpuProfiles = [
+            { value: null, label: 'System default' },
+            { value: 'ondemand', label: 'Balanced (ondemand governor)' },
+            { value: 'performance', label: 'Performance (max frequency)' },
+            { value: 'powersave', label: 'Power save (min frequency)' },
+            { value: 'custom', label: 'Custom frequency range' },
+        ];
+        self.cpuFrequencies = [];
+        self.processPriority = null;
+        self.processPresets = [
+            { value: 'default', label: 'Kernel defaults' },
+            { value: 'responsive', label: 'Responsive (higher cpu and I/O priority)' },
+            { value: 'background', label: 'Background (lower cpu and idle I/O priority)' },
+        ];
+        self.processPresetSettings = {
+            default: { nice: null, ioClass: null, ioLevel: null },
+            responsive: { nice: -5, ioClass: 'besteffort', ioLevel: 0 },
+            background: { nice: 10, ioClass: 'idle', ioLevel: null },
+        };
+        self.vmProfile = null;
+        self.vmProfiles = [
+            { value: 'default', label: 'Kernel defaults' },
+            { value: 'sdcard', label: 'SD card friendly (less frequent, larger writes)' },
+            { value: 'lowmemory', label: 'Low memory (small dirty cache, swap to zram)' },
+        ];
+        self.vmBenchmark = [];
+        self.arenaMaxOptions = [
+            { value: null, label: 'Default malloc arenas' },
+            { value: 1, label: '1 malloc arena' },
+            { value: 2, label: '2 malloc arenas' },
+            { value: 4, label: '4 malloc arenas' },
+        ];
+        self.reloadOptions = [];
+        self.reloadTarget = null;
+        self.startupProfile = null;
+        self.startupRows = [];
+        self.previousStartups = [];
         self.codeButtons = [];
         self.logs = '';
+        self.logLevels = [];
+        self.jsonLogFormat = false;
+        self.logLevelOptions = [
+            { value: 'DEBUG', label: 'Debug' },
+            { value: 'INFO', label: 'Info' },
+            { value: 'WARNING', label: 'Warning' },
+            { value: 'ERROR', label: 'Error' },
+            { value: 'CRITICAL', label: 'Critical' },
+        ];
         self.editorConfig = {
             lineWrapping: true,
             lineNumbers: true,
@@ -58,6 +128,64 @@ function($rootScope, $timeout, $q, toast, systemService, cleepService, confirm,
                 });
         };
 
+        /**
+         * Load configuration snapshots
+         */
+        self.loadSnapshots = function() {
+            systemService.listConfigSnapshots()
+                .then(function(resp) {
+                    self.snapshots = resp.data.map((snapshot) => ({
+                        title: new Date(snapshot.timestamp * 1000).toLocaleString(),
+                        subtitle: snapshot.files + ' file(s), ' + snapshot.size + ' bytes',
+                        icon: 'history',
+                        clicks: [
+                            {
+                                click: self.restoreSnapshot,
+                                icon: 'backup-restore',
+                                tooltip: 'Restore this configuration',
+                                meta: { snapshot },
+                            },
+                        ],
+                    }));
+                });
+        };
+
+        /**
+         * Restore configuration snapshot
+         */
+        self.restoreSnapshot = function(meta) {
+            const date = new Date(meta.snapshot.timestamp * 1000).toLocaleString();
+            confirm.open('Restore configuration', 'Restore configuration saved on ' + date + '?<br>Cleep must be restarted after restore.', 'Restore', 'Cancel')
+                .then(function() {
+                    return systemService.restoreConfigSnapshot(meta.snapshot.id);
+                })
+                .then(function(resp) {
+                    toast.success(resp.data.restored + ' file(s) restored. Please restart Cleep');
+                });
+        };
+
+        /**
+         * Set backup throttling
+         */
+        self.setBackupThrottling = function(value) {
+            systemService.setBackupThrottling(value)
+                .then(function() {
+                    toast.success('Backup throttling ' + (value ? 'enabled' : 'disabled'));
+                });
+        };
+
+        /**
+         * Set snapshot retention
+         */
+        self.setSnapshotRetention = function() {
+            systemService.setSnapshotRetention(Number(self.config.snapshotretention))
+                .then(function() {
+                    cleepService.reloadModuleConfig('system');
+                    toast.success('Snapshot retention saved');
+                    self.loadSnapshots();
+                });
+        };
+
         /**
          * Set filesystem protection
          */
@@ -99,6 +227,16 @@ function($rootScope, $timeout, $q, toast, systemService, cleepService, confirm,
             }
         };
 
+        /**
+         * Set led patterns
+         */
+        self.setLedPatterns = function(value) {
+            systemService.setLedPatterns(value)
+                .then(function() {
+                    toast.success('LED patterns ' + (value ? 'enabled' : 'disabled'));
+                });
+        };
+
         /**
          * Save crash report
          */
@@ -236,13 +374,34 @@ function($rootScope, $timeout, $q, toast, systemService, cleepService, confirm,
          * Get logs
          */
         self.getLogs = function() {
-            systemService.getLogs()
+            const request = self.logLevels.length ? systemService.searchLogs(null, self.logLevels) : systemService.getLogs();
+            request
                 .then(function(resp) {
                     self.logs = resp.data.join('');
                     // self.refreshEditor();
                 });
         };
 
+        /**
+         * Log format changed
+         */
+        self.logFormatChanged = function(value) {
+            systemService.setLogFormat(value ? 'json' : 'text')
+                .then(function() {
+                    toast.success('Log format updated');
+                });
+        };
+
+        /**
+         * RAM logs changed
+         */
+        self.ramLogsChanged = function(value) {
+            systemService.setRamLogs(value)
+                .then(function() {
+                    toast.success(value ? 'Logs are kept in RAM' : 'Logs are written to SD card');
+                });
+        };
+
         /**
          * Module debug changed
          */
@@ -270,6 +429,30 @@ function($rootScope, $timeout, $q, toast, systemService, cleepService, confirm,
             systemService.setCoreDebug(value);
         };
 
+        /**
+         * Start debug session
+         */
+        self.startDebugSession = function() {
+            if (!self.sessionTargets.length) {
+                toast.error('Please select at least one target');
+                return;
+            }
+            systemService.startDebugSession(self.sessionTargets, Number(self.sessionDuration))
+                .then(function() {
+                    toast.success('Debug session started');
+                });
+        };
+
+        /**
+         * Stop debug session
+         */
+        self.stopDebugSession = function() {
+            systemService.stopDebugSession()
+                .then(function() {
+                    toast.success('Debug session stopped');
+                });
+        };
+
         /**
          * Trace changed
          */
@@ -281,6 +464,337 @@ function($rootScope, $timeout, $q, toast, systemService, cleepService, confirm,
                 });
         };
 
+        /**
+         * Load cpu profile
+         */
+        self.loadCpuProfile = function() {
+            systemService.getCpuProfile()
+                .then(function(resp) {
+                    self.cpuProfile = resp.data;
+                    self.cpuFrequencies = [];
+                    const policy = resp.data.status.policies[0];
+                    if (policy && policy.hwminfreq && policy.hwmaxfreq) {
+                        for (let freq = policy.hwminfreq; freq < policy.hwmaxfreq; freq += 100) {
+                            self.cpuFrequencies.push({ value: freq, label: freq + 'MHz' });
+                        }
+                        self.cpuFrequencies.push({ value: policy.hwmaxfreq, label: policy.hwmaxfreq + 'MHz' });
+                        self.cpuProfile.minfreq = self.cpuProfile.minfreq || policy.hwminfreq;
+                        self.cpuProfile.maxfreq = self.cpuProfile.maxfreq || policy.hwmaxfreq;
+                    }
+                });
+        };
+
+        /**
+         * Tweak cpu profile
+         */
+        self.tweakCpuProfile = function() {
+            const custom = self.cpuProfile.profile === 'custom';
+            systemService.tweakCpuProfile(
+                self.cpuProfile.profile,
+                custom ? Number(self.cpuProfile.minfreq) : null,
+                custom ? Number(self.cpuProfile.maxfreq) : null,
+            )
+                .then(function() {
+                    cleepService.reloadModuleConfig('system');
+                    toast.success('CPU profile applied');
+                });
+        };
+
+        /**
+         * Load process priority
+         */
+        self.loadProcessPriority = function() {
+            systemService.getProcessPriority()
+                .then(function(resp) {
+                    const settings = resp.data.status.settings;
+                    let preset = 'default';
+                    for (const [name, values] of Object.entries(self.processPresetSettings)) {
+                        if (values.nice === settings.nice && values.ioClass === settings.ioclass) {
+                            preset = name;
+                        }
+                    }
+                    self.processPriority = {
+                        preset: preset,
+                        isolateRpc: !!(settings.threadgroups && settings.threadgroups.rpc),
+                        cpus: resp.data.status.availablecpus,
+                    };
+                });
+        };
+
+        /**
+         * Tweak process priority
+         */
+        self.tweakProcessPriority = function() {
+            const preset = self.processPresetSettings[self.processPriority.preset];
+            const cpus = self.processPriority.cpus;
+            const isolate = self.processPriority.isolateRpc && cpus.length > 1;
+            systemService.tweakProcessPriority(
+                preset.nice,
+                preset.ioClass,
+                preset.ioLevel,
+                isolate ? cpus.slice(1) : null,
+                isolate ? { rpc: cpus.slice(0, 1) } : null,
+            )
+                .then(function() {
+                    cleepService.reloadModuleConfig('system');
+                    toast.success('Process priority applied');
+                });
+        };
+
+        /**
+         * Load vm profile
+         */
+        self.loadVmProfile = function() {
+            systemService.getVmProfile()
+                .then(function(resp) {
+                    self.vmProfile = resp.data;
+                    const benchmark = resp.data.benchmark;
+                    const toMb = (size) => Math.round(size / 1048576) + 'MB';
+                    const toItem = (title, result) => ({
+                        title: title,
+                        subtitle: 'Write amplification ' + result.amplification + ' (' + toMb(result.diskbytes) + ' written to disk for ' + toMb(result.logicalbytes) + '), min available memory ' + toMb(result.minavailable) + ', swap used ' + toMb(result.swapused),
+                    });
+                    self.vmBenchmark = [];
+                    if (benchmark.before) {
+                        self.vmBenchmark.push(toItem('Current settings', benchmark.before));
+                    }
+                    if (benchmark.after) {
+                        self.vmBenchmark.push(toItem('Profile "' + benchmark.profile + '"', benchmark.after));
+                    }
+                });
+        };
+
+        /**
+         * Tweak vm profile
+         */
+        self.tweakVmProfile = function() {
+            systemService.tweakVmProfile(self.vmProfile.profile)
+                .then(function() {
+                    cleepService.reloadModuleConfig('system');
+                    toast.success('Memory profile applied');
+                });
+        };
+
+        /**
+         * Tweak zram swap
+         */
+        self.tweakZram = function(value) {
+            systemService.tweakZram(value)
+                .then(function() {
+                    cleepService.reloadModuleConfig('system');
+                    toast.success('Zram swap ' + (value ? 'enabled' : 'disabled'));
+                });
+        };
+
+        /**
+         * Tweak memory reclaim
+         */
+        self.tweakMemoryReclaim = function() {
+            systemService.tweakMemoryReclaim(self.config.memoryreclaim, self.config.mallocarenamax)
+                .then(function() {
+                    cleepService.reloadModuleConfig('system');
+                    toast.success('Memory reclaim updated');
+                });
+        };
+
+        /**
+         * Reclaim memory now
+         */
+        self.reclaimMemory = function() {
+            systemService.reclaimMemory()
+                .then(function(resp) {
+                    const reclaimed = Math.round(resp.data.reclaimed / 1024);
+                    toast.success(reclaimed + 'KB given back to system (' + resp.data.collected + ' objects collected)');
+                });
+        };
+
+        /**
+         * Benchmark selected vm profile
+         */
+        self.benchmarkVmProfile = function() {
+            systemService.benchmarkVmProfile(self.vmProfile.profile || 'sdcard')
+                .then(function() {
+                    toast.info('Benchmark started, refresh in few seconds');
+                });
+        };
+
+        /**
+         * Load hardware infos
+         */
+        self.loadHardwareInfos = function() {
+            systemService.getHardwareInfos()
+                .then(function(resp) {
+                    const infos = resp.data;
+                    const toMb = (size) => Math.round(size / 1048576) + 'MB';
+                    const maxFreqs = infos.cpu.frequencies.map((freq) => freq.max).filter((freq) => freq);
+                    self.hardware = [
+                        { title: 'Board', subtitle: infos.board.model || 'Unknown' },
+                        {
+                            title: 'CPU',
+                            subtitle: infos.cpu.count + ' core(s)' + (maxFreqs.length ? ' up to ' + Math.max(...maxFreqs) / 1000 + 'MHz' : ''),
+                        },
+                        { title: 'Memory', subtitle: toMb(infos.memory.total) + ' RAM, ' + toMb(infos.memory.swap) + ' swap' },
+                    ];
+                    for (const device of infos.storage) {
+                        self.hardware.push({
+                            title: 'Storage ' + device.name,
+                            subtitle: toMb(device.size) + (device.removable ? ' (removable)' : ''),
+                        });
+                    }
+                });
+        };
+
+        /**
+         * Set thread watchdog
+         */
+        self.setWatchdog = function(value) {
+            systemService.setWatchdog(value)
+                .then(function() {
+                    toast.success('Watchdog ' + (value ? 'enabled' : 'disabled'));
+                });
+        };
+
+        /**
+         * Dump threads stacks
+         */
+        self.dumpThreads = function() {
+            systemService.dumpThreads()
+                .then(function(resp) {
+                    self.threadsDump = resp.data.threads.map(function(thread) {
+                        return {
+                            title: thread.name + (thread.daemon ? ' (daemon)' : ''),
+                            subtitle: thread.stack.slice(-2).join(' '),
+                        };
+                    });
+                });
+        };
+
+        /**
+         * Set app task stats
+         */
+        self.setAppTaskStats = function(value) {
+            systemService.setAppTaskStats(value)
+                .then(function() {
+                    toast.success('Applications tasks statistics ' + (value ? 'enabled' : 'disabled'));
+                });
+        };
+
+        /**
+         * Load periodic tasks statistics
+         */
+        self.loadTaskStats = function() {
+            systemService.getTaskStats()
+                .then(function(resp) {
+                    const format = (value) => value === null ? '-' : value + 's';
+                    self.taskStats = Object.entries(resp.data).map(function([name, stats]) {
+                        return {
+                            title: name + ' (every ' + stats.interval + 's, ' + stats.fires + ' runs, ' + stats.overruns + ' overruns)',
+                            subtitle: 'jitter p50 ' + format(stats.jitter.p50) + ', p90 ' + format(stats.jitter.p90)
+                                + ', p99 ' + format(stats.jitter.p99) + ', max ' + format(stats.jitter.max)
+                                + ' - execution mean ' + format(stats.execution.mean) + ', max ' + format(stats.execution.max),
+                        };
+                    });
+                });
+        };
+
+        /**
+         * Load garbage collector statistics
+         */
+        self.loadGcStats = function() {
+            systemService.getGcStats()
+                .then(function(resp) {
+                    const buckets = resp.data.buckets;
+                    self.gcStats = resp.data.generations.map(function(gen) {
+                        const histogram = gen.histogram
+                            .map((count, index) => count ? (index < buckets.length ? '<=' + buckets[index] : '>' + buckets[buckets.length-1]) + 'ms: ' + count : null)
+                            .filter((item) => item);
+                        return {
+                            title: 'Generation ' + gen.generation + ': ' + gen.count + ' collections, ' + gen.collected + ' objects collected',
+                            subtitle: 'mean ' + gen.meanduration + 'ms, max ' + gen.maxduration + 'ms' + (histogram.length ? ' (' + histogram.join(', ') + ')' : ''),
+                        };
+                    });
+                });
+        };
+
+        /**
+         * Load drivers artifacts cache statistics
+         */
+        self.loadDriversCache = function() {
+            systemService.getDriverArtifactsCache()
+                .then(function(resp) {
+                    self.driversCache = resp.data;
+                });
+        };
+
+        /**
+         * Clear drivers artifacts cache
+         */
+        self.clearDriversCache = function() {
+            confirm.open('Clear drivers cache', 'Drivers will need to download their files again on repair. Continue?', 'Clear', 'Cancel')
+                .then(function() {
+                    return systemService.clearDriverArtifactsCache();
+                })
+                .then(function() {
+                    toast.success('Drivers cache cleared');
+                    self.loadDriversCache();
+                });
+        };
+
+        /**
+         * Reload selected application
+         */
+        self.reloadApp = function() {
+            if (!self.reloadTarget) {
+                return;
+            }
+            systemService.reloadApp(self.reloadTarget)
+                .then(function(resp) {
+                    if (resp.data.restart) {
+                        toast.info('Application cannot be reloaded, Cleep is restarting');
+                    } else {
+                        toast.success('Application reloaded in ' + resp.data.duration + 's');
+                    }
+                });
+        };
+
+        /**
+         * Load startup profile and build waterfall rows
+         */
+        self.loadStartupProfile = function() {
+            systemService.getStartupProfile()
+                .then(function(resp) {
+                    const profile = resp.data.current;
+                    self.startupProfile = profile;
+                    self.startupRows = [];
+                    self.previousStartups = resp.data.previous.map((previous) => ({
+                        title: new Date(previous.timestamp * 1000).toLocaleString(),
+                        subtitle: 'Started in ' + previous.duration + 's (first RPC after ' + previous.rpc + 's)',
+                    }));
+                    if (!profile || !profile.duration) {
+                        return;
+                    }
+
+                    const toRow = (label, start, duration) => ({
+                        label,
+                        duration,
+                        left: (start / profile.duration * 100) + '%',
+                        width: Math.max(duration / profile.duration * 100, 0.5) + '%',
+                    });
+                    for (const span of profile.timeline) {
+                        self.startupRows.push(toRow(span.name + ' ' + span.phase, span.start, span.duration));
+                    }
+                    const apps = Object.keys(profile.apps).sort((a, b) => (profile.apps[a] || 0) - (profile.apps[b] || 0));
+                    for (const app of apps) {
+                        if (profile.apps[app] !== null) {
+                            self.startupRows.push(toRow(app + ' ready', 0, profile.apps[app]));
+                        }
+                    }
+                    if (profile.rpc !== null) {
+                        self.startupRows.push(toRow('first RPC served', 0, profile.rpc));
+                    }
+                });
+        };
+
         /**
          * Init controller
          */
@@ -295,6 +809,10 @@ function($rootScope, $timeout, $q, toast, systemService, cleepService, confirm,
                 .then(function(resps) {
                     self._initRenderings(resps[0], resps[1]);
 
+                    for (const component of self.coreComponents) {
+                        self.sessionOptions.push({ label: 'core: ' + component, value: component });
+                    }
+
                     const apps = Object.keys(resps[2].data).sort();
                     for (const app of apps) {
                         const debug = resps[2].data[app].debug;
@@ -304,12 +822,22 @@ function($rootScope, $timeout, $q, toast, systemService, cleepService, confirm,
                             value: app,
                             debug,
                         });
+                        self.sessionOptions.push({ label: app, value: app });
+                        self.reloadOptions.push({ label: app, value: app });
                         if (debug) {
                             self.debugs.push(app);
                         }
                     }
                 });
 
+            self.loadSnapshots();
+            self.loadStartupProfile();
+            self.loadDriversCache();
+            self.loadHardwareInfos();
+            self.loadCpuProfile();
+            self.loadProcessPriority();
+            self.loadVmProfile();
+
             self.codeButtons = [
                 { label: 'Refresh logs', icon: 'refresh', click: self.getLogs },
                 { label: 'Download logs', icon: 'download', click: self.downloadLogs },
@@ -326,6 +854,7 @@ function($rootScope, $timeout, $q, toast, systemService, cleepService, confirm,
             function(newVal, oldVal) {
                 if( newVal && Object.keys(newVal).length ) { 
                     Object.assign(self.config, newVal);
+                    self.jsonLogFormat = self.config.logformat === 'json';
                 }   
             }   
         );
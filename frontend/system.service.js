@@ -63,6 +63,33 @@ function($rootScope, rpcService, cleepService, toast, cleepToolbarService) {
         return rpcService.sendCommand('get_logs', 'system');
     };
 
+    /**
+     * Search logs
+     */
+    self.searchLogs = function(pattern, levels) {
+        return rpcService.sendCommand('search_logs', 'system', {'pattern': pattern || null, 'levels': levels || null});
+    };
+
+    /**
+     * Set log format
+     */
+    self.setLogFormat = function(logFormat) {
+        return rpcService.sendCommand('set_log_format', 'system', {'log_format': logFormat})
+            .then(function() {
+                return cleepService.reloadModuleConfig('system');
+            });
+    };
+
+    /**
+     * Set RAM logs
+     */
+    self.setRamLogs = function(enable) {
+        return rpcService.sendCommand('set_ram_logs', 'system', {'enable': enable})
+            .then(function() {
+                return cleepService.reloadModuleConfig('system');
+            });
+    };
+
     /**
      * Clear logs
      */
@@ -84,6 +111,26 @@ function($rootScope, rpcService, cleepService, toast, cleepToolbarService) {
         return rpcService.sendCommand('set_core_debug', 'system', {'debug':debug});
     };
 
+    /**
+     * Start debug session
+     */
+    self.startDebugSession = function(targets, duration) {
+        return rpcService.sendCommand('start_debug_session', 'system', {'targets': targets, 'duration': duration})
+            .then(function() {
+                return cleepService.reloadModuleConfig('system');
+            });
+    };
+
+    /**
+     * Stop debug session
+     */
+    self.stopDebugSession = function() {
+        return rpcService.sendCommand('stop_debug_session', 'system')
+            .then(function() {
+                return cleepService.reloadModuleConfig('system');
+            });
+    };
+
     /**
      * Set trace
      */
@@ -136,6 +183,62 @@ function($rootScope, rpcService, cleepService, toast, cleepToolbarService) {
         return rpcService.sendCommand('backup_cleep_config', 'system', {});
     };
 
+    /**
+     * List configuration snapshots
+     */
+    self.listConfigSnapshots = function() {
+        return rpcService.sendCommand('list_config_snapshots', 'system');
+    };
+
+    /**
+     * Restore configuration snapshot
+     */
+    self.restoreConfigSnapshot = function(snapshotId) {
+        return rpcService.sendCommand('restore_config_snapshot', 'system', {'snapshot_id': snapshotId});
+    };
+
+    /**
+     * Enable or disable backup throttling
+     */
+    self.setBackupThrottling = function(enable) {
+        return rpcService.sendCommand('set_backup_throttling', 'system', {'enable': enable});
+    };
+
+    /**
+     * Set number of configuration snapshots to keep
+     */
+    self.setSnapshotRetention = function(retention) {
+        return rpcService.sendCommand('set_snapshot_retention', 'system', {'retention': retention});
+    };
+
+    /**
+     * Reload application without restarting Cleep
+     */
+    self.reloadApp = function(app) {
+        return rpcService.sendCommand('reload_app', 'system', {'app': app}, 60000);
+    };
+
+    /**
+     * Get drivers artifacts cache statistics
+     */
+    self.getDriverArtifactsCache = function() {
+        return rpcService.sendCommand('get_driver_artifacts_cache', 'system');
+    };
+
+    /**
+     * Clear drivers artifacts cache
+     */
+    self.clearDriverArtifactsCache = function() {
+        return rpcService.sendCommand('clear_driver_artifacts_cache', 'system');
+    };
+
+    /**
+     * Get startup profile
+     */
+    self.getStartupProfile = function() {
+        return rpcService.sendCommand('get_startup_profile', 'system');
+    };
+
     /**
      * Tweak activity led
      */
@@ -150,6 +253,133 @@ function($rootScope, rpcService, cleepService, toast, cleepToolbarService) {
         return rpcService.sendCommand('tweak_power_led', 'system', {'enable': enable});
     };
 
+    /**
+     * Tweak cpu profile
+     */
+    self.tweakCpuProfile = function(profile, minFreq, maxFreq) {
+        return rpcService.sendCommand('tweak_cpu_profile', 'system', {'profile': profile, 'min_freq': minFreq, 'max_freq': maxFreq});
+    };
+
+    /**
+     * Get cpu profile
+     */
+    self.getCpuProfile = function() {
+        return rpcService.sendCommand('get_cpu_profile', 'system');
+    };
+
+    /**
+     * Tweak process priority
+     */
+    self.tweakProcessPriority = function(nice, ioClass, ioLevel, cpus, threadGroups) {
+        return rpcService.sendCommand('tweak_process_priority', 'system', {
+            'nice': nice, 'io_class': ioClass, 'io_level': ioLevel, 'cpus': cpus, 'thread_groups': threadGroups,
+        });
+    };
+
+    /**
+     * Get process priority
+     */
+    self.getProcessPriority = function() {
+        return rpcService.sendCommand('get_process_priority', 'system');
+    };
+
+    /**
+     * Tweak vm profile
+     */
+    self.tweakVmProfile = function(profile) {
+        return rpcService.sendCommand('tweak_vm_profile', 'system', {'profile': profile});
+    };
+
+    /**
+     * Tweak zram swap
+     */
+    self.tweakZram = function(enable) {
+        return rpcService.sendCommand('tweak_zram', 'system', {'enable': enable});
+    };
+
+    /**
+     * Tweak memory reclaim
+     */
+    self.tweakMemoryReclaim = function(enable, arenaMax) {
+        return rpcService.sendCommand('tweak_memory_reclaim', 'system', {'enable': enable, 'arena_max': arenaMax});
+    };
+
+    /**
+     * Reclaim memory now
+     */
+    self.reclaimMemory = function() {
+        return rpcService.sendCommand('reclaim_memory', 'system');
+    };
+
+    /**
+     * Get vm profile
+     */
+    self.getVmProfile = function() {
+        return rpcService.sendCommand('get_vm_profile', 'system');
+    };
+
+    /**
+     * Benchmark vm profile
+     */
+    self.benchmarkVmProfile = function(profile) {
+        return rpcService.sendCommand('benchmark_vm_profile', 'system', {'profile': profile});
+    };
+
+    /**
+     * Get hardware infos
+     */
+    self.getHardwareInfos = function() {
+        return rpcService.sendCommand('get_hardware_infos', 'system');
+    };
+
+    /**
+     * Set thread watchdog
+     */
+    self.setWatchdog = function(enable) {
+        return rpcService.sendCommand('set_watchdog', 'system', {'enable': enable})
+            .then(function() {
+                return cleepService.reloadModuleConfig('system');
+            });
+    };
+
+    /**
+     * Set app task stats
+     */
+    self.setAppTaskStats = function(enable) {
+        return rpcService.sendCommand('set_app_task_stats', 'system', {'enable': enable})
+            .then(function() {
+                return cleepService.reloadModuleConfig('system');
+            });
+    };
+
+    /**
+     * Get periodic tasks statistics
+     */
+    self.getTaskStats = function() {
+        return rpcService.sendCommand('get_task_stats', 'system');
+    };
+
+    /**
+     * Dump threads stacks
+     */
+    self.dumpThreads = function() {
+        return rpcService.sendCommand('dump_threads', 'system');
+    };
+
+    /**
+     * Get garbage collector statistics
+     */
+    self.getGcStats = function() {
+        return rpcService.sendCommand('get_gc_stats', 'system');
+    };
+
+    /**
+     * Enable or disable led patterns
+     */
+    self.setLedPatterns = function(enable) {
+        return rpcService.sendCommand('set_led_patterns', 'system', {'enable': enable});
+    };
+
     /**
      * Watch for system config changes to add restart/reboot buttons if restart/reboot is needed
      */
@@ -210,4 +440,28 @@ function($rootScope, rpcService, cleepService, toast, cleepToolbarService) {
         }
     });
 
+    /**
+     * Catch garbage collector monitoring event
+     */
+    $rootScope.$on('system.monitoring.gc', function(event, uuid, params) {
+        for( var i=0; i<cleepService.devices.length; i++ ) {
+            if( cleepService.devices[i].type==='monitorgc' ) {
+                Object.assign(cleepService.devices[i], params);
+                break;
+            }
+        }
+    });
+
+    /**
+     * Catch thermal monitoring event
+     */
+    $rootScope.$on('system.monitoring.thermal', function(event, uuid, params) {
+        for( var i=0; i<cleepService.devices.length; i++ ) {
+            if( cleepService.devices[i].type==='monitorthermal' ) {
+                Object.assign(cleepService.devices[i], params);
+                break;
+            }
+        }
+    });
+
 }]);
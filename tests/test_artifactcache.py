@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+sys.path.append('../')
+from backend.artifactcache import ArtifactCache
+from unittest.mock import Mock
+
+class FakeFilesystem():
+    def __init__(self):
+        self.copy = Mock(side_effect=self._copy)
+
+    def _copy(self, source, destination):
+        shutil.copy2(source, destination)
+        return True
+
+    def rm(self, path):
+        os.remove(path)
+        return True
+
+    def mkdir(self, path, recursive=False):
+        os.makedirs(path, exist_ok=True)
+        return True
+
+    def read_json(self, path):
+        with open(path) as fd:
+            return json.load(fd)
+
+    def write_json(self, path, data):
+        with open(path, 'w') as fd:
+            json.dump(data, fd)
+        return True
+
+class TestsArtifactCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.tmp_dir, 'cache')
+        self.fs = FakeFilesystem()
+        self.cache = ArtifactCache(self.fs, self.cache_path, 250)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _make_file(self, name, content):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'wb') as fd:
+            fd.write(content)
+        return path
+
+    def test_add_and_get(self):
+        self.assertTrue(self.cache.add('audio/hifiberry/overlay', self._make_file('overlay', b'a' * 100)))
+
+        path = self.cache.get('audio/hifiberry/overlay')
+
+        with open(path, 'rb') as fd:
+            self.assertEqual(fd.read(), b'a' * 100)
+        self.assertEqual(self.cache.get_stats(), {'entries': 1, 'size': 100, 'maxsize': 250, 'hits': 1, 'misses': 0})
+
+    def test_get_keys(self):
+        self.cache.add('audio/hifiberry/overlay', self._make_file('overlay', b'a' * 10))
+        self.cache.add('audio/respeaker/overlay', self._make_file('other', b'b' * 10))
+
+        self.assertEqual(self.cache.get_keys('audio/hifiberry/'), ['audio/hifiberry/overlay'])
+        self.assertEqual(self.cache.get_keys(), ['audio/hifiberry/overlay', 'audio/respeaker/overlay'])
+
+    def test_get_miss(self):
+        self.assertIsNone(self.cache.get('audio/hifiberry/overlay'))
+
+        self.assertEqual(self.cache.get_stats()['misses'], 1)
+
+    def test_get_corrupted(self):
+        self.cache.add('key', self._make_file('overlay', b'a' * 100))
+        with open(self.cache.get('key'), 'wb') as fd:
+            fd.write(b'corrupted')
+
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(self.cache.get_stats()['entries'], 0)
+
+    def test_get_does_not_write_index(self):
+        self.cache.add('key1', self._make_file('file1', b'1' * 100))
+        self.fs.write_json = Mock(side_effect=self.fs.write_json)
+
+        self.assertIsNotNone(self.cache.get('key1'))
+
+        self.assertFalse(self.fs.write_json.called)
+
+    def test_access_time_written_on_next_add(self):
+        self.cache.add('key1', self._make_file('file1', b'1' * 100))
+        self.cache.get('key1')
+        lastaccess = self.cache._ArtifactCache__index['key1']['lastaccess']
+
+        self.cache.add('key2', self._make_file('file2', b'2' * 100))
+
+        with open(os.path.join(self.cache_path, 'index.json')) as fd:
+            self.assertEqual(json.load(fd)['key1']['lastaccess'], lastaccess)
+
+    def test_record_miss(self):
+        self.cache.record_miss()
+
+        self.assertEqual(self.cache.get_stats()['misses'], 1)
+
+    def test_add_too_big(self):
+        self.assertFalse(self.cache.add('key', self._make_file('big', b'a' * 300)))
+
+    def test_lru_eviction(self):
+        self.cache.add('key1', self._make_file('file1', b'1' * 100))
+        time.sleep(0.01)
+        self.cache.add('key2', self._make_file('file2', b'2' * 100))
+        time.sleep(0.01)
+        self.cache.get('key1')
+        time.sleep(0.01)
+
+        self.cache.add('key3', self._make_file('file3', b'3' * 100))
+
+        self.assertIsNotNone(self.cache.get('key1'))
+        self.assertIsNone(self.cache.get('key2'))
+        self.assertIsNotNone(self.cache.get('key3'))
+        self.assertEqual(self.cache.get_stats()['size'], 200)
+
+    def test_deduplicated_content(self):
+        self.cache.add('key1', self._make_file('file1', b'1' * 100))
+        self.cache.add('key2', self._make_file('file2', b'1' * 100))
+
+        self.assertEqual(self.cache.get_stats()['size'], 100)
+        self.assertEqual(self.fs.copy.call_count, 1)
+
+    def test_index_persisted(self):
+        self.cache.add('key1', self._make_file('file1', b'1' * 100))
+
+        cache = ArtifactCache(self.fs, self.cache_path, 250)
+
+        self.assertIsNotNone(cache.get('key1'))
+
+    def test_clear(self):
+        self.cache.add('key1', self._make_file('file1', b'1' * 100))
+
+        self.assertTrue(self.cache.clear())
+
+        self.assertEqual(self.cache.get_stats()['entries'], 0)
+        self.assertEqual(os.listdir(self.cache_path), ['index.json'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import sys
+import time
+import threading
+sys.path.append('../')
+from backend.backupworker import BackupWorker
+from unittest.mock import Mock, patch
+
+class TestsBackupWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        self.calls = 0
+        self.worker = BackupWorker(self._backup)
+
+    def tearDown(self):
+        self.release.set()
+        self.worker.stop(2.0)
+
+    def _backup(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(2.0)
+        return True
+
+    def test_flush_without_running_worker_runs_backup_inline(self):
+        self.assertTrue(self.worker.flush(1.0))
+
+        self.assertEqual(self.calls, 1)
+
+    def test_flush(self):
+        self.worker.start()
+
+        self.assertTrue(self.worker.flush(2.0))
+
+        self.assertEqual(self.calls, 1)
+        self.assertFalse(self.worker.is_pending())
+
+    def test_flush_timeout(self):
+        self.release.clear()
+        self.worker.start()
+
+        self.assertFalse(self.worker.flush(0.1))
+
+    def test_requests_are_coalesced(self):
+        self.release.clear()
+        self.worker.start()
+        self.worker.request()
+        self.started.wait(2.0)
+
+        # requests received while a backup is running trigger only one more backup
+        for _ in range(5):
+            self.worker.request()
+        self.release.set()
+        self.assertTrue(self.worker.flush(2.0))
+
+        self.assertEqual(self.calls, 2)
+
+    def test_jitter_delays_scheduled_request(self):
+        self.worker = BackupWorker(self._backup, jitter=10.0)
+        self.worker.start()
+
+        with patch('backend.backupworker.random.uniform', Mock(return_value=10.0)):
+            self.worker.request(jitter=True)
+            time.sleep(0.1)
+            self.assertEqual(self.calls, 0)
+            self.assertTrue(self.worker.is_pending())
+
+            # urgent request does not wait for jitter
+            self.assertTrue(self.worker.flush(2.0))
+        self.assertEqual(self.calls, 1)
+
+    def test_stop_performs_pending_backup(self):
+        self.release.clear()
+        self.worker.start()
+        self.worker.request()
+        self.started.wait(2.0)
+        self.worker.request()
+        self.release.set()
+
+        self.worker.stop(2.0)
+
+        self.assertEqual(self.calls, 2)
+        self.assertFalse(self.worker.is_running())
+
+    def test_scheduled_backup_deferred_while_busy(self):
+        is_busy = Mock(side_effect=[True, True, False])
+        worker = BackupWorker(self._backup, is_busy=is_busy, max_defer=5.0)
+        worker.DEFER_CHECK_INTERVAL = 0.01
+        worker.start()
+        try:
+            worker.request(jitter=True)
+            self.started.wait(2.0)
+
+            self.assertEqual(self.calls, 1)
+            self.assertEqual(worker.deferred, 2)
+        finally:
+            worker.stop(2.0)
+
+    def test_scheduled_backup_not_deferred_beyond_max_defer(self):
+        worker = BackupWorker(self._backup, is_busy=Mock(return_value=True), max_defer=0.1)
+        worker.DEFER_CHECK_INTERVAL = 0.01
+        worker.start()
+        try:
+            worker.request(jitter=True)
+
+            self.assertTrue(self.started.wait(2.0))
+            self.assertEqual(self.calls, 1)
+        finally:
+            worker.stop(2.0)
+
+    def test_urgent_backup_not_deferred(self):
+        is_busy = Mock(return_value=True)
+        worker = BackupWorker(self._backup, is_busy=is_busy, max_defer=60.0)
+        worker.start()
+        try:
+            self.assertTrue(worker.flush(2.0))
+
+            is_busy.assert_not_called()
+        finally:
+            worker.stop(2.0)
+
+    def test_backup_exception(self):
+        worker = BackupWorker(Mock(side_effect=Exception('Test exception')))
+
+        self.assertFalse(worker.flush(1.0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+sys.path.append('../')
+from backend.configbackup import ConfigBackup
+from unittest.mock import Mock, patch
+
+class FakeFilesystem():
+    def __init__(self):
+        self.copy = Mock(side_effect=self._copy)
+        self.rm = Mock(side_effect=self._rm)
+
+    def _copy(self, source, destination):
+        shutil.copy2(source, destination)
+        return True
+
+    def _rm(self, path):
+        os.remove(path)
+        return True
+
+    def mkdir(self, path, recursive=False):
+        os.makedirs(path, exist_ok=True)
+        return True
+
+    def read_json(self, path):
+        with open(path) as fd:
+            return json.load(fd)
+
+    def write_json(self, path, data):
+        with open(path, 'w') as fd:
+            json.dump(data, fd)
+        return True
+
+class TestsConfigBackup(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmp_dir, 'cleep')
+        self.backup_dir = os.path.join(self.tmp_dir, 'cleep.bak')
+        self.manifest = os.path.join(self.tmp_dir, 'cleep.bak.json')
+        os.makedirs(os.path.join(self.source, 'sub'))
+        self.write('a.conf', 'aaaa')
+        self.write('sub/b.conf', 'bb')
+        self.fs = FakeFilesystem()
+        self.full_backup = Mock(side_effect=self._full_backup)
+        self.config_backup = ConfigBackup(self.fs, self.full_backup, self.source, self.backup_dir, self.manifest)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, path, content):
+        with open(os.path.join(self.source, path), 'w') as fd:
+            fd.write(content)
+
+    def _full_backup(self):
+        shutil.copytree(self.source, self.backup_dir, dirs_exist_ok=True)
+        return True
+
+    def test_first_backup_is_full(self):
+        self.assertTrue(self.config_backup.backup())
+
+        self.full_backup.assert_called_once()
+        self.assertFalse(self.fs.copy.called)
+        stats = self.config_backup.get_last_backup()
+        self.assertTrue(stats['full'])
+        self.assertEqual(stats['files'], 2)
+        self.assertEqual(stats['byteswritten'], 6)
+        self.assertEqual(sorted(self.config_backup.get_manifest().keys()), ['a.conf', os.path.join('sub', 'b.conf')])
+        self.assertTrue(os.path.exists(self.manifest))
+
+    def test_unchanged_files_are_skipped(self):
+        self.config_backup.backup()
+
+        self.assertTrue(self.config_backup.backup())
+
+        self.assertEqual(self.full_backup.call_count, 1)
+        self.assertFalse(self.fs.copy.called)
+        stats = self.config_backup.get_last_backup()
+        self.assertFalse(stats['full'])
+        self.assertEqual(stats['copied'], 0)
+        self.assertEqual(stats['bytesskipped'], 6)
+
+    def test_only_changed_files_are_copied(self):
+        self.config_backup.backup()
+        self.write('sub/b.conf', 'bbbbb')
+        self.write('sub/c.conf', 'c')
+
+        self.assertTrue(self.config_backup.backup())
+
+        self.assertEqual(self.fs.copy.call_count, 2)
+        stats = self.config_backup.get_last_backup()
+        self.assertEqual(stats['copied'], 2)
+        self.assertEqual(stats['byteswritten'], 6)
+        self.assertEqual(stats['bytesskipped'], 4)
+        with open(os.path.join(self.backup_dir, 'sub', 'b.conf')) as fd:
+            self.assertEqual(fd.read(), 'bbbbb')
+
+    def test_touched_file_with_same_content_is_skipped(self):
+        self.config_backup.backup()
+        path = os.path.join(self.source, 'a.conf')
+        os.utime(path, ns=(1, 1))
+
+        self.assertTrue(self.config_backup.backup())
+
+        self.assertFalse(self.fs.copy.called)
+        self.assertEqual(self.config_backup.get_manifest()['a.conf']['mtime'], 1)
+
+    def test_deleted_files_are_removed(self):
+        self.config_backup.backup()
+        os.remove(os.path.join(self.source, 'a.conf'))
+
+        self.assertTrue(self.config_backup.backup())
+
+        self.assertEqual(self.config_backup.get_last_backup()['deleted'], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.backup_dir, 'a.conf')))
+
+    def test_file_disappearing_during_scan_is_skipped(self):
+        self.config_backup.backup()
+        self.write('a.conf', 'aaaaa')
+        self.write('sub/b.conf', 'bbb')
+        real_get_file_hash = sys.modules['backend.configbackup'].get_file_hash
+        def get_file_hash(path):
+            if path.endswith('a.conf'):
+                raise FileNotFoundError(path)
+            return real_get_file_hash(path)
+
+        with patch('backend.configbackup.get_file_hash', side_effect=get_file_hash):
+            self.assertTrue(self.config_backup.backup())
+
+        self.assertEqual(list(self.config_backup.get_manifest().keys()), [os.path.join('sub', 'b.conf')])
+        self.assertEqual(self.config_backup.get_last_backup()['copied'], 1)
+
+    def test_manifest_loaded_from_filesystem(self):
+        self.config_backup.backup()
+        config_backup = ConfigBackup(self.fs, self.full_backup, self.source, self.backup_dir, self.manifest)
+
+        self.assertTrue(config_backup.backup())
+
+        self.assertEqual(self.full_backup.call_count, 1)
+        self.assertFalse(config_backup.get_last_backup()['full'])
+
+    def test_failed_full_backup_does_not_save_manifest(self):
+        self.full_backup.side_effect = None
+        self.full_backup.return_value = False
+
+        self.assertFalse(self.config_backup.backup())
+
+        self.assertFalse(os.path.exists(self.manifest))
+        self.assertIsNone(self.config_backup.get_manifest())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+sys.path.append('../')
+from backend.cpufreq import CpuFreq
+
+class TestsCpuFreq(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.policy = os.path.join(self.tmp_dir, 'devices/system/cpu/cpufreq/policy0')
+        os.makedirs(self.policy)
+        self.write('scaling_available_governors', 'conservative ondemand userspace powersave performance schedutil\n')
+        self.write('scaling_governor', 'ondemand\n')
+        self.write('scaling_min_freq', '600000\n')
+        self.write('scaling_max_freq', '1500000\n')
+        self.write('cpuinfo_min_freq', '600000\n')
+        self.write('cpuinfo_max_freq', '1500000\n')
+        self.state_path = os.path.join(self.tmp_dir, 'run/cpufreq.json')
+        self.cpufreq = CpuFreq(self.tmp_dir, self.state_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, name, content):
+        with open(os.path.join(self.policy, name), 'w') as fd:
+            fd.write(content)
+
+    def read(self, name):
+        with open(os.path.join(self.policy, name)) as fd:
+            return fd.read().strip()
+
+    def test_get_status(self):
+        status = self.cpufreq.get_status()
+
+        self.assertTrue(status['supported'])
+        self.assertIn('performance', status['governors'])
+        self.assertEqual(status['policies'], [{
+            'policy': 'policy0',
+            'governor': 'ondemand',
+            'minfreq': 600,
+            'maxfreq': 1500,
+            'hwminfreq': 600,
+            'hwmaxfreq': 1500,
+        }])
+
+    def test_get_status_not_supported(self):
+        shutil.rmtree(self.policy)
+
+        status = self.cpufreq.get_status()
+
+        self.assertEqual(status, {'supported': False, 'governors': [], 'policies': []})
+
+    def test_apply_performance(self):
+        self.write('scaling_max_freq', '1000000')
+
+        self.cpufreq.apply('performance')
+
+        self.assertEqual(self.read('scaling_governor'), 'performance')
+        self.assertEqual(self.read('scaling_min_freq'), '600000')
+        self.assertEqual(self.read('scaling_max_freq'), '1500000')
+
+    def test_apply_custom(self):
+        self.cpufreq.apply('custom', 800, 1200)
+
+        self.assertEqual(self.read('scaling_governor'), 'ondemand')
+        self.assertEqual(self.read('scaling_min_freq'), '800000')
+        self.assertEqual(self.read('scaling_max_freq'), '1200000')
+
+    def test_apply_custom_bounded_to_hardware_limits(self):
+        self.cpufreq.apply('custom', 100, 3000)
+
+        self.assertEqual(self.read('scaling_min_freq'), '600000')
+        self.assertEqual(self.read('scaling_max_freq'), '1500000')
+
+    def test_apply_custom_invalid_range(self):
+        with self.assertRaises(ValueError) as cm:
+            self.cpufreq.apply('custom', 1400, 800)
+        self.assertEqual(str(cm.exception), 'Min frequency must be lower than max frequency')
+
+    def add_policy(self, name, hw_min, hw_max, governors='ondemand powersave performance'):
+        policy = os.path.join(self.tmp_dir, 'devices/system/cpu/cpufreq', name)
+        os.makedirs(policy)
+        for filename, content in (
+            ('scaling_available_governors', governors),
+            ('scaling_governor', 'ondemand'),
+            ('scaling_min_freq', hw_min),
+            ('scaling_max_freq', hw_max),
+            ('cpuinfo_min_freq', hw_min),
+            ('cpuinfo_max_freq', hw_max),
+        ):
+            with open(os.path.join(policy, filename), 'w') as fd:
+                fd.write(content)
+        return CpuFreq(self.tmp_dir, self.state_path)
+
+    def test_apply_rejected_leaves_all_policies_unchanged(self):
+        # custom range is valid for policy0 but not for policy4 (little cores)
+        cpufreq = self.add_policy('policy4', '300000', '700000')
+
+        with self.assertRaises(ValueError) as cm:
+            cpufreq.apply('custom', 1000, 1200)
+        self.assertEqual(str(cm.exception), 'Min frequency must be lower than max frequency')
+
+        self.assertEqual(self.read('scaling_governor'), 'ondemand')
+        self.assertEqual(self.read('scaling_min_freq'), '600000')
+        self.assertEqual(self.read('scaling_max_freq'), '1500000')
+        self.assertFalse(os.path.exists(self.state_path))
+
+    def test_apply_governor_unsupported_on_one_policy(self):
+        cpufreq = self.add_policy('policy4', '300000', '700000', governors='ondemand')
+
+        with self.assertRaises(ValueError):
+            cpufreq.apply('performance')
+
+        self.assertEqual(self.read('scaling_governor'), 'ondemand')
+        self.assertFalse(os.path.exists(self.state_path))
+
+    def test_apply_invalid_profile(self):
+        with self.assertRaises(ValueError) as cm:
+            self.cpufreq.apply('turbo')
+        self.assertEqual(str(cm.exception), 'Profile "turbo" does not exist')
+
+    def test_apply_unsupported_governor(self):
+        self.write('scaling_available_governors', 'ondemand performance')
+
+        with self.assertRaises(ValueError) as cm:
+            self.cpufreq.apply('powersave')
+        self.assertEqual(str(cm.exception), 'Governor "powersave" is not supported on this device')
+
+    def test_apply_not_supported(self):
+        shutil.rmtree(self.policy)
+
+        with self.assertRaises(ValueError) as cm:
+            self.cpufreq.apply('performance')
+        self.assertEqual(str(cm.exception), 'Cpufreq is not supported on this device')
+
+    def test_restore(self):
+        self.write('scaling_governor', 'powersave\n')
+        self.write('scaling_max_freq', '1000000\n')
+        self.cpufreq.apply('custom', 800, 1200)
+        self.cpufreq.apply('performance')
+
+        self.assertTrue(self.cpufreq.restore())
+
+        self.assertEqual(self.read('scaling_governor'), 'powersave')
+        self.assertEqual(self.read('scaling_min_freq'), '600000')
+        self.assertEqual(self.read('scaling_max_freq'), '1000000')
+        self.assertFalse(os.path.exists(self.state_path))
+
+    def test_restore_after_restart(self):
+        self.cpufreq.apply('performance')
+
+        self.assertTrue(CpuFreq(self.tmp_dir, self.state_path).restore())
+        self.assertEqual(self.read('scaling_governor'), 'ondemand')
+
+    def test_restore_nothing_applied(self):
+        self.assertFalse(self.cpufreq.restore())
+
+        self.assertEqual(self.read('scaling_governor'), 'ondemand')
+
+
+if __name__ == '__main__':
+    unittest.main()
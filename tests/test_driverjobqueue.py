@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import sys
+import time
+sys.path.append('../')
+from backend.driverjobqueue import DriverJobQueue
+from unittest.mock import Mock, ANY
+
+class Launcher():
+    def __init__(self):
+        self.launched = []
+        self.callbacks = {}
+
+    def make(self, name):
+        def launch(end_callback):
+            self.launched.append(name)
+            self.callbacks[name] = end_callback
+        return launch
+
+    def end(self, name, success=True, message=None):
+        self.callbacks[name]('type', name, success, message)
+
+class TestsDriverJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.on_progress = Mock()
+        self.on_terminated = Mock()
+        self.queue = DriverJobQueue(self.on_progress, self.on_terminated)
+        self.launcher = Launcher()
+
+    def test_submit(self):
+        job, created = self.queue.submit('install', 'audio', 'hifiberry', self.launcher.make('hifiberry'))
+
+        self.assertTrue(created)
+        self.assertEqual(job['status'], 'running')
+        self.assertEqual(self.launcher.launched, ['hifiberry'])
+        self.assertFalse(self.queue.is_idle())
+
+    def test_submit_dedupes_pending_job(self):
+        job1, _ = self.queue.submit('install', 'audio', 'hifiberry', self.launcher.make('hifiberry'))
+        job2, created = self.queue.submit('install', 'audio', 'hifiberry', self.launcher.make('hifiberry'))
+
+        self.assertFalse(created)
+        self.assertEqual(job1['id'], job2['id'])
+        self.assertEqual(self.launcher.launched, ['hifiberry'])
+
+    def test_conflicting_jobs_run_serially(self):
+        self.queue.submit('install', 'audio', 'hifiberry', self.launcher.make('hifiberry'))
+        job, _ = self.queue.submit('install', 'audio', 'respeaker', self.launcher.make('respeaker'))
+
+        self.assertEqual(job['status'], 'queued')
+        self.assertEqual(self.launcher.launched, ['hifiberry'])
+
+        self.launcher.end('hifiberry')
+
+        self.assertEqual(self.launcher.launched, ['hifiberry', 'respeaker'])
+
+    def test_different_driver_types_never_overlap(self):
+        self.queue.submit('install', 'audio', 'hifiberry', self.launcher.make('hifiberry'))
+        job, _ = self.queue.submit('install', 'electronic', 'onewire', self.launcher.make('onewire'))
+
+        self.assertEqual(job['status'], 'queued')
+        self.assertEqual(self.launcher.launched, ['hifiberry'])
+
+        self.launcher.end('hifiberry')
+
+        self.assertEqual(self.launcher.launched, ['hifiberry', 'onewire'])
+        running = [job for job in self.queue.get_jobs() if job['status'] == 'running']
+        self.assertEqual([job['drivername'] for job in running], ['onewire'])
+
+    def test_independent_jobs_run_in_parallel(self):
+        self.queue.submit('install', 'audio', 'hifiberry', self.launcher.make('hifiberry'), conflict='audio')
+        job, _ = self.queue.submit('install', 'electronic', 'onewire', self.launcher.make('onewire'), conflict='gpio')
+
+        self.assertEqual(job['status'], 'running')
+        self.assertEqual(self.launcher.launched, ['hifiberry', 'onewire'])
+
+    def test_same_conflict_key_run_serially(self):
+        self.queue.submit('install', 'audio', 'hifiberry', self.launcher.make('hifiberry'), conflict='gpio')
+        job, _ = self.queue.submit('install', 'electronic', 'onewire', self.launcher.make('onewire'), conflict='gpio')
+
+        self.assertEqual(job['status'], 'queued')
+        self.assertEqual(self.launcher.launched, ['hifiberry'])
+
+    def test_exclusive_job_not_overtaken(self):
+        self.queue.submit('install', 'audio', 'hifiberry', self.launcher.make('hifiberry'), conflict='audio')
+        self.queue.submit('install', 'network', 'wifi', self.launcher.make('wifi'))
+        self.queue.submit('install', 'electronic', 'onewire', self.launcher.make('onewire'), conflict='gpio')
+
+        self.assertEqual(self.launcher.launched, ['hifiberry'])
+
+        self.launcher.end('hifiberry')
+
+        self.assertEqual(self.launcher.launched, ['hifiberry', 'wifi'])
+
+        self.launcher.end('wifi')
+
+        self.assertEqual(self.launcher.launched, ['hifiberry', 'wifi', 'onewire'])
+
+    def test_terminated(self):
+        job, _ = self.queue.submit('install', 'audio', 'hifiberry', self.launcher.make('hifiberry'))
+
+        self.launcher.end('hifiberry', False, 'error')
+
+        self.assertTrue(self.queue.is_idle())
+        terminated = self.on_terminated.call_args.args[0]
+        self.assertEqual(terminated['id'], job['id'])
+        self.assertEqual(terminated['status'], 'failed')
+        self.on_terminated.assert_called_with(terminated, False, 'error')
+        self.assertEqual(self.on_progress.call_args.args[0]['progress'], 100)
+        jobs = self.queue.get_jobs()
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs[0]['status'], 'failed')
+
+    def test_launch_exception(self):
+        self.queue.submit('install', 'audio', 'hifiberry', Mock(side_effect=Exception('Test exception')))
+
+        self.assertTrue(self.queue.is_idle())
+        self.on_terminated.assert_called_with(ANY, False, 'Test exception')
+
+    def test_created_callback_before_launch(self):
+        calls = []
+        on_created = Mock(side_effect=lambda job: calls.append('created'))
+        self.on_terminated.side_effect = lambda *args: calls.append('terminated')
+
+        job, _ = self.queue.submit('install', 'audio', 'hifiberry', Mock(side_effect=Exception('Test exception')), on_created=on_created)
+
+        self.assertEqual(calls, ['created', 'terminated'])
+        self.assertEqual(on_created.call_args.args[0]['id'], job['id'])
+
+    def test_created_callback_not_called_for_pending_job(self):
+        on_created = Mock()
+        self.queue.submit('install', 'audio', 'hifiberry', self.launcher.make('hifiberry'), on_created=on_created)
+        self.queue.submit('install', 'audio', 'hifiberry', self.launcher.make('hifiberry'), on_created=on_created)
+
+        on_created.assert_called_once()
+
+    def test_created_callback_exception(self):
+        self.queue.submit('install', 'audio', 'hifiberry', self.launcher.make('hifiberry'), on_created=Mock(side_effect=Exception('Test exception')))
+
+        self.assertEqual(self.launcher.launched, ['hifiberry'])
+
+    def test_progress(self):
+        self.queue.PROGRESS_INTERVAL = 0.05
+        self.queue.DEFAULT_DURATION = 1.0
+        self.queue.submit('install', 'audio', 'hifiberry', self.launcher.make('hifiberry'))
+
+        time.sleep(0.3)
+        self.launcher.end('hifiberry')
+
+        progresses = [call.args[0]['progress'] for call in self.on_progress.call_args_list]
+        self.assertGreaterEqual(len(progresses), 2)
+        self.assertEqual(progresses, sorted(progresses))
+        self.assertEqual(progresses[-1], 100)
+        self.assertTrue(all(progress <= self.queue.MAX_ESTIMATED_PROGRESS for progress in progresses[:-1]))
+
+if __name__ == '__main__':
+    unittest.main()
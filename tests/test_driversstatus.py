@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+sys.path.append('../')
+from backend.driversstatus import DriversStatus
+from unittest.mock import Mock
+
+class TestsDriversStatus(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.watched = os.path.join(self.tmp_dir, 'config.txt')
+        with open(self.watched, 'w') as fd:
+            fd.write('dtparam=audio=on')
+        self.driver = Mock(version='1.0.0')
+        self.driver.is_installed.return_value = True
+        self.driver.require_reboot.return_value = False
+        self.drivers = Mock()
+        self.drivers.get_all_drivers.return_value = {'audio': {'hifiberry': self.driver}}
+        self.status = DriversStatus(self.drivers, [self.watched, os.path.join(self.tmp_dir, 'missing')])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_get(self):
+        status = self.status.get()
+
+        self.assertEqual(status['drivers'], [{
+            'drivertype': 'audio',
+            'drivername': 'hifiberry',
+            'installed': True,
+            'version': '1.0.0',
+            'requirereboot': False,
+        }])
+        self.assertIsNotNone(status['timestamp'])
+
+    def test_get_cached(self):
+        self.status.get()
+        self.status.get()
+
+        self.assertEqual(self.driver.is_installed.call_count, 1)
+        self.assertEqual(self.status.hits, 1)
+        self.assertEqual(self.status.misses, 1)
+
+    def test_invalidate(self):
+        self.status.get()
+
+        self.status.invalidate()
+        self.status.get()
+
+        self.assertEqual(self.driver.is_installed.call_count, 2)
+
+    def test_watched_file_changed(self):
+        self.status.get()
+        stat = os.stat(self.watched)
+        os.utime(self.watched, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+        self.status.get()
+
+        self.assertEqual(self.driver.is_installed.call_count, 2)
+
+    def test_driver_exception(self):
+        self.driver.is_installed.side_effect = Exception('Test exception')
+
+        self.assertEqual(self.status.get()['drivers'], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import sys
+import shutil
+import hashlib
+import tempfile
+sys.path.append('../')
+from backend.filehash import get_file_hash
+from unittest.mock import patch
+
+class TestsFileHash(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, content):
+        path = os.path.join(self.tmp_dir, 'file.bin')
+        with open(path, 'wb') as fd:
+            fd.write(content)
+        return path
+
+    def test_get_file_hash(self):
+        path = self.write(b'hello')
+
+        self.assertEqual(get_file_hash(path), hashlib.sha256(b'hello').hexdigest())
+
+    @patch('backend.filehash.HASH_CHUNK_SIZE', 3)
+    def test_get_file_hash_multiple_chunks(self):
+        path = self.write(b'0123456789')
+
+        self.assertEqual(get_file_hash(path), hashlib.sha256(b'0123456789').hexdigest())
+
+    def test_get_file_hash_empty_file(self):
+        path = self.write(b'')
+
+        self.assertEqual(get_file_hash(path), hashlib.sha256(b'').hexdigest())
+
+    def test_get_file_hash_missing_file(self):
+        with self.assertRaises(OSError):
+            get_file_hash(os.path.join(self.tmp_dir, 'missing'))
+
+
+if __name__ == '__main__':
+    unittest.main()
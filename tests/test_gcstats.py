@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import gc
+import sys
+sys.path.append('../')
+from backend.gcstats import GcStats
+from unittest.mock import Mock
+
+class TestsGcStats(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Mock(return_value=0.0)
+        self.stats = GcStats(self.clock)
+
+    def tearDown(self):
+        self.stats.stop()
+
+    def collect(self, generation, start, end, collected=0):
+        self.clock.return_value = start
+        self.stats._callback('start', {'generation': generation})
+        self.clock.return_value = end
+        self.stats._callback('stop', {'generation': generation, 'collected': collected, 'uncollectable': 0})
+
+    def test_start_stop(self):
+        self.stats.start()
+        self.stats.start()
+        self.assertTrue(self.stats.is_running())
+        self.assertEqual(gc.callbacks.count(self.stats._callback), 1)
+
+        self.stats.stop()
+        self.assertFalse(self.stats.is_running())
+        self.assertNotIn(self.stats._callback, gc.callbacks)
+
+    def test_real_collection(self):
+        self.stats = GcStats()
+        self.stats.start()
+
+        gc.collect()
+
+        generations = self.stats.get_stats()['generations']
+        self.assertGreaterEqual(generations[2]['count'], 1)
+
+    def test_get_stats(self):
+        self.collect(0, 1.0, 1.0003, collected=10)
+        self.collect(0, 2.0, 2.0008, collected=5)
+        self.collect(2, 3.0, 3.150, collected=100)
+
+        stats = self.stats.get_stats()
+
+        self.assertEqual(stats['buckets'], GcStats.BUCKETS)
+        gen0 = stats['generations'][0]
+        self.assertEqual(gen0['count'], 2)
+        self.assertEqual(gen0['collected'], 15)
+        self.assertAlmostEqual(gen0['totalduration'], 1.1, places=2)
+        self.assertAlmostEqual(gen0['maxduration'], 0.8, places=2)
+        self.assertEqual(gen0['histogram'][:2], [1, 1])
+        gen2 = stats['generations'][2]
+        self.assertEqual(gen2['count'], 1)
+        self.assertAlmostEqual(gen2['meanduration'], 150.0, places=2)
+        self.assertEqual(gen2['histogram'][8], 1)
+        self.assertEqual(stats['generations'][1]['count'], 0)
+
+    def test_histogram_overflow(self):
+        self.collect(2, 0.0, 2.0)
+
+        self.assertEqual(self.stats.get_stats()['generations'][2]['histogram'][-1], 1)
+
+    def test_stop_without_start(self):
+        self.stats._callback('stop', {'generation': 0, 'collected': 1})
+
+        self.assertEqual(self.stats.get_stats()['generations'][0]['count'], 0)
+
+    def test_reset(self):
+        self.collect(1, 0.0, 0.001)
+
+        self.stats.reset()
+
+        self.assertEqual(self.stats.get_stats()['generations'][1]['count'], 0)
+
+    def test_get_pause_percent(self):
+        self.clock.return_value = 0.0
+        self.stats.start()
+        self.collect(2, 1.0, 1.5)
+        self.collect(0, 2.0, 2.5)
+        self.clock.return_value = 10.0
+
+        self.assertEqual(self.stats.get_pause_percent(), 10.0)
+
+        self.clock.return_value = 20.0
+        self.assertEqual(self.stats.get_pause_percent(), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
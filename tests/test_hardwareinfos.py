@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+sys.path.append('../')
+from backend.hardwareinfos import HardwareInfos
+from backend.leds import Leds
+from unittest.mock import Mock, patch
+
+class TestsHardwareInfos(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.write('devices/system/cpu/cpu0/cpufreq/cpuinfo_min_freq', '600000')
+        self.write('devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq', '1500000')
+        self.write('block/mmcblk0/size', '62333952')
+        self.write('block/mmcblk0/removable', '0')
+        self.write('block/mmcblk0/queue/rotational', '0')
+        self.write('block/loop0/size', '0')
+        self.write('class/thermal/thermal_zone0/type', 'cpu-thermal')
+        self.write('class/thermal/thermal_zone0/temp', '45000')
+        self.write('class/leds/ACT/brightness', '0')
+        self.write('class/leds/ACT/trigger', 'mmc0')
+        self.get_board_infos = Mock(return_value={'model': 'Raspberry Pi 4 Model B'})
+        self.infos = HardwareInfos(self.get_board_infos, Leds(os.path.join(self.tmp_dir, 'class/leds')), self.tmp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, path, content):
+        path = os.path.join(self.tmp_dir, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as fd:
+            fd.write(content)
+
+    @patch('backend.hardwareinfos.os.cpu_count', Mock(return_value=2))
+    def test_get(self):
+        infos = self.infos.get()
+
+        self.assertEqual(infos['board'], {'model': 'Raspberry Pi 4 Model B'})
+        self.assertEqual(infos['cpu'], {
+            'count': 2,
+            'frequencies': [
+                {'cpu': 0, 'min': 600000, 'max': 1500000},
+                {'cpu': 1, 'min': None, 'max': None},
+            ],
+        })
+        self.assertGreater(infos['memory']['total'], 0)
+        self.assertEqual(infos['storage'], [
+            {'name': 'mmcblk0', 'size': 62333952 * 512, 'removable': False, 'rotational': False},
+        ])
+        self.assertEqual(infos['leds']['activity'], {
+            'brightness': os.path.join(self.tmp_dir, 'class/leds/ACT/brightness'),
+            'trigger': os.path.join(self.tmp_dir, 'class/leds/ACT/trigger'),
+        })
+        self.assertEqual(infos['leds']['power'], {'brightness': None, 'trigger': None})
+        self.assertEqual(infos['thermal'], [
+            {'zone': 'thermal_zone0', 'type': 'cpu-thermal', 'path': os.path.join(self.tmp_dir, 'class/thermal/thermal_zone0/temp')},
+        ])
+
+    def test_get_cached(self):
+        self.infos.get()
+        self.write('class/thermal/thermal_zone1/temp', '45000')
+        infos = self.infos.get()
+
+        self.get_board_infos.assert_called_once_with()
+        self.assertEqual(len(infos['thermal']), 1)
+
+    def test_get_storage_hotplug(self):
+        self.infos.get()
+        self.write('block/sda/size', '1000')
+        self.write('block/sda/removable', '1')
+
+        infos = self.infos.get()
+
+        self.assertEqual([device['name'] for device in infos['storage']], ['mmcblk0', 'sda'])
+        self.assertTrue(infos['storage'][1]['removable'])
+        self.get_board_infos.assert_called_once_with()
+
+    def test_get_board(self):
+        self.assertEqual(self.infos.get_board(), {'model': 'Raspberry Pi 4 Model B'})
+        self.infos.get_board()
+
+        self.get_board_infos.assert_called_once_with()
+
+    def test_get_board_exception(self):
+        self.get_board_infos.side_effect = Exception('Test exception')
+
+        self.assertEqual(self.infos.get_board(), {})
+
+    def test_get_without_sysfs(self):
+        shutil.rmtree(self.tmp_dir)
+        os.makedirs(self.tmp_dir)
+
+        infos = self.infos.get()
+
+        self.assertEqual(infos['storage'], [])
+        self.assertEqual(infos['thermal'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+from collections import namedtuple
+sys.path.append('../')
+from backend.iothrottle import IoThrottle
+from unittest.mock import Mock, patch
+
+DiskCounters = namedtuple('DiskCounters', ['read_bytes', 'write_bytes'])
+CpuTimes = namedtuple('CpuTimes', ['user', 'idle', 'iowait'])
+
+class FakeFilesystem():
+    def __init__(self):
+        self.copy = Mock(side_effect=self._copy)
+        self.close = Mock(side_effect=lambda fd: fd.close())
+
+    def _copy(self, source, destination):
+        shutil.copy2(source, destination)
+        return True
+
+    def open(self, path, mode):
+        return open(path, mode)
+
+class TestsIoThrottle(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmp_dir, 'source.bin')
+        self.destination = os.path.join(self.tmp_dir, 'destination.bin')
+        with open(self.source, 'wb') as fd:
+            fd.write(b'x' * 200000)
+        self.fs = FakeFilesystem()
+        self.throttle = IoThrottle(self.fs, 100000000, 80.0, 1000000)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_copy_not_throttled(self):
+        self.assertTrue(self.throttle.copy(self.source, self.destination))
+
+        self.fs.copy.assert_called_with(self.source, self.destination)
+
+    def test_copy_throttled(self):
+        self.throttle.enabled = True
+
+        with patch('backend.iothrottle.time.sleep') as sleep_mock:
+            self.throttle.bandwidth = 65536
+            self.assertTrue(self.throttle.copy(self.source, self.destination))
+
+        self.fs.copy.assert_not_called()
+        self.assertTrue(sleep_mock.called)
+        with open(self.destination, 'rb') as fd:
+            self.assertEqual(fd.read(), b'x' * 200000)
+        self.fs.close.assert_called()
+
+    def test_copy_throttled_keeps_metadata(self):
+        self.throttle.enabled = True
+        os.chmod(self.source, 0o600)
+        os.utime(self.source, (1000000000, 1000000000))
+
+        self.assertTrue(self.throttle.copy(self.source, self.destination))
+
+        stat = os.stat(self.destination)
+        self.assertEqual(stat.st_mode & 0o777, 0o600)
+        self.assertEqual(stat.st_mtime, 1000000000)
+
+    def test_copy_throttled_failed(self):
+        self.throttle.enabled = True
+
+        self.assertFalse(self.throttle.copy(os.path.join(self.tmp_dir, 'dummy'), self.destination))
+        self.fs.close.assert_called()
+
+    @patch('backend.iothrottle.time.monotonic')
+    @patch('backend.iothrottle.psutil')
+    def test_is_busy(self, psutil_mock, monotonic_mock):
+        self.throttle.enabled = True
+        monotonic_mock.side_effect = [0.0, 10.0, 20.0, 30.0]
+        psutil_mock.cpu_times.side_effect = [
+            CpuTimes(0.0, 0.0, 0.0),
+            CpuTimes(1.0, 9.0, 0.0),
+            CpuTimes(10.0, 10.0, 0.0),
+            CpuTimes(11.0, 19.0, 0.0),
+        ]
+        psutil_mock.disk_io_counters.side_effect = [DiskCounters(0, 0), DiskCounters(0, 100), DiskCounters(0, 200), DiskCounters(10000000, 10000000)]
+
+        self.assertFalse(self.throttle.is_busy())
+        self.assertFalse(self.throttle.is_busy())
+        self.assertTrue(self.throttle.is_busy())
+        self.assertTrue(self.throttle.is_busy())
+        psutil_mock.cpu_percent.assert_not_called()
+
+    @patch('backend.iothrottle.psutil')
+    def test_is_busy_uses_previous_sample(self, psutil_mock):
+        self.throttle.enabled = True
+        psutil_mock.cpu_times.return_value = CpuTimes(0.0, 0.0, 0.0)
+        psutil_mock.disk_io_counters.return_value = DiskCounters(0, 0)
+        self.throttle.sample()
+        psutil_mock.cpu_times.return_value = CpuTimes(9.5, 0.5, 0.0)
+
+        self.assertTrue(self.throttle.is_busy())
+
+    @patch('backend.iothrottle.psutil')
+    def test_is_busy_disabled(self, psutil_mock):
+        self.assertFalse(self.throttle.is_busy())
+
+        psutil_mock.cpu_percent.assert_not_called()
+
+    @patch('backend.iothrottle.psutil')
+    def test_set_idle_priority(self, psutil_mock):
+        self.assertTrue(self.throttle.set_idle_priority(True))
+        psutil_mock.Process.return_value.ionice.assert_called_with(psutil_mock.IOPRIO_CLASS_IDLE)
+
+        self.assertTrue(self.throttle.set_idle_priority(False))
+        psutil_mock.Process.return_value.ionice.assert_called_with(psutil_mock.IOPRIO_CLASS_NONE)
+
+    @patch('backend.iothrottle.psutil')
+    def test_set_idle_priority_failed(self, psutil_mock):
+        psutil_mock.Process.return_value.ionice.side_effect = Exception('Test exception')
+
+        self.assertFalse(self.throttle.set_idle_priority(True))
+
+if __name__ == '__main__':
+    unittest.main()
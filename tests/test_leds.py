@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import sys
+import time
+import threading
+import shutil
+import tempfile
+sys.path.append('../')
+from backend.leds import Leds, LedPatternEngine
+from unittest.mock import Mock
+
+class TestsLeds(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        for name in ['led1', 'ACT']:
+            os.makedirs(os.path.join(self.tmp_dir, name))
+            for attribute in ['brightness', 'trigger']:
+                with open(os.path.join(self.tmp_dir, name, attribute), 'w') as fd:
+                    fd.write('')
+        self.leds = Leds(self.tmp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def read(self, name, attribute):
+        with open(os.path.join(self.tmp_dir, name, attribute)) as fd:
+            return fd.read()
+
+    def test_get_path(self):
+        self.assertEqual(self.leds.get_path('power', 'brightness'), os.path.join(self.tmp_dir, 'led1', 'brightness'))
+        self.assertEqual(self.leds.get_path('activity', 'trigger'), os.path.join(self.tmp_dir, 'ACT', 'trigger'))
+        self.assertIsNone(self.leds.get_path('activity', 'unknown'))
+        self.assertIsNone(self.leds.get_path('unknown', 'brightness'))
+
+    def test_get_path_cached(self):
+        self.leds.get_path('power', 'brightness')
+        shutil.rmtree(os.path.join(self.tmp_dir, 'led1'))
+
+        self.assertEqual(self.leds.get_path('power', 'brightness'), os.path.join(self.tmp_dir, 'led1', 'brightness'))
+
+    def test_find_path(self):
+        paths = [os.path.join(self.tmp_dir, 'led0', 'brightness'), os.path.join(self.tmp_dir, 'ACT', 'brightness')]
+
+        self.assertEqual(self.leds.find_path(paths), paths[1])
+        self.assertIsNone(self.leds.find_path(paths[:1]))
+        self.assertIsNone(self.leds.find_path([]))
+
+    def test_has_led(self):
+        self.assertTrue(self.leds.has_led('power'))
+        shutil.rmtree(os.path.join(self.tmp_dir, 'ACT'))
+        self.assertFalse(self.leds.has_led('activity'))
+
+    def test_write(self):
+        self.assertTrue(self.leds.write('power', 'brightness', '1'))
+        self.assertEqual(self.read('led1', 'brightness'), '1')
+
+    def test_write_unknown_attribute(self):
+        self.assertFalse(self.leds.write('power', 'unknown', '1'))
+
+    def test_write_failed(self):
+        self.leds.get_path('power', 'brightness')
+        shutil.rmtree(os.path.join(self.tmp_dir, 'led1'))
+
+        self.assertFalse(self.leds.write('power', 'brightness', '1'))
+
+
+class TestsLedPatternEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.leds = Mock()
+        self.restore = Mock()
+        self.engine = LedPatternEngine(self.leds, 'activity', restore=self.restore)
+        self.engine.start()
+
+    def tearDown(self):
+        self.engine.stop()
+
+    def wait_thread(self, timeout=2.0):
+        end = time.time() + timeout
+        while any(thread.name == 'ledpatterns' for thread in threading.enumerate()) and time.time() < end:
+            time.sleep(0.01)
+
+    def test_set_pattern(self):
+        self.engine.set_pattern('backup', True)
+        time.sleep(0.1)
+
+        self.assertEqual(self.engine.get_active_patterns(), ['backup'])
+        self.leds.write.assert_any_call('activity', 'trigger', 'none')
+        self.leds.write.assert_any_call('activity', 'brightness', '1')
+
+    def test_set_pattern_invalid(self):
+        with self.assertRaises(ValueError):
+            self.engine.set_pattern('unknown', True)
+
+    def test_highest_priority_pattern_played(self):
+        self.engine.set_pattern('backup', True)
+        self.engine.set_pattern('memoryalert', True)
+        time.sleep(0.35)
+
+        self.assertEqual(self.engine.get_active_patterns(), ['memoryalert', 'backup'])
+        # memory alert toggles every 100ms while backup pattern toggles every 500ms
+        self.assertGreaterEqual(self.leds.write.call_count, 4)
+
+    def test_single_thread(self):
+        self.engine.set_pattern('backup', True)
+        self.engine.set_pattern('needreboot', True)
+        self.engine.set_pattern('memoryalert', True)
+
+        threads = [thread for thread in threading.enumerate() if thread.name == 'ledpatterns']
+        self.assertEqual(len(threads), 1)
+
+    def test_restore_when_no_pattern(self):
+        self.engine.set_pattern('backup', True)
+        time.sleep(0.05)
+        self.engine.set_pattern('backup', False)
+        self.wait_thread()
+
+        self.assertEqual(self.engine.get_active_patterns(), [])
+        self.restore.assert_called_once_with()
+
+    def test_disabled(self):
+        self.engine.enabled = False
+
+        self.engine.set_pattern('backup', True)
+
+        self.assertEqual(self.engine.get_active_patterns(), ['backup'])
+        self.assertFalse(self.leds.write.called)
+
+    def test_disabled_by_default(self):
+        engine = LedPatternEngine(self.leds, 'activity')
+
+        engine.set_pattern('backup', True)
+
+        self.assertFalse(engine.enabled)
+        self.assertFalse(self.leds.write.called)
+
+    def test_stop_and_start(self):
+        self.engine.set_pattern('needreboot', True)
+        time.sleep(0.05)
+
+        self.engine.stop()
+        self.assertTrue(self.restore.called)
+        self.leds.write.reset_mock()
+
+        self.engine.start()
+        time.sleep(0.05)
+        self.leds.write.assert_any_call('activity', 'trigger', 'none')
+
+    def test_restore_exception(self):
+        self.restore.side_effect = Exception('Test exception')
+        self.engine.set_pattern('backup', True)
+        self.engine.set_pattern('backup', False)
+        self.wait_thread()
+
+        self.assertTrue(self.restore.called)
+
+
+if __name__ == '__main__':
+    unittest.main()
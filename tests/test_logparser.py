@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.logparser import JsonLogFormatter, LogParser
+
+TEXT_LINES = [
+    '2024-01-01 10:00:00,000 system      [system.py:12] INFO  : hello : world\n',
+    '2024-01-01 10:00:01,000 inventory   [inventory.py:5] ERROR : failure\n',
+    'Traceback (most recent call last):\n',
+    '  File "inventory.py", line 5\n',
+    '2024-01-01 10:00:02,000 system      [system.py:14] DEBUG : debug message\n',
+]
+
+class TestsLogParser(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = LogParser()
+
+    def make_json_line(self, level, message, exc_info=None):
+        record = logging.LogRecord('system', getattr(logging, level), 'system.py', 12, message, None, exc_info)
+        return JsonLogFormatter().format(record) + '\n'
+
+    def test_get_level_text(self):
+        self.assertEqual(self.parser.get_level(TEXT_LINES[0]), 'INFO')
+        self.assertEqual(self.parser.get_level(TEXT_LINES[1]), 'ERROR')
+        self.assertIsNone(self.parser.get_level(TEXT_LINES[2]))
+
+    def test_get_level_json(self):
+        self.assertEqual(self.parser.get_level(self.make_json_line('WARNING', 'hello')), 'WARNING')
+
+    def test_parse_line_text(self):
+        record = self.parser.parse_line(TEXT_LINES[0])
+
+        self.assertEqual(record, {
+            'time': '2024-01-01 10:00:00,000',
+            'level': 'INFO',
+            'name': 'system',
+            'file': 'system.py',
+            'line': 12,
+            'message': 'hello : world',
+        })
+
+    def test_parse_line_json_requested_fields_only(self):
+        record = self.parser.parse_line(self.make_json_line('INFO', 'hello'), fields=['level', 'message'])
+
+        self.assertEqual(record, {'level': 'INFO', 'message': 'hello'})
+
+    def test_parse_line_continuation(self):
+        self.assertIsNone(self.parser.parse_line(TEXT_LINES[3]))
+
+    def test_to_text(self):
+        line = self.make_json_line('INFO', 'hello')
+
+        text = self.parser.to_text(line)
+
+        self.assertTrue(text.endswith(' system      [system.py:12] INFO  : hello\n'))
+        self.assertEqual(self.parser.parse_line(text, fields=['level', 'message']), {'level': 'INFO', 'message': 'hello'})
+        self.assertEqual(self.parser.to_text(TEXT_LINES[0]), TEXT_LINES[0])
+
+    def test_json_formatter_exception(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            line = self.make_json_line('ERROR', 'failure', exc_info=sys.exc_info())
+
+        self.assertIn('ValueError: boom', self.parser.parse_line(line, fields=['message'])['message'])
+
+    def test_search_levels_keeps_multiline_records(self):
+        lines = self.parser.search(TEXT_LINES, levels=['ERROR'])
+
+        self.assertEqual(lines, TEXT_LINES[1:4])
+
+    def test_search_pattern(self):
+        lines = self.parser.search(TEXT_LINES + [self.make_json_line('INFO', 'Hello json')], pattern='HELLO')
+
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0], TEXT_LINES[0])
+        self.assertTrue(lines[1].endswith('INFO  : Hello json\n'))
+
+    def test_search_json_pattern_not_matching_keys(self):
+        lines = self.parser.search([self.make_json_line('INFO', 'hello')], pattern='message')
+
+        self.assertEqual(lines, [])
+
+    def test_search_json_pattern_escaped_characters(self):
+        lines = [self.make_json_line('INFO', 'Caf\u00e9 "ouvert"'), self.make_json_line('INFO', 'path C:\\temp')]
+
+        self.assertEqual(len(self.parser.search(lines, pattern='café')), 1)
+        self.assertEqual(len(self.parser.search(lines, pattern='"ouvert"')), 1)
+        self.assertEqual(len(self.parser.search(lines, pattern='c:\\temp')), 1)
+
+    def test_search_pattern_in_traceback(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            json_line = self.make_json_line('ERROR', 'failure', exc_info=sys.exc_info())
+
+        self.assertEqual(self.parser.search(TEXT_LINES, pattern='inventory.py", line 5'), TEXT_LINES[1:4])
+        self.assertEqual(len(self.parser.search([json_line], pattern='valueerror: boom')), 1)
+
+    def test_search_limit(self):
+        lines = self.parser.search(TEXT_LINES, limit=1)
+
+        self.assertEqual(lines, TEXT_LINES[4:])
+
+if __name__ == '__main__':
+    unittest.main()
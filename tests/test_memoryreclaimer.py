@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import sys
+sys.path.append('../')
+from backend.memoryreclaimer import MemoryReclaimer
+from unittest.mock import Mock, patch
+
+class TestsMemoryReclaimer(unittest.TestCase):
+
+    def setUp(self):
+        self.process = Mock()
+        self.process.memory_info.side_effect = [Mock(rss=50000000), Mock(rss=42000000)]
+        self.libc = Mock()
+        self.libc.malloc_trim.return_value = 1
+        self.libc.mallopt.return_value = 1
+        self.reclaimer = MemoryReclaimer(self.process, self.libc)
+
+    @patch('backend.memoryreclaimer.gc.collect', Mock(return_value=12))
+    def test_reclaim(self):
+        result = self.reclaimer.reclaim('idle')
+
+        self.libc.malloc_trim.assert_called_with(0)
+        self.assertEqual(result['reason'], 'idle')
+        self.assertEqual(result['collected'], 12)
+        self.assertTrue(result['trimmed'])
+        self.assertEqual(result['reclaimed'], 8000000)
+        self.assertEqual(result['rssafter'], 42000000)
+
+        stats = self.reclaimer.get_stats()
+        self.assertTrue(stats['supported'])
+        self.assertEqual(stats['runs'], 1)
+        self.assertEqual(stats['reclaimed'], 8000000)
+        self.assertEqual(stats['history'], [result])
+
+    def test_reclaim_rss_increased(self):
+        self.process.memory_info.side_effect = [Mock(rss=40000000), Mock(rss=41000000)]
+
+        self.assertEqual(self.reclaimer.reclaim()['reclaimed'], 0)
+
+    def test_reclaim_not_supported(self):
+        del self.libc.malloc_trim
+
+        result = self.reclaimer.reclaim()
+
+        self.assertFalse(result['trimmed'])
+        self.assertFalse(self.reclaimer.is_supported())
+
+    def test_set_arena_max(self):
+        self.assertTrue(self.reclaimer.set_arena_max(2))
+
+        self.libc.mallopt.assert_called_with(MemoryReclaimer.M_ARENA_MAX, 2)
+
+    def test_set_arena_max_failed(self):
+        self.libc.mallopt.return_value = 0
+
+        self.assertFalse(self.reclaimer.set_arena_max(2))
+
+    @patch('backend.memoryreclaimer.time.monotonic')
+    def test_is_idle(self, mock_monotonic):
+        mock_monotonic.side_effect = [100.0, 160.0, 220.0]
+        self.process.cpu_times.side_effect = [Mock(user=10.0, system=2.0), Mock(user=10.5, system=2.1), Mock(user=30.0, system=5.0)]
+
+        self.assertFalse(self.reclaimer.is_idle(5.0))
+        self.assertTrue(self.reclaimer.is_idle(5.0))
+        self.assertFalse(self.reclaimer.is_idle(5.0))
+
+    @patch('backend.memoryreclaimer.ctypes.CDLL', Mock(side_effect=OSError('not found')))
+    def test_libc_not_found(self):
+        reclaimer = MemoryReclaimer(self.process)
+
+        self.assertFalse(reclaimer.is_supported())
+        self.assertFalse(reclaimer.set_arena_max(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import sys
+import threading
+sys.path.append('../')
+from backend.processpriority import ProcessPriority
+from unittest.mock import Mock, patch
+import psutil
+
+class TestsProcessPriority(unittest.TestCase):
+
+    def setUp(self):
+        self.threads = {}
+        self.process = Mock(pid=1000)
+        self.process.threads.return_value = [Mock(id=threading.main_thread().native_id), Mock(id=4242)]
+        self.process.nice.return_value = 0
+        self.process.ionice.return_value = Mock(ioclass=psutil.IOPRIO_CLASS_NONE, value=0)
+        self.process.cpu_affinity.return_value = [0, 1, 2, 3]
+        self.priority = ProcessPriority(self.process, {'rpc': ['MainThread'], 'workers': ['worker*']})
+
+        cpu_count_patcher = patch('backend.processpriority.psutil.cpu_count', Mock(return_value=4))
+        cpu_count_patcher.start()
+        self.addCleanup(cpu_count_patcher.stop)
+        process_patcher = patch('backend.processpriority.psutil.Process', side_effect=self.get_thread)
+        process_patcher.start()
+        self.addCleanup(process_patcher.stop)
+
+    def get_thread(self, thread_id):
+        return self.threads.setdefault(thread_id, Mock())
+
+    def test_apply(self):
+        updated = self.priority.apply({'nice': -5, 'ioclass': 'besteffort', 'iolevel': 2, 'cpus': [1, 2, 3], 'threadgroups': {'rpc': [0]}})
+
+        self.assertEqual(updated, 2)
+        main = self.threads[threading.main_thread().native_id]
+        main.nice.assert_called_with(-5)
+        main.ionice.assert_called_with(psutil.IOPRIO_CLASS_BE, 2)
+        main.cpu_affinity.assert_called_with([0])
+        other = self.threads[4242]
+        other.cpu_affinity.assert_called_with([1, 2, 3])
+
+    def test_apply_defaults(self):
+        self.priority.apply({})
+
+        main = self.threads[threading.main_thread().native_id]
+        main.nice.assert_called_with(0)
+        main.ionice.assert_called_with(psutil.IOPRIO_CLASS_NONE)
+        main.cpu_affinity.assert_called_with([0, 1, 2, 3])
+
+    def test_apply_thread_failure(self):
+        def get_thread(thread_id):
+            if thread_id == 4242:
+                raise psutil.NoSuchProcess(thread_id)
+            return Mock()
+        with patch('backend.processpriority.psutil.Process', side_effect=get_thread):
+            self.assertEqual(self.priority.apply({'nice': 5}), 1)
+
+    def test_validate(self):
+        with self.assertRaises(ValueError) as cm:
+            self.priority.apply({'nice': 20})
+        self.assertEqual(str(cm.exception), 'Nice value must be between -20 and 19')
+
+        with self.assertRaises(ValueError) as cm:
+            self.priority.apply({'ioclass': 'fast'})
+        self.assertEqual(str(cm.exception), 'I/O class "fast" does not exist')
+
+        with self.assertRaises(ValueError) as cm:
+            self.priority.apply({'iolevel': 8})
+        self.assertEqual(str(cm.exception), 'I/O level must be between 0 and 7')
+
+        with self.assertRaises(ValueError) as cm:
+            self.priority.apply({'cpus': [4]})
+        self.assertEqual(str(cm.exception), 'Invalid cpus for "cpus" (available cpus [0, 1, 2, 3])')
+
+        with self.assertRaises(ValueError) as cm:
+            self.priority.apply({'threadgroups': {'gpu': [0]}})
+        self.assertEqual(str(cm.exception), 'Thread group "gpu" does not exist')
+
+        with self.assertRaises(ValueError) as cm:
+            self.priority.apply({'threadgroups': {'rpc': []}})
+        self.assertEqual(str(cm.exception), 'Invalid cpus for "rpc" (available cpus [0, 1, 2, 3])')
+
+    def test_pin_new_threads(self):
+        self.priority.apply({'cpus': [1, 2, 3], 'threadgroups': {'workers': [0]}})
+        # threads left by other tests
+        self.priority.pin_new_threads()
+        event = threading.Event()
+        thread = threading.Thread(target=event.wait, name='worker1', daemon=True)
+        thread.start()
+
+        try:
+            self.assertEqual(self.priority.pin_new_threads(), 1)
+            self.threads[thread.native_id].cpu_affinity.assert_called_with([0])
+            self.assertEqual(self.priority.pin_new_threads(), 0)
+        finally:
+            event.set()
+            thread.join()
+
+    def test_get_status(self):
+        self.priority.apply({'threadgroups': {'rpc': [0]}})
+
+        status = self.priority.get_status()
+
+        self.assertEqual(status['nice'], 0)
+        self.assertEqual(status['ioclass'], 'none')
+        self.assertEqual(status['cpus'], [0, 1, 2, 3])
+        self.assertEqual(status['availablecpus'], [0, 1, 2, 3])
+        self.assertEqual(status['threadgroups']['rpc'], {'cpus': [0], 'threads': ['MainThread']})
+        self.assertEqual(status['threadgroups']['workers'], {'cpus': None, 'threads': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
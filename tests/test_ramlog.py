@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import sys
+import shutil
+import logging
+import tempfile
+sys.path.append('../')
+from backend.ramlog import RamLog
+
+class FakeFilesystem:
+    def open(self, path, mode):
+        return open(path, mode)
+
+    def close(self, fd):
+        fd.close()
+
+class TestsRamLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmp_dir, 'cleep.log')
+        self.ram_path = os.path.join(self.tmp_dir, 'shm', 'cleep.log')
+        os.makedirs(os.path.dirname(self.ram_path))
+        self.write(self.log_file, 'persistent\n')
+        self.handler = logging.FileHandler(self.log_file)
+        self.handler.setFormatter(logging.Formatter('%(message)s'))
+        self.logger = logging.getLogger('test_ramlog')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(self.handler)
+        self.ramlog = RamLog(FakeFilesystem(), self.log_file, self.ram_path, 32)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, path, content):
+        with open(path, 'w') as fd:
+            fd.write(content)
+
+    def read(self, path):
+        with open(path) as fd:
+            return fd.read()
+
+    def test_enable(self):
+        self.assertTrue(self.ramlog.enable(self.handler))
+        self.logger.info('in ram')
+        self.handler.flush()
+
+        self.assertTrue(self.ramlog.enabled)
+        self.assertEqual(self.handler.baseFilename, os.path.abspath(self.ram_path))
+        self.assertEqual(self.read(self.log_file), 'persistent\n')
+        self.assertEqual(self.ramlog.read_lines(), ['in ram\n'])
+
+    def test_enable_flush_leftovers(self):
+        self.write(self.ram_path, 'leftover\n')
+
+        self.ramlog.enable(self.handler)
+
+        self.assertEqual(self.read(self.log_file), 'persistent\nleftover\n')
+        self.assertEqual(self.ramlog.read_lines(), [])
+
+    def test_flush(self):
+        self.ramlog.enable(self.handler)
+        self.logger.info('line1')
+        self.logger.info('line2')
+
+        self.assertEqual(self.ramlog.flush(), 12)
+
+        self.assertEqual(self.read(self.log_file), 'persistent\nline1\nline2\n')
+        self.assertEqual(self.ramlog.read_lines(), [])
+        stats = self.ramlog.get_stats()
+        self.assertEqual(stats['flushes'], 1)
+        self.assertEqual(stats['bytesflushed'], 12)
+        self.assertIsNotNone(stats['lastflush'])
+
+    def test_flush_logging_continues(self):
+        self.ramlog.enable(self.handler)
+        self.logger.info('line1')
+        self.ramlog.flush()
+        self.logger.info('line2')
+        self.handler.flush()
+
+        self.assertEqual(self.ramlog.read_lines(), ['line2\n'])
+
+    def test_flush_nothing(self):
+        self.ramlog.enable(self.handler)
+
+        self.assertEqual(self.ramlog.flush(), 0)
+        self.assertEqual(self.ramlog.get_stats()['flushes'], 0)
+
+    def test_flush_disabled(self):
+        self.assertEqual(self.ramlog.flush(), 0)
+
+    def test_need_flush(self):
+        self.ramlog.enable(self.handler)
+        self.assertFalse(self.ramlog.need_flush())
+
+        self.logger.info('x' * 40)
+        self.handler.flush()
+
+        self.assertTrue(self.ramlog.need_flush())
+
+    def test_disable(self):
+        self.ramlog.enable(self.handler)
+        self.logger.info('in ram')
+
+        self.ramlog.disable()
+        self.logger.info('on disk')
+        self.handler.flush()
+
+        self.assertFalse(self.ramlog.enabled)
+        self.assertEqual(self.handler.baseFilename, os.path.abspath(self.log_file))
+        self.assertEqual(self.read(self.log_file), 'persistent\nin ram\non disk\n')
+
+    def test_clear(self):
+        self.ramlog.enable(self.handler)
+        self.logger.info('in ram')
+
+        self.ramlog.clear()
+
+        self.assertEqual(self.ramlog.read_lines(), [])
+        self.assertEqual(self.read(self.log_file), 'persistent\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import sys
+import time
+sys.path.append('../')
+from backend.shutdownpipeline import ShutdownPipeline
+from unittest.mock import Mock
+
+class TestsShutdownPipeline(unittest.TestCase):
+
+    def test_run(self):
+        calls = []
+        pipeline = ShutdownPipeline(5.0)
+        pipeline.add_phase('first', {'a': lambda: calls.append('a'), 'b': lambda: calls.append('b')})
+        pipeline.add_phase('second', {'c': lambda: calls.append('c')})
+
+        report = pipeline.run()
+
+        self.assertEqual(calls[-1], 'c')
+        self.assertCountEqual(calls[:2], ['a', 'b'])
+        self.assertFalse(report['timedout'])
+        self.assertEqual([phase['name'] for phase in report['phases']], ['first', 'second'])
+        self.assertTrue(report['phases'][0]['steps']['a']['success'])
+        self.assertFalse(report['phases'][0]['steps']['a']['timedout'])
+
+    def test_steps_run_concurrently(self):
+        pipeline = ShutdownPipeline(5.0)
+        pipeline.add_phase('apps', {str(index): lambda: time.sleep(0.2) for index in range(5)})
+
+        start = time.monotonic()
+        pipeline.run()
+
+        self.assertLess(time.monotonic() - start, 0.8)
+
+    def test_step_timeout(self):
+        pipeline = ShutdownPipeline(5.0)
+        pipeline.add_phase('apps', {'slow': lambda: time.sleep(2.0), 'fast': Mock(return_value=True)}, 0.1)
+        pipeline.add_phase('sync', {'sync': Mock()})
+
+        start = time.monotonic()
+        report = pipeline.run()
+
+        self.assertLess(time.monotonic() - start, 1.0)
+        steps = report['phases'][0]['steps']
+        self.assertTrue(steps['slow']['timedout'])
+        self.assertFalse(steps['slow']['success'])
+        self.assertIsNone(steps['slow']['duration'])
+        self.assertTrue(steps['fast']['success'])
+        self.assertTrue(report['phases'][1]['steps']['sync']['success'])
+        self.assertTrue(report['timedout'])
+        self.assertEqual(report['phases'][0]['timedout'], ['slow'])
+        self.assertEqual(report['phases'][1]['timedout'], [])
+
+    def test_step_finishing_late_does_not_change_report(self):
+        pipeline = ShutdownPipeline(5.0)
+        pipeline.add_phase('apps', {'slow': lambda: time.sleep(0.2)}, 0.05)
+
+        report = pipeline.run()
+        time.sleep(0.3)
+
+        self.assertTrue(report['phases'][0]['steps']['slow']['timedout'])
+
+    def test_step_failed(self):
+        pipeline = ShutdownPipeline(5.0)
+        pipeline.add_phase('phase', {
+            'false': Mock(return_value=False),
+            'exception': Mock(side_effect=Exception('Test exception')),
+        })
+
+        report = pipeline.run()
+
+        steps = report['phases'][0]['steps']
+        self.assertFalse(steps['false']['success'])
+        self.assertFalse(steps['exception']['success'])
+        self.assertFalse(steps['exception']['timedout'])
+
+    def test_pipeline_timeout_skips_next_phases(self):
+        sync = Mock()
+        pipeline = ShutdownPipeline(0.1)
+        pipeline.add_phase('apps', {'slow': lambda: time.sleep(1.0)})
+        pipeline.add_phase('sync', {'sync': sync})
+
+        report = pipeline.run()
+
+        self.assertTrue(report['timedout'])
+        self.assertTrue(report['phases'][1]['skipped'])
+        sync.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
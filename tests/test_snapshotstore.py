@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import sys
+import json
+import shutil
+import hashlib
+import tempfile
+sys.path.append('../')
+from backend.snapshotstore import SnapshotStore
+from unittest.mock import Mock, patch
+
+class FakeFilesystem():
+    def __init__(self):
+        self.copy = Mock(side_effect=self._copy)
+
+    def _copy(self, source, destination):
+        shutil.copy2(source, destination)
+        return True
+
+    def move(self, source, destination):
+        shutil.move(source, destination)
+        return True
+
+    def rm(self, path):
+        os.remove(path)
+        return True
+
+    def mkdir(self, path, recursive=False):
+        os.makedirs(path, exist_ok=True)
+        return True
+
+    def read_json(self, path):
+        with open(path) as fd:
+            return json.load(fd)
+
+    def write_json(self, path, data):
+        with open(path, 'w') as fd:
+            json.dump(data, fd)
+        return True
+
+class TestsSnapshotStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmp_dir, 'cleep')
+        os.makedirs(self.source)
+        self.fs = FakeFilesystem()
+        self.store = SnapshotStore(self.fs, os.path.join(self.tmp_dir, 'snapshots'), 3)
+        self.timestamp = 1000.0
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, path, content):
+        with open(os.path.join(self.source, path), 'w') as fd:
+            fd.write(content)
+
+    def read(self, path):
+        with open(os.path.join(self.source, path)) as fd:
+            return fd.read()
+
+    def manifest(self):
+        manifest = {}
+        for filename in os.listdir(self.source):
+            with open(os.path.join(self.source, filename), 'rb') as fd:
+                content = fd.read()
+            manifest[filename] = {'size': len(content), 'hash': hashlib.sha256(content).hexdigest(), 'mtime': 0}
+        return manifest
+
+    def record(self):
+        self.timestamp += 1
+        with patch('backend.snapshotstore.time.time', Mock(return_value=self.timestamp)):
+            return self.store.record(self.source, self.manifest())
+
+    def count_blobs(self):
+        return sum(len(files) for _, _, files in os.walk(os.path.join(self.tmp_dir, 'snapshots', 'blobs')))
+
+    def test_record(self):
+        self.write('a.conf', 'aaaa')
+        self.write('b.conf', 'bb')
+
+        snapshot = self.record()
+
+        self.assertEqual(snapshot['id'], '1001000')
+        self.assertEqual(sorted(snapshot['files'].keys()), ['a.conf', 'b.conf'])
+        self.assertEqual(self.store.list(), [{'id': '1001000', 'timestamp': 1001, 'files': 2, 'size': 6}])
+
+    def test_record_unchanged_configuration(self):
+        self.write('a.conf', 'aaaa')
+        self.record()
+
+        self.assertIsNone(self.record())
+        self.assertEqual(len(self.store.list()), 1)
+
+    def test_record_deduplicates_blobs(self):
+        self.write('a.conf', 'aaaa')
+        self.write('b.conf', 'bb')
+        self.record()
+        self.write('b.conf', 'bbb')
+
+        self.record()
+
+        self.assertEqual(self.count_blobs(), 3)
+        self.assertEqual(self.fs.copy.call_count, 3)
+
+    def test_retention(self):
+        for index in range(5):
+            self.write('a.conf', 'a' * (index + 1))
+            self.record()
+
+        snapshots = self.store.list()
+
+        self.assertEqual(len(snapshots), 3)
+        self.assertEqual(snapshots[0]['id'], '1005000')
+        self.assertEqual(self.count_blobs(), 3)
+
+    def test_restore_only_writes_changed_files(self):
+        self.write('a.conf', 'aaaa')
+        self.write('b.conf', 'bb')
+        snapshot = self.record()
+        self.write('b.conf', 'changed')
+        self.write('c.conf', 'new')
+        self.fs.copy.reset_mock()
+
+        stats = self.store.restore(snapshot['id'], self.source, ['a.conf', 'b.conf', 'c.conf'])
+
+        self.assertEqual(stats, {'restored': 1, 'deleted': 1, 'unchanged': 1, 'failed': 0, 'corrupted': 0})
+        self.assertEqual(self.fs.copy.call_count, 1)
+        self.assertEqual(self.read('b.conf'), 'bb')
+        self.assertFalse(os.path.exists(os.path.join(self.source, 'c.conf')))
+
+    def test_restore_keeps_untracked_files(self):
+        self.write('a.conf', 'aaaa')
+        snapshot = self.record()
+        self.write('c.conf', 'new')
+        self.write('d.conf', 'other')
+
+        stats = self.store.restore(snapshot['id'], self.source, ['a.conf', 'c.conf'])
+
+        self.assertEqual(stats['deleted'], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.source, 'c.conf')))
+        self.assertEqual(self.read('d.conf'), 'other')
+
+    def test_restore_corrupted_blob(self):
+        self.write('a.conf', 'aaaa')
+        self.write('b.conf', 'bb')
+        snapshot = self.record()
+        blob = os.path.join(self.tmp_dir, 'snapshots', 'blobs', snapshot['files']['b.conf']['hash'][:2], snapshot['files']['b.conf']['hash'])
+        with open(blob, 'w') as fd:
+            fd.write('corrupted')
+        self.write('a.conf', 'changed')
+        self.write('b.conf', 'changed')
+        self.fs.copy.reset_mock()
+
+        stats = self.store.restore(snapshot['id'], self.source, ['a.conf', 'b.conf'])
+
+        self.assertEqual(stats['corrupted'], 1)
+        self.assertEqual(stats['restored'], 0)
+        self.assertFalse(self.fs.copy.called)
+        self.assertEqual(self.read('a.conf'), 'changed')
+
+    def test_record_file_changed_since_manifest(self):
+        self.write('a.conf', 'aaaa')
+        manifest = self.manifest()
+        self.write('a.conf', 'changed')
+
+        snapshot = self.store.record(self.source, manifest)
+
+        file_hash = hashlib.sha256(b'changed').hexdigest()
+        self.assertEqual(snapshot['files']['a.conf'], {'hash': file_hash, 'size': 7})
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir, 'snapshots', 'blobs', file_hash[:2], file_hash)))
+        self.assertEqual(self.count_blobs(), 1)
+
+    def test_restore_unknown_snapshot(self):
+        self.assertIsNone(self.store.restore('123', self.source))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import urllib.error
+sys.path.append('../')
+from backend.startupprofiler import StartupProfiler
+from unittest.mock import Mock, patch
+
+class FakeFilesystem():
+    def read_json(self, path):
+        with open(path) as fd:
+            return json.load(fd)
+
+    def write_json(self, path, data):
+        with open(path, 'w') as fd:
+            json.dump(data, fd)
+        return True
+
+class TestsStartupProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'startup.json')
+        self.profiler = StartupProfiler(FakeFilesystem(), self.path, 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_add_span(self):
+        self.profiler.start(1000.0)
+
+        self.profiler.add_span('system', 'configure', 1002.0, 1002.5)
+
+        self.assertEqual(self.profiler.get_profile()['timeline'], [
+            {'name': 'system', 'phase': 'configure', 'start': 2.0, 'duration': 0.5},
+        ])
+
+    def test_probe_apps(self):
+        self.profiler.start(time.time() - 10.0)
+        probe = Mock(side_effect=lambda app: app != 'app2')
+
+        self.profiler.probe_apps(['app1', 'app2'], probe, 1.0)
+
+        apps = self.profiler.get_profile()['apps']
+        self.assertGreaterEqual(apps['app1'], 10.0)
+        self.assertIsNone(apps['app2'])
+
+    def test_probe_apps_exception(self):
+        self.profiler.start(time.time())
+
+        self.profiler.probe_apps(['app1'], Mock(side_effect=Exception('Test exception')), 1.0)
+
+        self.assertIsNone(self.profiler.get_profile()['apps']['app1'])
+
+    @patch('backend.startupprofiler.urllib.request.urlopen')
+    def test_probe_rpc(self, urlopen_mock):
+        urlopen_mock.side_effect = [
+            ConnectionRefusedError(),
+            urllib.error.HTTPError('http://127.0.0.1', 404, 'Not found', {}, None),
+        ]
+        self.profiler.start(time.time())
+
+        self.assertTrue(self.profiler.probe_rpc('http://127.0.0.1/', 1.0, interval=0.01))
+
+        self.assertIsNotNone(self.profiler.get_profile()['rpc'])
+        self.assertEqual(urlopen_mock.call_count, 2)
+
+    @patch('backend.startupprofiler.urllib.request.urlopen')
+    def test_probe_rpc_timeout(self, urlopen_mock):
+        urlopen_mock.side_effect = ConnectionRefusedError()
+        self.profiler.start(time.time())
+
+        self.assertFalse(self.profiler.probe_rpc('http://127.0.0.1/', 0.05, interval=0.01))
+
+        self.assertIsNone(self.profiler.get_profile()['rpc'])
+
+    def test_save_keeps_history(self):
+        for index in range(3):
+            self.profiler.start(1000.0 + index)
+            self.profiler.add_span('system', 'start', 1001.0 + index, 1002.0 + index)
+            profile = self.profiler.save()
+
+        self.assertEqual(profile['duration'], 2.0)
+        profiles = self.profiler.get_profiles()
+        self.assertEqual([profile['timestamp'] for profile in profiles], [1002, 1001])
+
+    def test_save_duration(self):
+        self.profiler.start(1000.0)
+        self.profiler.add_span('system', 'start', 1001.0, 1002.0)
+        self.profiler.get_profile()['apps'] = {'app1': 5.0, 'app2': None}
+        self.profiler.get_profile()['rpc'] = 7.5
+
+        self.assertEqual(self.profiler.save()['duration'], 7.5)
+
+    def test_get_profiles_invalid_file(self):
+        with open(self.path, 'w') as fd:
+            fd.write('invalid')
+
+        self.assertEqual(self.profiler.get_profiles(), [])
+
+if __name__ == '__main__':
+    unittest.main()
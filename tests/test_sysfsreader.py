@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+sys.path.append('../')
+from backend.sysfsreader import SysfsReader
+
+class TestsSysfsReader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.reader = SysfsReader(self.tmp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, path, content):
+        path = os.path.join(self.tmp_dir, path)
+        with open(path, 'w') as fd:
+            fd.write(content)
+        return path
+
+    def test_sysfs_root(self):
+        self.assertEqual(self.reader.sysfs_root, self.tmp_dir)
+        self.assertEqual(SysfsReader().sysfs_root, '/sys')
+
+    def test_read(self):
+        path = self.write('type', 'cpu-thermal\n')
+
+        self.assertEqual(self.reader._read(path), 'cpu-thermal')
+
+    def test_read_missing_file(self):
+        path = os.path.join(self.tmp_dir, 'missing')
+
+        self.assertIsNone(self.reader._read(path))
+        self.assertEqual(self.reader._read(path, 'default'), 'default')
+
+    def test_read_int(self):
+        self.assertEqual(self.reader._read_int(self.write('temp', '45231\n')), 45231)
+        self.assertIsNone(self.reader._read_int(self.write('temp', 'invalid')))
+        self.assertIsNone(self.reader._read_int(os.path.join(self.tmp_dir, 'missing')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,8 +5,14 @@ import unittest
 import logging
 import sys
 import os
+import time
+import threading
+import shutil
+import tempfile
 sys.path.append('../')
 from backend.system import System
+from backend.leds import Leds
+from backend.threadwatchdog import ThreadWatchdog
 from cleep.exception import InvalidParameter, MissingParameter, CommandError, Unauthorized, CommandInfo, NoResponse
 from cleep.libs.tests.common import get_log_level
 from unittest.mock import Mock, patch, MagicMock
@@ -71,20 +77,26 @@ class TestsSystem(unittest.TestCase):
             '123-123': {'type': 'monitor'},
             '456-456': {'type': 'monitorcpu'},
             '789-789': {'type': 'monitormemory'},
+            '012-012': {'type': 'monitorthermal'},
+            '345-345': {'type': 'monitorgc'},
         })
         self.module._add_device = Mock()
         self.module._configure_crash_report = Mock()
         self.module._set_not_renderable_events = Mock()
 
         self.session.start_module(self.module)
+        self.module._configure_deferred()
 
         mock_psutil.Process.assert_called()
         mock_psutil.Process.return_value.cpu_percent.assert_called()
         self.assertEqual(self.module._add_device.call_count, 0)
         self.assertEqual(self.module._System__monitor_memory_uuid, '789-789')
         self.assertEqual(self.module._System__monitor_cpu_uuid, '456-456')
+        self.assertEqual(self.module._System__monitor_thermal_uuid, '012-012')
+        self.assertEqual(self.module._System__monitor_gc_uuid, '345-345')
         self.module._configure_crash_report.assert_called_with(True)
-        self.module._set_not_renderable_events.assert_called()
+        # not renderable events are configured once apps are ready (see _run_startup_stage)
+        self.assertFalse(self.module._set_not_renderable_events.called)
 
     def test_configure_create_all_devices(self):
         self.init_session(start_module=False)
@@ -92,8 +104,9 @@ class TestsSystem(unittest.TestCase):
         self.module._add_device = Mock()
 
         self.session.start_module(self.module)
+        self.module._configure_deferred()
 
-        self.assertEqual(self.module._add_device.call_count, 3)
+        self.assertEqual(self.module._add_device.call_count, 5)
 
     def test_configure_create_missing_devices(self):
         self.init_session(start_module=False)
@@ -104,8 +117,38 @@ class TestsSystem(unittest.TestCase):
         self.module._add_device = Mock()
 
         self.session.start_module(self.module)
+        self.module._configure_deferred()
+
+        self.assertEqual(self.module._add_device.call_count, 3)
+
+    def test_configure_defers_non_critical_work(self):
+        self.init_session(start_module=False)
+        self.module.get_module_devices = Mock(return_value={})
+        self.module._add_device = Mock()
+        self.module._set_not_renderable_events = Mock()
+        self.module._System__apply_tweaks = Mock()
+        self.module.task_factory = Mock()
+
+        self.session.start_module(self.module)
+
+        self.assertFalse(self.module._add_device.called)
+        self.assertFalse(self.module._set_not_renderable_events.called)
+        self.assertFalse(self.module._System__apply_tweaks.called)
+        self.module.task_factory.create_task.assert_called_with(None, self.module._run_startup_stage)
+
+    def test_configure_deferred_runs_once(self):
+        self.init_session(start_module=False)
+        self.module.get_module_devices = Mock(return_value={})
+        self.module._add_device = Mock()
+        self.module._System__apply_tweaks = Mock()
+        self.module.task_factory = Mock()
+        self.session.start_module(self.module)
+
+        self.module._configure_deferred()
+        self.module._configure_deferred()
 
-        self.assertEqual(self.module._add_device.call_count, 1)
+        self.assertEqual(self.module._add_device.call_count, 5)
+        self.assertEqual(self.module._System__apply_tweaks.call_count, 1)
 
     def test_configure_disable_crash_report_at_startup(self):
         self.init_session(start_module=False)
@@ -157,6 +200,9 @@ class TestsSystem(unittest.TestCase):
                 'version',
                 'eventsnotrenderable',
                 'debug',
+                'debugsession',
+                'lastbackup',
+                'ramlog',
                 'cleepbackupdelay',
                 'monitoring',
                 'ssl',
@@ -166,7 +212,22 @@ class TestsSystem(unittest.TestCase):
                 'needreboot',
                 'devices',
                 'enablepowerled',
-                'enableactivityled'
+                'enableactivityled',
+                'logformat',
+                'snapshotretention',
+                'backupthrottling',
+                'ledpatterns',
+                'cpuprofile',
+                'cpuminfreq',
+                'cpumaxfreq',
+                'vmprofile',
+                'zram',
+                'ramlogs',
+                'processpriority',
+                'memoryreclaim',
+                'mallocarenamax',
+                'watchdog',
+                'apptaskstats',
             ],
             config.keys(),
         )
@@ -176,7 +237,7 @@ class TestsSystem(unittest.TestCase):
 
         devices = self.module.get_module_devices()
         logging.debug('Devices: %s' % devices)
-        self.assertEqual(len(devices), 3)
+        self.assertEqual(len(devices), 5)
         for device_uuid, device in devices.items():
             if device['type'] == 'monitor':
                 self.assertEqual(
@@ -208,7 +269,8 @@ class TestsSystem(unittest.TestCase):
 
     def test_on_event_backup_config(self):
         self.init_session()
-        self.module.backup_cleep_config = Mock()
+        self.module.backup_worker = Mock()
+        self.module.cleep_backup_offset = 0
 
         self.module.on_event({
             'event': 'parameters.time.now',
@@ -216,7 +278,7 @@ class TestsSystem(unittest.TestCase):
                 'minute': 5
             }
         })
-        self.assertFalse(self.module.backup_cleep_config.called)
+        self.assertFalse(self.module.backup_worker.request.called)
 
         self.module.on_event({
             'event': 'parameters.time.now',
@@ -224,7 +286,59 @@ class TestsSystem(unittest.TestCase):
                 'minute': 15
             }
         })
-        self.module.backup_cleep_config.assert_called()
+        self.module.backup_worker.request.assert_called_with(jitter=True)
+
+    def test_on_event_backup_config_with_offset(self):
+        self.init_session()
+        self.module.backup_worker = Mock()
+        self.module.cleep_backup_offset = 7
+
+        self.module.on_event({
+            'event': 'parameters.time.now',
+            'params': {
+                'minute': 15
+            }
+        })
+        self.assertFalse(self.module.backup_worker.request.called)
+
+        self.module.on_event({
+            'event': 'parameters.time.now',
+            'params': {
+                'minute': 22
+            }
+        })
+        self.assertTrue(self.module.backup_worker.request.called)
+
+    def test_on_event_samples_device_load(self):
+        self.init_session()
+        self.module.backup_worker = Mock()
+        self.module.io_throttle = Mock(enabled=True)
+
+        self.module.on_event({'event': 'parameters.time.now', 'params': {'minute': 1}})
+
+        self.module.io_throttle.sample.assert_called()
+
+    def test_on_event_backup_config_delay_longer_than_hour(self):
+        self.init_session()
+        self.module.backup_worker = Mock()
+        self.module.cleep_backup_delay = 90
+        self.module.cleep_backup_offset = 70
+
+        self.module.on_event({'event': 'parameters.time.now', 'params': {'hour': 1, 'minute': 40}})
+        self.assertFalse(self.module.backup_worker.request.called)
+
+        self.module.on_event({'event': 'parameters.time.now', 'params': {'hour': 2, 'minute': 40}})
+        self.assertTrue(self.module.backup_worker.request.called)
+
+    def test_on_event_backup_config_timestamp(self):
+        self.init_session()
+        self.module.backup_worker = Mock()
+        self.module.cleep_backup_delay = 90
+        self.module.cleep_backup_offset = 70
+
+        self.module.on_event({'event': 'parameters.time.now', 'params': {'timestamp': 160 * 60 + 12, 'hour': 2, 'minute': 40}})
+
+        self.assertTrue(self.module.backup_worker.request.called)
 
     def test_set_monitoring(self):
         self.init_session()
@@ -259,38 +373,320 @@ class TestsSystem(unittest.TestCase):
 
         self.assertTrue(self.module.get_monitoring())
 
-    @patch('backend.system.Console')
-    def test_reboot_device(self, mock_console):
+    def test_reboot_device(self):
         self.init_session()
-        self.module.backup_cleep_config = Mock()
+        self.module.task_factory = Mock()
 
         self.module.reboot_device(delay=10.0)
-        
-        self.module.backup_cleep_config.assert_called()
-        mock_console.return_value.command_delayed.assert_called_with('reboot -f', 10.0)
+
+        self.module.task_factory.create_task.assert_called_with(
+            None, self.module._shutdown, task_args=['reboot', 'reboot -f', 10.0, self.module.SHUTDOWN_TIMEOUT]
+        )
+        self.module.task_factory.create_task.return_value.start.assert_called()
+        self.assertTrue(self.session.event_called_with('system.device.reboot', {'delay': 10.0, 'timeout': self.module.SHUTDOWN_TIMEOUT}))
+
+    def test_poweroff_device(self):
+        self.init_session()
+        self.module.task_factory = Mock()
+
+        self.module.poweroff_device()
+
+        self.module.task_factory.create_task.assert_called_with(
+            None, self.module._shutdown, task_args=['poweroff', 'poweroff -f', 5.0, self.module.SHUTDOWN_TIMEOUT]
+        )
+        self.assertTrue(self.session.event_called('system.device.poweroff'))
+
+    def test_restart_cleep(self):
+        self.init_session()
+        self.module.task_factory = Mock()
+
+        self.module.restart_cleep(delay=10.0, timeout=30.0)
+
+        self.module.task_factory.create_task.assert_called_with(
+            None, self.module._shutdown, task_args=['restart', '/etc/cleep/cleephelper.sh restart', 10.0, 30.0]
+        )
+        self.assertTrue(self.session.event_called_with('system.cleep.restart', {'delay': 10.0, 'timeout': 30.0}))
+
+    def mock_reload_commands(self, reload_resp, commands=None):
+        def send_command(command, to, params=None, timeout=None):
+            if command == 'get_modules_debug':
+                return Mock(error=False, data={'system': {'debug': False}, 'dummy': {'debug': False}})
+            if command == 'get_module_commands':
+                return Mock(error=False, data=commands if commands is not None else ['reload'])
+            return reload_resp
+        self.module.send_command = Mock(side_effect=send_command)
+
+    def test_reload_app(self):
+        self.init_session()
+        self.module.restart_cleep = Mock()
+        self.mock_reload_commands(Mock(error=False, data=True))
+
+        result = self.module.reload_app('dummy')
+
+        self.module.send_command.assert_called_with('reload', 'dummy', timeout=self.module.APP_RELOAD_TIMEOUT)
+        self.assertTrue(result['reloaded'])
+        self.assertFalse(result['restart'])
+        self.module.restart_cleep.assert_not_called()
+
+    def test_reload_app_unsafe(self):
+        self.init_session()
+        self.module.restart_cleep = Mock()
+        self.mock_reload_commands(Mock(error=False, data=False))
+
+        result = self.module.reload_app('dummy')
+
+        self.assertFalse(result['reloaded'])
+        self.assertTrue(result['restart'])
+        self.module.restart_cleep.assert_called()
+
+    def test_reload_app_not_supported(self):
+        self.init_session()
+        self.module.restart_cleep = Mock()
+        self.mock_reload_commands(Mock(error=False, data=True), commands=['get_module_config'])
+
+        result = self.module.reload_app('dummy')
+
+        self.assertTrue(result['restart'])
+        self.module.restart_cleep.assert_called()
+        self.assertFalse(any(call.args[0] == 'reload' for call in self.module.send_command.call_args_list))
+
+    def test_reload_app_failed(self):
+        self.init_session()
+        self.module.restart_cleep = Mock()
+        self.mock_reload_commands(Mock(error=True, data=None, message='No response'))
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.reload_app('dummy')
+
+        self.assertEqual(str(cm.exception), 'Application "dummy" failed to reload: No response')
+        self.module.restart_cleep.assert_not_called()
+
+    def test_reload_app_unknown_app(self):
+        self.init_session()
+        self.module.restart_cleep = Mock()
+        self.mock_reload_commands(Mock(error=False, data=True))
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.reload_app('dumy')
+
+        self.assertEqual(str(cm.exception), 'Application "dumy" is not running')
+        self.module.restart_cleep.assert_not_called()
+
+    def test_reload_app_system(self):
+        self.init_session()
+        self.module.restart_cleep = Mock()
+        self.module.send_command = Mock()
+        self.module._System__apply_tweaks = Mock()
+        self.module._System__start_monitoring_tasks = Mock()
+
+        result = self.module.reload_app('system')
+
+        self.assertTrue(result['reloaded'])
+        self.module.send_command.assert_not_called()
+        self.module._System__apply_tweaks.assert_called()
+        self.module._System__start_monitoring_tasks.assert_called()
+
+    def test_reload_app_exception(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.reload_app(123)
+        self.assertEqual(str(cm.exception), 'Parameter "app" must be of type "str"')
+
+    def test_shutdown_requests_are_not_stacked(self):
+        self.init_session()
+        self.module.task_factory = Mock()
+
+        self.module.reboot_device()
+        self.module.restart_cleep()
+
+        self.assertEqual(self.module.task_factory.create_task.call_count, 1)
         self.assertTrue(self.session.event_called('system.device.reboot'))
+        self.assertFalse(self.session.event_called('system.cleep.restart'))
 
+    @patch('backend.system.os.sync')
     @patch('backend.system.Console')
-    def test_poweroff_device(self, mock_console):
+    def test_shutdown_allows_new_request_after_failure(self, mock_console, mock_sync):
         self.init_session()
-        self.module.backup_cleep_config = Mock()
+        self.module.task_factory = Mock()
+        self.module.backup_cleep_config = Mock(return_value=True)
+        self.module.send_command = Mock(return_value=Mock(error=True, data=None, message='error'))
+        mock_console.return_value.command.side_effect = Exception('Test exception')
 
-        self.module.poweroff_device(delay=10.0)
-        
+        self.module.reboot_device()
+        with self.assertRaises(Exception):
+            self.module._shutdown('reboot', 'reboot -f', 0.0, 10.0)
+        self.module.reboot_device()
+
+        self.assertEqual(self.module.task_factory.create_task.call_count, 2)
+
+    @patch('backend.system.os.sync')
+    @patch('backend.system.Console')
+    def test_shutdown(self, mock_console, mock_sync):
+        self.init_session()
+        self.module.backup_cleep_config = Mock(return_value=True)
+        def send_command(command, to, params=None, timeout=None):
+            if command == 'get_modules_debug':
+                return Mock(error=False, data={'system': {'debug': False}, 'app1': {'debug': False}, 'app2': {'debug': False}, 'app3': {'debug': False}})
+            if command == 'get_module_commands':
+                commands = ['get_module_config'] if params['module_name'] == 'app2' else ['prepare_shutdown']
+                return Mock(error=False, data=commands)
+            if to == 'app1':
+                return Mock(error=False, data=None, message='')
+            return Mock(error=True, data=None, message='Unable to close prepare_shutdown file')
+        self.module.send_command = Mock(side_effect=send_command)
+
+        report = self.module._shutdown('reboot', 'reboot -f', 0.0, 10.0)
+
+        self.module.send_command.assert_any_call('prepare_shutdown', 'app1', {'action': 'reboot'}, timeout=self.module.SHUTDOWN_APP_TIMEOUT)
+        self.assertEqual(report['action'], 'reboot')
+        self.assertEqual([phase['name'] for phase in report['phases']], ['apps', 'backup', 'logs', 'sync'])
+        self.assertCountEqual(report['phases'][0]['steps'].keys(), ['app1', 'app2', 'app3'])
+        self.assertTrue(report['phases'][0]['steps']['app1']['success'])
+        self.assertTrue(report['phases'][0]['steps']['app2']['success'])
+        self.assertFalse(report['phases'][0]['steps']['app3']['success'])
+        self.assertIsNone(self.module._System__shutdown_task)
         self.module.backup_cleep_config.assert_called()
-        mock_console.return_value.command_delayed.assert_called_with('poweroff -f', 10.0)
-        self.assertTrue(self.session.event_called('system.device.poweroff'))
+        mock_sync.assert_called()
+        mock_console.return_value.command.assert_called_with('reboot -f')
+        self.assertTrue(self.session.event_called('system.shutdown.report'))
 
+    @patch('backend.system.os.sync')
     @patch('backend.system.Console')
-    def test_restart_cleep(self, mock_console):
+    def test_shutdown_without_apps(self, mock_console, mock_sync):
         self.init_session()
-        self.module.backup_cleep_config = Mock()
+        self.module.backup_cleep_config = Mock(return_value=True)
+        self.module.send_command = Mock(return_value=Mock(error=True, data=None, message='error'))
 
-        self.module.restart_cleep(delay=10.0)
-        
-        self.module.backup_cleep_config.assert_called()
-        mock_console.return_value.command_delayed.assert_called_with('/etc/cleep/cleephelper.sh restart', 10.0)
-        self.assertTrue(self.session.event_called('system.cleep.restart'))
+        report = self.module._shutdown('restart', '/etc/cleep/cleephelper.sh restart', 0.0, 10.0)
+
+        self.assertEqual(report['phases'][0]['steps'], {})
+        mock_console.return_value.command.assert_called_with('/etc/cleep/cleephelper.sh restart')
+
+    @patch('backend.system.time.sleep')
+    @patch('backend.system.os.sync')
+    @patch('backend.system.Console')
+    def test_shutdown_waits_delay(self, mock_console, mock_sync, mock_sleep):
+        self.init_session()
+        self.module.backup_cleep_config = Mock(return_value=True)
+        self.module.send_command = Mock(return_value=Mock(error=True, data=None, message='error'))
+
+        self.module._shutdown('reboot', 'reboot -f', 5.0, 10.0)
+
+        # pipeline duration is part of delay
+        self.assertTrue(0.0 < mock_sleep.call_args[0][0] <= 5.0)
+        mock_console.return_value.command.assert_called_with('reboot -f')
+
+    @patch('backend.system.os.sync')
+    @patch('backend.system.Console')
+    def test_shutdown_flushes_ram_logs_before_command(self, mock_console, mock_sync):
+        self.init_session()
+        self.module.backup_cleep_config = Mock(return_value=True)
+        self.module.send_command = Mock(return_value=Mock(error=True, data=None, message='error'))
+        calls = []
+        self.module.ram_log = Mock()
+        self.module.ram_log.flush.side_effect = lambda: calls.append('flush')
+        self.module.shutdown_report_event = Mock()
+        self.module.shutdown_report_event.send.side_effect = lambda report: calls.append('report')
+        mock_console.return_value.command.side_effect = lambda command: calls.append('command')
+
+        self.module._shutdown('reboot', 'reboot -f', 0.0, 10.0)
+
+        self.assertEqual(calls, ['flush', 'report', 'flush', 'command'])
+
+    @patch('backend.system.os.sync')
+    @patch('backend.system.Console')
+    def test_shutdown_command_executed_when_last_flush_fails(self, mock_console, mock_sync):
+        self.init_session()
+        self.module.backup_cleep_config = Mock(return_value=True)
+        self.module.send_command = Mock(return_value=Mock(error=True, data=None, message='error'))
+        self.module.ram_log = Mock()
+        self.module.ram_log.flush.side_effect = [0, OSError('disk error')]
+
+        self.module._shutdown('reboot', 'reboot -f', 0.0, 10.0)
+
+        mock_console.return_value.command.assert_called_with('reboot -f')
+
+    def test_run_startup_stage(self):
+        self.init_session()
+        self.module._configure_deferred = Mock()
+        self.module._set_not_renderable_events = Mock()
+        self.module.hardware_infos = Mock()
+        mock_psutil.Process.return_value.create_time.return_value = time.time() - 20.0
+        self.module.startup_profiler = Mock()
+        self.module.startup_profiler.save.return_value = {'duration': 21.0}
+        self.module.send_command = Mock(return_value=Mock(error=False, data={'system': {}, 'app1': {}}))
+
+        profile = self.module._run_startup_stage()
+
+        self.assertEqual(profile, {'duration': 21.0})
+        self.module._configure_deferred.assert_called()
+        self.module.hardware_infos.get.assert_called()
+        phases = [call.args[1] for call in self.module.startup_profiler.add_span.call_args_list]
+        self.assertEqual(phases, ['init', 'configure', 'start', 'hardware', 'deferred', 'events'])
+        self.module._set_not_renderable_events.assert_called()
+        args = self.module.startup_profiler.probe_apps.call_args.args
+        self.assertEqual(args[0], ['app1'])
+        self.assertTrue(args[1]('app1'))
+        self.module.send_command.assert_called_with('get_module_config', 'app1', timeout=self.module.STARTUP_PROBE_TIMEOUT)
+        self.module.startup_profiler.probe_rpc.assert_called_once_with('http://127.0.0.1:80/', self.module.DEFERRED_RPC_TIMEOUT)
+
+    def test_run_startup_stage_deferred_does_not_wait_apps(self):
+        self.init_session()
+        calls = []
+        apps_ready = threading.Event()
+        self.module.hardware_infos = Mock()
+        self.module.startup_profiler = Mock()
+        self.module.startup_profiler.save.return_value = {'duration': 21.0}
+        self.module.startup_profiler.probe_apps.side_effect = lambda *args: (apps_ready.wait(1.0), calls.append('apps'))
+        self.module.startup_profiler.probe_rpc.side_effect = lambda *args: calls.append('rpc') or True
+        self.module._configure_deferred = Mock(side_effect=lambda: (calls.append('deferred'), apps_ready.set()))
+        self.module._set_not_renderable_events = Mock(side_effect=lambda: calls.append('events'))
+        self.module.send_command = Mock(return_value=Mock(error=False, data={'system': {}}))
+
+        self.module._run_startup_stage()
+
+        self.assertEqual(calls, ['rpc', 'deferred', 'apps', 'events'])
+
+    def test_run_startup_stage_rpc_not_served(self):
+        self.init_session()
+        self.module._configure_deferred = Mock()
+        self.module._set_not_renderable_events = Mock()
+        self.module.hardware_infos = Mock()
+        self.module.startup_profiler = Mock()
+        self.module.startup_profiler.save.return_value = {'duration': 21.0}
+        self.module.startup_profiler.probe_rpc.return_value = False
+        self.module.send_command = Mock(return_value=Mock(error=False, data={'system': {}}))
+
+        self.module._run_startup_stage()
+
+        # deferred configuration falls back after DEFERRED_RPC_TIMEOUT, UI keeps being probed for profile
+        self.module._configure_deferred.assert_called()
+        self.assertEqual(self.module.startup_profiler.probe_rpc.call_count, 2)
+        self.assertEqual(
+            self.module.startup_profiler.probe_rpc.call_args.args[1],
+            self.module.STARTUP_PROBE_TIMEOUT - self.module.DEFERRED_RPC_TIMEOUT,
+        )
+
+    def test_get_startup_profile(self):
+        self.init_session()
+        self.module.startup_profiler = Mock()
+        self.module.startup_profiler.get_profile.return_value = {'timestamp': 2000}
+        self.module.startup_profiler.get_profiles.return_value = [{'timestamp': 2000}, {'timestamp': 1000}]
+
+        profile = self.module.get_startup_profile()
+
+        self.assertEqual(profile, {'current': {'timestamp': 2000}, 'previous': [{'timestamp': 1000}]})
+
+    def test_get_startup_profile_not_available(self):
+        self.init_session()
+        self.module.startup_profiler = Mock()
+        self.module.startup_profiler.get_profile.return_value = None
+        self.module.startup_profiler.get_profiles.return_value = [{'timestamp': 1000}]
+
+        profile = self.module.get_startup_profile()
+
+        self.assertEqual(profile, {'current': None, 'previous': [{'timestamp': 1000}]})
 
     def test_get_memory_usage(self):
         self.init_session()
@@ -334,6 +730,203 @@ class TestsSystem(unittest.TestCase):
         
         self.assertTrue(self.session.event_called('system.monitoring.cpu'))
 
+    def test_monitoring_cpu_task_gc_pause(self):
+        self.init_session()
+        self.module._get_config_field = Mock(return_value=True)
+        self.module.gc_stats = Mock()
+        self.module.gc_stats.get_pause_percent.return_value = 0.5
+
+        self.module._monitoring_cpu_task()
+
+        self.assertTrue(self.session.event_called_with('system.monitoring.cpu', {'system': 100.0, 'cleep': 100.0}))
+        self.assertTrue(self.session.event_called_with('system.monitoring.gc', {'pause': 0.5}))
+
+    def test_gc_stats_follow_monitoring(self):
+        self.init_session()
+        self.module.gc_stats = Mock()
+        self.module._get_config_field = Mock(return_value=True)
+
+        self.module._System__start_monitoring_tasks()
+        self.module.gc_stats.start.assert_called()
+
+        self.module._System__stop_monitoring_tasks()
+        self.module.gc_stats.stop.assert_called()
+
+    def test_get_gc_stats(self):
+        self.init_session()
+        self.module.gc_stats = Mock()
+        self.module.gc_stats.get_stats.return_value = {'running': True}
+
+        self.assertEqual(self.module.get_gc_stats(), {'running': True})
+
+    def test_monitoring_tasks_watched(self):
+        self.init_session()
+        self.module._get_config_field = Mock(return_value=True)
+        self.module.task_factory = Mock()
+
+        self.module._System__start_monitoring_tasks()
+
+        self.assertCountEqual(
+            self.module.thread_watchdog.get_tasks().keys(),
+            ['monitoringcpu', 'monitoringmemory', 'monitoringthermal'],
+        )
+        self.module.task_factory.create_task.assert_any_call(self.module.MONITORING_CPU_DELAY, session.AnyArg())
+
+    def test_set_watchdog(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module._get_config_field = Mock(return_value=True)
+        self.module.task_factory = Mock()
+
+        self.module.set_watchdog(True)
+
+        self.module._set_config_field.assert_called_with('watchdog', True)
+        self.module.task_factory.create_task.assert_called_with(self.module.WATCHDOG_DELAY, session.AnyArg())
+        self.assertIn('watchdog', self.module.thread_watchdog.get_tasks())
+        self.module.task_factory.create_task.return_value.start.assert_called()
+
+        self.module.set_watchdog(False)
+
+        self.module.task_factory.create_task.return_value.stop.assert_called()
+
+    def test_set_watchdog_exception(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_watchdog(1)
+        self.assertEqual(str(cm.exception), 'Parameter "enable" must be of type "bool"')
+
+        self.module._set_config_field = Mock(return_value=False)
+        with self.assertRaises(CommandError) as cm:
+            self.module.set_watchdog(True)
+        self.assertEqual(str(cm.exception), 'Unable to save configuration')
+
+    def test_watchdog_alert(self):
+        self.init_session()
+        alert = {'type': 'stuck', 'thread': 'worker', 'task': 'monitoringcpu', 'duration': 121.0, 'stack': ['line']}
+
+        self.module._System__on_watchdog_alert(alert)
+
+        self.assertTrue(self.session.event_called_with('system.alert.watchdog', alert))
+
+    def test_monitoring_tasks_stats(self):
+        self.init_session()
+        self.module._get_config_field = Mock(return_value=True)
+        self.module.task_factory = Mock()
+        self.module._monitoring_cpu_task = Mock()
+
+        self.module._System__start_monitoring_tasks()
+        task = self.module.task_factory.create_task.call_args_list[0][0][1]
+        task()
+
+        stats = self.module.get_task_stats()
+        self.assertEqual(stats['monitoringcpu']['fires'], 1)
+        self.assertEqual(stats['monitoringcpu']['interval'], self.module.MONITORING_CPU_DELAY)
+        self.assertEqual(stats['monitoringmemory']['fires'], 0)
+        self.module._monitoring_cpu_task.assert_called()
+
+    def test_set_app_task_stats(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.task_factory = Mock()
+        create_task = self.module.task_factory.create_task
+        app_task = Mock(__name__='_task', __self__=Mock())
+
+        self.module.set_app_task_stats(True)
+        self.module.task_factory.create_task(30.0, app_task)
+        self.module.task_factory.create_task(None, app_task)
+
+        self.module._set_config_field.assert_called_with('apptaskstats', True)
+        self.assertEqual(create_task.call_count, 2)
+        wrapped = create_task.call_args_list[0][0][1]
+        self.assertIsNot(wrapped, app_task)
+        self.assertIs(create_task.call_args_list[1][0][1], app_task)
+        wrapped()
+        app_stats = {name: stat for name, stat in self.module.get_task_stats().items() if stat['source'] == 'apps'}
+        self.assertEqual(list(app_stats.keys()), ['mock._task'])
+        self.assertEqual(app_stats['mock._task']['fires'], 1)
+
+        self.module.set_app_task_stats(False)
+
+        self.assertIs(self.module.task_factory.create_task, create_task)
+        self.assertFalse(any(stat['source'] == 'apps' for stat in self.module.get_task_stats().values()))
+
+    def test_set_app_task_stats_app_task_watched(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.task_factory = Mock()
+        create_task = self.module.task_factory.create_task
+        now = [100.0]
+        on_alert = Mock()
+        self.module.thread_watchdog = ThreadWatchdog(on_alert, 60.0, clock=lambda: now[0])
+        release = threading.Event()
+        started = threading.Event()
+        app_task = Mock(__name__='_task', __self__=Mock(), side_effect=lambda: (started.set(), release.wait()))
+        self.module.set_app_task_stats(True)
+        self.module.task_factory.create_task(30.0, app_task)
+        thread = threading.Thread(target=create_task.call_args[0][1])
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+        started.wait(1.0)
+
+        now[0] += 31.0
+        self.module.thread_watchdog.check()
+        now[0] += 60.0
+        self.module.thread_watchdog.check()
+
+        alerts = [call.args[0] for call in on_alert.call_args_list]
+        self.assertEqual([(alert['type'], alert['task']) for alert in alerts], [('overrun', 'mock._task'), ('stuck', 'mock._task')])
+
+    def test_set_app_task_stats_system_tasks_not_instrumented_twice(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module._get_config_field = Mock(return_value=True)
+        self.module.task_factory = Mock()
+
+        self.module.set_app_task_stats(True)
+        self.module._System__start_monitoring_tasks()
+
+        self.assertFalse(any(stat['source'] == 'apps' for stat in self.module.get_task_stats().values()))
+
+    def test_set_app_task_stats_create_task_replaced_after_instrumentation(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.task_factory = Mock()
+        create_task = self.module.task_factory.create_task
+        app_task = Mock(__name__='_task', __self__=Mock())
+        self.module.set_app_task_stats(True)
+        instrumented_create_task = self.module.task_factory.create_task
+        other_create_task = Mock(side_effect=instrumented_create_task)
+        self.module.task_factory.create_task = other_create_task
+
+        self.module.set_app_task_stats(False)
+        self.module.task_factory.create_task(30.0, app_task)
+
+        # other wrapper is kept while instrumentation is deactivated
+        self.assertIs(self.module.task_factory.create_task, other_create_task)
+        self.assertIs(create_task.call_args[0][1], app_task)
+
+    def test_set_app_task_stats_exception(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_app_task_stats('yes')
+        self.assertEqual(str(cm.exception), 'Parameter "enable" must be of type "bool"')
+
+        self.module._set_config_field = Mock(return_value=False)
+        with self.assertRaises(CommandError) as cm:
+            self.module.set_app_task_stats(True)
+        self.assertEqual(str(cm.exception), 'Unable to save configuration')
+
+    def test_dump_threads(self):
+        self.init_session()
+
+        dump = self.module.dump_threads()
+
+        self.assertTrue(any(thread['name'] == 'MainThread' for thread in dump['threads']))
+        self.assertIsInstance(dump['tasks'], dict)
+
     def test_monitoring_cpu_task_disabled(self):
         self.init_session()
         self.module._get_config_field = Mock(return_value=False)
@@ -382,9 +975,58 @@ class TestsSystem(unittest.TestCase):
         logging.debug('Event params: %s' % self.session.get_last_event_params('system.alert.memory'))
         self.assertTrue(self.session.event_called_with('system.alert.memory', {'percent': 90.0, 'threshold': 80.0}))
 
+    def test_monitoring_thermal_task(self):
+        self.init_session()
+        self.module._get_config_field = Mock(return_value=True)
+        status = {
+            'temperature': 45.2, 'frequency': 1500, 'frequencies': [1500], 'throttled': False,
+            'undervoltage': False, 'flags': [], 'occurred': [],
+        }
+        self.module.thermal_collector = Mock()
+        self.module.thermal_collector.collect.return_value = (status, [])
+
+        self.module._monitoring_thermal_task()
+
+        self.assertTrue(self.session.event_called_with('system.monitoring.thermal', status))
+        self.assertFalse(self.session.event_called('system.alert.throttling'))
+
+    def test_monitoring_thermal_task_throttling_started(self):
+        self.init_session()
+        self.module._get_config_field = Mock(return_value=True)
+        status = {
+            'temperature': 82.0, 'frequency': 600, 'frequencies': [600], 'throttled': True,
+            'undervoltage': False, 'flags': ['throttled', 'softtemplimit'], 'occurred': ['throttled'],
+        }
+        self.module.thermal_collector = Mock()
+        self.module.thermal_collector.collect.return_value = (status, ['throttled', 'softtemplimit'])
+
+        self.module._monitoring_thermal_task()
+
+        self.assertTrue(self.session.event_called_with('system.alert.throttling', {
+            'flags': ['throttled', 'softtemplimit'], 'temperature': 82.0, 'frequency': 600,
+        }))
+        self.assertTrue(self.session.event_called('system.monitoring.thermal'))
+
+    def test_monitoring_thermal_task_disabled(self):
+        self.init_session()
+        self.module._get_config_field = Mock(return_value=False)
+        self.module.thermal_collector = Mock()
+
+        self.module._monitoring_thermal_task()
+
+        self.assertFalse(self.module.thermal_collector.collect.called)
+        self.assertFalse(self.session.event_called('system.monitoring.thermal'))
+
+    def test_get_thermal_status(self):
+        self.init_session()
+        self.module.thermal_collector = Mock()
+        self.module.thermal_collector.read.return_value = {'temperature': 45.2}
+
+        self.assertEqual(self.module.get_thermal_status(), {'temperature': 45.2})
+
     @patch('os.path.exists', Mock(return_value=True))
     @patch('backend.system.datetime')
-    @patch('backend.system.ZipFile')
+    @patch('zipfile.ZipFile')
     def test_download_logs(self, mock_zipfile, mock_datetime):
         mock_datetime.now = Mock(return_value=Datetime())
         self.init_session()
@@ -428,16 +1070,164 @@ class TestsSystem(unittest.TestCase):
     
         self.assertEqual(logs, [])
 
-    def test_clear_logs(self):
+    def test_get_logs_json_lines(self):
         self.init_session()
+        lines = [
+            '{"level": "INFO", "time": "2024-01-01 10:00:00,000", "name": "system", "file": "system.py", "line": 12, "message": "hello"}\n',
+            '2024-01-01 10:00:01,000 system      [system.py:13] INFO  : world\n',
+        ]
+        self.session.cleep_filesystem.read_data = Mock(return_value=lines)
 
-        with patch('os.path.exists') as mock_path_exists:
-            mock_path_exists.return_value = True
-            self.module.clear_logs()
-    
-        self.session.cleep_filesystem.write_data.assert_called_with('/tmp/cleep.log', '')
+        with patch('os.path.exists', Mock(return_value=True)):
+            logs = self.module.get_logs()
 
-    def test_clear_logs_not_exist(self):
+        self.assertEqual(logs, [
+            '2024-01-01 10:00:00,000 system      [system.py:12] INFO  : hello\n',
+            '2024-01-01 10:00:01,000 system      [system.py:13] INFO  : world\n',
+        ])
+
+    def test_search_logs(self):
+        self.init_session()
+        lines = [
+            '2024-01-01 10:00:00,000 system      [system.py:12] INFO  : hello\n',
+            '2024-01-01 10:00:01,000 system      [system.py:13] ERROR : world\n',
+            'Traceback (most recent call last):\n',
+        ]
+        self.session.cleep_filesystem.read_data = Mock(return_value=lines)
+
+        with patch('os.path.exists', Mock(return_value=True)):
+            logs = self.module.search_logs(levels=['ERROR'])
+
+        self.assertEqual(logs, lines[1:])
+
+    def test_search_logs_exception(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.search_logs(pattern=123)
+        self.assertEqual(str(cm.exception), 'Parameter "pattern" must be of type "str"')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.search_logs(limit=0)
+        self.assertEqual(str(cm.exception), 'Parameter "limit" is invalid (specified="0")')
+
+    def test_set_log_format(self):
+        self.init_session()
+        handler = logging.FileHandler('/tmp/cleep.log', delay=True)
+        text_formatter = logging.Formatter()
+        handler.setFormatter(text_formatter)
+        logging.getLogger().addHandler(handler)
+        self.module._set_config_field = Mock(return_value=True)
+
+        try:
+            self.module.set_log_format('json')
+            self.module._set_config_field.assert_called_with('logformat', 'json')
+            self.assertEqual(handler.formatter.__class__.__name__, 'JsonLogFormatter')
+
+            self.module.set_log_format('text')
+            self.assertIs(handler.formatter, text_formatter)
+        finally:
+            logging.getLogger().removeHandler(handler)
+
+    def test_set_log_format_exception(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_log_format('xml')
+        self.assertEqual(str(cm.exception), 'Parameter "log_format" is invalid (specified="xml")')
+
+        self.module._set_config_field = Mock(return_value=False)
+        with self.assertRaises(CommandError) as cm:
+            self.module.set_log_format('json')
+        self.assertEqual(str(cm.exception), 'Unable to save configuration')
+
+    def test_clear_logs(self):
+        self.init_session()
+
+        with patch('os.path.exists') as mock_path_exists:
+            mock_path_exists.return_value = True
+            self.module.clear_logs()
+    
+        self.session.cleep_filesystem.write_data.assert_called_with('/tmp/cleep.log', '')
+
+    def test_get_logs_with_ram_logs(self):
+        self.init_session()
+        self.session.cleep_filesystem.read_data = Mock(return_value=['line1\n'])
+        self.module.ram_log = Mock(enabled=True)
+        self.module.ram_log.read_lines.return_value = ['line2\n']
+
+        with patch('os.path.exists', Mock(return_value=True)):
+            logs = self.module.get_logs()
+
+        self.assertEqual(logs, ['line1\n', 'line2\n'])
+
+    @patch('os.path.exists', Mock(return_value=True))
+    @patch('zipfile.ZipFile', Mock())
+    def test_download_logs_flush_ram_logs(self):
+        self.init_session()
+        self.module.ram_log = Mock()
+
+        self.module.download_logs()
+
+        self.module.ram_log.flush.assert_called()
+
+    def test_clear_logs_with_ram_logs(self):
+        self.init_session()
+        self.module.ram_log = Mock()
+
+        with patch('os.path.exists', Mock(return_value=True)):
+            self.module.clear_logs()
+
+        self.module.ram_log.clear.assert_called()
+        self.session.cleep_filesystem.write_data.assert_called_with('/tmp/cleep.log', '')
+
+    def test_set_ram_logs(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        handler = logging.FileHandler('/tmp/cleep.log', delay=True)
+        logging.getLogger().addHandler(handler)
+        self.module.ram_log = Mock()
+        self.module.ram_log.ram_path = '/dev/shm/cleep.log'
+
+        try:
+            self.module.set_ram_logs(True)
+            self.module._set_config_field.assert_called_with('ramlogs', True)
+            self.module.ram_log.enable.assert_called_with(handler)
+
+            self.module.set_ram_logs(False)
+            self.module.ram_log.disable.assert_called()
+        finally:
+            logging.getLogger().removeHandler(handler)
+
+    def test_set_ram_logs_exception(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_ram_logs('true')
+        self.assertEqual(str(cm.exception), 'Parameter "enable" must be of type "bool"')
+
+        self.module._set_config_field = Mock(return_value=False)
+        with self.assertRaises(CommandError) as cm:
+            self.module.set_ram_logs(True)
+        self.assertEqual(str(cm.exception), 'Unable to save configuration')
+
+    def test_ram_logs_flushed_on_time_event(self):
+        self.init_session()
+        self.module.ram_log = Mock(enabled=True)
+        self.module.ram_log.need_flush.return_value = False
+        event = {'event': 'parameters.time.now', 'params': {'minute': 1}}
+
+        for _ in range(self.module.RAM_LOG_FLUSH_DELAY - 1):
+            self.module.on_event(event)
+        self.assertFalse(self.module.ram_log.flush.called)
+        self.module.on_event(event)
+        self.assertEqual(self.module.ram_log.flush.call_count, 1)
+
+        self.module.ram_log.need_flush.return_value = True
+        self.module.on_event(event)
+        self.assertEqual(self.module.ram_log.flush.call_count, 2)
+
+    def test_clear_logs_not_exist(self):
         self.init_session()
 
         with patch('os.path.exists') as mock_path_exists:
@@ -591,6 +1381,79 @@ class TestsSystem(unittest.TestCase):
             self.module.set_module_debug('rpc', True)
         self.assertEqual(str(cm.exception), 'Update debug failed')
 
+    def test_start_debug_session(self):
+        self.init_session()
+        self.session.add_mock_command(self.session.make_mock_command('set_debug'))
+        self.module.bootstrap['events_broker'].logger = Mock(level=logging.INFO)
+
+        session_infos = self.module.start_debug_session(['events_broker', 'dummy'], 10)
+        logging.debug('Session: %s' % session_infos)
+
+        self.assertEqual(session_infos['targets'], ['dummy', 'events_broker'])
+        self.assertEqual(session_infos['failed'], [])
+        self.module.bootstrap['events_broker'].logger.setLevel.assert_called_with(logging.DEBUG)
+        self.assertTrue(self.session.command_called_with('set_debug', to='dummy', params={'debug': True}))
+        self.assertFalse(mock_cleepconf.return_value.enable_module_debug.called)
+        self.assertFalse(mock_cleepconf.return_value.enable_core_debug.called)
+
+    def test_start_debug_session_all_targets_failed(self):
+        self.init_session()
+        self.session.add_mock_command(self.session.make_mock_command('set_debug', fail=True))
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.start_debug_session(['dummy'], 10)
+        self.assertEqual(str(cm.exception), 'Unable to enable debug on specified targets')
+        self.assertIsNone(self.module.get_debug_session())
+
+    def test_start_debug_session_exception(self):
+        self.init_session()
+
+        with self.assertRaises(MissingParameter) as cm:
+            self.module.start_debug_session(None, 10)
+        self.assertEqual(str(cm.exception), 'Parameter "targets" is missing')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.start_debug_session([], 10)
+        self.assertEqual(str(cm.exception), 'Parameter "targets" is invalid (specified="[]")')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.start_debug_session(['dummy'], 0)
+        self.assertEqual(str(cm.exception), 'Parameter "duration" is invalid (specified="0")')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.start_debug_session(['dummy'], 1441)
+        self.assertEqual(str(cm.exception), 'Parameter "duration" is invalid (specified="1441")')
+
+    def test_stop_debug_session(self):
+        self.init_session()
+        self.session.add_mock_command(self.session.make_mock_command('set_debug'))
+        self.module.bootstrap['drivers'].logger = Mock(level=logging.WARNING)
+        mock_cleepconf.return_value.is_module_debugged.return_value = False
+        self.module.start_debug_session(['drivers', 'dummy'], 10)
+
+        self.assertTrue(self.module.stop_debug_session())
+
+        self.module.bootstrap['drivers'].logger.setLevel.assert_called_with(logging.WARNING)
+        self.assertTrue(self.session.command_called_with('set_debug', to='dummy', params={'debug': False}))
+        self.assertIsNone(self.module.get_debug_session())
+        self.assertFalse(self.module.stop_debug_session())
+
+    def test_on_event_debug_session_expired(self):
+        self.init_session()
+        self.session.add_mock_command(self.session.make_mock_command('set_debug'))
+        self.module.backup_cleep_config = Mock()
+        self.module.start_debug_session(['dummy'], 10)
+
+        with patch('backend.system.time.time', Mock(return_value=time.time() + 601)):
+            self.module.on_event({
+                'event': 'parameters.time.now',
+                'params': {
+                    'minute': 5
+                }
+            })
+
+        self.assertIsNone(self.module.get_debug_session())
+
     def test_set_not_renderable_events(self):
         self.init_session()
         self.module.get_not_renderable_events = Mock(return_value=[{
@@ -781,179 +1644,880 @@ class TestsSystem(unittest.TestCase):
 
         self.module.cleep_backup.backup.assert_called()
 
-    def test_set_cleep_backup_delay(self):
+    def test_backup_cleep_config_use_worker(self):
         self.init_session()
+        self.module.backup_worker = Mock()
+        self.module.backup_worker.flush.return_value = True
 
-        self.module._set_config_field = Mock(return_value=True)
-        self.module.set_cleep_backup_delay(5)
-        self.assertEqual(self.module.cleep_backup_delay, 5)
-        self.module.set_cleep_backup_delay(120)
-        self.assertEqual(self.module.cleep_backup_delay, 120)
+        self.assertTrue(self.module.backup_cleep_config())
 
-        self.module._set_config_field = Mock(return_value=False)
-        self.module.set_cleep_backup_delay(15)
-        self.assertEqual(self.module.cleep_backup_delay, 120)
+        self.module.backup_worker.flush.assert_called_with(self.module.BACKUP_FLUSH_TIMEOUT)
 
-    def test_set_cleep_backup_delay_exception(self):
+    def test_get_last_backup(self):
         self.init_session()
+        self.module.cleep_backup = Mock()
+        self.module.cleep_backup.get_last_backup.return_value = {'bytesskipped': 1024}
 
-        with self.assertRaises(MissingParameter) as cm:
-            self.module.set_cleep_backup_delay(None)
-        self.assertEqual(str(cm.exception), 'Parameter "delay" is missing')
+        self.assertEqual(self.module.get_last_backup(), {'bytesskipped': 1024})
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.set_cleep_backup_delay(True)
-        self.assertEqual(str(cm.exception), 'Parameter "delay" is invalid (specified="True")')
+    def test_run_backup_records_snapshot(self):
+        self.init_session()
+        self.module.cleep_backup = Mock()
+        self.module.cleep_backup.backup.return_value = True
+        self.module.cleep_backup.get_manifest.return_value = {'a.conf': {'size': 1, 'hash': 'abc'}}
+        self.module.cleep_backup.get_last_backup.return_value = {'byteswritten': 1}
+        self.module.snapshot_store = Mock()
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.set_cleep_backup_delay(4)
-        self.assertEqual(str(cm.exception), 'Parameter "delay" is invalid (specified="4")')
+        self.assertTrue(self.module._run_backup())
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.set_cleep_backup_delay(121)
-        self.assertEqual(str(cm.exception), 'Parameter "delay" is invalid (specified="121")')
+        self.module.snapshot_store.record.assert_called_with('/etc/cleep/', {'a.conf': {'size': 1, 'hash': 'abc'}})
 
-    def test_install_driver_terminated_success_no_reboot_required(self):
+    def test_run_backup_failed_does_not_record_snapshot(self):
         self.init_session()
-        self.module.reboot_device = Mock()
-        self.module.drivers = Mock()
-        self.module.drivers.get_driver.return_value = DummyDriver(False)
+        self.module.cleep_backup = Mock()
+        self.module.cleep_backup.backup.return_value = False
+        self.module.cleep_backup.get_last_backup.return_value = {'byteswritten': 0}
+        self.module.snapshot_store = Mock()
 
-        self.module._install_driver_terminated('dummy', 'dummy-driver', True, '')
+        self.assertFalse(self.module._run_backup())
 
-        self.assertTrue(self.session.event_called_with('system.driver.install', {
-            'drivertype': 'dummy',
-            'drivername': 'dummy-driver',
-            'installing': False,
-            'success': True,
-            'message': '',
-        }))
-        self.assertFalse(self.module.reboot_device.called)
-        self.assertTrue(self.module.drivers.get_driver.called)
+        self.assertFalse(self.module.snapshot_store.record.called)
 
-    def test_install_driver_terminated_success_reboot_required(self):
+    def test_run_backup_throttled(self):
         self.init_session()
-        self.module.reboot_device = Mock()
-        self.module.drivers = Mock()
-        self.module.drivers.get_driver.return_value = DummyDriver(True)
+        self.module.cleep_backup = Mock()
+        self.module.cleep_backup.backup.return_value = True
+        self.module.cleep_backup.get_last_backup.return_value = {'byteswritten': 2048}
+        self.module.snapshot_store = Mock()
+        self.module.io_throttle = Mock(enabled=True)
+        self.module.backup_worker.deferred = 2
 
-        self.module._install_driver_terminated('dummy', 'dummy-driver', True, '')
+        self.module._run_backup()
 
-        self.assertTrue(self.session.event_called_with('system.driver.install', {
-            'drivertype': 'dummy',
-            'drivername': 'dummy-driver',
-            'installing': False,
-            'success': True,
-            'message': '',
-        }))
-        self.assertTrue(self.module.reboot_device.called)
-        self.assertTrue(self.module.drivers.get_driver.called)
+        self.module.io_throttle.set_idle_priority.assert_any_call(True)
+        self.module.io_throttle.set_idle_priority.assert_called_with(False)
+        metrics = self.module.get_backup_metrics()
+        self.assertEqual(len(metrics), 1)
+        self.assertEqual(metrics[0]['byteswritten'], 2048)
+        self.assertTrue(metrics[0]['throttled'])
+        self.assertEqual(metrics[0]['deferred'], 2)
+        self.assertEqual(self.module.backup_worker.deferred, 0)
 
-    def test_install_driver_terminated_failure(self):
+    def test_set_backup_throttling(self):
         self.init_session()
-        self.module.reboot_device = Mock()
-        self.module.drivers = Mock()
+        self.module._set_config_field = Mock(return_value=True)
 
-        self.module._install_driver_terminated('dummy', 'dummy-driver', False, 'error occured')
+        self.module.set_backup_throttling(True)
 
-        self.assertTrue(self.session.event_called_with('system.driver.install', {
-            'drivertype': 'dummy',
-            'drivername': 'dummy-driver',
-            'installing': False,
-            'success': False,
-            'message': 'error occured',
-        }))
-        self.assertFalse(self.module.reboot_device.called)
-        self.assertFalse(self.module.drivers.get_driver.called)
+        self.module._set_config_field.assert_called_with('backupthrottling', True)
+        self.assertTrue(self.module.io_throttle.enabled)
 
-    def test_install_driver(self):
+    def test_set_backup_throttling_exception(self):
         self.init_session()
-        driver = Mock()
-        driver.is_installed = Mock(return_value=False)
-        self.module.drivers.get_driver = Mock(return_value=driver)
 
-        self.module.install_driver('dummy', 'dummy-driver')
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_backup_throttling('hello')
+        self.assertEqual(str(cm.exception), 'Parameter "enable" must be of type "bool"')
 
-        driver.install.assert_called()
-        self.session.event_called_with('system.driver.install', {
-            'drivertype': 'dummy',
-            'drivername': 'dummy-driver',
-            'installing': True,
-            'success': None,
-            'message': None,
-        })
+        self.module._set_config_field = Mock(return_value=False)
+        with self.assertRaises(CommandError) as cm:
+            self.module.set_backup_throttling(True)
+        self.assertEqual(str(cm.exception), 'Unable to save configuration')
 
-    def test_install_driver_already_installed(self):
-        self.init_session()
-        driver = Mock()
-        driver.is_installed = Mock(return_value=True)
-        self.module.drivers.get_driver = Mock(return_value=driver)
+    def init_leds(self, model='Raspberry Pi 3 Model B'):
+        self.leds_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.leds_dir)
+        for name in ['led1', 'led0']:
+            os.makedirs(os.path.join(self.leds_dir, name))
+            for attribute in ['brightness', 'trigger']:
+                with open(os.path.join(self.leds_dir, name, attribute), 'w') as fd:
+                    fd.write('')
+        self.module.leds = Leds(self.leds_dir)
+        self.module.led_patterns.leds = self.module.leds
+        self.module.hardware_infos.get_board = Mock(return_value={'model': model})
 
-        with self.assertRaises(CommandInfo) as cm:
-            self.module.install_driver('dummy', 'dummy-driver')
-        self.assertEqual(str(cm.exception), 'Driver is already installed')
+    def read_led(self, name, attribute):
+        with open(os.path.join(self.leds_dir, name, attribute)) as fd:
+            return fd.read()
 
-    def test_install_driver_exception(self):
+    def test_get_led_path(self):
         self.init_session()
-        self.module.drivers.get_driver = Mock(return_value=None)
+        self.init_leds()
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.install_driver('dummy', 'dummy-driver')
-        self.assertEqual(str(cm.exception), 'No driver found for specified parameters')
+        path = self.module.get_led_path([os.path.join(self.leds_dir, 'PWR', 'brightness'), os.path.join(self.leds_dir, 'led1', 'brightness')])
 
-        with self.assertRaises(MissingParameter) as cm:
-            self.module.install_driver(None, 'dummy-driver')
-        self.assertEqual(str(cm.exception), 'Parameter "driver_type" is missing')
+        self.assertEqual(path, os.path.join(self.leds_dir, 'led1', 'brightness'))
+        self.assertIsNone(self.module.get_led_path([os.path.join(self.leds_dir, 'PWR', 'brightness')]))
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.install_driver(123, 'dummy-driver')
-        self.assertEqual(str(cm.exception), 'Parameter "driver_type" must be of type "str"')
+    @patch('backend.system.Tools')
+    def test_tweak_power_led(self, mock_tools):
+        self.init_session()
+        self.init_leds()
+        self.module._set_config_field = Mock(return_value=True)
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.install_driver('', 'dummy-driver')
-        self.assertEqual(str(cm.exception), 'Parameter "driver_type" is invalid (specified="")')
+        self.module.tweak_power_led(True)
+        self.assertEqual(self.read_led('led1', 'brightness'), '1')
+        self.module.tweak_power_led(False)
+        self.assertEqual(self.read_led('led1', 'brightness'), '0')
 
-        with self.assertRaises(MissingParameter) as cm:
-            self.module.install_driver('dummy', None)
-        self.assertEqual(str(cm.exception), 'Parameter "driver_name" is missing')
+        self.module._set_config_field.assert_called_with('enablepowerled', False)
+        self.assertFalse(mock_tools.raspberry_pi_infos.called)
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.install_driver('dummy', 123)
-        self.assertEqual(str(cm.exception), 'Parameter "driver_name" must be of type "str"')
+    def test_tweak_power_led_zero(self):
+        self.init_session()
+        self.init_leds('Zero W')
+        self.module._set_config_field = Mock(return_value=True)
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.install_driver('dummy', '')
-        self.assertEqual(str(cm.exception), 'Parameter "driver_name" is invalid (specified="")')
+        self.module.tweak_power_led(True)
 
-    def test_uninstall_driver_terminated_success_no_reboot_required(self):
+        self.assertEqual(self.read_led('led1', 'brightness'), '0')
+
+    def test_tweak_power_led_not_found(self):
         self.init_session()
-        self.module.reboot_device = Mock()
-        self.module.drivers = Mock()
-        self.module.drivers.get_driver.return_value = DummyDriver(False)
+        self.init_leds()
+        shutil.rmtree(os.path.join(self.leds_dir, 'led1'))
+        self.module._set_config_field = Mock(return_value=True)
 
-        self.module._uninstall_driver_terminated('dummy', 'dummy-driver', True, '')
+        self.module.tweak_power_led(True)
 
-        self.assertTrue(self.session.event_called_with('system.driver.uninstall', {
-            'drivertype': 'dummy',
-            'drivername': 'dummy-driver',
-            'uninstalling': False,
-            'success': True,
-            'message': '',
-        }))
-        self.assertFalse(self.module.reboot_device.called)
-        self.assertTrue(self.module.drivers.get_driver.called)
+        self.assertFalse(self.module._set_config_field.called)
 
-    def test_uninstall_driver_terminated_success_reboot_required(self):
+    def test_tweak_power_led_failed(self):
         self.init_session()
-        self.module.reboot_device = Mock()
-        self.module.drivers = Mock()
-        self.module.drivers.get_driver.return_value = DummyDriver(True)
+        self.init_leds()
+        self.module.leds.write = Mock(return_value=False)
 
-        self.module._uninstall_driver_terminated('dummy', 'dummy-driver', True, '')
+        with self.assertRaises(CommandError) as cm:
+            self.module.tweak_power_led(True)
+        self.assertEqual(str(cm.exception), 'Error tweaking power led')
 
-        self.assertTrue(self.session.event_called_with('system.driver.uninstall', {
-            'drivertype': 'dummy',
-            'drivername': 'dummy-driver',
+    def test_tweak_activity_led(self):
+        self.init_session()
+        self.init_leds()
+        self.module._set_config_field = Mock(return_value=True)
+
+        self.module.tweak_activity_led(True)
+
+        self.assertEqual(self.read_led('led0', 'brightness'), '1')
+        self.assertEqual(self.read_led('led0', 'trigger'), 'mmc0')
+        self.module._set_config_field.assert_called_with('enableactivityled', True)
+
+    def test_tweak_activity_led_pattern_playing(self):
+        self.init_session()
+        self.init_leds()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.led_patterns = Mock(enabled=True)
+        self.module.led_patterns.get_active_patterns.return_value = ['needreboot']
+
+        self.module.tweak_activity_led(False)
+
+        self.assertEqual(self.read_led('led0', 'brightness'), '')
+        self.module._set_config_field.assert_called_with('enableactivityled', False)
+
+    def test_tweak_activity_led_failed(self):
+        self.init_session()
+        self.init_leds()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.leds.write = Mock(return_value=False)
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.tweak_activity_led(True)
+        self.assertEqual(str(cm.exception), 'Error tweaking activity led')
+
+    def test_get_hardware_infos(self):
+        self.init_session()
+        self.module.hardware_infos = Mock()
+        self.module.hardware_infos.get.return_value = {'board': {'model': 'Raspberry Pi 4 Model B'}}
+
+        infos = self.module.get_hardware_infos()
+
+        self.assertEqual(infos, {'board': {'model': 'Raspberry Pi 4 Model B'}})
+
+    def test_tweak_cpu_profile(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.cpu_freq = Mock()
+
+        self.module.tweak_cpu_profile('performance', 800, 1200)
+
+        self.module.cpu_freq.apply.assert_called_with('performance', None, None)
+        self.module._set_config_field.assert_any_call('cpuprofile', 'performance')
+        self.module._set_config_field.assert_any_call('cpuminfreq', None)
+        self.module._set_config_field.assert_any_call('cpumaxfreq', None)
+
+    def test_tweak_cpu_profile_custom(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.cpu_freq = Mock()
+
+        self.module.tweak_cpu_profile('custom', 800, 1200)
+
+        self.module.cpu_freq.apply.assert_called_with('custom', 800, 1200)
+        self.module._set_config_field.assert_any_call('cpuminfreq', 800)
+        self.module._set_config_field.assert_any_call('cpumaxfreq', 1200)
+
+    def test_tweak_cpu_profile_restore(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.cpu_freq = Mock()
+
+        self.module.tweak_cpu_profile(None)
+
+        self.module.cpu_freq.restore.assert_called()
+        self.assertFalse(self.module.cpu_freq.apply.called)
+        self.module._set_config_field.assert_any_call('cpuprofile', None)
+        self.module._set_config_field.assert_any_call('cpuminfreq', None)
+        self.module._set_config_field.assert_any_call('cpumaxfreq', None)
+
+    def test_tweak_cpu_profile_exception(self):
+        self.init_session()
+        self.module.cpu_freq = Mock()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.tweak_cpu_profile('turbo')
+        self.assertEqual(str(cm.exception), 'Parameter "profile" is invalid (specified="turbo")')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.tweak_cpu_profile('custom', 0)
+        self.assertEqual(str(cm.exception), 'Parameter "min_freq" is invalid (specified="0")')
+
+        self.module.cpu_freq.apply.side_effect = ValueError('Governor "powersave" is not supported on this device')
+        with self.assertRaises(CommandError) as cm:
+            self.module.tweak_cpu_profile('powersave')
+        self.assertEqual(str(cm.exception), 'Governor "powersave" is not supported on this device')
+
+        self.module.cpu_freq.apply.side_effect = OSError('Permission denied')
+        with self.assertRaises(CommandError) as cm:
+            self.module.tweak_cpu_profile('powersave')
+        self.assertEqual(str(cm.exception), 'Error tweaking cpu profile')
+
+    def test_tweak_cpu_profile_save_failed(self):
+        self.init_session()
+        self.module.cpu_freq = Mock()
+        self.module._set_config_field = Mock(return_value=False)
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.tweak_cpu_profile('ondemand')
+        self.assertEqual(str(cm.exception), 'Unable to save configuration')
+
+    def test_get_cpu_profile(self):
+        self.init_session()
+        self.module._set_config_field('cpuprofile', 'powersave')
+        self.module.cpu_freq = Mock()
+        self.module.cpu_freq.get_status.return_value = {'supported': True}
+
+        profile = self.module.get_cpu_profile()
+
+        self.assertEqual(profile, {'profile': 'powersave', 'minfreq': None, 'maxfreq': None, 'status': {'supported': True}})
+
+    def test_apply_tweaks_cpu_profile(self):
+        self.init_session()
+        self.module.tweak_power_led = Mock()
+        self.module.tweak_activity_led = Mock()
+        self.module.cpu_freq = Mock()
+        self.module._set_config_field('cpuprofile', 'custom')
+        self.module._set_config_field('cpuminfreq', 800)
+
+        self.module._System__apply_tweaks()
+
+        self.module.cpu_freq.apply.assert_called_with('custom', 800, None)
+
+    def test_apply_tweaks_no_cpu_profile(self):
+        self.init_session()
+        self.module.tweak_power_led = Mock()
+        self.module.tweak_activity_led = Mock()
+        self.module.cpu_freq = Mock()
+        self.module.vm_tuning = Mock()
+
+        self.module._System__apply_tweaks()
+
+        self.assertFalse(self.module.cpu_freq.apply.called)
+        self.assertFalse(self.module.vm_tuning.apply_profile.called)
+        self.assertFalse(self.module.vm_tuning.enable_zram.called)
+
+    def test_tweak_process_priority(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.process_priority = Mock()
+
+        self.module.tweak_process_priority(nice=-5, cpus=[1, 2, 3], thread_groups={'rpc': [0]})
+
+        settings = {'nice': -5, 'ioclass': None, 'iolevel': None, 'cpus': [1, 2, 3], 'threadgroups': {'rpc': [0]}}
+        self.module.process_priority.apply.assert_called_with(settings)
+        self.module._set_config_field.assert_called_with('processpriority', settings)
+
+    def test_tweak_process_priority_reset(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.process_priority = Mock()
+        self.module.process_priority.get_default_settings.return_value = {'nice': 0}
+
+        self.module.tweak_process_priority()
+
+        self.module.process_priority.apply.assert_called_with({'nice': 0})
+        self.module._set_config_field.assert_called_with('processpriority', None)
+
+    def test_tweak_process_priority_exception(self):
+        self.init_session()
+        self.module.process_priority = Mock()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.tweak_process_priority(nice='high')
+        self.assertEqual(str(cm.exception), 'Parameter "nice" must be of type "int"')
+
+        self.module.process_priority.apply.side_effect = ValueError('Nice value must be between -20 and 19')
+        with self.assertRaises(CommandError) as cm:
+            self.module.tweak_process_priority(nice=30)
+        self.assertEqual(str(cm.exception), 'Nice value must be between -20 and 19')
+
+        self.module.process_priority.apply.side_effect = None
+        self.module._set_config_field = Mock(return_value=False)
+        with self.assertRaises(CommandError) as cm:
+            self.module.tweak_process_priority(nice=5)
+        self.assertEqual(str(cm.exception), 'Unable to save configuration')
+
+    def test_get_process_priority(self):
+        self.init_session()
+        self.module.process_priority = Mock()
+        self.module.process_priority.get_status.return_value = {'nice': 0}
+
+        self.assertEqual(self.module.get_process_priority(), {'configured': False, 'status': {'nice': 0}})
+
+    def test_process_priority_pin_new_threads(self):
+        self.init_session()
+        self.module._set_config_field('processpriority', {'nice': 5})
+        self.module.process_priority = Mock()
+
+        self.module.on_event({'event': 'parameters.time.now', 'params': {'minute': 1}})
+
+        self.module.process_priority.pin_new_threads.assert_called()
+
+    def test_tweak_memory_reclaim(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.memory_reclaimer = Mock()
+        self.module.memory_reclaimer.set_arena_max.return_value = True
+
+        self.module.tweak_memory_reclaim(True, 2)
+
+        self.module._set_config_field.assert_any_call('memoryreclaim', True)
+        self.module._set_config_field.assert_any_call('mallocarenamax', 2)
+        self.module.memory_reclaimer.set_arena_max.assert_called_with(2)
+
+    def test_tweak_memory_reclaim_exception(self):
+        self.init_session()
+        self.module.memory_reclaimer = Mock()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.tweak_memory_reclaim(True, 0)
+        self.assertEqual(str(cm.exception), 'Parameter "arena_max" is invalid (specified="0")')
+
+        self.module.memory_reclaimer.set_arena_max.return_value = False
+        with self.assertRaises(CommandError) as cm:
+            self.module.tweak_memory_reclaim(True, 2)
+        self.assertEqual(str(cm.exception), 'Unable to cap malloc arenas on this device')
+
+        self.module._set_config_field = Mock(return_value=False)
+        with self.assertRaises(CommandError) as cm:
+            self.module.tweak_memory_reclaim(False)
+        self.assertEqual(str(cm.exception), 'Unable to save configuration')
+
+    def test_reclaim_memory(self):
+        self.init_session()
+        self.module.memory_reclaimer = Mock()
+        self.module.memory_reclaimer.reclaim.return_value = {'reclaimed': 1024}
+
+        self.assertEqual(self.module.reclaim_memory(), {'reclaimed': 1024})
+        self.module.memory_reclaimer.reclaim.assert_called_with('manual')
+
+    def test_get_memory_reclaim(self):
+        self.init_session()
+        self.module.memory_reclaimer = Mock()
+        self.module.memory_reclaimer.get_stats.return_value = {'runs': 0}
+
+        self.assertEqual(self.module.get_memory_reclaim(), {'enabled': False, 'arenamax': None, 'stats': {'runs': 0}})
+
+    def test_memory_reclaim_on_time_event(self):
+        self.init_session()
+        self.module._set_config_field('memoryreclaim', True)
+        self.module.memory_reclaimer = Mock()
+        self.module.memory_reclaimer.is_idle.return_value = True
+        event = {'event': 'parameters.time.now', 'params': {'minute': 1}}
+
+        with patch.object(mock_psutil, 'virtual_memory', Mock(return_value=Mock(percent=20.0))):
+            for _ in range(self.module.MEMORY_RECLAIM_DELAY - 1):
+                self.module.on_event(event)
+            self.assertFalse(self.module.memory_reclaimer.reclaim.called)
+            self.module.on_event(event)
+        self.module.memory_reclaimer.reclaim.assert_called_once_with('idle')
+
+    def test_memory_reclaim_on_threshold(self):
+        self.init_session()
+        self.module._set_config_field('memoryreclaim', True)
+        self.module.memory_reclaimer = Mock()
+        self.module.memory_reclaimer.is_idle.return_value = False
+        event = {'event': 'parameters.time.now', 'params': {'minute': 1}}
+
+        with patch.object(mock_psutil, 'virtual_memory', Mock(return_value=Mock(percent=20.0))):
+            for _ in range(self.module.MEMORY_RECLAIM_DELAY):
+                self.module.on_event(event)
+        self.assertFalse(self.module.memory_reclaimer.reclaim.called)
+
+        with patch.object(mock_psutil, 'virtual_memory', Mock(return_value=Mock(percent=85.0))):
+            self.module.on_event(event)
+        self.module.memory_reclaimer.reclaim.assert_called_once_with('threshold')
+
+    def test_tweak_vm_profile(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.vm_tuning = Mock()
+
+        self.module.tweak_vm_profile('sdcard')
+
+        self.module.vm_tuning.apply_profile.assert_called_with('sdcard')
+        self.module._set_config_field.assert_called_with('vmprofile', 'sdcard')
+
+    def test_tweak_vm_profile_exception(self):
+        self.init_session()
+        self.module.vm_tuning = Mock()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.tweak_vm_profile('turbo')
+        self.assertEqual(str(cm.exception), 'Parameter "profile" is invalid (specified="turbo")')
+
+        self.module.vm_tuning.apply_profile.side_effect = OSError('Permission denied')
+        with self.assertRaises(CommandError) as cm:
+            self.module.tweak_vm_profile('sdcard')
+        self.assertEqual(str(cm.exception), 'Error tweaking vm profile')
+
+    def test_tweak_zram(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.vm_tuning = Mock()
+        self.module.hardware_infos = Mock()
+        self.module.hardware_infos.get.return_value = {'memory': {'total': 1000}}
+
+        self.module.tweak_zram(True)
+        self.module.vm_tuning.enable_zram.assert_called_with(1000)
+        self.module._set_config_field.assert_called_with('zram', True)
+
+        self.module.tweak_zram(False)
+        self.assertTrue(self.module.vm_tuning.disable_zram.called)
+        self.module._set_config_field.assert_called_with('zram', False)
+
+    def test_tweak_zram_failed(self):
+        self.init_session()
+        self.module.vm_tuning = Mock()
+        self.module.vm_tuning.disable_zram.return_value = False
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.tweak_zram(False)
+        self.assertEqual(str(cm.exception), 'Error tweaking zram swap')
+
+    def test_get_vm_profile(self):
+        self.init_session()
+        self.module.vm_tuning = Mock()
+        self.module.vm_tuning.is_zram_enabled.return_value = False
+        self.module.vm_tuning.get_settings.return_value = {'vm.swappiness': 60}
+
+        profile = self.module.get_vm_profile()
+
+        self.assertIsNone(profile['profile'])
+        self.assertFalse(profile['zram'])
+        self.assertEqual(profile['settings'], {'vm.swappiness': 60})
+        self.assertFalse(profile['benchmark']['running'])
+
+    def test_benchmark_vm_profile(self):
+        self.init_session()
+        self.module.task_factory = Mock()
+
+        self.module.benchmark_vm_profile('sdcard')
+
+        self.module.task_factory.create_task.assert_called_with(None, self.module._run_vm_benchmark, task_args=['sdcard'])
+        self.assertTrue(self.module.get_vm_benchmark()['running'])
+        with self.assertRaises(CommandInfo) as cm:
+            self.module.benchmark_vm_profile('sdcard')
+        self.assertEqual(str(cm.exception), 'Benchmark is already running')
+
+    def test_run_vm_benchmark(self):
+        self.init_session()
+        self.module.vm_tuning = Mock()
+        self.module.vm_tuning.get_settings.return_value = {'vm.swappiness': 60}
+        self.module.vm_tuning.benchmark.side_effect = [{'amplification': 1.0}, {'amplification': 0.5}]
+
+        self.module._run_vm_benchmark('sdcard')
+
+        benchmark = self.module.get_vm_benchmark()
+        self.assertFalse(benchmark['running'])
+        self.assertEqual(benchmark['before'], {'amplification': 1.0})
+        self.assertEqual(benchmark['after'], {'amplification': 0.5})
+        self.module.vm_tuning.apply_profile.assert_called_with('sdcard')
+        self.module.vm_tuning.set_settings.assert_called_with({'vm.swappiness': 60})
+
+    def test_run_vm_benchmark_failed_restores_settings(self):
+        self.init_session()
+        self.module.vm_tuning = Mock()
+        self.module.vm_tuning.get_settings.return_value = {'vm.swappiness': 60}
+        self.module.vm_tuning.benchmark.side_effect = [{'amplification': 1.0}, Exception('Test exception')]
+
+        self.module._run_vm_benchmark('sdcard')
+
+        self.assertFalse(self.module.get_vm_benchmark()['running'])
+        self.module.vm_tuning.set_settings.assert_called_with({'vm.swappiness': 60})
+
+    def test_apply_tweaks_vm_profile(self):
+        self.init_session()
+        self.module.tweak_power_led = Mock()
+        self.module.tweak_activity_led = Mock()
+        self.module.vm_tuning = Mock()
+        self.module.hardware_infos = Mock()
+        self.module.hardware_infos.get.return_value = {'memory': {'total': 1000}}
+        self.module._set_config_field('vmprofile', 'lowmemory')
+        self.module._set_config_field('zram', True)
+
+        self.module._System__apply_tweaks()
+
+        self.module.vm_tuning.apply_profile.assert_called_with('lowmemory')
+        self.module.vm_tuning.enable_zram.assert_called_with(1000)
+
+    def test_set_led_patterns(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.led_patterns = Mock()
+
+        self.module.set_led_patterns(True)
+        self.module._set_config_field.assert_called_with('ledpatterns', True)
+        self.assertTrue(self.module.led_patterns.start.called)
+
+        self.module.set_led_patterns(False)
+        self.assertTrue(self.module.led_patterns.stop.called)
+
+    def test_set_led_patterns_exception(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_led_patterns('hello')
+        self.assertEqual(str(cm.exception), 'Parameter "enable" must be of type "bool"')
+
+        self.module._set_config_field = Mock(return_value=False)
+        with self.assertRaises(CommandError) as cm:
+            self.module.set_led_patterns(True)
+        self.assertEqual(str(cm.exception), 'Unable to save configuration')
+
+    def test_get_led_patterns(self):
+        self.init_session()
+        self.module.led_patterns = Mock(enabled=True)
+        self.module.led_patterns.get_active_patterns.return_value = ['backup']
+
+        self.assertEqual(self.module.get_led_patterns(), {'enabled': True, 'active': ['backup']})
+
+    def test_led_pattern_needreboot(self):
+        self.init_session()
+        self.init_leds()
+        self.module.led_patterns = Mock()
+
+        self.module.on_event({'event': 'system.device.needreboot', 'params': {}})
+
+        self.module.led_patterns.set_pattern.assert_called_with('needreboot', True)
+
+    def test_led_pattern_memory_alert(self):
+        self.init_session()
+        self.init_leds()
+        self.module._get_config_field = Mock(return_value=True)
+        self.module.led_patterns = Mock()
+        self.module.get_memory_usage = Mock(return_value={'total': 500, 'available': 50})
+
+        self.module._monitoring_memory_task()
+        self.module.led_patterns.set_pattern.assert_called_with('memoryalert', True)
+
+        self.module.get_memory_usage = Mock(return_value={'total': 500, 'available': 450})
+        self.module._monitoring_memory_task()
+        self.module.led_patterns.set_pattern.assert_called_with('memoryalert', False)
+
+    def test_led_pattern_memory_alert_cleared_when_monitoring_disabled(self):
+        self.init_session()
+        self.init_leds()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module._get_config_field = Mock(return_value=False)
+        self.module.led_patterns = Mock()
+
+        self.module.set_monitoring(False)
+
+        self.module.led_patterns.set_pattern.assert_called_with('memoryalert', False)
+
+    def test_led_pattern_backup(self):
+        self.init_session()
+        self.init_leds()
+        self.module.cleep_backup = Mock()
+        self.module.snapshot_store = Mock()
+        self.module.led_patterns = Mock()
+
+        self.module._run_backup()
+
+        self.assertEqual(self.module.led_patterns.set_pattern.call_args_list, [
+            (('backup', True),),
+            (('backup', False),),
+        ])
+
+    def test_list_config_snapshots(self):
+        self.init_session()
+        self.module.snapshot_store = Mock()
+        self.module.snapshot_store.list.return_value = [{'id': '123'}]
+
+        self.assertEqual(self.module.list_config_snapshots(), [{'id': '123'}])
+
+    def test_restore_config_snapshot(self):
+        self.init_session()
+        self.module.snapshot_store = Mock()
+        self.module.snapshot_store.restore.return_value = {'restored': 1, 'deleted': 0, 'unchanged': 3, 'failed': 0, 'corrupted': 0}
+        self.module.cleep_backup = Mock()
+        self.module.cleep_backup.get_manifest.return_value = {'a.conf': {'size': 1, 'hash': 'abc'}}
+
+        stats = self.module.restore_config_snapshot('123')
+
+        self.assertEqual(stats['restored'], 1)
+        self.module.snapshot_store.restore.assert_called_with('123', '/etc/cleep/', ['a.conf'])
+        self.assertTrue(self.module._System__need_restart)
+        self.assertTrue(self.session.event_called('system.cleep.needrestart'))
+
+    def test_restore_config_snapshot_exception(self):
+        self.init_session()
+        self.module.snapshot_store = Mock()
+        self.module.snapshot_store.restore.return_value = None
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.restore_config_snapshot('123')
+        self.assertEqual(str(cm.exception), 'Snapshot "123" does not exist')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.restore_config_snapshot('../123')
+        self.assertEqual(str(cm.exception), 'Parameter "snapshot_id" is invalid (specified="../123")')
+
+        self.module.snapshot_store.restore.return_value = {'restored': 1, 'deleted': 0, 'unchanged': 3, 'failed': 1, 'corrupted': 0}
+        with self.assertRaises(CommandError) as cm:
+            self.module.restore_config_snapshot('123')
+        self.assertEqual(str(cm.exception), 'Configuration snapshot partially restored')
+
+        self.module.snapshot_store.restore.return_value = {'restored': 0, 'deleted': 0, 'unchanged': 3, 'failed': 0, 'corrupted': 1}
+        with self.assertRaises(CommandError) as cm:
+            self.module.restore_config_snapshot('123')
+        self.assertEqual(str(cm.exception), 'Configuration snapshot is corrupted, nothing restored')
+
+    def test_set_snapshot_retention(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=True)
+
+        self.module.set_snapshot_retention(5)
+
+        self.module._set_config_field.assert_called_with('snapshotretention', 5)
+        self.assertEqual(self.module.snapshot_store.retention, 5)
+
+    def test_set_snapshot_retention_exception(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_snapshot_retention(0)
+        self.assertEqual(str(cm.exception), 'Parameter "retention" is invalid (specified="0")')
+
+        self.module._set_config_field = Mock(return_value=False)
+        with self.assertRaises(CommandError) as cm:
+            self.module.set_snapshot_retention(5)
+        self.assertEqual(str(cm.exception), 'Unable to save configuration')
+
+    def test_set_cleep_backup_delay(self):
+        self.init_session()
+
+        self.session.cleep_filesystem.read_data = Mock(return_value=['0123456789abcdef\n'])
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.set_cleep_backup_delay(5)
+        self.assertEqual(self.module.cleep_backup_delay, 5)
+        self.assertTrue(0 <= self.module.cleep_backup_offset < 5)
+        self.module.set_cleep_backup_delay(120)
+        self.assertEqual(self.module.cleep_backup_delay, 120)
+        offset = self.module.cleep_backup_offset
+        self.assertTrue(0 <= offset < 120)
+        self.module.set_cleep_backup_delay(120)
+        self.assertEqual(self.module.cleep_backup_offset, offset)
+
+        self.module._set_config_field = Mock(return_value=False)
+        self.module.set_cleep_backup_delay(15)
+        self.assertEqual(self.module.cleep_backup_delay, 120)
+
+    def test_set_cleep_backup_delay_exception(self):
+        self.init_session()
+
+        with self.assertRaises(MissingParameter) as cm:
+            self.module.set_cleep_backup_delay(None)
+        self.assertEqual(str(cm.exception), 'Parameter "delay" is missing')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_cleep_backup_delay(True)
+        self.assertEqual(str(cm.exception), 'Parameter "delay" is invalid (specified="True")')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_cleep_backup_delay(4)
+        self.assertEqual(str(cm.exception), 'Parameter "delay" is invalid (specified="4")')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_cleep_backup_delay(121)
+        self.assertEqual(str(cm.exception), 'Parameter "delay" is invalid (specified="121")')
+
+    def test_install_driver_terminated_success_no_reboot_required(self):
+        self.init_session()
+        self.module.reboot_device = Mock()
+        self.module.drivers = Mock()
+        self.module.drivers.get_driver.return_value = DummyDriver(False)
+
+        self.module._install_driver_terminated('dummy', 'dummy-driver', True, '')
+
+        self.assertTrue(self.session.event_called_with('system.driver.install', {
+            'drivertype': 'dummy',
+            'drivername': 'dummy-driver',
+            'installing': False,
+            'success': True,
+            'message': '',
+        }))
+        self.assertFalse(self.module.reboot_device.called)
+        self.assertTrue(self.module.drivers.get_driver.called)
+
+    def test_install_driver_terminated_success_reboot_required(self):
+        self.init_session()
+        self.module.reboot_device = Mock()
+        self.module.drivers = Mock()
+        self.module.drivers.get_driver.return_value = DummyDriver(True)
+
+        self.module._install_driver_terminated('dummy', 'dummy-driver', True, '')
+
+        self.assertTrue(self.session.event_called_with('system.driver.install', {
+            'drivertype': 'dummy',
+            'drivername': 'dummy-driver',
+            'installing': False,
+            'success': True,
+            'message': '',
+        }))
+        self.assertTrue(self.module.reboot_device.called)
+        self.assertTrue(self.module.drivers.get_driver.called)
+
+    def test_install_driver_terminated_failure(self):
+        self.init_session()
+        self.module.reboot_device = Mock()
+        self.module.drivers = Mock()
+
+        self.module._install_driver_terminated('dummy', 'dummy-driver', False, 'error occured')
+
+        self.assertTrue(self.session.event_called_with('system.driver.install', {
+            'drivertype': 'dummy',
+            'drivername': 'dummy-driver',
+            'installing': False,
+            'success': False,
+            'message': 'error occured',
+        }))
+        self.assertFalse(self.module.reboot_device.called)
+        self.assertFalse(self.module.drivers.get_driver.called)
+
+    def test_install_driver(self):
+        self.init_session()
+        driver = Mock()
+        driver.is_installed = Mock(return_value=False)
+        self.module.drivers.get_driver = Mock(return_value=driver)
+
+        self.module.install_driver('dummy', 'dummy-driver')
+
+        driver.install.assert_called()
+        self.session.event_called_with('system.driver.install', {
+            'drivertype': 'dummy',
+            'drivername': 'dummy-driver',
+            'installing': True,
+            'success': None,
+            'message': None,
+        })
+
+    def test_install_driver_launch_failure(self):
+        self.init_session()
+        driver = Mock()
+        driver.is_installed = Mock(return_value=False)
+        driver.install.side_effect = Exception('Test exception')
+        self.module.drivers.get_driver = Mock(return_value=driver)
+        self.module.driver_install_event = Mock()
+
+        self.module.install_driver('dummy', 'dummy-driver')
+
+        # started event must be sent before terminated one
+        events = [call.args[0] for call in self.module.driver_install_event.send.call_args_list]
+        self.assertEqual([event['installing'] for event in events], [True, False])
+        self.assertFalse(events[1]['success'])
+
+    def test_install_driver_already_installed(self):
+        self.init_session()
+        driver = Mock()
+        driver.is_installed = Mock(return_value=True)
+        self.module.drivers.get_driver = Mock(return_value=driver)
+
+        with self.assertRaises(CommandInfo) as cm:
+            self.module.install_driver('dummy', 'dummy-driver')
+        self.assertEqual(str(cm.exception), 'Driver is already installed')
+
+    def test_install_driver_exception(self):
+        self.init_session()
+        self.module.drivers.get_driver = Mock(return_value=None)
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.install_driver('dummy', 'dummy-driver')
+        self.assertEqual(str(cm.exception), 'No driver found for specified parameters')
+
+        with self.assertRaises(MissingParameter) as cm:
+            self.module.install_driver(None, 'dummy-driver')
+        self.assertEqual(str(cm.exception), 'Parameter "driver_type" is missing')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.install_driver(123, 'dummy-driver')
+        self.assertEqual(str(cm.exception), 'Parameter "driver_type" must be of type "str"')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.install_driver('', 'dummy-driver')
+        self.assertEqual(str(cm.exception), 'Parameter "driver_type" is invalid (specified="")')
+
+        with self.assertRaises(MissingParameter) as cm:
+            self.module.install_driver('dummy', None)
+        self.assertEqual(str(cm.exception), 'Parameter "driver_name" is missing')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.install_driver('dummy', 123)
+        self.assertEqual(str(cm.exception), 'Parameter "driver_name" must be of type "str"')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.install_driver('dummy', '')
+        self.assertEqual(str(cm.exception), 'Parameter "driver_name" is invalid (specified="")')
+
+    def test_uninstall_driver_terminated_success_no_reboot_required(self):
+        self.init_session()
+        self.module.reboot_device = Mock()
+        self.module.drivers = Mock()
+        self.module.drivers.get_driver.return_value = DummyDriver(False)
+
+        self.module._uninstall_driver_terminated('dummy', 'dummy-driver', True, '')
+
+        self.assertTrue(self.session.event_called_with('system.driver.uninstall', {
+            'drivertype': 'dummy',
+            'drivername': 'dummy-driver',
+            'uninstalling': False,
+            'success': True,
+            'message': '',
+        }))
+        self.assertFalse(self.module.reboot_device.called)
+        self.assertTrue(self.module.drivers.get_driver.called)
+
+    def test_uninstall_driver_terminated_success_reboot_required(self):
+        self.init_session()
+        self.module.reboot_device = Mock()
+        self.module.drivers = Mock()
+        self.module.drivers.get_driver.return_value = DummyDriver(True)
+
+        self.module._uninstall_driver_terminated('dummy', 'dummy-driver', True, '')
+
+        self.assertTrue(self.session.event_called_with('system.driver.uninstall', {
+            'drivertype': 'dummy',
+            'drivername': 'dummy-driver',
             'uninstalling': False,
             'success': True,
             'message': '',
@@ -993,6 +2557,232 @@ class TestsSystem(unittest.TestCase):
             'message': None,
         })
 
+    def test_install_driver_dedupes_requests(self):
+        self.init_session()
+        driver = Mock()
+        driver.is_installed = Mock(return_value=False)
+        self.module.drivers.get_driver = Mock(return_value=driver)
+
+        job1 = self.module.install_driver('dummy', 'dummy-driver')
+        job2 = self.module.install_driver('dummy', 'dummy-driver')
+
+        self.assertEqual(job1['id'], job2['id'])
+        self.assertEqual(driver.install.call_count, 1)
+        self.assertEqual(self.session.event_call_count('system.driver.install'), 1)
+
+    def test_get_driver_jobs(self):
+        self.init_session()
+        driver = Mock()
+        driver.is_installed = Mock(return_value=False)
+        self.module.drivers.get_driver = Mock(return_value=driver)
+        self.module.install_driver('dummy', 'dummy-driver')
+
+        jobs = self.module.get_driver_jobs()
+
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs[0]['drivertype'], 'dummy')
+        self.assertEqual(jobs[0]['status'], 'running')
+
+    def test_driver_job_terminated(self):
+        self.init_session()
+        self.module.reboot_device = Mock()
+        driver = Mock()
+        driver.is_installed = Mock(return_value=False)
+        driver.require_reboot = Mock(return_value=True)
+        self.module.drivers.get_driver = Mock(return_value=driver)
+        self.module.install_driver('dummy', 'dummy-driver')
+        self.module.install_driver('other', 'other-driver')
+
+        # first job terminated while another one is running: reboot is delayed
+        end_callback = driver.install.call_args_list[0].args[0]
+        end_callback('dummy', 'dummy-driver', True, '')
+        self.assertTrue(self.session.event_called('system.driver.progress'))
+        self.assertFalse(self.module.reboot_device.called)
+
+        end_callback = driver.install.call_args_list[1].args[0]
+        end_callback('other', 'other-driver', True, '')
+        self.module.reboot_device.assert_called_once()
+
+    def test_driver_reboot_deadline(self):
+        self.init_session()
+        self.module.backup_worker = Mock()
+        self.module.reboot_device = Mock()
+        self.module._set_config_field = Mock(return_value=True)
+        driver = Mock()
+        driver.is_installed = Mock(return_value=False)
+        driver.require_reboot = Mock(return_value=True)
+        self.module.drivers.get_driver = Mock(return_value=driver)
+        self.module.install_driver('dummy', 'dummy-driver')
+        self.module.install_driver('other', 'other-driver')
+        driver.install.call_args_list[0].args[0]('dummy', 'dummy-driver', True, '')
+        self.module._set_config_field.assert_called_with('needreboot', True)
+
+        self.module.on_event({'event': 'parameters.time.now', 'params': {'minute': 1}})
+        self.assertFalse(self.module.reboot_device.called)
+
+        # deadline passed while other driver job is still running
+        with patch('backend.system.time.time', Mock(return_value=time.time() + self.module.DRIVER_REBOOT_DEADLINE + 1)):
+            self.module.on_event({'event': 'parameters.time.now', 'params': {'minute': 1}})
+        self.module.reboot_device.assert_called_once()
+
+    def test_get_drivers_status(self):
+        self.init_session()
+        self.module.drivers_status = Mock()
+        self.module.drivers_status.get.return_value = {
+            'drivers': [
+                {'drivertype': 'audio', 'drivername': 'hifiberry', 'installed': False, 'version': None, 'requirereboot': True},
+                {'drivertype': 'audio', 'drivername': 'respeaker', 'installed': True, 'version': None, 'requirereboot': True},
+            ],
+            'timestamp': 123,
+        }
+        driver = Mock()
+        driver.is_installed = Mock(return_value=False)
+        self.module.drivers.get_driver = Mock(return_value=driver)
+        self.module.install_driver('audio', 'hifiberry')
+
+        status = self.module.get_drivers_status()
+
+        self.assertEqual(status['drivers'][0]['processing'], 1)
+        self.assertEqual(status['drivers'][1]['processing'], 0)
+
+    def test_driver_job_terminated_invalidates_drivers_status(self):
+        self.init_session()
+        self.module.drivers_status = Mock()
+        driver = Mock()
+        driver.is_installed = Mock(return_value=False)
+        driver.require_reboot = Mock(return_value=False)
+        self.module.drivers.get_driver = Mock(return_value=driver)
+        self.module.install_driver('audio', 'hifiberry')
+
+        driver.install.call_args.args[0]('audio', 'hifiberry', True, '')
+
+        self.module.drivers_status.invalidate.assert_called()
+
+    def test_install_driver_caches_downloaded_packages(self):
+        self.init_session()
+        archives_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archives_dir)
+        self.module.APT_ARCHIVES_PATH = archives_dir
+        with open(os.path.join(archives_dir, 'old.deb'), 'w') as fd:
+            fd.write('old')
+        self.module.artifact_cache = Mock()
+        driver = Mock()
+        driver.is_installed = Mock(return_value=False)
+        driver.require_reboot = Mock(return_value=False)
+        self.module.drivers.get_driver = Mock(return_value=driver)
+        self.module.install_driver('dummy', 'dummy-driver')
+
+        with open(os.path.join(archives_dir, 'new.deb'), 'w') as fd:
+            fd.write('new')
+        driver.install.call_args.args[0]('dummy', 'dummy-driver', True, '')
+
+        self.module.artifact_cache.add.assert_called_once_with('dummy/dummy-driver/new.deb', os.path.join(archives_dir, 'new.deb'))
+
+    def test_install_driver_failed_does_not_cache_packages(self):
+        self.init_session()
+        archives_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archives_dir)
+        self.module.APT_ARCHIVES_PATH = archives_dir
+        self.module.artifact_cache = Mock()
+        driver = Mock()
+        driver.is_installed = Mock(return_value=False)
+        self.module.drivers.get_driver = Mock(return_value=driver)
+        self.module.install_driver('dummy', 'dummy-driver')
+
+        with open(os.path.join(archives_dir, 'new.deb'), 'w') as fd:
+            fd.write('new')
+        driver.install.call_args.args[0]('dummy', 'dummy-driver', False, 'error')
+
+        self.assertFalse(self.module.artifact_cache.add.called)
+
+    def test_repair_driver_restores_cached_packages(self):
+        self.init_session()
+        archives_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archives_dir)
+        self.module.APT_ARCHIVES_PATH = archives_dir
+        self.module.artifact_cache = Mock()
+        self.module.artifact_cache.get_keys.return_value = ['dummy/dummy-driver/pkg.deb']
+        self.module.artifact_cache.get.return_value = '/var/cache/cleep/drivers/1234'
+        self.module.cleep_filesystem.copy = Mock(return_value=True)
+        driver = Mock()
+        driver.is_installed = Mock(return_value=True)
+        self.module.drivers.get_driver = Mock(return_value=driver)
+
+        self.module.install_driver('dummy', 'dummy-driver', force=True)
+
+        self.module.artifact_cache.get_keys.assert_called_with('dummy/dummy-driver/')
+        self.module.cleep_filesystem.copy.assert_called_with('/var/cache/cleep/drivers/1234', os.path.join(archives_dir, 'pkg.deb'))
+        driver.install.assert_called()
+
+    def test_repair_driver_without_cached_packages_is_a_miss(self):
+        self.init_session()
+        archives_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archives_dir)
+        self.module.APT_ARCHIVES_PATH = archives_dir
+        self.module.artifact_cache = Mock()
+        self.module.artifact_cache.get_keys.return_value = []
+        driver = Mock()
+        driver.is_installed = Mock(return_value=True)
+        self.module.drivers.get_driver = Mock(return_value=driver)
+
+        self.module.install_driver('dummy', 'dummy-driver', force=True)
+
+        self.module.artifact_cache.record_miss.assert_called_once()
+        driver.install.assert_called()
+
+    def test_install_drivers_packages_attributed_to_their_job(self):
+        self.init_session()
+        archives_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archives_dir)
+        self.module.APT_ARCHIVES_PATH = archives_dir
+        self.module.artifact_cache = Mock()
+        drivers = {'audio': Mock(), 'electronic': Mock()}
+        for driver in drivers.values():
+            driver.is_installed = Mock(return_value=False)
+            driver.require_reboot = Mock(return_value=False)
+        self.module.drivers.get_driver = Mock(side_effect=lambda driver_type, driver_name: drivers[driver_type])
+        self.module.install_driver('audio', 'hifiberry')
+        self.module.install_driver('electronic', 'onewire')
+        with open(os.path.join(archives_dir, 'audio.deb'), 'w') as fd:
+            fd.write('audio')
+
+        # second install is launched (and archives snapshotted) once first one is terminated
+        self.assertFalse(drivers['electronic'].install.called)
+        drivers['audio'].install.call_args.args[0]('audio', 'hifiberry', True, '')
+        self.module.artifact_cache.add.assert_called_once_with('audio/hifiberry/audio.deb', os.path.join(archives_dir, 'audio.deb'))
+
+        with open(os.path.join(archives_dir, 'gpio.deb'), 'w') as fd:
+            fd.write('gpio')
+        drivers['electronic'].install.call_args.args[0]('electronic', 'onewire', True, '')
+
+        self.assertEqual(self.module.artifact_cache.add.call_count, 2)
+        self.module.artifact_cache.add.assert_called_with('electronic/onewire/gpio.deb', os.path.join(archives_dir, 'gpio.deb'))
+
+    def test_get_driver_artifacts_cache(self):
+        self.init_session()
+        self.module.artifact_cache = Mock()
+        self.module.artifact_cache.get_stats.return_value = {'entries': 1}
+
+        self.assertEqual(self.module.get_driver_artifacts_cache(), {'entries': 1})
+
+    def test_clear_driver_artifacts_cache(self):
+        self.init_session()
+        self.module.artifact_cache = Mock()
+        self.module.artifact_cache.clear.return_value = True
+
+        self.module.clear_driver_artifacts_cache()
+
+        self.module.artifact_cache.clear.assert_called()
+
+    def test_clear_driver_artifacts_cache_failed(self):
+        self.init_session()
+        self.module.artifact_cache = Mock()
+        self.module.artifact_cache.clear.return_value = False
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.clear_driver_artifacts_cache()
+        self.assertEqual(str(cm.exception), 'Unable to clear drivers cache')
+
     def test_uninstall_driver_already_uninstalled(self):
         self.init_session()
         driver = Mock()
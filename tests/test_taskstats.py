@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import sys
+sys.path.append('../')
+from backend.taskstats import TaskStats
+from unittest.mock import Mock
+
+class TestsTaskStats(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Mock(return_value=0.0)
+        self.stats = TaskStats(self.clock)
+
+    def test_wrap(self):
+        func = Mock(return_value=3)
+        self.clock.side_effect = [10.0, 10.5, 12.0]
+        task = self.stats.wrap('monitoringcpu', 60.0, func)
+
+        self.assertEqual(task(1, key=2), 3)
+
+        func.assert_called_with(1, key=2)
+        stats = self.stats.get_stats()['monitoringcpu']
+        self.assertEqual(stats['source'], 'system')
+        self.assertEqual(stats['fires'], 1)
+        self.assertEqual(stats['execution'], {'mean': 0.5, 'p90': 0.5, 'max': 0.5})
+        self.assertEqual(stats['lastfire'], 2.0)
+        self.assertIsNone(stats['period'])
+        self.assertEqual(stats['jitter'], {'p50': None, 'p90': None, 'p99': None, 'max': None})
+
+    def test_wrap_exception(self):
+        task = self.stats.wrap('monitoringcpu', 60.0, Mock(side_effect=Exception('Test exception')))
+
+        with self.assertRaises(Exception):
+            task()
+
+        self.assertEqual(self.stats.get_stats()['monitoringcpu']['fires'], 1)
+
+    def test_jitter(self):
+        self.stats.wrap('monitoringcpu', 10.0, Mock())
+        end = 0.0
+        for delay in [10.0, 10.0, 11.0, 10.0, 15.0]:
+            start = end + delay
+            end = start + 1.0
+            self.stats.record('monitoringcpu', start, end)
+        self.clock.return_value = end
+
+        stats = self.stats.get_stats()['monitoringcpu']
+
+        self.assertEqual(stats['fires'], 5)
+        self.assertEqual(stats['jitter'], {'p50': 0.0, 'p90': 5.0, 'p99': 5.0, 'max': 5.0})
+        self.assertEqual(stats['period'], 12.5)
+        self.assertEqual(stats['execution']['mean'], 1.0)
+
+    def test_overruns(self):
+        self.stats.wrap('monitoringcpu', 10.0, Mock())
+
+        self.stats.record('monitoringcpu', 0.0, 5.0)
+        self.stats.record('monitoringcpu', 15.0, 27.0)
+
+        self.assertEqual(self.stats.get_stats()['monitoringcpu']['overruns'], 1)
+
+    def test_history_size(self):
+        self.stats = TaskStats(self.clock, history_size=2)
+        self.stats.wrap('monitoringcpu', 10.0, Mock())
+
+        self.stats.record('monitoringcpu', 0.0, 100.0)
+        self.stats.record('monitoringcpu', 110.0, 111.0)
+        self.stats.record('monitoringcpu', 121.0, 122.0)
+
+        stats = self.stats.get_stats()['monitoringcpu']
+        self.assertEqual(stats['fires'], 3)
+        self.assertEqual(stats['execution']['max'], 1.0)
+
+    def test_record_unknown_task(self):
+        self.stats.record('unknown', 0.0, 1.0)
+
+        self.assertEqual(self.stats.get_stats(), {})
+
+    def test_sources(self):
+        self.stats.wrap('monitoringcpu', 10.0, Mock())
+        app_task = self.stats.wrap('sensors._task', 30.0, Mock(), source='apps')
+
+        self.assertEqual(list(self.stats.get_stats(source='apps').keys()), ['sensors._task'])
+
+        self.stats.enable_source('apps', False)
+        app_task()
+        self.assertEqual(list(self.stats.get_stats().keys()), ['monitoringcpu'])
+
+        self.stats.enable_source('apps', True)
+        self.stats.wrap('sensors._task', 30.0, Mock(), source='apps')()
+        self.assertEqual(self.stats.get_stats()['sensors._task']['fires'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
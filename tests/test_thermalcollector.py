@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+sys.path.append('../')
+from backend.thermalcollector import ThermalCollector
+from unittest.mock import Mock
+
+class TestsThermalCollector(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.write('class/thermal/thermal_zone0/temp', '45231')
+        self.write('devices/system/cpu/cpu0/cpufreq/scaling_cur_freq', '1500000')
+        self.write('devices/system/cpu/cpu1/cpufreq/scaling_cur_freq', '600000')
+        self.write('devices/platform/soc/soc:firmware/get_throttled', '0')
+        self.hardware_infos = Mock()
+        self.hardware_infos.get.return_value = {
+            'cpu': {'count': 2},
+            'thermal': [{'zone': 'thermal_zone0', 'type': 'cpu-thermal', 'path': os.path.join(self.tmp_dir, 'class/thermal/thermal_zone0/temp')}],
+        }
+        self.collector = ThermalCollector(self.hardware_infos, self.tmp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, path, content):
+        path = os.path.join(self.tmp_dir, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as fd:
+            fd.write(content)
+
+    def test_read(self):
+        status = self.collector.read()
+
+        self.assertEqual(status, {
+            'temperature': 45.2,
+            'frequency': 1500,
+            'frequencies': [1500, 600],
+            'throttled': False,
+            'undervoltage': False,
+            'flags': [],
+            'occurred': [],
+        })
+
+    def test_read_throttled_flags(self):
+        self.write('devices/platform/soc/soc:firmware/get_throttled', '0x50005')
+
+        status = self.collector.read()
+
+        self.assertTrue(status['throttled'])
+        self.assertTrue(status['undervoltage'])
+        self.assertEqual(status['flags'], ['undervoltage', 'throttled'])
+        self.assertEqual(status['occurred'], ['undervoltage', 'throttled'])
+
+    def test_read_occurred_only(self):
+        self.write('devices/platform/soc/soc:firmware/get_throttled', '0x20000')
+
+        status = self.collector.read()
+
+        self.assertFalse(status['throttled'])
+        self.assertEqual(status['flags'], [])
+        self.assertEqual(status['occurred'], ['freqcapped'])
+
+    def test_read_invalid_throttled(self):
+        self.write('devices/platform/soc/soc:firmware/get_throttled', 'invalid')
+
+        status = self.collector.read()
+
+        self.assertEqual(status['flags'], [])
+
+    def test_read_without_sysfs(self):
+        shutil.rmtree(self.tmp_dir)
+        os.makedirs(self.tmp_dir)
+
+        status = self.collector.read()
+
+        self.assertIsNone(status['temperature'])
+        self.assertIsNone(status['frequency'])
+        self.assertEqual(status['frequencies'], [])
+        self.assertFalse(status['throttled'])
+
+    def test_collect_throttling_started(self):
+        status, started = self.collector.collect()
+        self.assertEqual(started, [])
+
+        self.write('devices/platform/soc/soc:firmware/get_throttled', '0x4')
+        status, started = self.collector.collect()
+        self.assertEqual(started, ['throttled'])
+
+        # still throttled: no new flag
+        status, started = self.collector.collect()
+        self.assertEqual(started, [])
+
+        self.write('devices/platform/soc/soc:firmware/get_throttled', '0x5')
+        status, started = self.collector.collect()
+        self.assertEqual(started, ['undervoltage'])
+
+    def test_collect_throttling_restarted(self):
+        self.write('devices/platform/soc/soc:firmware/get_throttled', '0x4')
+        self.collector.collect()
+        self.write('devices/platform/soc/soc:firmware/get_throttled', '0x40000')
+        self.collector.collect()
+        self.write('devices/platform/soc/soc:firmware/get_throttled', '0x40004')
+
+        status, started = self.collector.collect()
+
+        self.assertEqual(started, ['throttled'])
+
+
+if __name__ == '__main__':
+    unittest.main()
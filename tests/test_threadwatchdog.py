@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import sys
+import time
+import threading
+sys.path.append('../')
+from backend.threadwatchdog import ThreadWatchdog, dump_threads
+from unittest.mock import Mock
+
+class TestsThreadWatchdog(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Mock(return_value=0.0)
+        self.on_alert = Mock()
+        self.watchdog = ThreadWatchdog(self.on_alert, 60.0, self.clock)
+        self.threads = []
+
+    def tearDown(self):
+        for release, thread in self.threads:
+            release()
+            thread.join()
+
+    def start_thread(self, name, target, release):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self.threads.append((release, thread))
+        time.sleep(0.05)
+        return thread
+
+    def blocked_function(self, lock):
+        lock.acquire()
+        lock.release()
+
+    def test_dump_threads(self):
+        dump = dump_threads()
+
+        main = next(thread for thread in dump if thread['name'] == 'MainThread')
+        self.assertEqual(main['ident'], threading.main_thread().ident)
+        self.assertTrue(any('test_dump_threads' in line for line in main['stack']))
+
+    def test_overrun(self):
+        event = threading.Event()
+        task = self.watchdog.wrap('monitoringcpu', 30.0, event.wait)
+        self.start_thread('monitoringtask', task, event.set)
+
+        self.assertEqual(self.watchdog.check(), [])
+        self.assertEqual(self.watchdog.get_tasks()['monitoringcpu']['running'], 0.0)
+        self.clock.return_value = 31.0
+        alerts = self.watchdog.check()
+
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(alerts[0]['type'], 'overrun')
+        self.assertEqual(alerts[0]['task'], 'monitoringcpu')
+        self.assertEqual(alerts[0]['thread'], 'monitoringtask')
+        self.assertEqual(alerts[0]['duration'], 31.0)
+        self.on_alert.assert_called_once_with(alerts[0])
+        self.clock.return_value = 40.0
+        self.assertEqual(self.watchdog.check(), [])
+
+    def test_task_finished(self):
+        task = self.watchdog.wrap('monitoringcpu', 30.0, Mock(return_value=12))
+
+        self.assertEqual(task(), 12)
+
+        self.assertEqual(self.watchdog.get_tasks(), {'monitoringcpu': {'interval': 30.0, 'running': None}})
+        self.clock.return_value = 100.0
+        self.assertEqual([alert for alert in self.watchdog.check() if alert['type'] == 'overrun'], [])
+
+    def test_stuck_task(self):
+        lock = threading.Lock()
+        lock.acquire()
+        task = self.watchdog.wrap('monitoringcpu', 600.0, lambda: self.blocked_function(lock), stuck=True)
+        self.start_thread('stuckthread', task, lock.release)
+
+        self.watchdog.check()
+        self.clock.return_value = 61.0
+        alerts = self.watchdog.check()
+
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(alerts[0]['type'], 'stuck')
+        self.assertEqual(alerts[0]['task'], 'monitoringcpu')
+        self.assertEqual(alerts[0]['thread'], 'stuckthread')
+        self.assertTrue(any('blocked_function' in line for line in alerts[0]['stack']))
+        self.clock.return_value = 200.0
+        self.assertEqual(self.watchdog.check(), [])
+
+    def test_stuck_check_not_enabled(self):
+        lock = threading.Lock()
+        lock.acquire()
+        task = self.watchdog.wrap('monitoringcpu', 600.0, lambda: self.blocked_function(lock))
+        self.start_thread('stuckthread', task, lock.release)
+
+        self.watchdog.check()
+        self.clock.return_value = 61.0
+
+        self.assertEqual(self.watchdog.check(), [])
+
+    def test_unwatched_thread_not_stuck(self):
+        lock = threading.Lock()
+        lock.acquire()
+        self.start_thread('stuckthread', lambda: self.blocked_function(lock), lock.release)
+
+        self.watchdog.check()
+        self.clock.return_value = 61.0
+
+        self.assertEqual(self.watchdog.check(), [])
+
+    def test_task_making_progress_not_stuck(self):
+        step1 = threading.Lock()
+        step1.acquire()
+        step2 = threading.Lock()
+        step2.acquire()
+        def steps():
+            self.blocked_function(step1)
+            self.blocked_function(step2)
+        task = self.watchdog.wrap('monitoringcpu', 600.0, steps, stuck=True)
+        self.start_thread('progressthread', task, step2.release)
+
+        self.watchdog.check()
+        step1.release()
+        time.sleep(0.05)
+        self.clock.return_value = 61.0
+
+        self.assertEqual(self.watchdog.check(), [])
+
+    def test_alert_callback_failure(self):
+        self.on_alert.side_effect = Exception('Test exception')
+        lock = threading.Lock()
+        lock.acquire()
+        task = self.watchdog.wrap('monitoringcpu', 600.0, lambda: self.blocked_function(lock), stuck=True)
+        self.start_thread('stuckthread', task, lock.release)
+
+        self.watchdog.check()
+        self.clock.return_value = 61.0
+
+        self.assertTrue(any(alert['thread'] == 'stuckthread' for alert in self.watchdog.check()))
+
+
+if __name__ == '__main__':
+    unittest.main()
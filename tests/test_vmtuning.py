@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+sys.path.append('../')
+from backend.vmtuning import VmTuning
+from unittest.mock import Mock, patch
+
+class FakeFilesystem:
+    def open(self, path, mode):
+        return open(path, mode)
+
+    def close(self, fd):
+        fd.close()
+
+    def rm(self, path):
+        os.remove(path)
+        return True
+
+class TestsVmTuning(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.proc = os.path.join(self.tmp_dir, 'proc')
+        self.sys = os.path.join(self.tmp_dir, 'sys')
+        for name, value in VmTuning.PROFILES['default'].items():
+            self.write(os.path.join(self.proc, 'sys', *name.split('.')), str(value))
+        self.write(os.path.join(self.proc, 'swaps'), 'Filename\tType\tSize\tUsed\tPriority\n')
+        self.write(os.path.join(self.sys, 'block/zram0/comp_algorithm'), 'lzo [lzo-rle] lz4 zstd')
+        self.write(os.path.join(self.sys, 'block/zram0/disksize'), '0')
+        self.write(os.path.join(self.sys, 'block/zram0/reset'), '')
+        self.run_command = Mock(return_value={'returncode': 0, 'stdout': [], 'stderr': []})
+        self.tuning = VmTuning(FakeFilesystem(), self.run_command, self.proc, self.sys)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as fd:
+            fd.write(content)
+
+    def read(self, path):
+        with open(path) as fd:
+            return fd.read()
+
+    def test_get_settings(self):
+        os.remove(os.path.join(self.proc, 'sys/vm/dirty_writeback_centisecs'))
+
+        settings = self.tuning.get_settings()
+
+        self.assertEqual(settings['vm.swappiness'], 60)
+        self.assertEqual(settings['vm.dirty_ratio'], 20)
+        self.assertIsNone(settings['vm.dirty_writeback_centisecs'])
+
+    def test_apply_profile(self):
+        self.tuning.apply_profile('sdcard')
+
+        self.assertEqual(self.tuning.get_settings(), VmTuning.PROFILES['sdcard'])
+
+    def test_apply_profile_invalid(self):
+        with self.assertRaises(ValueError) as cm:
+            self.tuning.apply_profile('turbo')
+        self.assertEqual(str(cm.exception), 'Profile "turbo" does not exist')
+
+    def test_set_settings_skip_unknown_and_none(self):
+        self.tuning.set_settings({'vm.swappiness': None, 'vm.unknown': 1, 'vm.dirty_ratio': 30})
+
+        settings = self.tuning.get_settings()
+        self.assertEqual(settings['vm.swappiness'], 60)
+        self.assertEqual(settings['vm.dirty_ratio'], 30)
+
+    def test_enable_zram(self):
+        self.assertTrue(self.tuning.enable_zram(1000))
+
+        self.assertEqual(self.read(os.path.join(self.sys, 'block/zram0/disksize')), '500')
+        self.assertEqual(self.read(os.path.join(self.sys, 'block/zram0/comp_algorithm')), 'lz4')
+        self.run_command.assert_any_call('mkswap /dev/zram0')
+        self.run_command.assert_any_call('swapon -p 100 /dev/zram0')
+
+    def test_enable_zram_load_module(self):
+        shutil.rmtree(os.path.join(self.sys, 'block/zram0'))
+
+        self.assertFalse(self.tuning.enable_zram(1000))
+
+        self.run_command.assert_called_with('modprobe zram num_devices=1')
+
+    def test_enable_zram_command_failed(self):
+        self.run_command.return_value = {'returncode': 1, 'stdout': [], 'stderr': ['error']}
+
+        self.assertFalse(self.tuning.enable_zram(1000))
+
+    def test_enable_zram_already_enabled(self):
+        self.write(os.path.join(self.proc, 'swaps'), 'Filename\tType\tSize\tUsed\tPriority\n/dev/zram0\tpartition\t500\t0\t100\n')
+
+        self.assertTrue(self.tuning.is_zram_enabled())
+        self.assertTrue(self.tuning.enable_zram(1000))
+        self.assertFalse(self.run_command.called)
+
+    def test_disable_zram(self):
+        self.write(os.path.join(self.proc, 'swaps'), 'Filename\tType\tSize\tUsed\tPriority\n/dev/zram0\tpartition\t500\t0\t100\n')
+
+        self.assertTrue(self.tuning.disable_zram())
+
+        self.run_command.assert_called_with('swapoff /dev/zram0')
+        self.assertEqual(self.read(os.path.join(self.sys, 'block/zram0/reset')), '1')
+
+    def test_disable_zram_not_enabled(self):
+        self.assertTrue(self.tuning.disable_zram())
+        self.assertFalse(self.run_command.called)
+
+    def test_benchmark(self):
+        path = os.path.join(self.tmp_dir, 'benchmark')
+
+        result = self.tuning.benchmark(path, file_size=65536, rewrites=2, settle=0.0, memory_ratio=0.001)
+
+        self.assertEqual(result['logicalbytes'], 131072)
+        self.assertGreaterEqual(result['diskbytes'], 0)
+        self.assertEqual(result['amplification'], round(result['diskbytes'] / 131072, 3))
+        self.assertGreater(result['minavailable'], 0)
+        self.assertFalse(os.path.exists(path))
+
+    @patch('backend.vmtuning.subprocess.run')
+    def test_benchmark_settle_longer_than_dirty_expire(self, run_mock):
+        run_mock.return_value = Mock(returncode=0, stdout='{"logicalbytes": 1}', stderr='')
+        self.tuning.apply_profile('sdcard')
+
+        result = self.tuning.benchmark(os.path.join(self.tmp_dir, 'benchmark'))
+
+        self.assertEqual(result, {'logicalbytes': 1})
+        params = json.loads(run_mock.call_args.args[0][2])
+        self.assertEqual(params['settle'], 60 + 15 + VmTuning.SETTLE_MARGIN)
+
+    @patch('backend.vmtuning.subprocess.run')
+    def test_benchmark_process_failed(self, run_mock):
+        run_mock.return_value = Mock(returncode=1, stdout='', stderr='MemoryError\n')
+        path = os.path.join(self.tmp_dir, 'benchmark')
+
+        with self.assertRaises(RuntimeError) as cm:
+            self.tuning.benchmark(path, settle=0.0)
+        self.assertEqual(str(cm.exception), 'Benchmark process failed: MemoryError')
+        self.assertFalse(os.path.exists(path))
+
+if __name__ == '__main__':
+    unittest.main()